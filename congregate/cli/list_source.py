@@ -2,6 +2,8 @@ import os
 import sys
 import click
 from time import sleep
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 from celery import shared_task
 
@@ -36,13 +38,14 @@ from congregate.migration.ado.api.projects import ProjectsApi as AdoProjectsApi
 from congregate.migration.jenkins.base import JenkinsClient as JenkinsData
 from congregate.migration.teamcity.base import TeamcityClient as TeamcityData
 
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector, mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, mongo_connection
 
 from congregate.migration.codecommit.api.base import CodeCommitApiWrapper
 from congregate.migration.codecommit.projects import CodeCommitProjectsClient as CodeCommitProjects
 from congregate.migration.codecommit.groups import GroupsClient as CodeCommitGroups
 
-from congregate.helpers.csv_utils import write_projects_csv, write_groups_csv, write_users_csv
+from congregate.helpers.csv_utils import write_collection_csv
+from congregate.helpers.staging_store import get_staging_store
 
 LIST_TASKS = [
     'list_data',
@@ -61,6 +64,9 @@ LIST_TASKS = [
     'retrieve-ado-groups'
 ]
 
+# GitLab updates a project last_activity_at at most once an hour
+LAST_ACTIVITY_LAG = timedelta(hours=1)
+
 class ListClient(BaseClass):
     def __init__(
         self,
@@ -76,7 +82,8 @@ class ListClient(BaseClass):
         subset=False,
         skip_archived_projects=False,
         only_specific_projects=None,
-        format="json"
+        format="json",
+        delta=False
     ):
         super().__init__()
         self.processes = processes
@@ -92,13 +99,23 @@ class ListClient(BaseClass):
         self.skip_archived_projects = skip_archived_projects
         self.only_specific_projects = only_specific_projects
         self.format = format
+        self.delta = delta
+        self.since = None
 
     def list_gitlab_data(self):
         """
             List the projects information, and Retrieve user info, group info from source instance.
             File-based - Save all projects, groups, and users information into mongodb and json file.
+
+            Delta - Only list projects active or updated since the last complete listing, and sweep deleted ones
         """
-        mongo, p, g, u = self.mongo_init()
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if self.delta and self.config.direct_transfer:
+            # Direct transfer listings run as Celery tasks, which list everything
+            self.log.warning(
+                "Delta listing is not supported with direct_transfer. Listing everything")
+        mongo, p, g, u = self.mongo_init(
+            delta=self.delta and not self.config.direct_transfer)
         host = self.config.source_host
         token = self.config.source_token
 
@@ -106,40 +123,35 @@ class ListClient(BaseClass):
             users = UsersClient()
             users.retrieve_user_info(host, token, processes=self.processes)
             if not self.config.direct_transfer:
-                mongo.dump_collection_to_file(
-                    u, f"{self.app_path}/data/users.json")
-                if self.format.lower() == "csv":
-                    write_users_csv(json_path=f"{self.app_path}/data/users.json",
-                                    csv_path=f"{self.app_path}/data/users.csv")
+                self.dump_listed_data(mongo, u, "users")
 
         # Lists all groups and group projects
         if not self.skip_groups:
             groups = GroupsClient()
             groups.skip_group_members = self.skip_group_members
             groups.skip_project_members = self.skip_project_members
+            groups.since = self.since
             groups.retrieve_group_info(host, token, processes=self.processes)
             if not self.config.direct_transfer:
-                mongo.dump_collection_to_file(
-                    g, f"{self.app_path}/data/groups.json")
-                if self.format.lower() == "csv":
-                    write_groups_csv(json_path=f"{self.app_path}/data/groups.json",
-                                    csv_path=f"{self.app_path}/data/groups.csv")
+                self.dump_listed_data(mongo, g, "groups")
 
         # Listing groups on gitlab.com will also list their projects
         # Listing on-prem includes personal projects
         if not self.skip_projects and not is_dot_com(host):
             projects = ProjectsClient()
             projects.skip_project_members = self.skip_project_members
+            projects.since = self.since
             projects.retrieve_project_info(
                 host, token, processes=self.processes)
 
         # When to dump listed projects
         if not self.skip_projects and not self.config.direct_transfer:
-            mongo.dump_collection_to_file(
-                p, f"{self.app_path}/data/projects.json")
-            if self.format.lower() == "csv":
-                write_projects_csv(json_path=f"{self.app_path}/data/projects.json",
-                                csv_path=f"{self.app_path}/data/projects.csv")
+            if self.since:
+                ProjectsClient().delete_missing_projects(host, token)
+            self.dump_listed_data(mongo, p, "projects")
+            # A complete listing is the starting point of the next delta listing
+            if not self.partial:
+                mongo.set_high_water_mark(p, started)
 
         mongo.close_connection()
 
@@ -150,21 +162,13 @@ class ListClient(BaseClass):
         if not self.skip_users:
             users = BitBucketUsers()
             users.retrieve_user_info(processes=self.processes)
-            mongo.dump_collection_to_file(
-                u, f"{self.app_path}/data/users.json")
-            if self.format.lower() == "csv":
-                write_users_csv(json_path=f"{self.app_path}/data/users.json",
-                                csv_path=f"{self.app_path}/data/users.csv")
+            self.dump_listed_data(mongo, u, "users")
         if not self.skip_groups:
             projects = BitBucketProjects(subset=self.subset)
             if not self.skip_group_members:
                 projects.set_user_groups(user_groups)
             projects.retrieve_project_info(processes=self.processes, skip_archived_projects=self.skip_archived_projects)
-            mongo.dump_collection_to_file(
-                g, f"{self.app_path}/data/groups.json")
-            if self.format.lower() == "csv":
-                write_groups_csv(json_path=f"{self.app_path}/data/groups.json",
-                                csv_path=f"{self.app_path}/data/groups.csv")
+            self.dump_listed_data(mongo, g, "groups")
             # Save listed BB Server parent projects
             if self.subset:
                 mongo.dump_collection_to_file(
@@ -174,18 +178,10 @@ class ListClient(BaseClass):
             if not self.skip_project_members:
                 repos.set_user_groups(user_groups)
             repos.retrieve_repo_info(processes=self.processes, skip_archived_projects=self.skip_archived_projects)
-            mongo.dump_collection_to_file(
-                p, f"{self.app_path}/data/projects.json")
-            if self.format.lower() == "csv":
-                write_projects_csv(json_path=f"{self.app_path}/data/projects.json",
-                                csv_path=f"{self.app_path}/data/projects.csv")
+            self.dump_listed_data(mongo, p, "projects")
             # Save listed BB Server parent projects
             if self.subset:
-                mongo.dump_collection_to_file(
-                    g, f"{self.app_path}/data/groups.json")
-                if self.format.lower() == "csv":
-                    write_groups_csv(json_path=f"{self.app_path}/data/groups.json",
-                                    csv_path=f"{self.app_path}/data/groups.csv")
+                self.dump_listed_data(mongo, g, "groups")
         mongo.close_connection()
 
     def list_bitbucket_cloud_data(self):
@@ -228,24 +224,15 @@ class ListClient(BaseClass):
                 users = GitHubUsers(
                     host, token, self.config.source_username, self.config.source_password)
                 users.retrieve_user_info(processes=self.processes)
-                mongo.dump_collection_to_file(u, f"{app}/data/users.json")
-                if self.format.lower() == "csv":
-                    write_users_csv(json_path=f"{self.app_path}/data/users.json",
-                                    csv_path=f"{self.app_path}/data/users.csv")
+                self.dump_listed_data(mongo, u, "users")
             if not self.skip_groups:
                 orgs = GitHubOrgs(host, token)
                 orgs.retrieve_org_info(processes=self.processes)
-                mongo.dump_collection_to_file(g, f"{app}/data/groups.json")
-                if self.format.lower() == "csv":
-                    write_groups_csv(json_path=f"{self.app_path}/data/groups.json",
-                                    csv_path=f"{self.app_path}/data/groups.csv")
+                self.dump_listed_data(mongo, g, "groups")
             if not self.skip_projects:
                 repos = GitHubRepos(host, token)
                 repos.retrieve_repo_info(processes=self.processes)
-                mongo.dump_collection_to_file(p, f"{app}/data/projects.json")
-                if self.format.lower() == "csv":
-                    write_projects_csv(json_path=f"{self.app_path}/data/projects.json",
-                                    csv_path=f"{self.app_path}/data/projects.csv")
+                self.dump_listed_data(mongo, p, "projects")
         else:
             for _, single_source in enumerate(
                     self.config.list_multiple_source_config("github_source")):
@@ -297,21 +284,13 @@ class ListClient(BaseClass):
             if not self.skip_projects:
                 projects = AdoProjects()
                 projects.retrieve_project_info(processes=self.processes, projects_list=projects_list)
-                mongo.dump_collection_to_file(
-                    p, f"{self.app_path}/data/projects.json")
-                if self.format.lower() == "csv":
-                    write_projects_csv(json_path=f"{self.app_path}/data/projects.json",
-                                csv_path=f"{self.app_path}/data/projects.csv")
+                self.dump_listed_data(mongo, p, "projects")
 
             # Find ADO projects with >1 repos ( = group in GitLab)
             if not self.skip_groups:
                 groups = AdoGroups()
                 groups.retrieve_group_info(processes=self.processes, projects_list=projects_list)
-                mongo.dump_collection_to_file(
-                    g, f"{self.app_path}/data/groups.json")
-                if self.format.lower() == "csv":
-                    write_projects_csv(json_path=f"{self.app_path}/data/groups.json",
-                                csv_path=f"{self.app_path}/data/groups.csv")
+                self.dump_listed_data(mongo, g, "groups")
 
         else:
 
@@ -319,37 +298,25 @@ class ListClient(BaseClass):
             if not self.skip_projects:
                 projects = AdoProjects()
                 projects.retrieve_project_info(processes=self.processes)
-                mongo.dump_collection_to_file(
-                    p, f"{self.app_path}/data/projects.json")
-                if self.format.lower() == "csv":
-                    write_projects_csv(json_path=f"{self.app_path}/data/projects.json",
-                                csv_path=f"{self.app_path}/data/projects.csv")
+                self.dump_listed_data(mongo, p, "projects")
 
             # Find ADO projects with >1 repos ( = group in GitLab)
             if not self.skip_groups:
                 groups = AdoGroups()
                 groups.retrieve_group_info(processes=self.processes)
-                mongo.dump_collection_to_file(
-                    g, f"{self.app_path}/data/groups.json")
-                if self.format.lower() == "csv":
-                    write_projects_csv(json_path=f"{self.app_path}/data/groups.json",
-                                csv_path=f"{self.app_path}/data/groups.csv")
+                self.dump_listed_data(mongo, g, "groups")
                 
         if not self.skip_users and "dev.azure.com" in self.config.source_host:
             users = AdoUsers()
             users.retrieve_user_info(processes=self.processes)
-            mongo.dump_collection_to_file(
-                u, f"{self.app_path}/data/users.json")
-            if self.format.lower() == "csv":
-                write_projects_csv(json_path=f"{self.app_path}/data/users.json",
-                            csv_path=f"{self.app_path}/data/users.csv")
+            self.dump_listed_data(mongo, u, "users")
         else:
             self.log.info("TFS and Azure DevOps Server do not support user retrieval via API. Skipping user retrieval data ...")
 
         mongo.close_connection()
 
     def list_jenkins_data(self):
-        mongo = CongregateMongoConnector()
+        mongo = get_shared_mongo_connector()
         for i, single_jenkins_ci_source in enumerate(
                 self.config.list_ci_source_config("jenkins_ci_source")):
             collection_name = f"jenkins-{single_jenkins_ci_source.get('jenkins_ci_src_hostname').split('//')[-1]}"
@@ -360,7 +327,7 @@ class ListClient(BaseClass):
                 collection_name, f"{self.app_path}/data/jenkins-{i}.json")
 
     def list_teamcity_data(self):
-        mongo = CongregateMongoConnector()
+        mongo = get_shared_mongo_connector()
         for i, single_teamcity_ci_source in enumerate(
                 self.config.list_ci_source_config("teamcity_ci_source")):
             collection_name = f"teamcity-{single_teamcity_ci_source.get('tc_ci_src_hostname').split('//')[-1]}"
@@ -402,6 +369,27 @@ class ListClient(BaseClass):
             raise
 
 
+    def dump_listed_data(self, mongo, collection, asset):
+        """
+            Dump a listed collection to data/<asset>.json and, in CSV format,
+            stream it to data/<asset>.csv at the same time
+
+            :param collection: (str) Listed collection e.g. projects-<host>
+            :param asset: (str) projects, groups or users
+        """
+        if self.format.lower() != "csv":
+            mongo.dump_collection_to_file(
+                collection, f"{self.app_path}/data/{asset}.json")
+            return
+        # Flush buffered writes before both readers start
+        mongo.flush_bulk_writes()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            csv_written = executor.submit(write_collection_csv, mongo, collection,
+                                          f"{self.app_path}/data/{asset}.csv", asset)
+            mongo.dump_collection_to_file(
+                collection, f"{self.app_path}/data/{asset}.json")
+            csv_written.result()
+
     def write_empty_file(self, filename):
         """
             Write an empty json file containing an empty list, it's used to make sure a file is present in the filesystem
@@ -458,6 +446,8 @@ class ListClient(BaseClass):
             self.write_empty_file(f)
         if as_task:
             return watch_task.id
+        # Index the listed data for staging
+        get_staging_store(self.app_path).index_all()
 
     def initialize_list_files(self):
         objects = ["users", "groups", "projects"]
@@ -469,15 +459,19 @@ class ListClient(BaseClass):
                 with open(file_path, "w") as f:
                     f.write("[]")
 
-    def mongo_init(self, subset=False):
-        mongo = CongregateMongoConnector()
+    def mongo_init(self, subset=False, delta=False):
+        """
+            :param delta: (bool) Keep the listed projects if they were completely listed before, and set since
+        """
+        mongo = get_shared_mongo_connector()
         src_hostname = strip_netloc(self.config.source_host)
         p = f"projects-{src_hostname}"
         g = f"groups-{src_hostname}"
         u = f"users-{src_hostname}"
+        self.since = self.get_delta_since(mongo, p) if delta else None
         if not self.partial:
             self.log.info("Dropping database collections")
-            if not self.skip_projects or subset:
+            if (not self.skip_projects or subset) and not self.since:
                 mongo.drop_collection(p)
             if not self.skip_groups or subset:
                 mongo.drop_collection(g)
@@ -485,6 +479,20 @@ class ListClient(BaseClass):
                 mongo.drop_collection(u)
         return mongo, p, g, u
 
+    def get_delta_since(self, mongo, collection):
+        """
+            :return: (str) ISO 8601 time projects must have been active or updated since to be listed, or None to list all
+        """
+        if not (mark := mongo.get_high_water_mark(collection)):
+            self.log.info(
+                f"No complete listing of {collection} found. Listing all projects")
+            return None
+        since = (datetime.fromisoformat(mark.replace("Z", "+00:00")) -
+                 LAST_ACTIVITY_LAG).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.log.info(
+            f"Delta listing {collection} projects active or updated since {since}")
+        return since
+
 
 @shared_task(name='list_data')
 def list_data(partial=False, skip_users=False, skip_groups=False, skip_group_members=False,
@@ -518,4 +526,5 @@ def watch_list_status(mongo=None):
         b.log.info(f"Saving {asset} to {b.app_path}/data/{asset}.json")
         mongo.dump_collection_to_file(
             f"{asset}-{src_hostname}", f"{b.app_path}/data/{asset}.json")
+    get_staging_store(b.app_path).index_all()
         
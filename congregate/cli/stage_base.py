@@ -9,10 +9,11 @@ import sys
 import os
 from gitlab_ps_utils.misc_utils import get_dry_log, strip_netloc
 from gitlab_ps_utils.list_utils import remove_dupes_with_keys, remove_dupes
-from gitlab_ps_utils.dict_utils import dig
+from gitlab_ps_utils.dict_utils import dig, rewrite_list_into_dict
 from gitlab_ps_utils.json_utils import json_pretty, write_json_to_file
 
 from congregate.helpers.base_class import BaseClass
+from congregate.helpers.staging_store import get_staging_store, ListedData
 from congregate.helpers.migrate_utils import sanitize_name, is_gl_version_older_than, sanitize_project_path
 
 
@@ -65,6 +66,35 @@ class BaseStageClass(BaseClass):
             with open(f"{self.app_path}/data/users.json", "r") as f:
                 return json.load(f)
 
+    def get_listed_data(self, asset, scm_source=None):
+        """
+            Get listed projects, groups or users, queried by key from the indexed staging store (data/staging.db).
+            Falls back to loading the whole JSON file when it does not exist.
+
+            :param asset: (str) projects, groups or users
+            :return: (ListedData or list) Listed assets
+        """
+        listed = get_staging_store(self.app_path).get(asset, scm_source)
+        if listed is not None:
+            return listed
+        return getattr(self, f"open_{asset}_file")(scm_source)
+
+    def index_listed_data(self, data, key, lowercase=False):
+        """
+            Index listed assets by key, e.g. id or full_path
+        """
+        if isinstance(data, ListedData):
+            return data.index(key, lowercase=lowercase)
+        return rewrite_list_into_dict(data, key, lowercase=lowercase)
+
+    def filter_listed_data(self, data, ids):
+        """
+            Listed assets of the given IDs, in listed order
+        """
+        if isinstance(data, ListedData):
+            return data.get_many(ids)
+        return [d for d in data if d["id"] in ids]
+
     def write_staging_files(self, skip_users=False):
         """
             Write all staged projects, users and groups objects into JSON files
@@ -10,7 +10,7 @@ import os
 
 from gitlab_ps_utils.misc_utils import get_dry_log
 from gitlab_ps_utils.list_utils import remove_dupes
-from gitlab_ps_utils.dict_utils import rewrite_list_into_dict, dig
+from gitlab_ps_utils.dict_utils import dig
 
 from congregate.cli.stage_base import BaseStageClass
 from congregate.migration.meta import constants
@@ -51,13 +51,13 @@ class GroupStageCLI(BaseStageClass):
             groups = parse_groups_csv(self.app_path, scm_source)
             users = parse_users_csv(self.app_path, scm_source)
         else:
-            projects = self.open_projects_file(scm_source)
-            groups = self.open_groups_file(scm_source)
-            users = self.open_users_file(scm_source)
+            projects = self.get_listed_data("projects", scm_source)
+            groups = self.get_listed_data("groups", scm_source)
+            users = self.get_listed_data("users", scm_source)
 
-        self.rewritten_users = rewrite_list_into_dict(users, "id")
-        self.rewritten_projects = rewrite_list_into_dict(projects, "id")
-        self.rewritten_groups = rewrite_list_into_dict(groups, "id")
+        self.rewritten_users = self.index_listed_data(users, "id")
+        self.rewritten_projects = self.index_listed_data(projects, "id")
+        self.rewritten_groups = self.index_listed_data(groups, "id")
 
         # Track which groups have already been staged to avoid duplicates
         self.staged_group_ids = set()
@@ -85,8 +85,8 @@ class GroupStageCLI(BaseStageClass):
                             f"{get_dry_log(dry_run)}Staging user '{u['email']}' (ID: {u['id']})")
                         self.staged_users.append(u)
                 elif re.match(constants.UUID_PATTERN, groups_to_stage[0]):
-                    groups = [group for group in groups if group["id"]
-                              in groups_to_stage]
+                    groups = self.filter_listed_data(
+                        groups, groups_to_stage)
                     for g in groups:
                         self.log.info(
                             f"{get_dry_log(dry_run)}Staging group '{g['full_path']}' (ID: {g['id']})")
@@ -114,8 +114,8 @@ class GroupStageCLI(BaseStageClass):
                             f"{get_dry_log(dry_run)}Staging user '{u['email']}' (ID: {u['id']})")
                         self.staged_users.append(u)
                 elif re.match(constants.UUID_PATTERN, groups_to_stage[0]):
-                    groups = [group for group in groups if group["id"]
-                              in groups_to_stage]
+                    groups = self.filter_listed_data(
+                        groups, groups_to_stage)
                     for g in groups:
                         self.log.info(
                             f"{get_dry_log(dry_run)}Staging group '{g['full_path']}' (ID: {g['id']})")
@@ -10,7 +10,7 @@ import os
 
 from gitlab_ps_utils.misc_utils import get_dry_log
 from gitlab_ps_utils.list_utils import remove_dupes
-from gitlab_ps_utils.dict_utils import rewrite_list_into_dict, dig
+from gitlab_ps_utils.dict_utils import dig
 from gitlab_ps_utils.json_utils import json_pretty
 
 from congregate.helpers.migrate_utils import get_staged_user_projects
@@ -72,14 +72,14 @@ class ProjectStageCLI(BaseStageClass):
             groups = parse_groups_csv(self.app_path, scm_source)
             users = parse_users_csv(self.app_path, scm_source)
         else:
-            projects = self.open_projects_file(scm_source)
-            groups = self.open_groups_file(scm_source)
-            users = self.open_users_file(scm_source)
+            projects = self.get_listed_data("projects", scm_source)
+            groups = self.get_listed_data("groups", scm_source)
+            users = self.get_listed_data("users", scm_source)
 
         # Rewriting projects to retrieve objects by ID more efficiently
-        self.rewritten_users = rewrite_list_into_dict(users, "id")
-        self.rewritten_projects = rewrite_list_into_dict(projects, "id")
-        self.rewritten_groups = rewrite_list_into_dict(groups, "id")
+        self.rewritten_users = self.index_listed_data(users, "id")
+        self.rewritten_projects = self.index_listed_data(projects, "id")
+        self.rewritten_groups = self.index_listed_data(groups, "id")
 
         # If there is CLI or UI input
         if list(filter(None, projects_to_stage)):
@@ -102,8 +102,8 @@ class ProjectStageCLI(BaseStageClass):
                             f"{get_dry_log(dry_run)}Staging user '{u['email']}' (ID: {u['id']})")
                         self.staged_users.append(u)
                 elif re.match(constants.UUID_PATTERN, projects_to_stage[0]):
-                    projects = [
-                        project for project in projects if project["id"] in projects_to_stage]
+                    projects = self.filter_listed_data(
+                        projects, projects_to_stage)
                     for p in projects:
                         self.log.info(
                             f"{get_dry_log(dry_run)}Staging project '{p['path_with_namespace']}' (ID: {p['id']})")
@@ -132,8 +132,8 @@ class ProjectStageCLI(BaseStageClass):
                             f"{get_dry_log(dry_run)}Staging user '{u['email']}' (ID: {u['id']})")
                         self.staged_users.append(u)
                 elif re.match(constants.UUID_PATTERN, projects_to_stage[0]):
-                    projects = [
-                        project for project in projects if project["id"] in projects_to_stage]
+                    projects = self.filter_listed_data(
+                        projects, projects_to_stage)
                     for p in projects:
                         self.log.info(
                             f"{get_dry_log(dry_run)}Staging project '{p['path_with_namespace']}' (ID: {p['id']})")
@@ -8,6 +8,7 @@ from gitlab_ps_utils.json_utils import write_json_to_file
 from gitlab_ps_utils.list_utils import remove_dupes
 from congregate.cli.stage_base import BaseStageClass
 from congregate.helpers.csv_utils import parse_users_csv
+from congregate.helpers.staging_store import ListedData
 
 
 class UserStageCLI(BaseStageClass):
@@ -39,7 +40,7 @@ class UserStageCLI(BaseStageClass):
         if self.format.lower() == "csv":
             users = parse_users_csv(self.app_path)
         else:
-            users = self.open_users_file()
+            users = self.get_listed_data("users")
         if list(filter(None, users_to_stage)):
             if users_to_stage[0] in ["all", "."]:
                 for u in users:
@@ -48,12 +49,19 @@ class UserStageCLI(BaseStageClass):
                     self.staged_users.append(u)
             else:
                 for user in filter(None, users_to_stage):
-                    for u in users:
-                        if (user == u["username"]) or (user == str(u["id"])) or (user == u["email"]):
-                            self.staged_users.append(u)
-                            self.log.info(
-                                f"Staging user '{u['email']}' (ID: {u['id']}) [{len(self.staged_users)}/{len(users)}]")
+                    for u in self.find_listed_users(users, user):
+                        self.staged_users.append(u)
+                        self.log.info(
+                            f"Staging user '{u['email']}' (ID: {u['id']}) [{len(self.staged_users)}/{len(users)}]")
         else:
             self.log.info("Staging empty user list")
             return self.staged_users
         return remove_dupes(self.staged_users)
+
+    def find_listed_users(self, users, user):
+        """
+            Listed users matching a username, email or ID
+        """
+        if isinstance(users, ListedData):
+            return users.find_users(user)
+        return [u for u in users if user in (u["username"], str(u["id"]), u["email"])]
@@ -6,8 +6,6 @@ Copyright (c) 2022 - GitLab
 import os
 import sys
 
-from gitlab_ps_utils.dict_utils import rewrite_list_into_dict
-
 from congregate.migration.meta.etl import WaveSpreadsheetHandler
 from congregate.migration.gitlab.api.groups import GroupsApi
 from congregate.cli.stage_base import BaseStageClass
@@ -45,18 +43,19 @@ class WaveStageCLI(BaseStageClass):
         if i == -1:
             self.log.warning(
                 f"Couldn't find the correct GH instance with hostname: {scm_source}")
-        self.rewritten_projects = rewrite_list_into_dict(
-            self.open_projects_file(scm_source), "id")
-        self.rewritten_users = rewrite_list_into_dict(
-            self.open_users_file(scm_source), "id")
-        self.rewritten_groups = rewrite_list_into_dict(
-            self.open_groups_file(scm_source), "id")
-        self.group_paths = rewrite_list_into_dict(
-            self.open_groups_file(scm_source), "full_path", lowercase=True)
-        self.project_urls = rewrite_list_into_dict(
-            self.open_projects_file(scm_source), "http_url_to_repo", lowercase=True)
-        self.project_paths = rewrite_list_into_dict(
-            self.open_projects_file(scm_source), "path_with_namespace", lowercase=True)
+        # Looked up by ID, path and URL from the staging store, instead of loading whole files
+        projects = self.get_listed_data("projects", scm_source)
+        groups = self.get_listed_data("groups", scm_source)
+        self.rewritten_projects = self.index_listed_data(projects, "id")
+        self.rewritten_users = self.index_listed_data(
+            self.get_listed_data("users", scm_source), "id")
+        self.rewritten_groups = self.index_listed_data(groups, "id")
+        self.group_paths = self.index_listed_data(
+            groups, "full_path", lowercase=True)
+        self.project_urls = self.index_listed_data(
+            projects, "http_url_to_repo", lowercase=True)
+        self.project_paths = self.index_listed_data(
+            projects, "path_with_namespace", lowercase=True)
 
         wave_spreadsheet_path = self.config.wave_spreadsheet_path
         if not os.path.isfile(wave_spreadsheet_path):
@@ -1,19 +1,52 @@
 import tarfile
 import os
 from time import time
-from json import dumps, load
+from json import dumps, loads
 from io import BytesIO
+from hashlib import sha256
 from pathlib import Path
 from dacite import from_dict
 from congregate.helpers.configuration_validator import Config
 from congregate.helpers.congregate_mdbc import mongo_connection
 from congregate.migration.meta.api_models.single_project_features import SingleProjectFeatures
 
+# Archive members are piped between file objects in chunks of this size
+CHUNK_SIZE = 1024 * 1024
+# Last archive member, listing the SHA-256 checksum of the other members (sha256sum format)
+CHECKSUMS_FILE = "checksums.sha256"
+
+
+class ChecksumReader():
+    """
+        File object wrapper computing the SHA-256 checksum of the data read through it
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.checksum = sha256()
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.checksum.update(data)
+        return data
+
+    def hexdigest(self):
+        return self.checksum.hexdigest()
+
+
 def create_archive(pid, export_file):
     final_path = f"{export_file.split('.tar.gz')[0]}_artifact.tar.gz"
+    checksums = {}
     with tarfile.TarFile.open(final_path, 'w:gz') as tar:
-        __add_file(tar, Path(export_file).name, __read_targz(export_file))
-        __add_file(tar, "project_features.json", __get_project_features(pid))
+        tar.copybufsize = CHUNK_SIZE
+        with open(export_file, 'rb') as f:
+            checksums[Path(export_file).name] = __add_file(
+                tar, Path(export_file).name, f, os.fstat(f.fileno()).st_size)
+        checksums["project_features.json"] = __add_file(
+            tar, "project_features.json", __get_project_features(pid))
+        if Config().airgap_checksums:
+            __add_file(tar, CHECKSUMS_FILE, BytesIO(
+                "".join(f"{c}  {name}\n" for name, c in checksums.items()).encode()))
     return final_path
 
 def extract_archive(import_file):
@@ -21,20 +54,32 @@ def extract_archive(import_file):
         # open tar for extraction
         project_details = {}
         project_export_filename = ''
-        with tarfile.TarFile.open(import_file, 'r:gz') as tar:
-            for tf in tar.getmembers():
+        export_download_path = None
+        checksums = {}
+        # Read the archive in a single pass, piping each member to its destination
+        with tarfile.TarFile.open(import_file, 'r|gz') as tar:
+            for tf in tar:
+                reader = ChecksumReader(tar.extractfile(tf)) if tf.isfile() else None
                 if tf.name == "project_features.json":
                     # load project features into mongo
-                    features = load((tar.extractfile(tf)))
+                    features = loads(reader.read())
                     project_details = features.get('project_details')
                     load_project_features(features)
+                    checksums[tf.name] = reader.hexdigest()
                 elif ''.join(Path(tf.name).suffixes) == '.tar.gz':
                     # download project export
                     project_export_filename = tf.name
                     export_download_path = os.path.join(Config().filesystem_path, 'downloads', tf.name)
                     with open(export_download_path, 'wb') as export_tar:
-                        export_tar.write(tar.extractfile(tf).read())
+                        while chunk := reader.read(CHUNK_SIZE):
+                            export_tar.write(chunk)
+                    checksums[tf.name] = reader.hexdigest()
+                elif tf.name == CHECKSUMS_FILE:
+                    verify_checksums(reader.read().decode(), checksums, export_download_path)
         return project_details, project_export_filename
+    except ValueError as e:
+        # Handle invalid archive contents e.g. checksum mismatches
+        raise Exception(f"Invalid archive: {e}") from e
     except tarfile.TarError as e:
         # Handle tar file specific errors
         raise Exception("Error extracting tar file") from e
@@ -51,6 +96,18 @@ def extract_archive(import_file):
         # Handle any other unexpected errors
         raise Exception("Unexpected error during archive extraction") from e
 
+def verify_checksums(manifest, checksums, export_download_path=None):
+    """
+        Verify the checksums of the extracted archive members against the archive manifest.
+        The extracted project export is deleted on a mismatch.
+    """
+    for line in manifest.splitlines():
+        expected, name = line.split("  ", 1)
+        if checksums.get(name) != expected:
+            if export_download_path and os.path.exists(export_download_path):
+                os.remove(export_download_path)
+            raise ValueError(f"Checksum mismatch of archive member '{name}'")
+
 def delete_project_export(filename):
     full_path = os.path.join(Config().filesystem_path, 'downloads', filename)
     if ''.join(Path(full_path).suffixes) == '.tar.gz' and os.path.exists(full_path):
@@ -75,14 +132,19 @@ def __get_project_features(pid, mongo=None):
         ), encoding='utf-8')
     )
 
-def __read_targz(filepath):
-    with open(filepath, 'rb') as f:
-        return BytesIO(f.read())
+def __add_file(tar, path, data, size=None):
+    """
+        Add a file object to the archive, copied in chunks
 
-def __add_file(tar, path, data):
+        :return: (str) SHA-256 checksum of the added data
+    """
     new_file = tarfile.TarInfo(path)
-    data.seek(0, os.SEEK_END)
-    new_file.size = data.tell()
-    data.seek(0)
+    if size is None:
+        data.seek(0, os.SEEK_END)
+        size = data.tell()
+        data.seek(0)
+    new_file.size = size
     new_file.mtime = time()
-    return tar.addfile(tarinfo=new_file, fileobj=data)
+    reader = ChecksumReader(data)
+    tar.addfile(tarinfo=new_file, fileobj=reader)
+    return reader.hexdigest()
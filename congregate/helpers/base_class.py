@@ -1,6 +1,9 @@
 """
 Base class to import congregate configuration
 and logger as well provide the app path
+
+The configuration, loggers and MultiProcessing helper are shared by all instances of a process (client_registry),
+so constructing a client is cheap and opens no log files or validation requests of its own.
 """
 from logging import FileHandler
 from os.path import exists
@@ -12,7 +15,7 @@ from gitlab_ps_utils.logger import myLogger
 from gitlab_ps_utils.audit_logger import audit_logger
 from gitlab_ps_utils.processes import MultiProcessing
 
-from congregate.helpers.configuration_validator import ConfigurationValidator
+from congregate.helpers.client_registry import get_shared, get_shared_config
 from congregate.helpers.utils import get_congregate_path
 from congregate.helpers.syslog_filter import SyslogLevelFilter
 
@@ -24,16 +27,16 @@ class BaseClass():
     UNIT = " unit"
 
     def __init__(self):
-        self.config = ConfigurationValidator()
+        self.config = get_shared_config()
         if not self.config.ssl_verify:
             simplefilter("ignore", category=InsecureRequestWarning)
         self.app_path = get_congregate_path()
         self.log_name = 'congregate'
-        self.log = self.set_up_logger(__name__)
+        self.log = get_shared(("logger", __name__), lambda: self.set_up_logger(__name__))
         self.audit = audit_logger(__name__, app_path=self.app_path)
         self.INACTIVE = ["blocked", "blocked_pending_approval",
                          "ldap_blocked", "deactivated", "banned"]
-        self.multi = MultiProcessing()
+        self.multi = get_shared("multiprocessing", MultiProcessing)
 
     def set_up_logger(self, logger_name):
         base_logger = myLogger(logger_name, app_path=self.app_path, log_name=self.log_name, config=self.config)
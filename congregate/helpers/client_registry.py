@@ -0,0 +1,79 @@
+"""
+Per-process registry of the objects shared by every BaseClass instance and its sub-clients:
+the (validated) configuration, loggers, the MultiProcessing helper and API wrappers.
+
+Objects are keyed by process ID, so forked (multiprocessing and Celery) workers build their own on first use.
+The shared configuration is rebuilt, and validated again, when data/congregate.conf changes.
+"""
+from os import getpid
+from os.path import getmtime, exists
+
+from congregate.helpers.configuration_validator import ConfigurationValidator
+from congregate.helpers.utils import get_congregate_path
+
+_shared = {}
+
+
+def get_shared(name, factory):
+    '''
+        Returns the object registered under a name for this process, built by factory() on first use
+    '''
+    key = (getpid(), name)
+    if (obj := _shared.get(key)) is None:
+        obj = _shared.setdefault(key, factory())
+    return obj
+
+
+def get_shared_config():
+    '''
+        Returns the ConfigurationValidator of this process, so tokens and parent groups are validated once per process
+    '''
+    path = f"{get_congregate_path()}/data/congregate.conf"
+    mtime = getmtime(path) if exists(path) else None
+    key = (getpid(), "config")
+    cached = _shared.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = _shared[key] = (mtime, ConfigurationValidator())
+    return cached[1]
+
+
+def get_shared_api(api_class):
+    '''
+        Returns the API wrapper (e.g. ProjectsApi) instance of this process
+    '''
+    return get_shared(api_class, api_class)
+
+
+class lazy_client():
+    '''
+        Class attribute creating a sub-client on first access, and caching it on the instance
+
+        e.g.
+            class GitLabMigrateClient(MigrateClient):
+                projects = lazy_client(ProjectsClient)
+                registries = lazy_client(lambda self: RegistryClient(reg_dry_run=self.reg_dry_run), bind=True)
+
+        API wrapper classes (*Api) are shared per process, instead of created per instance.
+        Assigning the attribute, e.g. a mock in a test, replaces the sub-client.
+    '''
+    def __init__(self, factory, *args, bind=False, **kwargs):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self.bind = bind
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.bind:
+            client = self.factory(obj, *self.args, **self.kwargs)
+        elif isinstance(self.factory, type) and self.factory.__name__.endswith("Api") and not (self.args or self.kwargs):
+            client = get_shared_api(self.factory)
+        else:
+            client = self.factory(*self.args, **self.kwargs)
+        obj.__dict__[self.name] = client
+        return client
@@ -398,6 +398,57 @@ class Config(BaseConfig):
         """
         return self.prop_int("APP", "export_import_timeout", default=3600)
 
+    @property
+    def export_import_status_max_concurrency(self):
+        """
+        The maximum number of export or import status checks sent concurrently by the status scheduler.
+        :return: The set config value or 10 as default
+        """
+        return self.prop_int(
+            "APP", "export_import_status_max_concurrency", default=10)
+
+    @property
+    def scheduled_project_exports(self):
+        """
+        Export (filesystem) projects with worker threads and the status scheduler, instead of a process per export.
+        Streamed projects (--stream-projects) are always exported this way.
+        :return: The set config value or False as default
+        """
+        return self.prop_bool("APP", "scheduled_project_exports", default=False)
+
+    @property
+    def project_export_concurrency(self):
+        """
+        The maximum number of project exports in flight at once when streaming projects (--stream-projects),
+        or with scheduled_project_exports.
+        :return: The set config value or None, defaulting to the number of processes
+        """
+        return self.prop_int("APP", "project_export_concurrency")
+
+    @property
+    def project_download_concurrency(self):
+        """
+        The number of concurrent project export downloads when streaming projects (--stream-projects).
+        :return: The set config value or None, defaulting to the number of processes
+        """
+        return self.prop_int("APP", "project_download_concurrency")
+
+    @property
+    def project_import_concurrency(self):
+        """
+        The number of concurrent project import processes when streaming projects (--stream-projects).
+        :return: The set config value or None, defaulting to the number of processes
+        """
+        return self.prop_int("APP", "project_import_concurrency")
+
+    @property
+    def project_features_concurrency(self):
+        """
+        The number of post-import project feature steps (variables, hooks, registries, etc.) migrated concurrently per project.
+        :return: The set config value or 4 as default
+        """
+        return self.prop_int("APP", "project_features_concurrency", default=4)
+
     @property
     def slack_url(self):
         """
@@ -477,6 +528,115 @@ class Config(BaseConfig):
         """
         return self.prop_int("APP", "mongo_port", default=27017)
 
+    @property
+    def mongo_bulk_write_size(self):
+        """
+        The number of listed documents a process buffers before bulk upserting them into mongodb. Defaults to 500
+        """
+        return self.prop_int("APP", "mongo_bulk_write_size", default=500)
+
+    @property
+    def mongo_bulk_write_interval(self):
+        """
+        The max number of seconds listed documents stay buffered before they are bulk upserted into mongodb. Defaults to 5
+        """
+        return self.prop_int("APP", "mongo_bulk_write_interval", default=5)
+
+    @property
+    def http_pool_size(self):
+        """
+        The max number of keep-alive connections each process pools per host for the GitHub, ADO and BitBucket APIs. Defaults to 10
+        """
+        return self.prop_int("APP", "http_pool_size", default=10)
+
+    @property
+    def rate_limit_backend(self):
+        """
+        Where processes share the per-host rate limit state: "file" (default), "redis" (Celery broker) or "none" to disable pacing
+        """
+        return self.prop("APP", "rate_limit_backend", default="file")
+
+    @property
+    def rate_limit_burst(self):
+        """
+        The max number of requests sent back-to-back to a rate limited host, before pacing them. Defaults to 10
+        """
+        return self.prop_int("APP", "rate_limit_burst", default=10)
+
+    @property
+    def github_list_concurrency(self):
+        """
+        The max number of GitHub REST pages fetched ahead concurrently when listing. 1 lists page by page. Defaults to 4
+        """
+        return self.prop_int("APP", "github_list_concurrency", default=4)
+
+    @property
+    def git_mirror_cache(self):
+        """
+        Keep the bare mirror clones of custom exports (ADO, CodeCommit) under <filesystem_path>/repos/mirrors,
+        to only fetch new objects when exporting again. Defaults to True
+        """
+        return self.prop_bool("APP", "git_mirror_cache", default=True)
+
+    @property
+    def export_ndjson_buffer_size(self):
+        """
+        The max number of tree records (e.g. merge requests, issues) of custom exports buffered in memory
+        before being written to their ndjson file. Defaults to 100
+        """
+        return self.prop_int("APP", "export_ndjson_buffer_size", default=100)
+
+    @property
+    def registry_copy_method(self):
+        """
+        How container registries are migrated: "docker" (default) pulls, tags and pushes every image through the local Docker daemon,
+        "api" (opt-in) copies blobs through the registry HTTP API
+        """
+        return self.prop("APP", "registry_copy_method", default="docker")
+
+    @property
+    def registry_blob_concurrency(self):
+        """
+        The max number of image blobs copied concurrently by the registry HTTP API copy. Defaults to 4
+        """
+        return self.prop_int("APP", "registry_blob_concurrency", default=4)
+
+    @property
+    def package_transfer_concurrency(self):
+        """
+        The max number of package files streamed concurrently from the source to the destination package registry. Defaults to 4
+        """
+        return self.prop_int("APP", "package_transfer_concurrency", default=4)
+
+    @property
+    def diff_report_page_size(self):
+        """
+        The number of projects, groups or users per page of the diff HTML reports. Defaults to 500
+        """
+        return self.prop_int("APP", "diff_report_page_size", default=500)
+
+    @property
+    def diff_cache_ttl(self):
+        """
+        The max age (hours) of cached project diff results reused by generate-diff for unchanged projects, limited to counts, repository, issues and wikis. Defaults to 24, 0 disables the cache
+        """
+        return self.prop_int("APP", "diff_cache_ttl", default=24)
+
+    @property
+    def user_email_cache_size(self):
+        """
+        The max number of user emails cached per process when listing group and project members. Defaults to 10000
+        """
+        return self.prop_int("APP", "user_email_cache_size", default=10000)
+
+    @property
+    def config_validation_ttl(self):
+        """
+        The max age (seconds) of token and parent group validations shared by all processes via data/config_validations.json.
+        Defaults to 0, validating once per process
+        """
+        return self.prop_int("APP", "config_validation_ttl", default=0)
+
     @property
     def redis_host(self):
         """
@@ -532,6 +692,14 @@ class Config(BaseConfig):
         """
         return self.prop_bool("APP", "airgap_import", default=False)
 
+    @property
+    def airgap_checksums(self):
+        """
+        Adds a SHA-256 checksum manifest to air-gap archives, computed while they are written.
+        Archives with a manifest are verified against it on import. Defaults to True
+        """
+        return self.prop_bool("APP", "airgap_checksums", default=True)
+
     @property
     def direct_transfer(self):
         """
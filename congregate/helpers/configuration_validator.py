@@ -1,5 +1,9 @@
 from base64 import b64encode
 import sys
+import json
+from time import time
+from hashlib import sha256
+from fcntl import flock, LOCK_EX, LOCK_UN
 import requests
 import boto3
 
@@ -10,10 +14,13 @@ from congregate.helpers.conf import Config
 from congregate.migration.gitlab.api.groups import GroupsApi
 from congregate.migration.gitlab.api.users import UsersApi
 from congregate.migration.gitlab.api.instance import InstanceApi
-from congregate.helpers.utils import is_github_dot_com, is_dot_com
+from congregate.helpers.utils import is_github_dot_com, is_dot_com, get_congregate_path
 from gitlab_ps_utils.string_utils import deobfuscate
 from botocore.exceptions import ClientError
 
+# Successful validations of this process (and its forked workers), by check and settings fingerprint
+_validations = set()
+
 
 class ConfigurationValidator(Config):
     '''
@@ -22,6 +29,22 @@ class ConfigurationValidator(Config):
 
     GET_TIMEOUT = 10
 
+    # Settings (section, option) each validation depends on, fingerprinted to key its result
+    DSTN_SETTINGS = [("DESTINATION", "dstn_hostname"), ("DESTINATION", "dstn_access_token")]
+    SRC_SETTINGS = [("SOURCE", "src_type"), ("SOURCE", "src_hostname"), ("SOURCE", "src_access_token"),
+                    ("SOURCE", "src_username"), ("SOURCE", "src_aws_access_key_id"),
+                    ("SOURCE", "src_aws_secret_access_key"), ("SOURCE", "src_aws_session_token")]
+    VALIDATED_SETTINGS = {
+        "dstn_parent_id": DSTN_SETTINGS + [("DESTINATION", "dstn_parent_group_id")],
+        "import_user_id": DSTN_SETTINGS + [("DESTINATION", "import_user_id")],
+        "dstn_parent_group_path": DSTN_SETTINGS + [("DESTINATION", "dstn_parent_group_id"),
+                                                   ("DESTINATION", "dstn_parent_group_path")],
+        "dstn_token": DSTN_SETTINGS,
+        "src_token": SRC_SETTINGS,
+        "airgap": [("APP", "airgap_export"), ("APP", "airgap_import")],
+        "direct_transfer": SRC_SETTINGS + DSTN_SETTINGS
+    }
+
     def __init__(self, path=None):
         self.groups = GroupsApi()
         self.users = UsersApi()
@@ -116,7 +139,8 @@ class ConfigurationValidator(Config):
             if self.airgap_validated_in_session:
                 return ag
             try:
-                return self.validate_airgap_configuration()
+                self.airgap_validated_in_session = self.validate_airgap_configuration()
+                return ag
             except ConfigurationException as ce:
                 sys.exit(ce)
         return False
@@ -127,7 +151,8 @@ class ConfigurationValidator(Config):
             if self.direct_transfer_validated_in_session:
                 return direct_transfer
             try:
-                return self.validate_direct_transfer_enabled()
+                self.direct_transfer_validated_in_session = self.validate_direct_transfer_enabled()
+                return direct_transfer
             except ConfigurationException as ce:
                 sys.exit(ce)
         return False
@@ -417,58 +442,138 @@ class ConfigurationValidator(Config):
         return (settings.get("bulk_import_enabled", False),
                 settings.get("bulk_import_max_download_file_size", False))
 
+    def get_validation_key(self, check):
+        '''
+            Key of a validation check, with a fingerprint of the hosts, tokens and values it validates
+        '''
+        settings = "\n".join(str(self.prop(section, option))
+                             for section, option in self.VALIDATED_SETTINGS[check])
+        return f"{check}:{sha256(settings.encode()).hexdigest()}"
+
+    def is_validated(self, check):
+        '''
+            Whether a check passed in this process, or (within config_validation_ttl) in another one
+        '''
+        key = self.get_validation_key(check)
+        if key in _validations:
+            return True
+        if self.config_validation_ttl and self.__update_validations().get(key, 0) > time():
+            _validations.add(key)
+            return True
+        return False
+
+    def set_validated(self, check, value):
+        '''
+            Shares the result of a check with all ConfigurationValidator instances of this process,
+            and, when config_validation_ttl is set, of other processes
+        '''
+        key = self.get_validation_key(check)
+        if value:
+            _validations.add(key)
+        else:
+            _validations.discard(key)
+        if ttl := self.config_validation_ttl:
+            self.__update_validations(key, time() + ttl if value else None)
+
+    def __update_validations(self, key=None, expires=None):
+        '''
+            Reads, and updates with a key (removed when expires is None), the locked data/config_validations.json.
+            Only fingerprints and expiry times are stored
+        '''
+        with open(f"{get_congregate_path()}/data/config_validations.json", "a+") as f:
+            flock(f, LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                now = time()
+                validations = {k: v for k, v in (json.loads(raw) if raw else {}).items() if v > now}
+                if key is None:
+                    return validations
+                if expires:
+                    validations[key] = expires
+                else:
+                    validations.pop(key, None)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(validations))
+                f.flush()
+                return validations
+            finally:
+                flock(f, LOCK_UN)
+
     @property
     def dstn_parent_id_validated_in_session(self):
+        if not self._dstn_parent_id_validated_in_session and self.is_validated("dstn_parent_id"):
+            self._dstn_parent_id_validated_in_session = True
         return self._dstn_parent_id_validated_in_session
 
     @property
     def import_user_id_validated_in_session(self):
+        if not self._import_user_id_validated_in_session and self.is_validated("import_user_id"):
+            self._import_user_id_validated_in_session = True
         return self._import_user_id_validated_in_session
 
     @property
     def dstn_parent_group_path_validated_in_session(self):
+        if not self._dstn_parent_group_path_validated_in_session and self.is_validated("dstn_parent_group_path"):
+            self._dstn_parent_group_path_validated_in_session = True
         return self._dstn_parent_group_path_validated_in_session
 
     @property
     def dstn_token_validated_in_session(self):
+        if not self._dstn_token_validated_in_session and self.is_validated("dstn_token"):
+            self._dstn_token_validated_in_session = True
         return self._dstn_token_validated_in_session
 
     @property
     def src_token_validated_in_session(self):
+        if not self._src_token_validated_in_session and self.is_validated("src_token"):
+            self._src_token_validated_in_session = True
         return self._src_token_validated_in_session
 
     @property
     def airgap_validated_in_session(self):
+        if not self._airgap_validated_in_session and self.is_validated("airgap"):
+            self._airgap_validated_in_session = True
         return self._airgap_validated_in_session
 
     @property
     def direct_transfer_validated_in_session(self):
+        if not self._direct_transfer_validated_in_session and self.is_validated("direct_transfer"):
+            self._direct_transfer_validated_in_session = True
         return self._direct_transfer_validated_in_session
 
     @dstn_parent_id_validated_in_session.setter
     def dstn_parent_id_validated_in_session(self, value):
         self._dstn_parent_id_validated_in_session = value
+        self.set_validated("dstn_parent_id", value)
 
     @import_user_id_validated_in_session.setter
     def import_user_id_validated_in_session(self, value):
         self._import_user_id_validated_in_session = value
+        self.set_validated("import_user_id", value)
 
     @dstn_parent_group_path_validated_in_session.setter
     def dstn_parent_group_path_validated_in_session(self, value):
         self._dstn_parent_group_path_validated_in_session = value
+        self.set_validated("dstn_parent_group_path", value)
 
     @dstn_token_validated_in_session.setter
     def dstn_token_validated_in_session(self, value):
         self._dstn_token_validated_in_session = value
+        self.set_validated("dstn_token", value)
 
     @src_token_validated_in_session.setter
     def src_token_validated_in_session(self, value):
         self._src_token_validated_in_session = value
+        self.set_validated("src_token", value)
 
     @airgap_validated_in_session.setter
     def airgap_validated_in_session(self, value):
         self._airgap_validated_in_session = value
+        self.set_validated("airgap", value)
 
     @direct_transfer_validated_in_session.setter
     def direct_transfer_validated_in_session(self, value):
         self._direct_transfer_validated_in_session = value
+        self.set_validated("direct_transfer", value)
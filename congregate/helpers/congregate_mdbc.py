@@ -1,4 +1,5 @@
-
+from os import getpid
+from multiprocessing.util import Finalize
 from pymongo import DESCENDING
 from celery import shared_task
 from gitlab_ps_utils.misc_utils import strip_netloc
@@ -11,6 +12,8 @@ class CongregateMongoConnector(MongoConnector):
     """
 
     CI_SOURCES = ["jenkins", "teamcity"]
+    # Start time of the last complete listing per listed collection, for delta listing
+    HIGH_WATER_MARKS = "list_high_water_marks"
 
     def __init__(self, client=None):
         super().__init__(db='congregate', client=client)
@@ -71,6 +74,19 @@ class CongregateMongoConnector(MongoConnector):
             ):
                 return query.get("email", None)
 
+    def get_high_water_mark(self, collection):
+        """
+            :param collection: (str) Listed collection e.g. projects-<host>
+            :return: (str) ISO 8601 UTC time the last complete listing of the collection started, if any
+        """
+        if mark := self.db[self.HIGH_WATER_MARKS].find_one({"id": collection}):
+            return mark.get("since")
+        return None
+
+    def set_high_water_mark(self, collection, since):
+        self.db[self.HIGH_WATER_MARKS].replace_one(
+            {"id": collection}, {"id": collection, "since": since}, upsert=True)
+
     def clean_db(self, keys=False):
         for col in self.db.list_collection_names():
             # In order to preserve list of created deploy keys
@@ -79,6 +95,43 @@ class CongregateMongoConnector(MongoConnector):
         self.__setup_db()
 
 
+_shared_connectors = {}
+
+
+def get_shared_mongo_connector():
+    '''
+        Returns the CongregateMongoConnector shared by everything running in this process.
+
+        The MongoClient connection pool is reused across calls, and upsert_data writes are
+        buffered and bulk flushed based on the mongo_bulk_write_size and mongo_bulk_write_interval settings.
+        Any remaining buffered writes are flushed when the connection is closed or the process exits.
+    '''
+    pid = getpid()
+    if (mongo := _shared_connectors.get(pid)) is None or mongo.db is None:
+        mongo = CongregateMongoConnector()
+        mongo.bulk_write_size = mongo.config.mongo_bulk_write_size
+        mongo.bulk_write_interval = mongo.config.mongo_bulk_write_interval
+        _shared_connectors[pid] = mongo
+        # Runs on interpreter exit and on exit of multiprocessing pool workers
+        Finalize(mongo, mongo.close_connection, exitpriority=10)
+    return mongo
+
+
+def shared_mongo_connection(func):
+    '''
+        Decorator function to pass the process-wide MongoDB connection.
+        Buffered writes are flushed once the function returns.
+    '''
+    def wrapper(*args, **kwargs):
+        if 'mongo' in kwargs:
+            return func(*args, **kwargs)
+        mongo = get_shared_mongo_connector()
+        retval = func(*args, mongo=mongo, **kwargs)
+        mongo.flush_bulk_writes()
+        return retval
+    return wrapper
+
+
 def mongo_connection(func):
     '''
         Decorator function to open and close a MongoDB connection
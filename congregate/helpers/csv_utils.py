@@ -2,6 +2,264 @@ import json
 import csv
 import os
 
+
+def write_csv(csv_path, fieldnames, rows):
+    """
+    Writes rows to 'csv_path' as they are produced, e.g. from a Mongo cursor
+    """
+    with open(csv_path, "w", newline="", encoding="utf-8") as cf:
+        writer = csv.DictWriter(cf, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+def write_collection_csv(mongo, collection, csv_path, asset):
+    """
+    Streams a listed Mongo 'collection' of projects, groups or users ('asset') into 'csv_path',
+    reading only the CSV columns through a batched cursor, so memory use does not grow with the collection.
+    """
+    fieldnames, get_row = CSV_ASSETS[asset]
+    write_csv(csv_path, fieldnames, map(get_row, mongo.stream_projection(
+        collection, get_source_fields(fieldnames))))
+
+
+def get_source_fields(fieldnames):
+    """
+    Listed data fields of CSV columns, e.g. 'namespace' for 'namespace_json'
+    """
+    return list(dict.fromkeys(f[:-len("_json")] if f.endswith("_json") else f for f in fieldnames))
+
+
+# Define all possible CSV columns (flattening nested items like 'namespace.*'):
+PROJECT_FIELDNAMES = [
+    "id",
+    "name",
+    "name_with_namespace",
+    "path",
+    "path_with_namespace",
+    "archived",
+    "visibility",
+    "default_branch",
+    "ssh_url_to_repo",
+    "http_url_to_repo",
+    "web_url",
+    "readme_url",
+    "avatar_url",
+    "creator_id",
+    "created_at",
+    "last_activity_at",
+    "updated_at",
+    "star_count",
+    "forks_count",
+    "empty_repo",
+    "public_jobs",
+    "build_timeout",
+    "build_git_strategy",
+    "repository_storage",
+    "repository_object_format",
+    "packages_enabled",
+    "lfs_enabled",
+    "merge_method",
+    "issues_enabled",
+    "merge_requests_enabled",
+    "jobs_enabled",
+    "wiki_enabled",
+    "snippets_enabled",
+    "service_desk_enabled",
+    "emails_enabled",
+    "emails_disabled",
+    "mirror",
+    "import_status",
+    "import_type",
+    "import_url",
+    "autoclose_referenced_issues",
+    "printing_merge_request_link_enabled",
+    "only_allow_merge_if_pipeline_succeeds",
+    "only_allow_merge_if_all_discussions_are_resolved",
+    "only_allow_merge_if_all_status_checks_passed",
+    "remove_source_branch_after_merge",
+    "request_access_enabled",
+    "shared_runners_enabled",
+    "group_runners_enabled",
+    "forking_access_level",
+    "issues_access_level",
+    "merge_requests_access_level",
+    "snippets_access_level",
+    "container_registry_access_level",
+    "security_and_compliance_access_level",
+    "analytics_access_level",
+    "environments_access_level",
+    "releases_access_level",
+    "feature_flags_access_level",
+    "infrastructure_access_level",
+    "monitor_access_level",
+    "model_experiments_access_level",
+    "model_registry_access_level",
+    "repository_access_level",
+    "pages_access_level",
+    "wiki_access_level",
+    "builds_access_level",
+    "ci_allow_fork_pipelines_to_run_in_parent_project",
+    "ci_job_token_scope_enabled",
+    "ci_default_git_depth",
+    "ci_config_path",
+    "ci_restrict_pipeline_cancellation_role",
+    "ci_separated_caches",
+    "ci_forward_deployment_enabled",
+    "ci_forward_deployment_rollback_allowed",
+    "allow_pipeline_trigger_approve_deployment",
+    "allow_merge_on_skipped_pipeline",
+    "auto_cancel_pending_pipelines",
+    "auto_devops_enabled",
+    "auto_devops_deploy_strategy",
+    "marked_for_deletion_at",
+    "marked_for_deletion_on",
+    "runner_token_expiration_interval",
+    "runners_token",
+    "description",
+    "description_html",
+    "merge_commit_template",
+    "merge_requests_template",
+    "squash_commit_template",
+    "suggestion_commit_message",
+    "remove_source_branch_after_merge",
+    "security_and_compliance_enabled",
+    "service_desk_address",
+    "warn_about_potentially_unwanted_characters",
+    "prevent_merge_without_jira_issue",
+    "resolve_outdated_diff_discussions",
+    "restrict_user_defined_variables",
+    "keep_latest_artifact",
+    "pages_access_level",
+    "compliance_frameworks_json",
+    "namespace_json",
+    "shared_with_groups_json",
+    "members_json",
+    "tag_list_json",
+    "topics_json",
+    "groups_json",
+]
+
+
+def get_project_row(proj):
+    """
+    Flattens a listed project into a CSV row
+    """
+    # Safely fetch each field, converting None -> "" for CSV
+    def val(key):
+        return proj.get(key, "") if proj.get(key, "") is not None else ""
+
+    return {
+        "id": val("id"),
+        "name": val("name"),
+        "name_with_namespace": val("name_with_namespace"),
+        "path": val("path"),
+        "path_with_namespace": val("path_with_namespace"),
+        "archived": str(val("archived")).lower(),
+        "visibility": val("visibility"),
+        "default_branch": val("default_branch"),
+        "ssh_url_to_repo": val("ssh_url_to_repo"),
+        "http_url_to_repo": val("http_url_to_repo"),
+        "web_url": val("web_url"),
+        "readme_url": val("readme_url"),
+        "avatar_url": val("avatar_url"),
+        "creator_id": val("creator_id"),
+        "created_at": val("created_at"),
+        "last_activity_at": val("last_activity_at"),
+        "updated_at": val("updated_at"),
+        "star_count": val("star_count"),
+        "forks_count": val("forks_count"),
+        "empty_repo": str(val("empty_repo")).lower(),
+        "public_jobs": str(val("public_jobs")).lower(),
+        "build_timeout": val("build_timeout"),
+        "build_git_strategy": val("build_git_strategy"),
+        "repository_storage": val("repository_storage"),
+        "repository_object_format": val("repository_object_format"),
+        "packages_enabled": str(val("packages_enabled")).lower(),
+        "lfs_enabled": str(val("lfs_enabled")).lower(),
+        "merge_method": val("merge_method"),
+        "issues_enabled": str(val("issues_enabled")).lower(),
+        "merge_requests_enabled": str(val("merge_requests_enabled")).lower(),
+        "jobs_enabled": str(val("jobs_enabled")).lower(),
+        "wiki_enabled": str(val("wiki_enabled")).lower(),
+        "snippets_enabled": str(val("snippets_enabled")).lower(),
+        "service_desk_enabled": str(val("service_desk_enabled")).lower(),
+        "emails_enabled": str(val("emails_enabled")).lower(),
+        "emails_disabled": str(val("emails_disabled")).lower(),
+        "mirror": str(val("mirror")).lower(),
+        "import_status": val("import_status"),
+        "import_type": val("import_type"),
+        "import_url": val("import_url"),
+        "autoclose_referenced_issues": str(val("autoclose_referenced_issues")).lower(),
+        "printing_merge_request_link_enabled": str(val("printing_merge_request_link_enabled")).lower(),
+        "only_allow_merge_if_pipeline_succeeds": str(val("only_allow_merge_if_pipeline_succeeds")).lower(),
+        "only_allow_merge_if_all_discussions_are_resolved": str(val("only_allow_merge_if_all_discussions_are_resolved")).lower(),
+        "only_allow_merge_if_all_status_checks_passed": str(val("only_allow_merge_if_all_status_checks_passed")).lower(),
+        "remove_source_branch_after_merge": str(val("remove_source_branch_after_merge")).lower(),
+        "request_access_enabled": str(val("request_access_enabled")).lower(),
+        "shared_runners_enabled": str(val("shared_runners_enabled")).lower(),
+        "group_runners_enabled": str(val("group_runners_enabled")).lower(),
+        "forking_access_level": val("forking_access_level"),
+        "issues_access_level": val("issues_access_level"),
+        "merge_requests_access_level": val("merge_requests_access_level"),
+        "snippets_access_level": val("snippets_access_level"),
+        "container_registry_access_level": val("container_registry_access_level"),
+        "security_and_compliance_access_level": val("security_and_compliance_access_level"),
+        "analytics_access_level": val("analytics_access_level"),
+        "environments_access_level": val("environments_access_level"),
+        "releases_access_level": val("releases_access_level"),
+        "feature_flags_access_level": val("feature_flags_access_level"),
+        "infrastructure_access_level": val("infrastructure_access_level"),
+        "monitor_access_level": val("monitor_access_level"),
+        "model_experiments_access_level": val("model_experiments_access_level"),
+        "model_registry_access_level": val("model_registry_access_level"),
+        "repository_access_level": val("repository_access_level"),
+        "pages_access_level": val("pages_access_level"),
+        "wiki_access_level": val("wiki_access_level"),
+        "builds_access_level": val("builds_access_level"),
+        "ci_allow_fork_pipelines_to_run_in_parent_project": str(val("ci_allow_fork_pipelines_to_run_in_parent_project")).lower(),
+        "ci_job_token_scope_enabled": str(val("ci_job_token_scope_enabled")).lower(),
+        "ci_default_git_depth": val("ci_default_git_depth"),
+        "ci_config_path": val("ci_config_path"),
+        "ci_restrict_pipeline_cancellation_role": val("ci_restrict_pipeline_cancellation_role"),
+        "ci_separated_caches": str(val("ci_separated_caches")).lower(),
+        "ci_forward_deployment_enabled": str(val("ci_forward_deployment_enabled")).lower(),
+        "ci_forward_deployment_rollback_allowed": str(val("ci_forward_deployment_rollback_allowed")).lower(),
+        "allow_pipeline_trigger_approve_deployment": str(val("allow_pipeline_trigger_approve_deployment")).lower(),
+        "allow_merge_on_skipped_pipeline": str(val("allow_merge_on_skipped_pipeline")).lower(),
+        "auto_cancel_pending_pipelines": val("auto_cancel_pending_pipelines"),
+        "auto_devops_enabled": str(val("auto_devops_enabled")).lower(),
+        "auto_devops_deploy_strategy": val("auto_devops_deploy_strategy"),
+        "marked_for_deletion_at": val("marked_for_deletion_at"),
+        "marked_for_deletion_on": val("marked_for_deletion_on"),
+        "runner_token_expiration_interval": val("runner_token_expiration_interval"),
+        "runners_token": val("runners_token"),
+        "description": val("description"),
+        "description_html": val("description_html"),
+        "merge_commit_template": val("merge_commit_template"),
+        "merge_requests_template": val("merge_requests_template"),
+        "squash_commit_template": val("squash_commit_template"),
+        "suggestion_commit_message": val("suggestion_commit_message"),
+        "security_and_compliance_enabled": str(val("security_and_compliance_enabled")).lower(),
+        "service_desk_address": val("service_desk_address"),
+        "warn_about_potentially_unwanted_characters": str(val("warn_about_potentially_unwanted_characters")).lower(),
+        "prevent_merge_without_jira_issue": str(val("prevent_merge_without_jira_issue")).lower(),
+        "resolve_outdated_diff_discussions": str(val("resolve_outdated_diff_discussions")).lower(),
+        "restrict_user_defined_variables": str(val("restrict_user_defined_variables")).lower(),
+        "keep_latest_artifact": str(val("keep_latest_artifact")).lower(),
+        "pages_access_level": val("pages_access_level"),
+        # JSON columns
+        "compliance_frameworks_json": json.dumps(proj.get("compliance_frameworks", {}), ensure_ascii=False),
+        "namespace_json": json.dumps(proj.get("namespace", {}), ensure_ascii=False),
+        "members_json": json.dumps(proj.get("members", []), ensure_ascii=False),
+        "shared_with_groups_json": json.dumps(proj.get("shared_with_groups", []), ensure_ascii=False),
+        "tag_list_json": json.dumps(proj.get("tag_list", []), ensure_ascii=False),
+        "topics_json": json.dumps(proj.get("topics", []), ensure_ascii=False),
+        "groups_json": json.dumps(proj.get("groups", {}), ensure_ascii=False), # "groups" only exists on bitbucket, should be empty on GitLab
+    }
+
+
 def write_projects_csv(json_path, csv_path):
     """
     Reads a list of project objects from 'json_path' (projects.json) and writes them to 'csv_path'.
@@ -17,235 +275,121 @@ def write_projects_csv(json_path, csv_path):
             print(f"Expected a list of projects in {json_path}, got something else.")
             return
 
-    # Define all possible CSV columns (flattening nested items like 'namespace.*'):
-    fieldnames = [
-        "id",
-        "name",
-        "name_with_namespace",
-        "path",
-        "path_with_namespace",
-        "archived",
-        "visibility",
-        "default_branch",
-        "ssh_url_to_repo",
-        "http_url_to_repo",
-        "web_url",
-        "readme_url",
-        "avatar_url",
-        "creator_id",
-        "created_at",
-        "last_activity_at",
-        "updated_at",
-        "star_count",
-        "forks_count",
-        "empty_repo",
-        "public_jobs",
-        "build_timeout",
-        "build_git_strategy",
-        "repository_storage",
-        "repository_object_format",
-        "packages_enabled",
-        "lfs_enabled",
-        "merge_method",
-        "issues_enabled",
-        "merge_requests_enabled",
-        "jobs_enabled",
-        "wiki_enabled",
-        "snippets_enabled",
-        "service_desk_enabled",
-        "emails_enabled",
-        "emails_disabled",
-        "mirror",
-        "import_status",
-        "import_type",
-        "import_url",
-        "autoclose_referenced_issues",
-        "printing_merge_request_link_enabled",
-        "only_allow_merge_if_pipeline_succeeds",
-        "only_allow_merge_if_all_discussions_are_resolved",
-        "only_allow_merge_if_all_status_checks_passed",
-        "remove_source_branch_after_merge",
-        "request_access_enabled",
-        "shared_runners_enabled",
-        "group_runners_enabled",
-        "forking_access_level",
-        "issues_access_level",
-        "merge_requests_access_level",
-        "snippets_access_level",
-        "container_registry_access_level",
-        "security_and_compliance_access_level",
-        "analytics_access_level",
-        "environments_access_level",
-        "releases_access_level",
-        "feature_flags_access_level",
-        "infrastructure_access_level",
-        "monitor_access_level",
-        "model_experiments_access_level",
-        "model_registry_access_level",
-        "repository_access_level",
-        "pages_access_level",
-        "wiki_access_level",
-        "builds_access_level",
-        "ci_allow_fork_pipelines_to_run_in_parent_project",
-        "ci_job_token_scope_enabled",
-        "ci_default_git_depth",
-        "ci_config_path",
-        "ci_restrict_pipeline_cancellation_role",
-        "ci_separated_caches",
-        "ci_forward_deployment_enabled",
-        "ci_forward_deployment_rollback_allowed",
-        "allow_pipeline_trigger_approve_deployment",
-        "allow_merge_on_skipped_pipeline",
-        "auto_cancel_pending_pipelines",
-        "auto_devops_enabled",
-        "auto_devops_deploy_strategy",
-        "marked_for_deletion_at",
-        "marked_for_deletion_on",
-        "runner_token_expiration_interval",
-        "runners_token",
-        "description",
-        "description_html",
-        "merge_commit_template",
-        "merge_requests_template",
-        "squash_commit_template",
-        "suggestion_commit_message",
-        "remove_source_branch_after_merge",
-        "security_and_compliance_enabled",
-        "service_desk_address",
-        "warn_about_potentially_unwanted_characters",
-        "prevent_merge_without_jira_issue",
-        "resolve_outdated_diff_discussions",
-        "restrict_user_defined_variables",
-        "keep_latest_artifact",
-        "pages_access_level",
-        "compliance_frameworks_json",
-        "namespace_json",
-        "shared_with_groups_json",
-        "members_json",
-        "tag_list_json",
-        "topics_json",
-        "groups_json",
-    ]
-
-    with open(csv_path, "w", newline="", encoding="utf-8") as cf:
-        writer = csv.DictWriter(cf, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for proj in projects:
-            # Safely fetch each field, converting None -> "" for CSV
-            def val(key):
-                return proj.get(key, "") if proj.get(key, "") is not None else ""
-
-            row = {
-                "id": val("id"),
-                "name": val("name"),
-                "name_with_namespace": val("name_with_namespace"),
-                "path": val("path"),
-                "path_with_namespace": val("path_with_namespace"),
-                "archived": str(val("archived")).lower(),
-                "visibility": val("visibility"),
-                "default_branch": val("default_branch"),
-                "ssh_url_to_repo": val("ssh_url_to_repo"),
-                "http_url_to_repo": val("http_url_to_repo"),
-                "web_url": val("web_url"),
-                "readme_url": val("readme_url"),
-                "avatar_url": val("avatar_url"),
-                "creator_id": val("creator_id"),
-                "created_at": val("created_at"),
-                "last_activity_at": val("last_activity_at"),
-                "updated_at": val("updated_at"),
-                "star_count": val("star_count"),
-                "forks_count": val("forks_count"),
-                "empty_repo": str(val("empty_repo")).lower(),
-                "public_jobs": str(val("public_jobs")).lower(),
-                "build_timeout": val("build_timeout"),
-                "build_git_strategy": val("build_git_strategy"),
-                "repository_storage": val("repository_storage"),
-                "repository_object_format": val("repository_object_format"),
-                "packages_enabled": str(val("packages_enabled")).lower(),
-                "lfs_enabled": str(val("lfs_enabled")).lower(),
-                "merge_method": val("merge_method"),
-                "issues_enabled": str(val("issues_enabled")).lower(),
-                "merge_requests_enabled": str(val("merge_requests_enabled")).lower(),
-                "jobs_enabled": str(val("jobs_enabled")).lower(),
-                "wiki_enabled": str(val("wiki_enabled")).lower(),
-                "snippets_enabled": str(val("snippets_enabled")).lower(),
-                "service_desk_enabled": str(val("service_desk_enabled")).lower(),
-                "emails_enabled": str(val("emails_enabled")).lower(),
-                "emails_disabled": str(val("emails_disabled")).lower(),
-                "mirror": str(val("mirror")).lower(),
-                "import_status": val("import_status"),
-                "import_type": val("import_type"),
-                "import_url": val("import_url"),
-                "autoclose_referenced_issues": str(val("autoclose_referenced_issues")).lower(),
-                "printing_merge_request_link_enabled": str(val("printing_merge_request_link_enabled")).lower(),
-                "only_allow_merge_if_pipeline_succeeds": str(val("only_allow_merge_if_pipeline_succeeds")).lower(),
-                "only_allow_merge_if_all_discussions_are_resolved": str(val("only_allow_merge_if_all_discussions_are_resolved")).lower(),
-                "only_allow_merge_if_all_status_checks_passed": str(val("only_allow_merge_if_all_status_checks_passed")).lower(),
-                "remove_source_branch_after_merge": str(val("remove_source_branch_after_merge")).lower(),
-                "request_access_enabled": str(val("request_access_enabled")).lower(),
-                "shared_runners_enabled": str(val("shared_runners_enabled")).lower(),
-                "group_runners_enabled": str(val("group_runners_enabled")).lower(),
-                "forking_access_level": val("forking_access_level"),
-                "issues_access_level": val("issues_access_level"),
-                "merge_requests_access_level": val("merge_requests_access_level"),
-                "snippets_access_level": val("snippets_access_level"),
-                "container_registry_access_level": val("container_registry_access_level"),
-                "security_and_compliance_access_level": val("security_and_compliance_access_level"),
-                "analytics_access_level": val("analytics_access_level"),
-                "environments_access_level": val("environments_access_level"),
-                "releases_access_level": val("releases_access_level"),
-                "feature_flags_access_level": val("feature_flags_access_level"),
-                "infrastructure_access_level": val("infrastructure_access_level"),
-                "monitor_access_level": val("monitor_access_level"),
-                "model_experiments_access_level": val("model_experiments_access_level"),
-                "model_registry_access_level": val("model_registry_access_level"),
-                "repository_access_level": val("repository_access_level"),
-                "pages_access_level": val("pages_access_level"),
-                "wiki_access_level": val("wiki_access_level"),
-                "builds_access_level": val("builds_access_level"),
-                "ci_allow_fork_pipelines_to_run_in_parent_project": str(val("ci_allow_fork_pipelines_to_run_in_parent_project")).lower(),
-                "ci_job_token_scope_enabled": str(val("ci_job_token_scope_enabled")).lower(),
-                "ci_default_git_depth": val("ci_default_git_depth"),
-                "ci_config_path": val("ci_config_path"),
-                "ci_restrict_pipeline_cancellation_role": val("ci_restrict_pipeline_cancellation_role"),
-                "ci_separated_caches": str(val("ci_separated_caches")).lower(),
-                "ci_forward_deployment_enabled": str(val("ci_forward_deployment_enabled")).lower(),
-                "ci_forward_deployment_rollback_allowed": str(val("ci_forward_deployment_rollback_allowed")).lower(),
-                "allow_pipeline_trigger_approve_deployment": str(val("allow_pipeline_trigger_approve_deployment")).lower(),
-                "allow_merge_on_skipped_pipeline": str(val("allow_merge_on_skipped_pipeline")).lower(),
-                "auto_cancel_pending_pipelines": val("auto_cancel_pending_pipelines"),
-                "auto_devops_enabled": str(val("auto_devops_enabled")).lower(),
-                "auto_devops_deploy_strategy": val("auto_devops_deploy_strategy"),
-                "marked_for_deletion_at": val("marked_for_deletion_at"),
-                "marked_for_deletion_on": val("marked_for_deletion_on"),
-                "runner_token_expiration_interval": val("runner_token_expiration_interval"),
-                "runners_token": val("runners_token"),
-                "description": val("description"),
-                "description_html": val("description_html"),
-                "merge_commit_template": val("merge_commit_template"),
-                "merge_requests_template": val("merge_requests_template"),
-                "squash_commit_template": val("squash_commit_template"),
-                "suggestion_commit_message": val("suggestion_commit_message"),
-                "security_and_compliance_enabled": str(val("security_and_compliance_enabled")).lower(),
-                "service_desk_address": val("service_desk_address"),
-                "warn_about_potentially_unwanted_characters": str(val("warn_about_potentially_unwanted_characters")).lower(),
-                "prevent_merge_without_jira_issue": str(val("prevent_merge_without_jira_issue")).lower(),
-                "resolve_outdated_diff_discussions": str(val("resolve_outdated_diff_discussions")).lower(),
-                "restrict_user_defined_variables": str(val("restrict_user_defined_variables")).lower(),
-                "keep_latest_artifact": str(val("keep_latest_artifact")).lower(),
-                "pages_access_level": val("pages_access_level"),
-                # JSON columns
-                "compliance_frameworks_json": json.dumps(proj.get("compliance_frameworks", {}), ensure_ascii=False),
-                "namespace_json": json.dumps(proj.get("namespace", {}), ensure_ascii=False),
-                "members_json": json.dumps(proj.get("members", []), ensure_ascii=False),
-                "shared_with_groups_json": json.dumps(proj.get("shared_with_groups", []), ensure_ascii=False),
-                "tag_list_json": json.dumps(proj.get("tag_list", []), ensure_ascii=False),
-                "topics_json": json.dumps(proj.get("topics", []), ensure_ascii=False),
-                "groups_json": json.dumps(proj.get("groups", {}), ensure_ascii=False), # "groups" only exists on bitbucket, should be empty on GitLab
-            }
+    write_csv(csv_path, PROJECT_FIELDNAMES, map(get_project_row, projects))
+
+
+USER_FIELDNAMES = [
+    "id",
+    "username",
+    "email",
+    "name",
+    "avatar_url",
+    "bot",
+    "can_create_group",
+    "can_create_project",
+    "color_scheme_id",
+    "commit_email",
+    "discord",
+    "email_reset_offered_at",
+    "enterprise_group_associated_at",
+    "enterprise_group_id",
+    "external",
+    "extra_shared_runners_minutes_limit",
+    "followers",
+    "following",
+    "is_admin",
+    "is_auditor",
+    "is_followed",
+    "job_title",
+    "linkedin",
+    "local_time",
+    "location",
+    "locked",
+    "namespace_id",
+    "note",
+    "organization",
+    "private_profile",
+    "projects_limit",
+    "pronouns",
+    "provisioned_by_group_id",
+    "public_email",
+    "shared_runners_minutes_limit",
+    "skype",
+    "state",
+    "theme_id",
+    "twitter",
+    "two_factor_enabled",
+    "using_license_seat",
+    "website_url",
+    "work_information",
+    "created_by_json",
+    "identities_json",
+    "scim_identities_json",
+]
+
+
+def get_user_row(user):
+    """
+    Flattens a listed user into a CSV row
+    """
+    def val(key):
+        raw = user.get(key, "")
+        if raw is None:
+            return ""
+        if isinstance(raw, bool):
+            return str(raw).lower()
+        return raw
+
+    return {
+        "id": val("id"),
+        "username": val("username"),
+        "email": val("email"),
+        "name": val("name"),
+        "avatar_url": val("avatar_url"),
+        "bot": val("bot"),
+        "can_create_group": val("can_create_group"),
+        "can_create_project": val("can_create_project"),
+        "color_scheme_id": val("color_scheme_id"),
+        "commit_email": val("commit_email"),
+        "discord": val("discord"),
+        "email_reset_offered_at": val("email_reset_offered_at"),
+        "enterprise_group_associated_at": val("enterprise_group_associated_at"),
+        "enterprise_group_id": val("enterprise_group_id"),
+        "external": val("external"),
+        "extra_shared_runners_minutes_limit": val("extra_shared_runners_minutes_limit"),
+        "followers": val("followers"),
+        "following": val("following"),
+        "is_admin": val("is_admin"),
+        "is_auditor": val("is_auditor"),
+        "is_followed": val("is_followed"),
+        "job_title": val("job_title"),
+        "linkedin": val("linkedin"),
+        "local_time": val("local_time"),
+        "location": val("location"),
+        "locked": val("locked"),
+        "namespace_id": val("namespace_id"),
+        "note": val("note"),
+        "organization": val("organization"),
+        "private_profile": val("private_profile"),
+        "projects_limit": val("projects_limit"),
+        "pronouns": val("pronouns"),
+        "provisioned_by_group_id": val("provisioned_by_group_id"),
+        "public_email": val("public_email"),
+        "shared_runners_minutes_limit": val("shared_runners_minutes_limit"),
+        "skype": val("skype"),
+        "state": val("state"),
+        "theme_id": val("theme_id"),
+        "twitter": val("twitter"),
+        "two_factor_enabled": val("two_factor_enabled"),
+        "using_license_seat": val("using_license_seat"),
+        "website_url": val("website_url"),
+        "work_information": val("work_information"),
+        # JSON columns
+        "created_by_json": json.dumps(user.get("created_by", {}), ensure_ascii=False),
+        "scim_identities_json": json.dumps(user.get("scim_identities", {}), ensure_ascii=False),
+        "identities_json": json.dumps(user.get("identities", []), ensure_ascii=False),
+    }
 
-            writer.writerow(row)
 
 def write_users_csv(json_path, csv_path):
     """
@@ -261,120 +405,102 @@ def write_users_csv(json_path, csv_path):
         if not isinstance(users, list):
             print(f"Expected a list of user objects in {json_path}, got something else.")
             return
-        
-    fieldnames = [
-        "id",
-        "username",
-        "email",
-        "name",
-        "avatar_url",
-        "bot",
-        "can_create_group",
-        "can_create_project",
-        "color_scheme_id",
-        "commit_email",
-        "discord",
-        "email_reset_offered_at",
-        "enterprise_group_associated_at",
-        "enterprise_group_id",
-        "external",
-        "extra_shared_runners_minutes_limit",
-        "followers",
-        "following",
-        "is_admin",
-        "is_auditor",
-        "is_followed",
-        "job_title",
-        "linkedin",
-        "local_time",
-        "location",
-        "locked",
-        "namespace_id",
-        "note",
-        "organization",
-        "private_profile",
-        "projects_limit",
-        "pronouns",
-        "provisioned_by_group_id",
-        "public_email",
-        "shared_runners_minutes_limit",
-        "skype",
-        "state",
-        "theme_id",
-        "twitter",
-        "two_factor_enabled",
-        "using_license_seat",
-        "website_url",
-        "work_information",
-        "created_by_json",
-        "identities_json",
-        "scim_identities_json",
-    ]
 
-    with open(csv_path, "w", newline="", encoding="utf-8") as cf:
-        writer = csv.DictWriter(cf, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for user in users:
-            def val(key):
-                raw = user.get(key, "")
-                if raw is None:
-                    return ""
-                if isinstance(raw, bool):
-                    return str(raw).lower()
-                return raw
-
-            row = {
-                "id": val("id"),
-                "username": val("username"),
-                "email": val("email"),
-                "name": val("name"),
-                "avatar_url": val("avatar_url"),
-                "bot": val("bot"),
-                "can_create_group": val("can_create_group"),
-                "can_create_project": val("can_create_project"),
-                "color_scheme_id": val("color_scheme_id"),
-                "commit_email": val("commit_email"),
-                "discord": val("discord"),
-                "email_reset_offered_at": val("email_reset_offered_at"),
-                "enterprise_group_associated_at": val("enterprise_group_associated_at"),
-                "enterprise_group_id": val("enterprise_group_id"),
-                "external": val("external"),
-                "extra_shared_runners_minutes_limit": val("extra_shared_runners_minutes_limit"),
-                "followers": val("followers"),
-                "following": val("following"),
-                "is_admin": val("is_admin"),
-                "is_auditor": val("is_auditor"),
-                "is_followed": val("is_followed"),
-                "job_title": val("job_title"),
-                "linkedin": val("linkedin"),
-                "local_time": val("local_time"),
-                "location": val("location"),
-                "locked": val("locked"),
-                "namespace_id": val("namespace_id"),
-                "note": val("note"),
-                "organization": val("organization"),
-                "private_profile": val("private_profile"),
-                "projects_limit": val("projects_limit"),
-                "pronouns": val("pronouns"),
-                "provisioned_by_group_id": val("provisioned_by_group_id"),
-                "public_email": val("public_email"),
-                "shared_runners_minutes_limit": val("shared_runners_minutes_limit"),
-                "skype": val("skype"),
-                "state": val("state"),
-                "theme_id": val("theme_id"),
-                "twitter": val("twitter"),
-                "two_factor_enabled": val("two_factor_enabled"),
-                "using_license_seat": val("using_license_seat"),
-                "website_url": val("website_url"),
-                "work_information": val("work_information"),
-                # JSON columns
-                "created_by_json": json.dumps(user.get("created_by", {}), ensure_ascii=False),
-                "scim_identities_json": json.dumps(user.get("scim_identities", {}), ensure_ascii=False),
-                "identities_json": json.dumps(user.get("identities", []), ensure_ascii=False),
-            }
+    write_csv(csv_path, USER_FIELDNAMES, map(get_user_row, users))
+
+
+GROUP_FIELDNAMES = [
+    "id",
+    "name",
+    "path",
+    "full_path",
+    "visibility",
+    "avatar_url",
+    "description",
+    "created_at",
+    "organization_id",
+    "parent_id",
+    "emails_enabled",
+    "emails_disabled",
+    "lfs_enabled",
+    "wiki_access_level",
+    "project_creation_level",
+    "subgroup_creation_level",
+    "shared_runners_setting",
+    "require_two_factor_authentication",
+    "two_factor_grace_period",
+    "share_with_group_lock",
+    "lock_duo_features_enabled",
+    "lock_math_rendering_limits_enabled",
+    "math_rendering_limits_enabled",
+    "duo_features_enabled",
+    "marked_for_deletion_on",
+    "mentions_disabled",
+    "repository_storage",
+    "default_branch",
+    "default_branch_protection",
+    "emails_disabled",
+    "empty_repo",
+    "request_access_enabled",
+    "default_branch_protection_defaults_json",
+    "desc_groups_json",
+    "members_json",
+    "projects_json",
+    "groups_json",
+]
+
+
+def get_group_row(group):
+    """
+    Flattens a listed group into a CSV row
+    """
+    def val(key):
+        raw = group.get(key, "")
+        if raw is None:
+            return ""
+        if isinstance(raw, bool):
+            return str(raw).lower()
+        return raw
+
+    return {
+        "id": val("id"),
+        "name": val("name"),
+        "path": val("path"),
+        "full_path": val("full_path"),
+        "visibility": val("visibility"),
+        "avatar_url": val("avatar_url"),
+        "description": val("description"),
+        "created_at": val("created_at"),
+        "organization_id": val("organization_id"),
+        "parent_id": val("parent_id"),
+        "emails_enabled": str(val("emails_enabled")).lower(),
+        "emails_disabled": str(val("emails_disabled")).lower(),
+        "lfs_enabled": str(val("lfs_enabled")).lower(),
+        "wiki_access_level": val("wiki_access_level"),
+        "project_creation_level": val("project_creation_level"),
+        "subgroup_creation_level": val("subgroup_creation_level"),
+        "shared_runners_setting": val("shared_runners_setting"),
+        "require_two_factor_authentication": str(val("require_two_factor_authentication")).lower(),
+        "two_factor_grace_period": val("two_factor_grace_period"),
+        "share_with_group_lock": str(val("share_with_group_lock")).lower(),
+        "lock_duo_features_enabled": str(val("lock_duo_features_enabled")).lower(),
+        "lock_math_rendering_limits_enabled": str(val("lock_math_rendering_limits_enabled")).lower(),
+        "math_rendering_limits_enabled": str(val("math_rendering_limits_enabled")).lower(),
+        "duo_features_enabled": str(val("duo_features_enabled")).lower(),
+        "marked_for_deletion_on": val("marked_for_deletion_on"),
+        "mentions_disabled": str(val("mentions_disabled")).lower() if val("mentions_disabled") else "",
+        "repository_storage": val("repository_storage"),
+        "default_branch": val("default_branch"),
+        "default_branch_protection": val("default_branch_protection"),
+        "request_access_enabled": str(val("request_access_enabled")).lower(),
+        # JSON columns
+        "default_branch_protection_defaults_json": json.dumps(group.get("default_branch_protection_defaults", {}), ensure_ascii=False),
+        "desc_groups_json": json.dumps(group.get("desc_groups", {}), ensure_ascii=False),
+        "members_json": json.dumps(group.get("members", []), ensure_ascii=False),
+        "projects_json": json.dumps(group.get("projects", []), ensure_ascii=False),
+        "groups_json": json.dumps(group.get("groups", {}), ensure_ascii=False), # "groups" only exists on bitbucket, should be empty on GitLab
+    }
 
-            writer.writerow(row)
 
 def write_groups_csv(json_path, csv_path):
     """
@@ -391,99 +517,15 @@ def write_groups_csv(json_path, csv_path):
             print(f"Expected a list of groups in {json_path}, got something else.")
             return
 
-    fieldnames = [
-        "id",
-        "name",
-        "path",
-        "full_path",
-        "visibility",
-        "avatar_url",
-        "description",
-        "created_at",
-        "organization_id",
-        "parent_id",
-        "emails_enabled",
-        "emails_disabled",
-        "lfs_enabled",
-        "wiki_access_level",
-        "project_creation_level",
-        "subgroup_creation_level",
-        "shared_runners_setting",
-        "require_two_factor_authentication",
-        "two_factor_grace_period",
-        "share_with_group_lock",
-        "lock_duo_features_enabled",
-        "lock_math_rendering_limits_enabled",
-        "math_rendering_limits_enabled",
-        "duo_features_enabled",
-        "marked_for_deletion_on",
-        "mentions_disabled",
-        "repository_storage",
-        "default_branch",
-        "default_branch_protection",
-        "emails_disabled",
-        "empty_repo",
-        "request_access_enabled",
-        "default_branch_protection_defaults_json",
-        "desc_groups_json",
-        "members_json",
-        "projects_json",
-        "groups_json",
-    ]
+    write_csv(csv_path, GROUP_FIELDNAMES, map(get_group_row, groups))
 
-    with open(csv_path, "w", newline="", encoding="utf-8") as cf:
-        writer = csv.DictWriter(cf, fieldnames=fieldnames)
-        writer.writeheader()
 
-        for group in groups:
-            def val(key):
-                raw = group.get(key, "")
-                if raw is None:
-                    return ""
-                if isinstance(raw, bool):
-                    return str(raw).lower()
-                return raw
-
-            row = {
-                "id": val("id"),
-                "name": val("name"),
-                "path": val("path"),
-                "full_path": val("full_path"),
-                "visibility": val("visibility"),
-                "avatar_url": val("avatar_url"),
-                "description": val("description"),
-                "created_at": val("created_at"),
-                "organization_id": val("organization_id"),
-                "parent_id": val("parent_id"),
-                "emails_enabled": str(val("emails_enabled")).lower(),
-                "emails_disabled": str(val("emails_disabled")).lower(),
-                "lfs_enabled": str(val("lfs_enabled")).lower(),
-                "wiki_access_level": val("wiki_access_level"),
-                "project_creation_level": val("project_creation_level"),
-                "subgroup_creation_level": val("subgroup_creation_level"),
-                "shared_runners_setting": val("shared_runners_setting"),
-                "require_two_factor_authentication": str(val("require_two_factor_authentication")).lower(),
-                "two_factor_grace_period": val("two_factor_grace_period"),
-                "share_with_group_lock": str(val("share_with_group_lock")).lower(),
-                "lock_duo_features_enabled": str(val("lock_duo_features_enabled")).lower(),
-                "lock_math_rendering_limits_enabled": str(val("lock_math_rendering_limits_enabled")).lower(),
-                "math_rendering_limits_enabled": str(val("math_rendering_limits_enabled")).lower(),
-                "duo_features_enabled": str(val("duo_features_enabled")).lower(),
-                "marked_for_deletion_on": val("marked_for_deletion_on"),
-                "mentions_disabled": str(val("mentions_disabled")).lower() if val("mentions_disabled") else "",
-                "repository_storage": val("repository_storage"),
-                "default_branch": val("default_branch"),
-                "default_branch_protection": val("default_branch_protection"),
-                "request_access_enabled": str(val("request_access_enabled")).lower(),
-                # JSON columns
-                "default_branch_protection_defaults_json": json.dumps(group.get("default_branch_protection_defaults", {}), ensure_ascii=False),
-                "desc_groups_json": json.dumps(group.get("desc_groups", {}), ensure_ascii=False),
-                "members_json": json.dumps(group.get("members", []), ensure_ascii=False),
-                "projects_json": json.dumps(group.get("projects", []), ensure_ascii=False),
-                "groups_json": json.dumps(group.get("groups", {}), ensure_ascii=False), # "groups" only exists on bitbucket, should be empty on GitLab
-            }
+CSV_ASSETS = {
+    "projects": (PROJECT_FIELDNAMES, get_project_row),
+    "groups": (GROUP_FIELDNAMES, get_group_row),
+    "users": (USER_FIELDNAMES, get_user_row)
+}
 
-            writer.writerow(row)
 
 def parse_projects_csv(app_path, scm_source=None):
     """
@@ -0,0 +1,89 @@
+"""
+Per-process, per-host pooled keep-alive HTTP sessions for the requests based API wrappers
+(GitHub, Azure DevOps, BitBucket Server and Cloud).
+
+Each process keeps one session per host, shared by every API client of that process,
+so connections (and their TLS handshakes) are reused instead of opened for every request.
+Requests are paced by the shared rate limiter, and counted by the request counters.
+"""
+from os import getpid
+from time import perf_counter
+from threading import Lock
+from multiprocessing.util import Finalize
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from gitlab_ps_utils.logger import myLogger
+
+from congregate.helpers.conf import Config
+from congregate.helpers.utils import get_congregate_path, get_host
+from congregate.helpers.rate_limiter import pace_request, record_response
+from congregate.helpers.request_counters import count_request
+
+log = myLogger(__name__, app_path=get_congregate_path(), log_name="congregate")
+
+
+class PooledSession(Session):
+    # Log the connection reuse counters every time this many requests are sent
+    STATS_INTERVAL = 1000
+
+    def __init__(self, host, pool_size=10):
+        super().__init__()
+        self.host = host
+        self.requests_sent = 0
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        self.requests_sent += 1
+        if self.requests_sent % self.STATS_INTERVAL == 0:
+            self.log_stats()
+        pace_request(url)
+        started = perf_counter()
+        response = super().request(method, url, *args, **kwargs)
+        count_request(method, url, response.status_code,
+                      response.headers, perf_counter() - started)
+        record_response(url, response.status_code, response.headers)
+        return response
+
+    @property
+    def connections_opened(self):
+        opened = 0
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                if (pool := pools.get(key)) is not None:
+                    opened += pool.num_connections
+        return opened
+
+    def log_stats(self):
+        opened = self.connections_opened
+        log.info(
+            f"Pooled session to {self.host} (PID: {getpid()}) sent {self.requests_sent} requests over {opened} connections"
+            f" ({max(self.requests_sent - opened, 0)} reused)")
+
+    def close(self):
+        if self.requests_sent:
+            self.log_stats()
+        super().close()
+
+
+_sessions = {}
+_lock = Lock()
+
+
+def get_pooled_session(url):
+    '''
+        Returns the keep-alive session shared by every API client of this process for the host of the given URL.
+        Connections per host are capped by the http_pool_size setting.
+    '''
+    key = (getpid(), get_host(url))
+    with _lock:
+        if (session := _sessions.get(key)) is None:
+            session = PooledSession(key[1], pool_size=Config().http_pool_size)
+            _sessions[key] = session
+            # Runs on interpreter exit and on exit of multiprocessing pool workers
+            Finalize(session, session.close, exitpriority=10)
+    return session
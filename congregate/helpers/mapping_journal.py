@@ -0,0 +1,147 @@
+"""
+Append-only journal of source to destination ID mappings, e.g. data/project_id_mapping.jsonl.
+
+Each process appends one JSON line per mapped ID as it is migrated, under a shared lock,
+so concurrent MultiProcessing workers never overwrite each other's mappings.
+Appends are fsynced in batches, and a line torn by a crash is skipped on load.
+
+Compaction merges the journal into the JSON mapping file (e.g. data/project_id_mapping.json)
+read by the post-migration steps, and empties the journal.
+Resetting drops both, so a migration run starts from an empty mapping file as it used to.
+"""
+import os
+import json
+from time import time
+from fcntl import flock, LOCK_EX, LOCK_SH, LOCK_UN
+from multiprocessing.util import Finalize
+
+# Fsync the journal after this many appends, or seconds since the last fsync
+FSYNC_BATCH = 50
+FSYNC_INTERVAL = 2
+
+
+class MappingJournal():
+    def __init__(self, path):
+        """
+            :param path: (str) JSON mapping file path. The journal is kept next to it, with a .jsonl extension.
+        """
+        self.path = path
+        self.journal_path = f"{os.path.splitext(path)[0]}.jsonl"
+        self.fd = None
+        self.pending = 0
+        self.synced = time()
+
+    def append(self, src_id, dst_id):
+        """
+            Append a single mapping, in one write
+        """
+        if self.fd is None:
+            self.fd = os.open(self.journal_path, os.O_WRONLY |
+                              os.O_APPEND | os.O_CREAT, 0o644)
+        line = f"{json.dumps([str(src_id), dst_id])}\n".encode()
+        flock(self.fd, LOCK_SH)
+        try:
+            os.write(self.fd, line)
+        finally:
+            flock(self.fd, LOCK_UN)
+        self.pending += 1
+        if self.pending >= FSYNC_BATCH or time() - self.synced >= FSYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        if self.fd is not None and self.pending:
+            os.fsync(self.fd)
+            self.pending = 0
+            self.synced = time()
+
+    def close(self):
+        if self.fd is not None:
+            self.sync()
+            os.close(self.fd)
+            self.fd = None
+
+    def read_journal(self, mapping):
+        """
+            Apply the journal lines onto a mapping, the last mapping of an ID winning
+        """
+        try:
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        src_id, dst_id = json.loads(line)
+                    except ValueError:
+                        # Torn line of an interrupted write
+                        continue
+                    mapping[src_id] = dst_id
+        except FileNotFoundError:
+            pass
+        return mapping
+
+    def read_compacted(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def load(self):
+        """
+            :return: (dict) Compacted mappings updated with the journal, keyed by source ID string
+        """
+        self.sync()
+        return self.read_journal(self.read_compacted())
+
+    def compact(self):
+        """
+            Merge the journal into the JSON mapping file, written atomically, and empty the journal.
+            Mappings already in the file since the last reset are kept.
+            Appends wait on the exclusive lock meanwhile, so none are lost.
+
+            :return: (dict) The compacted mappings
+        """
+        self.sync()
+        with open(self.journal_path, "a") as journal:
+            flock(journal, LOCK_EX)
+            try:
+                mapping = self.read_journal(self.read_compacted())
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(mapping, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                journal.truncate(0)
+            finally:
+                flock(journal, LOCK_UN)
+        return mapping
+
+    def reset(self):
+        """
+            Remove the JSON mapping file and empty the journal, e.g. at the start of a migration run,
+            so mappings of earlier runs and rolled back projects are not carried over
+        """
+        self.sync()
+        with open(self.journal_path, "a") as journal:
+            flock(journal, LOCK_EX)
+            try:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+                journal.truncate(0)
+            finally:
+                flock(journal, LOCK_UN)
+
+
+_journals = {}
+
+
+def get_mapping_journal(path):
+    '''
+        Returns the MappingJournal of a mapping file for this process, closed (and fsynced) on exit
+    '''
+    key = (os.getpid(), path)
+    if key not in _journals:
+        _journals[key] = journal = MappingJournal(path)
+        Finalize(journal, journal.close, exitpriority=10)
+    return _journals[key]
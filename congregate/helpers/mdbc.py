@@ -1,7 +1,9 @@
 import sys
 import os
 from re import search
-from pymongo import MongoClient, errors, DESCENDING
+from time import time
+from copy import deepcopy
+from pymongo import MongoClient, UpdateOne, ReplaceOne, errors, DESCENDING
 from gitlab_ps_utils.json_utils import stream_json_yield_to_file, read_json_file_into_object
 from gitlab_ps_utils.file_utils import find_files_in_folder
 from gitlab_ps_utils.misc_utils import strip_netloc
@@ -13,8 +15,12 @@ class MongoConnector(BaseClass):
         Wrapper class for connecting to a mongo instance
     """
 
-    def __init__(self, db=None, client=None):
+    def __init__(self, db=None, client=None, bulk_write_size=1, bulk_write_interval=0):
         super().__init__()
+        self.bulk_write_size = bulk_write_size
+        self.bulk_write_interval = bulk_write_interval
+        self.bulk_buffer = {}
+        self.last_bulk_write = time()
         try:
             host = self.config.mongo_host
             port = self.config.mongo_port
@@ -45,6 +51,7 @@ class MongoConnector(BaseClass):
             return self.create_unique_index(collection, key)
 
     def close_connection(self):
+        self.flush_bulk_writes()
         self.db = None
         self.client.close()
 
@@ -68,11 +75,84 @@ class MongoConnector(BaseClass):
                 f"{coll_type} (ID: {did}) document too large. Aborting operation\n{dtl}")
             return None
 
+    def upsert_data(self, collection, data, key="id", replace=False):
+        """
+            Buffer a document to be bulk upserted on its unique key.
+            Same as insert_data an existing document is kept as is, unless replace is set.
+
+            The buffer is flushed once it holds bulk_write_size documents
+            or bulk_write_interval seconds have passed since the last flush.
+            There is no timer: the interval is only checked on the next upsert,
+            so call flush_bulk_writes (or close_connection) after the last one.
+
+            :param collection: (str) Mongo collection name
+            :param data: (dict) Document to upsert
+            :param key: (str) Unique index key of the collection
+            :param replace: (bool) Replace an existing document e.g. when re-listing changed data
+        """
+        if isinstance(data, tuple):
+            data = data[0]
+        data = self.stringify_int_keys_in_dict(data)
+        if (value := data.get(key)) is None:
+            self.log.warning(
+                f"{collection.split('-')[0].upper()} missing '{key}' key. Inserting without buffering")
+            return self.insert_data(collection, data)
+        # Deep copy so callers can keep modifying their data, nested fields included, while it is buffered
+        data = deepcopy(data)
+        self.bulk_buffer.setdefault(collection, []).append((value, ReplaceOne(
+            {key: value}, data, upsert=True) if replace else UpdateOne(
+            {key: value},
+            {"$setOnInsert": {k: v for k, v in data.items() if k != key}},
+            upsert=True)))
+        if sum(len(ops) for ops in self.bulk_buffer.values()) >= self.bulk_write_size or (
+                time() - self.last_bulk_write >= self.bulk_write_interval):
+            self.flush_bulk_writes()
+        return value
+
+    def flush_bulk_writes(self):
+        """
+            Write all buffered upserts, one bulk_write per collection
+        """
+        buffer, self.bulk_buffer = self.bulk_buffer, {}
+        self.last_bulk_write = time()
+        if self.db is None:
+            return
+        for collection, ops in buffer.items():
+            coll_type = collection.split("-")[0].upper()
+            try:
+                self.db[collection].bulk_write(
+                    [op for _, op in ops], ordered=False)
+            except errors.BulkWriteError as bwe:
+                for we in bwe.details.get("writeErrors", []):
+                    self.log.error(
+                        f"{coll_type} (ID: {ops[we['index']][0]}) failed bulk upsert\n{we.get('errmsg')}")
+            except errors.DocumentTooLarge:
+                # A single oversized document fails the whole batch
+                for did, op in ops:
+                    try:
+                        self.db[collection].bulk_write([op])
+                    except errors.DocumentTooLarge as dtl:
+                        self.log.error(
+                            f"{coll_type} (ID: {did}) document too large. Aborting operation\n{dtl}")
+
+    def delete_missing(self, collection, values, key="id"):
+        """
+            Delete the documents whose key is not one of values e.g. entities deleted on source since the last listing
+
+            :return: (int) Number of deleted documents
+        """
+        self.flush_bulk_writes()
+        deleted = self.db[collection].delete_many({key: {"$nin": list(values)}}).deleted_count
+        if deleted:
+            self.log.info(f"Deleted {deleted} {collection} documents no longer found on source")
+        return deleted
+
     def drop_collection(self, collection):
         self.log.info(f"Dropping {collection} collection")
         return self.db[collection].drop()
 
     def dump_collection_to_file(self, collection, path):
+        self.flush_bulk_writes()
         self.log.info(f"Dumping {collection} collection to {path}")
         return stream_json_yield_to_file(
             path, self.stream_collection, collection)
@@ -88,6 +168,14 @@ class MongoConnector(BaseClass):
             else:
                 yield data, True
 
+    def stream_projection(self, collection, fields, batch_size=1000):
+        """
+            Iterate a collection through a batched cursor, returning only the given fields of each document
+        """
+        self.flush_bulk_writes()
+        return self.db[collection].find(
+            {}, {"_id": 0, **{f: 1 for f in fields}}, batch_size=batch_size)
+
     def wildcard_collection_query(self, pattern):
         return [c for c in self.db.list_collection_names() if (
             pattern in c and "noindex" not in c)]
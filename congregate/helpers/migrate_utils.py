@@ -12,10 +12,12 @@ from time import time
 from datetime import timedelta, datetime
 from httpx import Response
 from gitlab_ps_utils.misc_utils import is_error_message_present, get_dry_log, safe_json_response, strip_netloc
-from gitlab_ps_utils.json_utils import read_json_file_into_object, write_json_to_file
+from gitlab_ps_utils.json_utils import read_json_file_into_object, write_json_to_file, json_pretty
 from gitlab_ps_utils.dict_utils import dig
 from congregate.helpers.base_class import BaseClass
 from congregate.helpers.utils import is_dot_com, get_congregate_path
+from congregate.helpers.mapping_journal import get_mapping_journal
+from congregate.helpers.request_counters import get_request_counters
 from congregate.migration.gitlab.api.users import UsersApi
 from congregate.migration.gitlab.api.instance import InstanceApi
 from congregate.migration.meta.constants import TOP_LEVEL_RESERVED_NAMES, SUBGROUP_RESERVED_NAMES, PROJECT_RESERVED_NAMES
@@ -40,9 +42,15 @@ def get_staged_projects():
         f"{b.app_path}/data/staged_projects.json")
 
 
+def get_project_id_mapping_journal():
+    return get_mapping_journal(f"{b.app_path}/data/project_id_mapping.json")
+
+
 def get_project_id_mapping():
-    return read_json_file_into_object(
-        f"{b.app_path}/data/project_id_mapping.json")
+    """
+        Compact the project ID mapping journal and return the source to destination project ID mapping
+    """
+    return get_project_id_mapping_journal().compact()
 
 
 def get_staged_projects_without_failed_export(staged_projects, failed_export):
@@ -352,20 +360,19 @@ def clean_data(dry_run=True, files=None):
 
 def add_post_migration_stats(start, log=None):
     """
-    Print all POST/PUT/DELETE requests and their total number
-    Assuming you've started the migration with an empty congregate.log
+    Print the number of requests, by host, method and status code, counted since the logs were rotated
     Print total migration time
     """
-    reqs = ["POST request to", "PUT request to",
-            "DELETE request to", "PATCH request to"]
-    reqs_no = 0
-    with open(f"{b.app_path}/data/logs/audit.log", "r") as f:
-        for line in f:
-            if any(req in line for req in reqs):
-                reqs_no += 1
-        if log:
-            log.info(f"Total number of POST/PUT/DELETE requests: {reqs_no}")
+    stats = get_request_counters().summarize()
     if log:
+        log.info(f"Total number of POST/PUT/PATCH/DELETE requests: {stats['write_requests']}")
+        if stats["requests"]:
+            log.info(
+                f"Total number of requests: {stats['requests']} ({stats['bytes']} bytes received, "
+                f"{stats['latency'] / stats['requests']:.3f}s average latency)\n"
+                f"By host: {json_pretty(stats['hosts'])}\n"
+                f"By method: {json_pretty(stats['methods'])}\n"
+                f"By status code: {json_pretty(stats['status_codes'])}")
         log.info(f"Total time: {timedelta(seconds=time() - start)}")
 
 
@@ -267,4 +267,26 @@ def compare_packages(
         "match": True,
         "reason": "exact_match",
         "details": "All files match exactly"
-    }
\ No newline at end of file
+    }
+
+
+def is_file_migrated(src_file, dest_files):
+    """
+    Checks whether a source package file already exists in the destination package,
+    by file name and every digest (sha256, md5 or sha1) exposed by both instances.
+    Without a common digest, a file of the same name and size may differ, so it is not considered migrated.
+
+    Args:
+        src_file: Source package file e.g. GET /projects/:id/packages/:package_id/package_files item
+        dest_files: Destination package files of the same package
+
+    Returns:
+        bool: True if a destination file matches the source file
+    """
+    for dest_file in dest_files or []:
+        if dest_file.get('file_name') != src_file.get('file_name'):
+            continue
+        digests = [d for d in ['file_sha256', 'file_md5', 'file_sha1'] if src_file.get(d) and dest_file.get(d)]
+        if digests and all(src_file[d] == dest_file[d] for d in digests):
+            return True
+    return False
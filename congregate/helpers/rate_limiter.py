@@ -0,0 +1,243 @@
+"""
+Adaptive, per-host rate limiter shared by every process of a migration
+(MultiProcessing pool and Celery workers).
+
+Each host gets a token bucket, paced at the rate the server reports through its rate limit headers
+(RateLimit-*, X-RateLimit-* and Retry-After), so all processes together spread the remaining requests
+over the current window instead of bursting into a 429 and stalling.
+Hosts that send no rate limit headers are not paced, and each process skips the shared store for them
+until one of their responses has rate limit headers or is a 429.
+
+The bucket state is stored in a locked file per host (default), or in the Redis instance used by Celery.
+"""
+import json
+from os import getpid, makedirs
+from os.path import join
+from time import time, sleep
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from fcntl import flock, LOCK_EX, LOCK_UN
+
+from redis import Redis
+from redis.exceptions import RedisError
+from gitlab_ps_utils.logger import myLogger
+
+from congregate.helpers.conf import Config
+from congregate.helpers.utils import get_congregate_path, get_host
+
+log = myLogger(__name__, app_path=get_congregate_path(), log_name="congregate")
+
+REMAINING_HEADERS = ["RateLimit-Remaining", "X-RateLimit-Remaining"]
+RESET_HEADERS = ["RateLimit-Reset", "X-RateLimit-Reset"]
+
+
+def get_header_number(headers, names):
+    for name in names:
+        if (value := headers.get(name)) is not None:
+            try:
+                return float(value)
+            except ValueError:
+                continue
+    return None
+
+
+def get_retry_after(headers, now):
+    """
+        Retry-After is either a number of seconds or an HTTP date
+    """
+    if (value := headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - now, 0)
+        except (TypeError, ValueError):
+            return None
+
+
+def get_reset_time(headers, now):
+    """
+        The reset header is a Unix timestamp for GitLab and GitHub, or a number of seconds (IETF draft)
+    """
+    if (reset := get_header_number(headers, RESET_HEADERS)) is None:
+        return None
+    return reset if reset > 1e9 else now + reset
+
+
+class FileRateLimitStore():
+    def __init__(self, path):
+        self.path = path
+
+    @contextmanager
+    def locked(self, host):
+        # Created on first use, as hosts without a known limit never use the store
+        makedirs(self.path, exist_ok=True)
+        netloc = urlsplit(host).netloc or host
+        with open(join(self.path, f"{netloc.replace(':', '_')}.json"), "a+") as f:
+            flock(f, LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw else {}
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                flock(f, LOCK_UN)
+
+
+class RedisRateLimitStore():
+    # Expire the state of hosts we stopped talking to
+    EXPIRY = 3600
+
+    def __init__(self, host, port):
+        self.redis = Redis(host=host, port=port, password="password")
+
+    @contextmanager
+    def locked(self, host):
+        key = f"congregate:rate_limit:{host}"
+        with self.redis.lock(f"{key}:lock", timeout=10):
+            raw = self.redis.get(key)
+            state = json.loads(raw) if raw else {}
+            yield state
+            self.redis.set(key, json.dumps(state), ex=self.EXPIRY)
+
+
+class RateLimiter():
+    # Fallback wait on a 429 without any rate limit headers
+    DEFAULT_RETRY_AFTER = 60
+    # Re-check the shared state at least this often while waiting
+    MAX_SLEEP = 5
+
+    def __init__(self, store, burst=10):
+        self.store = store
+        self.burst = burst
+        # Hosts this process has seen rate limit headers or a 429 from
+        self.limited_hosts = set()
+
+    def is_limited(self, status_code, headers):
+        return status_code == 429 or any(headers.get(h) is not None for h in
+                                         REMAINING_HEADERS + RESET_HEADERS + ["Retry-After"])
+
+    def acquire(self, url):
+        """
+            Block until a request to the host of the given URL is allowed
+        """
+        host = get_host(url)
+        if host not in self.limited_hosts:
+            return
+        while True:
+            try:
+                with self.store.locked(host) as state:
+                    wait = self.take(state, time())
+            except (OSError, RedisError, ValueError) as e:
+                log.warning(f"Failed to pace request to {host}, with error:\n{e}")
+                return
+            if wait <= 0:
+                return
+            sleep(min(wait, self.MAX_SLEEP))
+
+    def update(self, url, status_code, headers):
+        """
+            Adapt the pace of the host of the given URL to its response rate limit headers
+        """
+        if not self.is_limited(status_code, headers):
+            return
+        host = get_host(url)
+        self.limited_hosts.add(host)
+        try:
+            with self.store.locked(host) as state:
+                self.adapt(state, status_code, headers, time())
+        except (OSError, RedisError, ValueError) as e:
+            log.warning(f"Failed to update rate limit of {host}, with error:\n{e}")
+
+    def refill(self, state, now):
+        tokens = state.get("tokens", self.burst)
+        if rate := state.get("rate"):
+            tokens += (now - state.get("updated", now)) * rate
+        state["tokens"] = min(tokens, self.burst)
+        state["updated"] = now
+
+    def take(self, state, now):
+        """
+            Take a token from the bucket state, or return the number of seconds to wait for one
+        """
+        if (blocked_until := state.get("blocked_until", 0)) > now:
+            return blocked_until - now
+        if state.get("rate") and state.get("rate_until", 0) <= now:
+            # The rate limit window is over
+            state.pop("rate")
+        if not state.get("rate"):
+            return 0
+        self.refill(state, now)
+        if state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return 0
+        return (1 - state["tokens"]) / state["rate"]
+
+    def adapt(self, state, status_code, headers, now):
+        self.refill(state, now)
+        remaining = get_header_number(headers, REMAINING_HEADERS)
+        reset_at = get_reset_time(headers, now)
+        if (retry_after := get_retry_after(headers, now)) is not None:
+            state["blocked_until"] = max(
+                state.get("blocked_until", 0), now + retry_after)
+        elif remaining is not None and remaining <= 0:
+            state["blocked_until"] = max(state.get(
+                "blocked_until", 0), reset_at or now + self.DEFAULT_RETRY_AFTER)
+        elif status_code == 429:
+            state["blocked_until"] = max(
+                state.get("blocked_until", 0), now + self.DEFAULT_RETRY_AFTER)
+        if remaining is not None and reset_at and reset_at > now:
+            # Spread the remaining requests over what is left of the window
+            state["rate"] = max(remaining, 1) / max(reset_at - now, 1)
+            state["rate_until"] = reset_at
+            state["tokens"] = min(state["tokens"], remaining)
+
+
+_limiters = {}
+
+
+def get_rate_limiter():
+    '''
+        Returns the RateLimiter of this process, or None when the rate_limit_backend setting is "none".
+        All processes share the bucket state through the configured backend.
+    '''
+    pid = getpid()
+    if pid not in _limiters:
+        config = Config()
+        backend = str(config.rate_limit_backend).lower()
+        if backend == "none":
+            _limiters[pid] = None
+        elif backend == "redis":
+            _limiters[pid] = RateLimiter(RedisRateLimitStore(
+                config.redis_host, config.redis_port), burst=config.rate_limit_burst)
+        else:
+            _limiters[pid] = RateLimiter(FileRateLimitStore(
+                f"{get_congregate_path()}/data/rate_limits"), burst=config.rate_limit_burst)
+    return _limiters[pid]
+
+
+def pace_request(url):
+    if limiter := get_rate_limiter():
+        limiter.acquire(url)
+
+
+def record_response(url, status_code, headers):
+    if limiter := get_rate_limiter():
+        limiter.update(url, status_code, headers)
+
+
+def get_httpx_event_hooks():
+    '''
+        Event hooks pacing the requests of an httpx Client (GitLab API)
+    '''
+    return {
+        "request": [lambda request: pace_request(str(request.url))],
+        "response": [lambda response: record_response(
+            str(response.request.url), response.status_code, response.headers)]
+    }
@@ -0,0 +1,206 @@
+"""
+Live API request counters, by host, method, status code and endpoint template,
+with response byte counts and latency sums.
+
+Every API layer (GitLab httpx client, GitHub, Azure DevOps and BitBucket pooled sessions)
+counts its requests in-process. Each process periodically, and on exit, merges its counts
+into a locked data/request_counters.json shared by all processes of a run,
+so the end-of-run summary reads the counters instead of scanning the audit log.
+"""
+import re
+import json
+from os import getpid, makedirs
+from os.path import dirname
+from time import time, perf_counter
+from threading import Lock
+from urllib.parse import urlsplit
+from fcntl import flock, LOCK_EX, LOCK_UN
+from multiprocessing.util import Finalize
+
+from gitlab_ps_utils.logger import myLogger
+
+from congregate.helpers.utils import get_congregate_path
+
+log = myLogger(__name__, app_path=get_congregate_path(), log_name="congregate")
+
+WRITE_METHODS = ["POST", "PUT", "PATCH", "DELETE"]
+# Path segments templated as :id - numbers, UUIDs, hashes and URL encoded paths
+ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|[0-9a-f]{40}|[0-9a-f]{64}|.*%2F.*)$", re.IGNORECASE)
+# Number of name segments templated as :name after a GitHub or BitBucket path segment e.g. /repos/:name/:name
+NAME_SEGMENTS = {"repos": 2, "orgs": 1, "users": 1, "projects": 1, "repositories": 2, "workspaces": 1}
+
+
+def get_endpoint_template(url):
+    """
+        Endpoint of a request URL without its query, IDs and (GitHub, BitBucket) owner and repository names
+        e.g. /api/v4/projects/:id/issues/:id or /repos/:name/:name/pulls/:id
+    """
+    path = urlsplit(url).path
+    # GitLab API paths only have IDs
+    name_segments = {} if path.startswith("/api/v4/") else NAME_SEGMENTS
+    template, names, previous = [], 0, None
+    for s in path.split("/"):
+        if ID_SEGMENT.match(s):
+            template.append(":id")
+        elif names:
+            template.append(":name")
+        else:
+            template.append(s)
+            if s in name_segments:
+                # BitBucket Server repositories are named within their project e.g. /projects/:name/repos/:name
+                names = 1 if s == "repos" and previous == "projects" else name_segments[s]
+                previous = s
+                continue
+        names = max(names - 1, 0)
+    return "/".join(template)
+
+
+def get_response_size(headers):
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+class RequestCounters():
+    # Merge the in-process counts into the shared file at most this often (seconds)
+    FLUSH_INTERVAL = 5
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = {}
+        self.flushed = time()
+        self.lock = Lock()
+
+    def record(self, method, url, status_code, size=0, elapsed=0.0):
+        split = urlsplit(url)
+        key = "|".join([f"{split.scheme}://{split.netloc}", method.upper(),
+                       str(status_code), get_endpoint_template(url)])
+        with self.lock:
+            counter = self.counts.setdefault(key, [0, 0, 0.0])
+            counter[0] += 1
+            counter[1] += size
+            counter[2] += elapsed
+        if time() - self.flushed >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    @staticmethod
+    def merge(into, counts):
+        for key, (count, size, elapsed) in counts.items():
+            counter = into.setdefault(key, [0, 0, 0.0])
+            counter[0] += count
+            counter[1] += size
+            counter[2] += elapsed
+        return into
+
+    def flush(self):
+        """
+            Merge the in-process counts into the shared counters file.
+            Called from response hooks, so failing to write only keeps the counts for the next flush.
+        """
+        with self.lock:
+            counts, self.counts = self.counts, {}
+            self.flushed = time()
+        if not counts:
+            return
+        try:
+            makedirs(dirname(self.path), exist_ok=True)
+            with open(self.path, "a+") as f:
+                flock(f, LOCK_EX)
+                try:
+                    f.seek(0)
+                    raw = f.read()
+                    shared = self.merge(json.loads(raw) if raw else {}, counts)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(shared))
+                    f.flush()
+                finally:
+                    flock(f, LOCK_UN)
+        except (OSError, ValueError) as e:
+            log.warning(f"Failed to write request counters to {self.path}, with error:\n{e}")
+            with self.lock:
+                self.merge(self.counts, counts)
+
+    def load(self):
+        """
+            :return: (dict) Counters of all processes, keyed by host|method|status code|endpoint template
+        """
+        self.flush()
+        try:
+            with open(self.path, "r") as f:
+                flock(f, LOCK_EX)
+                try:
+                    raw = f.read()
+                finally:
+                    flock(f, LOCK_UN)
+            return json.loads(raw) if raw else {}
+        except FileNotFoundError:
+            return {}
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+        with open(self.path, "a+") as f:
+            flock(f, LOCK_EX)
+            try:
+                f.truncate(0)
+            finally:
+                flock(f, LOCK_UN)
+
+    def summarize(self):
+        """
+            Totals of all processes by host, method and status code
+        """
+        summary = {"requests": 0, "write_requests": 0, "bytes": 0, "latency": 0.0,
+                   "hosts": {}, "methods": {}, "status_codes": {}, "endpoints": {}}
+        for key, (count, size, elapsed) in self.load().items():
+            host, method, status_code, endpoint = key.split("|", 3)
+            summary["requests"] += count
+            summary["bytes"] += size
+            summary["latency"] += elapsed
+            if method in WRITE_METHODS:
+                summary["write_requests"] += count
+            for group, name in [("hosts", host), ("methods", method), ("status_codes", status_code),
+                                ("endpoints", f"{method} {endpoint}")]:
+                summary[group][name] = summary[group].get(name, 0) + count
+        return summary
+
+
+_counters = {}
+
+
+def get_request_counters():
+    '''
+        Returns the RequestCounters of this process, flushed on exit
+    '''
+    pid = getpid()
+    if pid not in _counters:
+        _counters[pid] = counters = RequestCounters(
+            f"{get_congregate_path()}/data/request_counters.json")
+        # Runs on interpreter exit and on exit of multiprocessing pool workers
+        Finalize(counters, counters.flush, exitpriority=10)
+    return _counters[pid]
+
+
+def count_request(method, url, status_code, headers, elapsed):
+    get_request_counters().record(
+        method, url, status_code, get_response_size(headers), elapsed)
+
+
+def add_httpx_event_hooks(event_hooks):
+    '''
+        Add the event hooks counting the requests of an httpx Client (GitLab API)
+    '''
+    def start(request):
+        request.extensions["started"] = perf_counter()
+
+    def stop(response):
+        request = response.request
+        count_request(request.method, str(request.url), response.status_code, response.headers,
+                      perf_counter() - request.extensions.get("started", perf_counter()))
+
+    event_hooks.setdefault("request", []).append(start)
+    event_hooks.setdefault("response", []).append(stop)
+    return event_hooks
@@ -0,0 +1,219 @@
+"""
+Indexed SQLite store (data/staging.db) of the listed projects, groups and users JSON files.
+
+Staging queries the listed assets by key from the store, instead of loading the whole JSON files.
+Each JSON file is indexed at the end of list, and again whenever it changed since (e.g. partial list).
+"""
+import os
+import sqlite3
+from threading import local, Lock
+from json import load, loads, dumps
+from glob import glob
+from collections.abc import Mapping
+
+from gitlab_ps_utils.dict_utils import dig
+
+ASSETS = ["projects", "groups", "users"]
+# Batch size of bulk inserts and of ID lookups
+BATCH_SIZE = 500
+# Listed data keys, staging looks assets up by, and their indexed columns
+KEY_COLUMNS = {
+    "id": "id",
+    "path_with_namespace": "path",
+    "full_path": "path",
+    "http_url_to_repo": "url",
+    "username": "username",
+    "email": "email"
+}
+
+
+def get_row(file, pos, item):
+    path = item.get("path_with_namespace") or item.get("full_path")
+    url = item.get("http_url_to_repo")
+    return (file, pos, item.get("id"), path.lower() if path else None, url.lower() if url else None,
+            dig(item, "namespace", "id") if isinstance(item.get("namespace"), dict) else None,
+            item.get("username"), item.get("email"), dumps(item))
+
+
+class StagingStore():
+    '''
+        SQLite connections cannot be shared between threads (e.g. UI requests), so each thread of each process has its own
+    '''
+    def __init__(self, app_path):
+        self.app_path = app_path
+        self.__local = local()
+        self.__conns = []
+        self.__lock = Lock()
+
+    @property
+    def conn(self):
+        """
+            Connect on first use, so nothing is created without listed data
+        """
+        conn = getattr(self.__local, "conn", None)
+        if conn is None or self.__local.pid != os.getpid():
+            # Only used by this thread, but closable by any
+            conn = sqlite3.connect(f"{self.app_path}/data/staging.db", check_same_thread=False)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (file TEXT PRIMARY KEY, mtime REAL, size INTEGER);
+                CREATE TABLE IF NOT EXISTS listed (
+                    file TEXT, pos INTEGER, id, path TEXT, url TEXT, namespace_id, username TEXT, email TEXT, data TEXT,
+                    PRIMARY KEY (file, pos));
+                CREATE INDEX IF NOT EXISTS listed_id ON listed (file, id);
+                CREATE INDEX IF NOT EXISTS listed_path ON listed (file, path);
+                CREATE INDEX IF NOT EXISTS listed_url ON listed (file, url);
+                CREATE INDEX IF NOT EXISTS listed_namespace_id ON listed (file, namespace_id);
+                CREATE INDEX IF NOT EXISTS listed_username ON listed (file, username);
+                CREATE INDEX IF NOT EXISTS listed_email ON listed (file, email);
+            """)
+            self.__local.conn, self.__local.pid = conn, os.getpid()
+            with self.__lock:
+                self.__conns.append((os.getpid(), conn))
+        return conn
+
+    def close(self):
+        """
+            Close the connections of every thread of this process
+        """
+        with self.__lock:
+            conns, self.__conns = self.__conns, []
+        for pid, conn in conns:
+            if pid == os.getpid():
+                conn.close()
+        self.__local = local()
+
+    def get_file(self, asset, scm_source=None):
+        return f"{asset}-{scm_source}" if scm_source is not None else asset
+
+    def get(self, asset, scm_source=None):
+        """
+            Listed assets of data/<asset>[-<scm_source>].json, indexed first if the file changed
+
+            :return: (ListedData) or None if the file does not exist
+        """
+        file = self.get_file(asset, scm_source)
+        try:
+            stat = os.stat(f"{self.app_path}/data/{file}.json")
+        except FileNotFoundError:
+            return None
+        if self.conn.execute("SELECT mtime, size FROM files WHERE file = ?", (file,)).fetchone() != (stat.st_mtime, stat.st_size):
+            self.index_file(file, stat)
+        return ListedData(self, file)
+
+    def index_file(self, file, stat=None):
+        """
+            (Re-)index a listed JSON file, in a single parse
+        """
+        path = f"{self.app_path}/data/{file}.json"
+        stat = stat or os.stat(path)
+        with open(path, "r") as f:
+            data = load(f)
+        with self.conn:
+            self.conn.execute("DELETE FROM listed WHERE file = ?", (file,))
+            for i in range(0, len(data), BATCH_SIZE):
+                self.conn.executemany("INSERT INTO listed VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                    get_row(file, pos, item) for pos, item in enumerate(data[i:i + BATCH_SIZE], start=i)])
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                              (file, stat.st_mtime, stat.st_size))
+        return len(data)
+
+    def index_all(self):
+        """
+            Index every listed projects, groups and users JSON file, including those of multiple SCM sources
+        """
+        for asset in ASSETS:
+            for path in glob(f"{self.app_path}/data/{asset}.json") + glob(f"{self.app_path}/data/{asset}-*.json"):
+                file = os.path.basename(path)[:-len(".json")]
+                self.get(asset, file[len(asset) + 1:] if file != asset else None)
+
+
+class ListedData():
+    '''
+        Sequence-like view of a listed JSON file, queried from the staging store
+    '''
+    def __init__(self, store, file):
+        self.store = store
+        self.file = file
+
+    def query(self, where="", params=()):
+        for (data,) in self.store.conn.execute(
+                f"SELECT data FROM listed WHERE file = ? {where} ORDER BY pos", (self.file, *params)):
+            yield loads(data)
+
+    def __len__(self):
+        return self.store.conn.execute("SELECT COUNT(*) FROM listed WHERE file = ?", (self.file,)).fetchone()[0]
+
+    def __iter__(self):
+        return self.query()
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += len(self)
+        for item in self.query("AND pos = ?", (pos,)):
+            return item
+        raise IndexError(f"{self.file} index {pos} out of range")
+
+    def get_many(self, ids):
+        """
+            Listed assets of the given IDs, in listed order
+        """
+        ids = list(ids)
+        found = []
+        for i in range(0, len(ids), BATCH_SIZE):
+            batch = ids[i:i + BATCH_SIZE]
+            found += self.query(f"AND id IN ({', '.join('?' * len(batch))})", batch)
+        return found
+
+    def find_users(self, value):
+        """
+            Listed users matching a username, email or ID
+        """
+        uid = int(value) if str(value).isdigit() else value
+        return list(self.query("AND (username = ? OR email = ? OR id = ? OR id = ?)", (value, value, uid, str(value))))
+
+    def index(self, key, lowercase=False):
+        return ListedIndex(self, KEY_COLUMNS[key], lowercase)
+
+
+class ListedIndex(Mapping):
+    '''
+        Read-only dict view of listed assets by key, in place of rewrite_list_into_dict.
+        Looked up assets are kept, so they are shared between lookups like dict values.
+    '''
+    def __init__(self, listed, column, lowercase=False):
+        self.listed = listed
+        self.column = column
+        # Path and URL columns are stored lowercase
+        self.lowercase = lowercase or column in ["path", "url"]
+        self.found = {}
+
+    def __getitem__(self, key):
+        if key not in self.found:
+            value = key.lower() if self.lowercase and isinstance(key, str) else key
+            for item in self.listed.query(f"AND {self.column} = ?", (value,)):
+                self.found[key] = item
+                break
+            else:
+                raise KeyError(key)
+        return self.found[key]
+
+    def __iter__(self):
+        for (key,) in self.listed.store.conn.execute(
+                f"SELECT {self.column} FROM listed WHERE file = ? ORDER BY pos", (self.listed.file,)):
+            yield key
+
+    def __len__(self):
+        return len(self.listed)
+
+
+_store = None
+
+
+def get_staging_store(app_path):
+    '''
+        Returns the staging store of this process
+    '''
+    global _store
+    if _store is None or _store.app_path != app_path:
+        _store = StagingStore(app_path)
+    return _store
@@ -0,0 +1,66 @@
+"""
+Startup and import cost of a CLI command, reported by the congregate --timings option.
+
+Imports are timed by wrapping builtins.__import__ once the command is dispatched,
+so only the modules loaded for the command itself are counted, and nested imports only once.
+"""
+import sys
+import builtins
+from atexit import register
+from threading import current_thread, main_thread
+from time import perf_counter
+
+
+class CommandTimings():
+    def __init__(self, started):
+        """
+            :param started: (float) perf_counter() when the CLI module started loading
+        """
+        self.started = started
+        self.dispatched = None
+        self.command = None
+        self.modules = 0
+        self.import_time = 0
+        self.depth = 0
+        self.__import = builtins.__import__
+
+    def start(self, command):
+        """
+            Start timing the imports of a dispatched command, and report the timings on exit
+        """
+        self.command = command
+        self.dispatched = perf_counter()
+        self.modules = len(sys.modules)
+        builtins.__import__ = self.__timed_import
+        register(self.report)
+
+    def __timed_import(self, *args, **kwargs):
+        # Worker threads and nested imports are not timed (again)
+        if self.depth or current_thread() is not main_thread():
+            return self.__import(*args, **kwargs)
+        self.depth += 1
+        started = perf_counter()
+        try:
+            return self.__import(*args, **kwargs)
+        finally:
+            self.import_time += perf_counter() - started
+            self.depth -= 1
+
+    def get_timings(self):
+        """
+            :return: (dict) Startup, import and run seconds of the command, and the number of modules it imported
+        """
+        ended = perf_counter()
+        return {
+            "startup": self.dispatched - self.started,
+            "imports": self.import_time,
+            "modules": len(sys.modules) - self.modules,
+            "run": ended - self.dispatched - self.import_time,
+            "total": ended - self.started
+        }
+
+    def report(self):
+        builtins.__import__ = self.__import
+        t = self.get_timings()
+        print(f"Timings of '{self.command}': startup {t['startup']:.3f}s, imports {t['imports']:.3f}s ({t['modules']} modules), "
+              f"run {t['run']:.3f}s, total {t['total']:.3f}s", file=sys.stderr)
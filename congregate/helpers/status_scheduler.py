@@ -0,0 +1,195 @@
+"""
+Central scheduler for polling the status of in-flight exports and imports.
+
+Rather than pinning a worker process in a sleep loop per export or import,
+status checks are registered with the scheduler of the current process.
+Pending checks are kept in a single priority queue ordered by their next check time,
+polled by a bounded set of threads and resolved through a Future and an optional callback.
+"""
+from os import getpid
+from time import monotonic
+from heapq import heappush, heappop
+from itertools import count
+from threading import Condition, Thread
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.util import Finalize
+
+from httpx import RequestError
+
+from congregate.helpers.base_class import BaseClass
+
+PENDING = "pending"
+FINISHED = "finished"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+# Result of a single status check, where data is passed on to the Future once resolved
+# and retry_after overrides the (backoff) time until the next check
+StatusResult = namedtuple(
+    "StatusResult", ["state", "data", "retry_after"], defaults=[None, None])
+
+
+class StatusCheck():
+    def __init__(self, name, check, wait_time, timeout=None, callback=None):
+        self.name = name
+        self.check = check
+        self.wait_time = wait_time
+        self.timeout = timeout
+        self.callback = callback
+        self.future = Future()
+        self.started = monotonic()
+
+    @property
+    def age(self):
+        return monotonic() - self.started
+
+
+class StatusScheduler(BaseClass):
+    # Number of check intervals after which the interval doubles, up to MAX_BACKOFF times
+    BACKOFF_STEPS = 30
+    MAX_BACKOFF = 8
+
+    def __init__(self, max_concurrency=None):
+        super().__init__()
+        self.max_concurrency = max_concurrency or self.config.export_import_status_max_concurrency
+        self.in_flight = 0
+        self.closed = False
+        self.__queue = []
+        self.__seq = count()
+        self.__cond = Condition()
+        self.__pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="status-check")
+        self.__thread = None
+
+    def schedule(self, name, check, wait_time=None, timeout=None, callback=None, delay=0):
+        """
+            Register a status check and return a Future resolved with its final StatusResult.
+
+            :param name: (str) Entity name used for logging
+            :param check: (callable) Takes the entity age in seconds and returns a StatusResult
+            :param wait_time: (int) Base interval between checks. Defaults to export_import_status_check_time
+            :param timeout: (int) Resolve as TIMEOUT once the entity is older than this, without checking again
+            :param callback: (callable) Called with the resolved Future
+            :param delay: (int) Seconds before the first check
+            :return: (Future) Resolved with the final StatusResult
+        """
+        entry = StatusCheck(
+            name, check, wait_time or self.config.export_import_status_check_time,
+            timeout=timeout, callback=callback)
+        if callback:
+            entry.future.add_done_callback(
+                lambda future: self.__run_callback(entry, future))
+        with self.__cond:
+            if self.closed:
+                raise RuntimeError("Status scheduler is closed")
+            self.__push(entry, delay)
+            self.__start()
+        return entry.future
+
+    def next_wait(self, entry):
+        """
+            Check interval that grows with the entity age, as long running exports and imports
+            are unlikely to finish within the next base interval
+        """
+        steps = int(entry.age // (entry.wait_time * self.BACKOFF_STEPS))
+        return entry.wait_time * min(2 ** steps, self.MAX_BACKOFF)
+
+    def pending(self):
+        with self.__cond:
+            return len(self.__queue) + self.in_flight
+
+    def close(self):
+        """
+            Stop polling, cancelling any checks that are still queued
+        """
+        with self.__cond:
+            self.closed = True
+            while self.__queue:
+                _, _, entry = heappop(self.__queue)
+                self.log.warning(f"Cancelling status check of {entry.name}")
+                entry.future.cancel()
+            self.__cond.notify_all()
+        if self.__thread:
+            self.__thread.join()
+        self.__pool.shutdown(wait=True)
+
+    def __push(self, entry, delay):
+        heappush(self.__queue, (monotonic() + max(float(delay), 0), next(self.__seq), entry))
+        self.__cond.notify()
+
+    def __start(self):
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__thread = Thread(
+                target=self.__loop, name="status-scheduler", daemon=True)
+            self.__thread.start()
+
+    def __loop(self):
+        while True:
+            with self.__cond:
+                while True:
+                    if self.closed:
+                        return
+                    if self.__queue and self.in_flight < self.max_concurrency:
+                        wait = self.__queue[0][0] - monotonic()
+                        if wait <= 0:
+                            break
+                        self.__cond.wait(wait)
+                    else:
+                        self.__cond.wait()
+                _, _, entry = heappop(self.__queue)
+                self.in_flight += 1
+            self.__pool.submit(self.__poll, entry)
+
+    def __poll(self, entry):
+        delay = None
+        try:
+            if entry.timeout is not None and entry.age > entry.timeout:
+                self.log.error(
+                    f"Time limit of {entry.timeout} seconds exceeded for {entry.name}")
+                result = StatusResult(TIMEOUT)
+            else:
+                result = entry.check(entry.age)
+            if result.state == PENDING:
+                delay = self.next_wait(entry) if result.retry_after is None else result.retry_after
+            else:
+                entry.future.set_result(result)
+        except RequestError as re:
+            self.log.warning(
+                f"Failed to check status of {entry.name}, retrying:\n{re}")
+            delay = self.next_wait(entry)
+        except Exception as e:
+            self.log.error(f"Status check of {entry.name} failed with error:\n{e}")
+            entry.future.set_exception(e)
+        finally:
+            with self.__cond:
+                self.in_flight -= 1
+                if delay is not None:
+                    if self.closed:
+                        entry.future.cancel()
+                    else:
+                        self.__push(entry, delay)
+                self.__cond.notify()
+
+    def __run_callback(self, entry, future):
+        try:
+            entry.callback(future)
+        except Exception as e:
+            self.log.error(
+                f"Status callback of {entry.name} failed with error:\n{e}")
+
+
+_schedulers = {}
+
+
+def get_status_scheduler():
+    '''
+        Returns the StatusScheduler shared by everything running in this process.
+    '''
+    pid = getpid()
+    if (scheduler := _schedulers.get(pid)) is None or scheduler.closed:
+        scheduler = StatusScheduler()
+        _schedulers[pid] = scheduler
+        # Runs on interpreter exit and on exit of multiprocessing pool workers
+        Finalize(scheduler, scheduler.close, exitpriority=10)
+    return scheduler
@@ -0,0 +1,55 @@
+"""
+Run a small DAG of dependent steps on a bounded thread pool
+"""
+from time import perf_counter
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# A named step, called with the results of the steps it depends on (None for steps not being run)
+Step = namedtuple("Step", ["name", "func", "depends_on"], defaults=[()])
+
+
+def run_steps(steps, max_workers=1):
+    """
+        Run each step as soon as all the steps it depends on are done.
+        Once a step fails no new steps are started, and the first error is raised after the running steps are done.
+
+        :param steps: (list) Step tuples. Dependencies on steps that are not listed are considered done
+        :param max_workers: (int) Number of steps running concurrently
+        :return: (tuple) Dicts of step results and step durations (in seconds)
+    """
+    pending = {s.name: s for s in steps}
+    results, timings, running = {}, {}, {}
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers or 1, thread_name_prefix="step") as pool:
+        while pending or running:
+            if error is None:
+                for name in [n for n, s in pending.items() if is_ready(s, pending, running)]:
+                    step = pending.pop(name)
+                    running[pool.submit(
+                        timed, step.func, *[results.get(d) for d in step.depends_on])] = name
+                if pending and not running:
+                    raise ValueError(
+                        f"Circular or self dependencies between steps {list(pending)}")
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as e:
+                    error = error or e
+    if error:
+        raise error
+    return results, timings
+
+
+def is_ready(step, pending, running):
+    return not any(d in pending or d in running.values() for d in step.depends_on)
+
+
+def timed(func, *args):
+    start = perf_counter()
+    result = func(*args)
+    return result, round(perf_counter() - start, 3)
@@ -29,7 +29,7 @@ def is_github_dot_com(host):
 
 def rotate_logs():
     """
-        Rotate and empty logs
+        Rotate and empty logs, and reset the request counters
     """
     log_path = f"{get_congregate_path()}/data/logs"
     if os.path.isdir(log_path):
@@ -47,6 +47,9 @@ def rotate_logs():
         except OSError as e:
             if e.errno != errno.ENOENT:
                 raise
+        # Count requests from here on, like the emptied logs
+        from congregate.helpers.request_counters import get_request_counters
+        get_request_counters().reset()
     else:
         raise NotADirectoryError(
             "Cannot find data directory. CONGREGATE_PATH not set or you are not running this in the Congregate directory.")
@@ -79,6 +82,10 @@ def is_valid_url(url):
     parsed = urlparse(url)
     return all([parsed.scheme, parsed.netloc])
 
+def get_host(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else url
+
 def guess_file_type(filename):
     """
         Guess file type based on file path/url
@@ -311,4 +318,17 @@ class ProjectIdPrefixedLogger:
         self.logger.warning(f"{self.prefix} {msg}")
     
     def error(self, msg):
-        self.logger.error(f"{self.prefix} {msg}")
\ No newline at end of file
+        self.logger.error(f"{self.prefix} {msg}")
+
+def is_changed_since(entity, since, fields=("last_activity_at", "updated_at")):
+    """
+        :param entity: (dict) Listed source entity e.g. a GitLab project
+        :param since: (str) ISO 8601 time e.g. a listing high-water mark
+        :param fields: (tuple) Entity time fields, any of which changes with the entity
+        :return: (bool) Whether any entity time field is later than since, or none is known
+    """
+    times = [entity[f] for f in fields if entity.get(f)]
+    if not since or not times:
+        return True
+    since = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    return any(datetime.fromisoformat(t.replace("Z", "+00:00")) > since for t in times)
@@ -27,11 +27,11 @@ Usage:
     congregate generate-seed-data [--commit] # TODO: Refactor, broken
     congregate init
     congregate ldap-group-sync <file-path> [--commit]
-    congregate list [--processes=<n>] [--partial] [--skip-users] [--skip-groups] [--skip-group-members] [--skip-projects] [--skip-project-members] [--skip-ci] [--src-instances] [--subset] [--skip-archived-projects] [--only-specific-projects=<ids>] [--format=fmt]
+    congregate list [--processes=<n>] [--partial] [--skip-users] [--skip-groups] [--skip-group-members] [--skip-projects] [--skip-project-members] [--skip-ci] [--src-instances] [--subset] [--skip-archived-projects] [--only-specific-projects=<ids>] [--format=fmt] [--delta]
     congregate list-staged-projects-contributors [--commit]
     congregate map-and-stage-users-by-email-match [--commit]
     congregate map-users [--commit]
-    congregate migrate [--commit] [--processes=<n>] [--reporting] [--skip-users] [--remove-members] [--sync-members] [--stream-groups] [--skip-group-export] [--skip-group-import] [--skip-project-export] [--skip-project-import] [--only-post-migration-info] [--subgroups-only] [--scm-source=hostname] [--reg-dry-run] [--group-structure] [--retain-contributors]
+    congregate migrate [--commit] [--processes=<n>] [--reporting] [--skip-users] [--remove-members] [--sync-members] [--stream-groups] [--stream-projects] [--skip-group-export] [--skip-group-import] [--skip-project-export] [--skip-project-import] [--only-post-migration-info] [--subgroups-only] [--scm-source=hostname] [--reg-dry-run] [--group-structure] [--retain-contributors]
     congregate migrate-linked-issues [--commit]
     congregate obfuscate
     congregate pull-mirror-staged-projects [--commit] [--protected-only] [--force] [--overwrite]
@@ -71,6 +71,7 @@ Usage:
 Options:
     -h, --help                              Show Usage.
     -v, --version                           Show current version of congregate.
+    --timings                               Report the startup, import and run time of the command on exit (stderr).
 
 Arguments:
     processes                               Set number of processes to run in parallel.
@@ -85,6 +86,7 @@ Arguments:
     hard-delete                             DESTRUCTIVE: Remove user contributions and solely owned groups
     permanent                               DESTRUCTIVE: Permanently delete group and/or project. Otherwise, by default, scheduled for deletion
     stream-groups                           Streamed approach of migrating staged groups in bulk
+    stream-projects                         Pipelined approach of migrating staged projects, importing each project as soon as its export is downloaded (GitLab only)
     skip-groups                             Rollback: Remove only users and projects
     skip-group-members                      Add empty list instead of listing GitLab group members. Skip saving BBS project user groups as GL group members.
     skip-group-export                       Skip exporting groups from source instance
@@ -112,6 +114,7 @@ Arguments:
     head                                    Read results files in chronological order
     tail                                    Read results files in reverse chronological order (default for stitch-results)
     partial                                 Option used when listing. Keeps existing data in mongo instead of dropping it before retrieving new data
+    delta                                   Option used when listing from GitLab. Only re-lists projects active or updated since the last complete listing, and removes projects deleted on source. Membership- or settings-only changes are not picked up, deleted projects are not removed from gitlab.com without a src_parent_group_path, and direct_transfer (Celery) listings do not support it
     off                                     Toggle maintenance mode off, otherwise on by default
     dest                                    Toggle maintenance mode on destination instance
     msg                                     Maintenance mode message, with "+" in place of " "
@@ -215,11 +218,12 @@ import os
 import subprocess
 from sys import platform
 from pathlib import Path
-from json import dump, dumps
-from time import time
-from toml import load as load_toml
+from time import time, perf_counter
 from docopt import docopt
 
+# Start of the CLI startup, reported by --timings
+STARTED = perf_counter()
+
 if __name__ == '__main__':
     if __package__ is None:
         import sys
@@ -227,30 +231,37 @@ if __name__ == '__main__':
             os.path.dirname(os.path.abspath(__file__))))
     from gitlab_ps_utils.logger import myLogger
     from gitlab_ps_utils.misc_utils import strip_netloc
-    from gitlab_ps_utils.dict_utils import dig
-    from gitlab_ps_utils.string_utils import obfuscate, deobfuscate
     from congregate.helpers import conf
-    
-    from congregate.helpers.utils import get_congregate_path, rotate_logs, stitch_json_results
-    from congregate.helpers.ui_utils import spin_up_ui
+    from congregate.helpers.utils import get_congregate_path, rotate_logs
+    from congregate.helpers.startup_timings import CommandTimings
 else:
     import sys
     sys.path.append(os.path.dirname(
         os.path.dirname(os.path.abspath(__file__))))
     from gitlab_ps_utils.logger import myLogger
     from gitlab_ps_utils.misc_utils import strip_netloc
-    from gitlab_ps_utils.dict_utils import dig
-    from gitlab_ps_utils.string_utils import obfuscate, deobfuscate
     from congregate.helpers import conf
-    from congregate.helpers.utils import get_congregate_path, rotate_logs, stitch_json_results
-    from congregate.helpers.ui_utils import spin_up_ui
+    from congregate.helpers.utils import get_congregate_path, rotate_logs
+    from congregate.helpers.startup_timings import CommandTimings
 
 app_path = get_congregate_path()
 
 
+def get_command(arguments):
+    """
+        The docopt command (or first option e.g. --version) of the parsed CLI arguments
+    """
+    return next((k for k, v in arguments.items() if v is True and not k.startswith("-")),
+                next((k for k, v in arguments.items() if v is True), None))
+
+
 def main():
     if __name__ == '__main__':
-        arguments = docopt(__doc__)
+        # Each command imports only the modules it needs, timed with --timings
+        argv = sys.argv[1:]
+        arguments = docopt(__doc__, argv=[a for a in argv if a != "--timings"])
+        if "--timings" in argv:
+            CommandTimings(STARTED).start(get_command(arguments))
         if arguments["init"]:
             Path("data/logs").mkdir(parents=True, exist_ok=True)
             Path("data/results").mkdir(parents=True, exist_ok=True)
@@ -263,6 +274,8 @@ def main():
             log = myLogger(__name__)
 
         if arguments["--version"]:
+            from toml import load as load_toml
+            from gitlab_ps_utils.dict_utils import dig
             with open(f"{app_path}/pyproject.toml", "r") as f:
                 print(
                     f"Congregate {dig(load_toml(f), 'tool', 'poetry', 'version')}")
@@ -289,9 +302,8 @@ def main():
         if SCM_SOURCE:
             SCM_SOURCE = strip_netloc(SCM_SOURCE)
 
-        from congregate.helpers.migrate_utils import clean_data, add_post_migration_stats, write_results_to_file, toggle_maintenance_mode
-
         if arguments["obfuscate"]:
+            from gitlab_ps_utils.string_utils import obfuscate
             data = obfuscate("Secret:")
             if platform == "darwin":
                 subprocess.run("pbcopy", universal_newlines=True,
@@ -300,6 +312,7 @@ def main():
             else:
                 print(f"Masked secret: {data}")
         elif arguments["deobfuscate"]:
+            from gitlab_ps_utils.string_utils import deobfuscate
             data = deobfuscate(input("Masked secret:"))
             if platform == "darwin":
                 subprocess.run("pbcopy", universal_newlines=True,
@@ -316,41 +329,7 @@ def main():
             for v in dir(c):
                 getattr(c, v)
         else:
-            from gitlab_ps_utils.string_utils import convert_to_underscores
-            from congregate.migration.gitlab.users import UsersClient
-            from congregate.migration.gitlab.groups import GroupsClient
-            from congregate.migration.gitlab.projects import ProjectsClient
-            from congregate.migration.migrate import MigrateClient
-            from congregate.migration.meta.base_migrate import MigrateClient as BaseMigrateClient
-            from congregate.migration.gitlab.migrate import GitLabMigrateClient
-            from congregate.migration.gitlab.branches import BranchesClient
-            from congregate.cli import do_all
-            from congregate.cli.list_source import ListClient
-            from congregate.cli.stage_projects import ProjectStageCLI
-            from congregate.cli.stage_groups import GroupStageCLI
-            from congregate.cli.stage_users import UserStageCLI
-            from congregate.cli.stage_wave import WaveStageCLI
-            from congregate.cli.stage_wave_csv_generator import WaveStageCSVGeneratorCLI
-            from congregate.helpers.seed.generator import SeedDataGenerator
-            from congregate.migration.gitlab.diff.userdiff import UserDiffClient
-            from congregate.migration.gitlab.diff.projectdiff import ProjectDiffClient
-            from congregate.migration.gitlab.diff.groupdiff import GroupDiffClient
-            from congregate.migration.github.diff.repodiff import RepoDiffClient as GHRepoDiffClient
-            from congregate.migration.bitbucket.diff.repodiff import RepoDiffClient as BBSRepoDiffClient
-            from congregate.helpers.user_util import map_users, map_and_stage_users_by_email_match
-            from congregate.helpers.congregate_mdbc import CongregateMongoConnector
-            from congregate.migration.github.repos import ReposClient as GHReposClient
-            from congregate.migration.bitbucket.repos import ReposClient as BBReposClient
-            from congregate.cli.ldap_group_sync import LdapGroupSync
-
-
-
             config = conf.Config()
-            users = UsersClient()
-            groups = GroupsClient()
-            projects = ProjectsClient()
-            bb_repos = BBReposClient()
-            branches = BranchesClient()
 
             if not config.ssl_verify:
                 log.warning(
@@ -359,6 +338,12 @@ def main():
                 )
 
             if arguments["list"]:
+                if arguments["--delta"] and config.direct_transfer:
+                    log.error(
+                        "--delta is not supported by direct_transfer listings. Run a complete listing")
+                    sys.exit(os.EX_USAGE)
+                from congregate.cli.list_source import ListClient
+                from congregate.helpers.migrate_utils import add_post_migration_stats
                 start = time()
                 rotate_logs()
                 # Default to json if not specified
@@ -376,7 +361,8 @@ def main():
                     subset=arguments["--subset"],
                     skip_archived_projects=arguments["--skip-archived-projects"],
                     only_specific_projects=arguments["--only-specific-projects"],
-                    format=fmt
+                    format=fmt,
+                    delta=arguments["--delta"]
                 )
                 list_client.list_data()
                 add_post_migration_stats(start, log=log)
@@ -385,6 +371,7 @@ def main():
                 pass
 
             if arguments["stage-projects"]:
+                from congregate.cli.stage_projects import ProjectStageCLI
                 # Default to json if not specified
                 fmt = arguments["--format"] or "json"
                 pcli = ProjectStageCLI(format=fmt)
@@ -392,6 +379,7 @@ def main():
                                 dry_run=DRY_RUN, skip_users=SKIP_USERS, scm_source=SCM_SOURCE)
 
             if arguments["stage-groups"]:
+                from congregate.cli.stage_groups import GroupStageCLI
                 # Default to json if not specified
                 fmt = arguments["--format"] or "json"
                 gcli = GroupStageCLI(format=fmt)
@@ -399,17 +387,20 @@ def main():
                                 dry_run=DRY_RUN, skip_users=SKIP_USERS, scm_source=SCM_SOURCE)
 
             if arguments["stage-users"]:
+                from congregate.cli.stage_users import UserStageCLI
                 # Default to json if not specified
                 fmt = arguments["--format"] or "json"
                 ucli = UserStageCLI(format=fmt)
                 ucli.stage_data(arguments['<users>'], dry_run=DRY_RUN)
 
             if arguments["stage-wave"]:
+                from congregate.cli.stage_wave import WaveStageCLI
                 wcli = WaveStageCLI()
                 wcli.stage_data(
                     arguments['<wave>'], dry_run=DRY_RUN, skip_users=SKIP_USERS, scm_source=SCM_SOURCE)
 
             if arguments["create-stage-wave-csv"]:
+                from congregate.cli.stage_wave_csv_generator import WaveStageCSVGeneratorCLI
                 wscsvCli = WaveStageCSVGeneratorCLI()
                 wscsvCli.generate(
                     destination_file=config.wave_spreadsheet_path,
@@ -421,10 +412,12 @@ def main():
                 )
 
             if arguments["migrate-linked-issues"]:
+                from congregate.migration.gitlab.migrate import GitLabMigrateClient
                 migrate = GitLabMigrateClient(dry_run=DRY_RUN)
                 migrate.migrate_linked_items_in_issues()
 
             if arguments["migrate"]:
+                from congregate.migration.migrate import MigrateClient
                 migrate = MigrateClient(
                     processes=PROCESSES,
                     dry_run=DRY_RUN,
@@ -432,6 +425,7 @@ def main():
                     remove_members=REMOVE_MEMBERS,
                     sync_members=SYNC_MEMBERS,
                     stream_groups=arguments["--stream-groups"],
+                    stream_projects=arguments["--stream-projects"],
                     skip_group_export=bool(
                         arguments["--skip-group-export"] or ONLY_POST_MIGRATION_INFO),
                     skip_group_import=arguments["--skip-group-import"],
@@ -448,6 +442,7 @@ def main():
                 migrate.migrate()
 
             if arguments["rollback"]:
+                from congregate.migration.meta.base_migrate import MigrateClient as BaseMigrateClient
                 migrate = BaseMigrateClient(
                     dry_run=DRY_RUN,
                     skip_users=SKIP_USERS,
@@ -459,23 +454,30 @@ def main():
                 migrate.rollback()
 
             if arguments["do-all"]:
+                from congregate.cli import do_all
                 do_all.do_all(dry_run=DRY_RUN)
             if arguments["do-all-users"]:
+                from congregate.cli import do_all
                 do_all.do_all_users(dry_run=DRY_RUN)
             if arguments["do-all-groups-and-projects"]:
+                from congregate.cli import do_all
                 do_all.do_all_groups_and_projects(dry_run=DRY_RUN)
             if arguments["ui"]:
+                from congregate.helpers.ui_utils import spin_up_ui
                 spin_up_ui(app_path, config.ui_port)
             if arguments["search-for-staged-users"]:
-                users.search_for_staged_users(table=arguments["--table"])
+                from congregate.migration.gitlab.users import UsersClient
+                UsersClient().search_for_staged_users(table=arguments["--table"])
             if arguments["update-parent-group-members"]:
+                from congregate.migration.gitlab.users import UsersClient
                 access_level = arguments["--access-level"] or "Guest"
-                users.update_parent_group_members(
+                UsersClient().update_parent_group_members(
                     access_level, add_members=arguments["--add-members"], dry_run=DRY_RUN)
             if arguments["update-members-access-level"]:
+                from congregate.migration.gitlab.users import UsersClient
                 current_level = arguments["--current-level"] or "Owner"
                 target_level = arguments["--target-level"] or "Guest"
-                users.update_members_access_level(
+                UsersClient().update_members_access_level(
                     current_level, target_level, skip_groups=SKIP_GROUPS, skip_projects=SKIP_PROJECTS, dry_run=DRY_RUN)
             if arguments["update-aws-creds"]:
                 if config.s3_access_key and config.s3_secret_key:
@@ -489,42 +491,57 @@ def main():
                     log.warning(
                         f"No AWS configuration. Export location: {config.location}")
             if arguments["remove-inactive-users"]:
-                users.remove_inactive_users(
+                from congregate.migration.gitlab.users import UsersClient
+                UsersClient().remove_inactive_users(
                     membership=MEMBERSHIP, dry_run=DRY_RUN)
             if arguments["find-unimported-projects"]:
-                projects.find_unimported_projects(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().find_unimported_projects(dry_run=DRY_RUN)
             if arguments["stage-unimported-projects"]:
+                from congregate.migration.meta.base_migrate import MigrateClient as BaseMigrateClient
                 BaseMigrateClient(dry_run=DRY_RUN).stage_unimported_projects()
             if arguments["remove-users-from-parent-group"]:
-                users.remove_users_from_parent_group(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.users import UsersClient
+                UsersClient().remove_users_from_parent_group(dry_run=DRY_RUN)
             if arguments["delete-all-staged-projects-pull-mirrors"]:
-                projects.delete_all_pull_mirrors(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().delete_all_pull_mirrors(dry_run=DRY_RUN)
             if arguments["pull-mirror-staged-projects"]:
-                projects.pull_mirror_staged_projects(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().pull_mirror_staged_projects(
                     protected_only=arguments["--protected-only"], force=arguments["--force"], overwrite=arguments["--overwrite"], dry_run=DRY_RUN)
             if arguments["push-mirror-staged-projects"]:
-                projects.push_mirror_staged_projects(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().push_mirror_staged_projects(
                     disabled=arguments["--disabled"], keep_div_refs=arguments["--keep_div_refs"], force=arguments["--force"], dry_run=DRY_RUN)
             if arguments["toggle-staged-projects-push-mirror"]:
-                projects.toggle_staged_projects_push_mirror(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().toggle_staged_projects_push_mirror(
                     disable=arguments["--disable"], dry_run=DRY_RUN)
             if arguments["verify-staged-projects-push-mirror"]:
-                projects.verify_staged_projects_push_mirror(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().verify_staged_projects_push_mirror(
                     disabled=arguments["--disabled"], keep_div_refs=arguments["--keep_div_refs"])
             if arguments["delete-staged-projects-push-mirrors"]:
-                projects.delete_staged_projects_push_mirrors(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().delete_staged_projects_push_mirrors(
                     remove_all=arguments["--all"], dry_run=DRY_RUN)
             if arguments["set-default-branch"]:
-                branches.set_default_branch(
+                from congregate.migration.gitlab.branches import BranchesClient
+                BranchesClient().set_default_branch(
                     name=arguments["--name"], dry_run=DRY_RUN)
             if arguments["count-unarchived-projects"]:
-                projects.count_unarchived_projects(local=arguments["--local"])
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().count_unarchived_projects(local=arguments["--local"])
             if arguments["archive-staged-projects"]:
                 # GitLab as source and/or destination instance
                 if (config.source_type == "gitlab") or DEST:
-                    projects.update_staged_projects_archive_state(
+                    from congregate.migration.gitlab.projects import ProjectsClient
+                    ProjectsClient().update_staged_projects_archive_state(
                         dest=DEST, dry_run=DRY_RUN, rollback=ROLLBACK, append_suffix=APPEND_SUFFIX)
                 elif config.source_type == "github" or config.list_multiple_source_config("github_source"):
+                    from congregate.migration.github.repos import ReposClient as GHReposClient
+                    from gitlab_ps_utils.string_utils import deobfuscate
                     for single_source in config.list_multiple_source_config(
                             "github_source"):
                         if SCM_SOURCE in single_source.get("src_hostname"):
@@ -539,9 +556,12 @@ def main():
             if arguments["unarchive-staged-projects"]:
                 # GitLab as source and/or destination instance
                 if (config.source_type == "gitlab") or DEST:
-                    projects.update_staged_projects_archive_state(
+                    from congregate.migration.gitlab.projects import ProjectsClient
+                    ProjectsClient().update_staged_projects_archive_state(
                         archive=False, dest=DEST, dry_run=DRY_RUN, rollback=ROLLBACK)
                 elif config.source_type == "github" or config.list_multiple_source_config("github_source"):
+                    from congregate.migration.github.repos import ReposClient as GHReposClient
+                    from gitlab_ps_utils.string_utils import deobfuscate
                     if SCM_SOURCE is not None:
                         for single_source in config.list_multiple_source_config(
                                 "github_source"):
@@ -558,59 +578,75 @@ def main():
                     log.warning(
                         f"Bulk unarchive not available for {config.source_type}. Did you mean to add '--dest'?")
             if arguments["set-bb-read-only-branch-permissions"]:
+                from congregate.migration.bitbucket.repos import ReposClient as BBReposClient
                 if config.source_type == "bitbucket server":
-                    bb_repos.update_branch_permissions(
+                    BBReposClient().update_branch_permissions(
                         is_project=arguments["--bb-projects"], dry_run=DRY_RUN)
                 else:
                     log.warning(
                         "This command is ONLY intended for BitBucket source instances")
             if arguments["unset-bb-read-only-branch-permissions"]:
+                from congregate.migration.bitbucket.repos import ReposClient as BBReposClient
                 if config.source_type == "bitbucket server":
-                    bb_repos.update_branch_permissions(
+                    BBReposClient().update_branch_permissions(
                         restrict=False, is_project=arguments["--bb-projects"], dry_run=DRY_RUN)
                 else:
                     log.warning(
                         "This command is ONLY intended for BitBucket source instances. Skipping")
             if arguments["set-bb-read-only-member-permissions"]:
+                from congregate.migration.bitbucket.repos import ReposClient as BBReposClient
                 if config.source_type == "bitbucket server":
-                    bb_repos.update_member_permissions(
+                    BBReposClient().update_member_permissions(
                         is_project=arguments["--bb-projects"], dry_run=DRY_RUN)
                 else:
                     log.warning(
                         "This command is ONLY intended for BitBucket source instances. Skipping")
             if arguments["unset-bb-read-only-member-permissions"]:
+                from congregate.migration.bitbucket.repos import ReposClient as BBReposClient
                 if config.source_type == "bitbucket server":
-                    bb_repos.update_member_permissions(
+                    BBReposClient().update_member_permissions(
                         restrict=False, is_project=arguments["--bb-projects"], dry_run=DRY_RUN)
                 else:
                     log.warning(
                         "This command is ONLY intended for BitBucket source instances")
             if arguments["filter-projects-by-state"]:
+                from congregate.migration.gitlab.projects import ProjectsClient
                 if config.source_type == "gitlab":
-                    projects.filter_projects_by_state(
+                    ProjectsClient().filter_projects_by_state(
                         archived=ARCHIVED, dry_run=DRY_RUN)
                 else:
                     log.warning(
                         f"The 'archived' field is currently not present when listing on {config.source_type}")
             if arguments["find-empty-repos"]:
-                projects.find_empty_repos()
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().find_empty_repos()
             if arguments["generate-seed-data"]:
+                from congregate.helpers.seed.generator import SeedDataGenerator
                 s = SeedDataGenerator()
                 s.generate_seed_data(dry_run=DRY_RUN)
             if arguments["validate-staged-groups-schema"]:
-                groups.validate_staged_groups_schema()
+                from congregate.migration.gitlab.groups import GroupsClient
+                GroupsClient().validate_staged_groups_schema()
             if arguments["validate-staged-projects-schema"]:
-                projects.validate_staged_projects_schema()
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().validate_staged_projects_schema()
             if arguments["map-users"]:
+                from congregate.helpers.user_util import map_users
                 map_users(dry_run=DRY_RUN)
             if arguments["map-and-stage-users-by-email-match"]:
+                from congregate.helpers.user_util import map_and_stage_users_by_email_match
                 map_and_stage_users_by_email_match(dry_run=DRY_RUN)
             if arguments["clean"]:
+                from congregate.helpers.migrate_utils import clean_data
                 clean_data(dry_run=DRY_RUN)
             if arguments["generate-diff"]:
+                from congregate.helpers.migrate_utils import add_post_migration_stats
                 start = time()
                 rotate_logs()
                 if config.source_type == "gitlab":
+                    from congregate.migration.gitlab.diff.userdiff import UserDiffClient
+                    from congregate.migration.gitlab.diff.groupdiff import GroupDiffClient
+                    from congregate.migration.gitlab.diff.projectdiff import ProjectDiffClient
                     if not SKIP_USERS:
                         user_diff = UserDiffClient(
                             staged=STAGED,
@@ -646,6 +682,7 @@ def main():
                             "/data/results/project_migration_results.html"
                         )
                 elif config.source_type == "bitbucket server":
+                    from congregate.migration.bitbucket.diff.repodiff import RepoDiffClient as BBSRepoDiffClient
                     repo_diff = BBSRepoDiffClient(
                         staged=STAGED,
                         processes=PROCESSES,
@@ -654,6 +691,8 @@ def main():
                     repo_diff.generate_diff_report(start)
                     repo_diff.generate_split_html_report()
                 elif config.source_type == "github" or SCM_SOURCE is not None:
+                    from congregate.migration.github.diff.repodiff import RepoDiffClient as GHRepoDiffClient
+                    from gitlab_ps_utils.string_utils import deobfuscate
                     if SCM_SOURCE is not None:
                         for single_instance in config.list_multiple_source_config(
                                 "github_source"):
@@ -680,6 +719,8 @@ def main():
                 add_post_migration_stats(start, log=log)
 
             if arguments["stitch-results"]:
+                from congregate.helpers.utils import stitch_json_results
+                from congregate.helpers.migrate_utils import write_results_to_file
                 result_type = str(
                     arguments["--result-type"]).rstrip("s") if arguments["--result-type"] else "project"
                 steps = int(arguments["--no-of-files"]
@@ -692,46 +733,58 @@ def main():
                     result_type=result_type, steps=steps, order=order)
                 write_results_to_file(new_results, result_type, log=log)
             if arguments["dump-database"]:
+                from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+                from gitlab_ps_utils.string_utils import convert_to_underscores
                 m = CongregateMongoConnector()
                 for collection in m.db.list_collection_names():
                     print(f"Dumping collection {collection} to file")
                     m.dump_collection_to_file(
                         collection, f"{app_path}/data/{convert_to_underscores(collection)}.json")
             if arguments["reingest"]:
+                from congregate.helpers.congregate_mdbc import CongregateMongoConnector
                 m = CongregateMongoConnector()
                 for asset in arguments["<assets>"]:
                     print(f"Reingesting {asset} into database")
                     m.re_ingest_into_mongo(asset)
             if arguments["clean-database"]:
+                from congregate.helpers.congregate_mdbc import CongregateMongoConnector
                 if not DRY_RUN:
                     m = CongregateMongoConnector()
                     m.clean_db(keys=arguments["--keys"])
                 else:
                     print("\nThis command will drop all collections in the congregate database and then recreate the structure. Please append `--commit` to clean the database")
             if arguments["toggle-maintenance-mode"]:
+                from congregate.helpers.migrate_utils import toggle_maintenance_mode
                 toggle_maintenance_mode(
                     off=arguments["--off"],
                     msg=arguments["--msg"],
                     dest=DEST,
                     dry_run=DRY_RUN)
             if arguments["ldap-group-sync"]:
+                from congregate.cli.ldap_group_sync import LdapGroupSync
                 ldap = LdapGroupSync()
                 ldap.load_pdv(arguments['<file-path>'])
                 ldap.synchronize_groups(dry_run=DRY_RUN)
             if arguments["set-staged-users-public-email"]:
-                users.set_staged_users_public_email(
+                from congregate.migration.gitlab.users import UsersClient
+                UsersClient().set_staged_users_public_email(
                     dry_run=DRY_RUN, hide=arguments["--hide"])
             if arguments["align-user-mapping-emails"]:
-                users.align_user_mapping_emails(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.users import UsersClient
+                UsersClient().align_user_mapping_emails(dry_run=DRY_RUN)
             if arguments["create-staged-projects-structure"]:
-                projects.create_staged_projects_structure(
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().create_staged_projects_structure(
                     dry_run=DRY_RUN, disable_cicd=arguments["--disable-cicd"])
             if arguments["create-staged-projects-fork-relation"]:
-                projects.create_staged_projects_fork_relation(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().create_staged_projects_fork_relation(dry_run=DRY_RUN)
             if arguments["url-rewrite-only"]:
-                projects.perform_url_rewrite_only(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().perform_url_rewrite_only(dry_run=DRY_RUN)
             if arguments["list-staged-projects-contributors"]:
-                projects.list_staged_projects_contributors(dry_run=DRY_RUN)
+                from congregate.migration.gitlab.projects import ProjectsClient
+                ProjectsClient().list_staged_projects_contributors(dry_run=DRY_RUN)
 
 
 if __name__ == "__main__":
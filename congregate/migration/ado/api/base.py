@@ -1,8 +1,8 @@
 from urllib.parse import urljoin
-import requests
 import sys
 
 from congregate.helpers.base_class import BaseClass
+from congregate.helpers.http_session import get_pooled_session
 from gitlab_ps_utils.decorators import stable_retry
 from gitlab_ps_utils.audit_logger import audit_logger
 from gitlab_ps_utils.logger import myLogger
@@ -49,7 +49,7 @@ class AzureDevOpsApiWrapper(BaseClass):
             params['api-version'] = self.config.ado_api_version
         else:
             params = {'api-version': self.config.ado_api_version}
-        return requests.get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_post_request(self, api, data, description=None, params=None):
@@ -74,7 +74,7 @@ class AzureDevOpsApiWrapper(BaseClass):
         else:
             params = {'api-version': self.config.ado_api_version}
 
-        return requests.post(url, params=(params or {}), data=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).post(url, params=(params or {}), data=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_patch_request(self, api, data, description=None):
@@ -92,7 +92,7 @@ class AzureDevOpsApiWrapper(BaseClass):
         url = self.generate_request_url(api)
         audit.info(generate_audit_log_message("PATCH", description, url))
         headers = self._get_headers()
-        return requests.patch(url, data=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).patch(url, data=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_put_request(self, api, data, description=None):
@@ -110,7 +110,7 @@ class AzureDevOpsApiWrapper(BaseClass):
         url = self.generate_request_url(api)
         audit.info(generate_audit_log_message("PUT", description, url))
         headers = self._get_headers()
-        return requests.put(url, data=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).put(url, data=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_delete_request(self, api, description=None):
@@ -127,7 +127,7 @@ class AzureDevOpsApiWrapper(BaseClass):
         url = self.generate_request_url(api)
         audit.info(generate_audit_log_message("DELETE", description, url))
         headers = self._get_headers()
-        return requests.delete(url, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).delete(url, headers=headers, verify=self.config.ssl_verify)
 
     def list_all(self, api, params=None, sub_api=None):
         """
@@ -1,5 +1,5 @@
 from congregate.migration.ado.api.base import AzureDevOpsApiWrapper
-import requests
+from congregate.helpers.http_session import get_pooled_session
 
 
 class PullRequestsApi():
@@ -70,7 +70,7 @@ class PullRequestsApi():
         headers = {
             "Authorization": f"Basic {token}"
         }
-        return requests.get(object_url, headers=headers, stream=True, timeout=15)
+        return get_pooled_session(object_url).get(object_url, headers=headers, stream=True, timeout=15)
 
     def get_all_pull_request_reviewers(self, project_id, repository_id, pull_request_id):
         """
@@ -60,12 +60,15 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
     
     def create(self):
         tree = self.build_ado_project_data()
-        self.build_export(tree, self.project_metadata)
-        filename = self.create_export_tar_gz()
+        # Merge requests and issues are built and written one by one, while the tar.gz is packaged
+        filename = self.build_export_tar_gz(tree, self.project_metadata)
         self.delete_cloned_repo()
         return filename
     
     def build_ado_project_data(self):
+        """
+        Project tree data, with the merge requests and issues as generators
+        """
         return ProjectExport(
             project_members=self.build_project_members(),
             merge_requests=self.build_merge_requests(),
@@ -73,7 +76,6 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
         )
 
     def build_merge_requests(self):
-        merge_requests = []
         for pr in self.pull_requests_api.get_all_pull_requests(self.project_id, self.repository_id):
             # Convert Azure DevOps PR to GitLab MR format
             pr_id = pr['pullRequestId']
@@ -83,7 +85,7 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
             start_sha = merge_request_commits[-1].sha
             target_sha = dig(pr, 'lastMergeSourceCommit', 'commitId')
             merge_request_diffs = self.build_mr_diff_files(start_sha, target_sha)
-            merge_requests.append(MergeRequests(
+            yield MergeRequests(
                 author=Author(name=dig(pr, 'createdBy', 'displayName')),
                 iid=pr_id,
                 source_branch=pr['sourceRefName'].replace("refs/heads/", ""),
@@ -123,8 +125,7 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
                 merge_request_reviewers=self.add_merge_request_reviewers([], pr),
                 label_links=self.add_label_links([], pr),
                 metrics=self.add_metrics(pr)
-            ))
-        return merge_requests
+            )
 
     def build_project_members(self):
         project_members = []
@@ -385,7 +386,6 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
             return None
 
     def build_issues(self):
-        issues = []
         # Work item types that should be mapped to GitLab Issues (project-level)
         issue_types = [
             'user story', 'product backlog item', 'requirement', 'issue', 'bug', 'task', 'impediment',
@@ -411,7 +411,7 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
                         "color": self.work_item_type_color(work_item_type),
                     }
                 })
-                issues.append(Issues(
+                yield Issues(
                     author_id=self.get_new_member_id(author),
                     project_id=1,
                     title=fields.get('System.Title', 'No Title'),
@@ -422,8 +422,7 @@ class AdoExportBuilder(ExportBuilder, BaseAdoExportBuilder):
                     issue_assignees=[{"user_id": self.get_new_member_id(assignee)}],
                     label_links=label_links,
                     work_item_type={"ado": work_item_type},
-                ))
-        return issues
+                )
 
     def build_issue_notes(self, work_item_id):
         notes = []
@@ -4,7 +4,7 @@ from congregate.migration.ado.api.base import AzureDevOpsApiWrapper
 from congregate.migration.ado.base import AzureDevOpsWrapper
 from congregate.migration.ado.api.projects import ProjectsApi
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector, mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
 
 
 class GroupsClient(BaseClass):
@@ -30,20 +30,19 @@ class GroupsClient(BaseClass):
 
     def handle_retrieving_group(self, project, mongo=None):
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         if project:
             count = self.api.get_count(f'{project["id"]}/_apis/git/repositories')
             if count >= 1:
-                mongo.insert_data(
+                mongo.upsert_data(
                     f"groups-{strip_netloc(self.config.source_host)}",
                     self.base_api.format_group(project, mongo))
         else:
             self.log.error("Failed to retrieve project information")
-        mongo.close_connection()
 
 
 @shared_task(name='retrieve-ado-groups')
-@mongo_connection
+@shared_mongo_connection
 def handle_retrieving_ado_groups_task(project, mongo=None):
     grp_client = GroupsClient()
     if project:
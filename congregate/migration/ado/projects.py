@@ -6,7 +6,7 @@ from congregate.migration.ado.api.projects import ProjectsApi
 from congregate.migration.ado.api.repositories import RepositoriesApi
 from congregate.migration.gitlab.api.users import UsersApi
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector, mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
 
 
 class ProjectsClient(BaseClass):
@@ -35,7 +35,7 @@ class ProjectsClient(BaseClass):
 
     def handle_retrieving_project(self, project, mongo=None):
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         if not project:
             self.log.error("Failed to retrieve project information")
             return
@@ -50,12 +50,11 @@ class ProjectsClient(BaseClass):
                 and repository.get("defaultBranch")
             ):
                 formatted_project = self.base_api.format_project(project, repository, count)
-                mongo.insert_data(collection_name, formatted_project)
-        mongo.close_connection()
+                mongo.upsert_data(collection_name, formatted_project)
 
 
 @shared_task(name='retrieve-ado-projects')
-@mongo_connection
+@shared_mongo_connection
 def handle_retrieving_ado_projects_task(project, mongo=None):
     project_client = ProjectsClient()
     project_client.log.info("Handling ADO project via Celery task")
@@ -1,11 +1,10 @@
 from gitlab_ps_utils.misc_utils import strip_netloc
 from celery import shared_task
-from congregate.helpers.congregate_mdbc import mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
 
 from congregate.migration.ado.api.users import UsersApi
 from congregate.migration.ado.base import AzureDevOpsWrapper
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
 
 
 class UsersClient(BaseClass):
@@ -30,23 +29,22 @@ class UsersClient(BaseClass):
 
     def handle_retrieving_user(self, user, mongo=None):
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         if user:
-            mongo.insert_data(
+            mongo.upsert_data(
                 f"users-{strip_netloc(self.config.source_host)}",
                 self.base_api.format_user(user))
         else:
             self.log.error("Failed to retrieve user information")
-        mongo.close_connection()
 
 
 @shared_task(name='retrieve-ado-users')
-@mongo_connection
+@shared_mongo_connection
 def handle_retrieving_ado_users_task(user, mongo=None):
     user_client = UsersClient()
     user_client.log.info("Handling ADO user via Celery task")
     if user:
-        mongo.insert_data(
+        mongo.upsert_data(
             f"users-{strip_netloc(user_client.config.source_host)}",
             user_client.base_api.format_user(user)
         )
@@ -1,10 +1,10 @@
 from time import sleep
 from base64 import b64encode
-import requests
 
 from gitlab_ps_utils.decorators import stable_retry
 from gitlab_ps_utils.misc_utils import generate_audit_log_message
 from congregate.helpers.base_class import BaseClass
+from congregate.helpers.http_session import get_pooled_session
 
 
 class BitBucketServerApi(BaseClass):
@@ -45,7 +45,7 @@ class BitBucketServerApi(BaseClass):
 
         headers = self.generate_v4_request_headers()
 
-        return requests.get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_post_request(self, api, data, url=None, branch_permissions=False, description=None):
@@ -67,7 +67,7 @@ class BitBucketServerApi(BaseClass):
         headers = self.generate_v4_request_headers(
             branch_permissions=branch_permissions)
 
-        return requests.post(url, json=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).post(url, json=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_put_request(self, api, data, url=None, branch_permissions=False, description=None):
@@ -89,7 +89,7 @@ class BitBucketServerApi(BaseClass):
         headers = self.generate_v4_request_headers(
             branch_permissions=branch_permissions)
 
-        return requests.put(url, json=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).put(url, json=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_delete_request(self, api, url=None, branch_permissions=False, description=None):
@@ -109,7 +109,7 @@ class BitBucketServerApi(BaseClass):
         self.audit.info(generate_audit_log_message("DELETE", description, url))
         headers = self.generate_v4_request_headers()
 
-        return requests.delete(url, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).delete(url, headers=headers, verify=self.config.ssl_verify)
 
     def list_all(self, api, params=None, limit=1000, branch_permissions=False):
         isLastPage = False
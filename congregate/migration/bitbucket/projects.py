@@ -4,7 +4,7 @@ from gitlab_ps_utils.misc_utils import strip_netloc, is_error_message_present
 from congregate.helpers.migrate_utils import get_subset_list, check_list_subset_input_file_path
 from congregate.migration.bitbucket.api.projects import ProjectsApi
 from congregate.migration.bitbucket.base import BitBucketServer
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 
 
 class ProjectsClient(BitBucketServer):
@@ -44,10 +44,9 @@ class ProjectsClient(BitBucketServer):
             # mongo should be set to None unless this function is being used in a
             # unit test
             if not mongo:
-                mongo = CongregateMongoConnector()
-            mongo.insert_data(
+                mongo = get_shared_mongo_connector()
+            mongo.upsert_data(
                 f"groups-{strip_netloc(self.config.source_host)}",
                 self.format_project(resp, mongo, skip_archived_projects))
-            mongo.close_connection()
         else:
             self.log.error(resp)
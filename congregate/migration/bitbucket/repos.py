@@ -12,7 +12,7 @@ from congregate.helpers.migrate_utils import get_staged_projects, add_post_migra
 from congregate.helpers.utils import rotate_logs
 from congregate.migration.bitbucket.base import BitBucketServer
 from congregate.migration.bitbucket import constants
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 
 
 class ReposClient(BitBucketServer):
@@ -63,11 +63,10 @@ class ReposClient(BitBucketServer):
 
             # mongo should be set to None unless this function is being used in a unit test
             if not mongo:
-                mongo = CongregateMongoConnector()
-            mongo.insert_data(
+                mongo = get_shared_mongo_connector()
+            mongo.upsert_data(
                 f"projects-{strip_netloc(self.config.source_host)}",
                 self.format_repo(resp, skip_archived_projects))
-            mongo.close_connection()
         else:
             self.log.error(resp)
 
@@ -75,11 +74,10 @@ class ReposClient(BitBucketServer):
         if project := self.list_repo_parent_project(repo_slug, project_key):
             # mongo should be set to None unless this function is being used in a unit test
             if not mongo:
-                mongo = CongregateMongoConnector()
-            mongo.insert_data(
+                mongo = get_shared_mongo_connector()
+            mongo.upsert_data(
                 f"groups-{strip_netloc(self.config.source_host)}",
                 self.format_project(project, mongo, skip_archived_projects))
-            mongo.close_connection()
 
     def list_repo_parent_project(self, repo_slug, project_key):
         try:
@@ -2,7 +2,7 @@ from gitlab_ps_utils.misc_utils import strip_netloc, is_error_message_present
 
 from congregate.migration.bitbucket.api.users import UsersApi
 from congregate.migration.bitbucket.base import BitBucketServer
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 
 
 class UsersClient(BitBucketServer):
@@ -23,11 +23,10 @@ class UsersClient(BitBucketServer):
             # mongo should be set to None unless this function is being used in a
             # unit test
             if not mongo:
-                mongo = CongregateMongoConnector()
+                mongo = get_shared_mongo_connector()
             if formatted_user := self.format_user(user):
-                mongo.insert_data(
+                mongo.upsert_data(
                     f"users-{strip_netloc(self.config.source_host)}",
                     formatted_user)
-            mongo.close_connection()
         else:
             self.log.error(resp)
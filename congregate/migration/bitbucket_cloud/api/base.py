@@ -1,10 +1,10 @@
 from time import sleep
 from base64 import b64encode
-import requests
 
 from gitlab_ps_utils.decorators import stable_retry
 from gitlab_ps_utils.misc_utils import generate_audit_log_message, safe_json_response
 from congregate.helpers.base_class import BaseClass
+from congregate.helpers.http_session import get_pooled_session
 
 
 class BitBucketCloudApi(BaseClass):
@@ -55,7 +55,7 @@ class BitBucketCloudApi(BaseClass):
 
         headers = self.generate_v2_request_headers()
 
-        return requests.get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).get(url, params=(params or {}), headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_post_request(self, api, data, url=None, description=None):
@@ -75,7 +75,7 @@ class BitBucketCloudApi(BaseClass):
         self.audit.info(generate_audit_log_message("POST", description, url))
         headers = self.generate_v2_request_headers()
 
-        return requests.post(url, json=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).post(url, json=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_put_request(self, api, data, url=None, description=None):
@@ -95,7 +95,7 @@ class BitBucketCloudApi(BaseClass):
         self.audit.info(generate_audit_log_message("PUT", description, url))
         headers = self.generate_v2_request_headers()
 
-        return requests.put(url, json=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).put(url, json=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     def generate_delete_request(self, api, url=None, description=None):
@@ -114,7 +114,7 @@ class BitBucketCloudApi(BaseClass):
         self.audit.info(generate_audit_log_message("DELETE", description, url))
         headers = self.generate_v2_request_headers()
 
-        return requests.delete(url, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).delete(url, headers=headers, verify=self.config.ssl_verify)
 
     def list_all(self, api, params=None, limit=1000):
         if not params:
@@ -150,7 +150,7 @@ class BitBucketCloudApi(BaseClass):
             next_url = data.get("next")
             while next_url:
                 self.log.info(f"Following pagination to {next_url}")
-                r = requests.get(next_url, headers=self.generate_v2_request_headers())
+                r = get_pooled_session(next_url).get(next_url, headers=self.generate_v2_request_headers())
                 
                 if r.status_code != 200:
                     self.log.error(f"HTTP Response was NOT 200: {r.status_code} - {r.text}")
@@ -2,7 +2,7 @@ from requests.exceptions import RequestException
 
 from gitlab_ps_utils.misc_utils import strip_netloc, is_error_message_present
 from congregate.migration.bitbucket_cloud.base import BitBucketCloud
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 
 
 class BitbucketCloudReposClient(BitBucketCloud):
@@ -51,13 +51,12 @@ class BitbucketCloudReposClient(BitBucketCloud):
             
             # mongo should be set to None unless this function is being used in a unit test
             if not mongo:
-                mongo = CongregateMongoConnector()
+                mongo = get_shared_mongo_connector()
                 
             # Format and insert the repository
-            mongo.insert_data(
+            mongo.upsert_data(
                 f"projects-{strip_netloc(self.config.source_host)}",
                 self.format_repo(resp)
             )
-            mongo.close_connection()
         else:
             self.log.error(resp)
\ No newline at end of file
@@ -1,15 +1,14 @@
 import json
 import base64
-import re
-from bs4 import BeautifulSoup as bs
 from httpx import Response
-from gitlab_ps_utils.misc_utils import is_error_message_present, pretty_print_key, safe_json_response
+from gitlab_ps_utils.misc_utils import is_error_message_present, safe_json_response
 from gitlab_ps_utils.dict_utils import rewrite_list_into_dict, is_nested_dict, dig, find as nested_find
 from gitlab_ps_utils.jsondiff import Comparator
 from gitlab_ps_utils.json_utils import read_json_file_into_object
 from congregate.helpers.migrate_utils import get_target_project_path, get_full_path_with_parent_namespace
 from congregate.helpers.base_class import BaseClass
 from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.migration.diff.html_report import PagedHtmlReport
 
 b = BaseClass()
 
@@ -145,16 +144,15 @@ class BaseDiffClient(BaseClass):
         """
         mongo = CongregateMongoConnector()
         for diff_col in mongo.wildcard_collection_query("diff_report"):
-            diff = {}
+            filepath = f"{self.app_path}/data/results/{diff_col}.html"
+            self.log.info(f"Writing HTML report to {filepath}")
+            # Entries are rendered as streamed, and the overall accuracy rolled up along the way
+            report = PagedHtmlReport(self, "Project", filepath)
             for d, _ in mongo.stream_collection(diff_col):
-                # if isinstance(d, str):
-                #     diff.update(json.loads(d))
-                # else:
-                diff.update(d)
-            diff["project_migration_results"] = self.calculate_overall_stage_accuracy(
-                diff)
-            self.generate_html_report(
-                "Project", diff, f"/data/results/{diff_col}.html")
+                for k, v in d.items():
+                    report.add(k, v)
+            report.close("project_migration_results",
+                         staged_count=len(self.staged_data))
         mongo.close_connection()
 
     def diff(self, source_data, destination_data,
@@ -567,341 +565,26 @@ class BaseDiffClient(BaseClass):
                     v[field]['accuracy'] = accuracy
 
     def generate_html_report(self, asset, diff, filepath, nested=False):
+        """
+            Write the diff report as an index page, with the overall results,
+            linking pages of diff_report_page_size entries, failed entries first
+        """
         filepath = f"{self.app_path}{filepath}"
         self.log.info(f"Writing HTML report to {filepath}")
-
-        soup = bs(
-            "<html><body><table class = 'content'></table></body></html>", features="lxml")
-        style = soup.new_tag("style")
-        style.content = "table tr th td { border: 1px solid #000 }"
-        soup.html.append(soup.new_tag("head"))
-        soup.html.head.append(style)
-
-        # Separate failed projects from successful ones
-        failed_projects = []
-        successful_projects = []
-        summary_data = None
-
-        # First pass - sort projects into failed and successful
+        report = PagedHtmlReport(self, asset, filepath)
+        summary_key, summary = f"{asset.lower()}_migration_results", None
+        failed, successful = [], []
         for d, v in sorted(diff.items()):
-            if not isinstance(v, dict):
-                p = re.compile('(?<!\\\\)\'')
-                v = json.loads(json.dumps(p.sub('\"', v)))
-            
             if "migration_results" in d:
-                summary_data = (d, v)
-            elif (len(v) <= 50000 or nested is True) and len(v) <= 100000:
-                # Calculate accuracies for problematic fields
-                self.calculate_problematic_fields_accuracy(v)
-                
-                # Check if this is a failure
-                if dig(v, "overall_accuracy", "result") == "failure":
-                    failed_projects.append((d, v))
-                else:
-                    successful_projects.append((d, v))
-
-        # Add summary header and instructions first
-        if summary_data:
-            d, v = summary_data
-            # Create the Summary Header Row
-            summary_header_row = soup.new_tag("tr")
-            summary_cell_header = soup.new_tag("th")
-            summary_cell_header['colspan'] = 3
-            summary_cell_header.string = "Instructions"
-            summary_header_row.append(summary_cell_header)
-            soup.html.body.table.append(summary_header_row)
-            
-            # Create the Summary Data Row
-            summary_data_row = soup.new_tag("tr")
-            summary_cell_data = soup.new_tag("td")
-            summary_cell_data['colspan'] = 3
-            summary_cell_data.string = self.SUMMARY
-            summary_data_row.append(summary_cell_data)
-            soup.html.body.table.append(summary_data_row)
-
-            # Add the filter button row
-            filter_row = soup.new_tag("tr")
-            filter_cell = soup.new_tag("td")
-            filter_cell['colspan'] = 3
-            filter_button = soup.new_tag("button", id="filterButton", onclick="toggleBasicStatsMismatch()", **{'data-showMismatch':'false'})
-            filter_button.string = "Show Categories Only"
-            filter_cell.append(filter_button)
-            filter_row.append(filter_cell)
-            soup.html.body.table.append(filter_row)
-
-            # Add overall results header with correct color
-            overall_results_header_row = soup.new_tag("tr")
-            diff_headers = [pretty_print_key(d), "Overall Accuracy", "Result"]
-            for diff_header in diff_headers:
-                diff_cell_header = soup.new_tag("th")
-                diff_cell_header.string = diff_header
-                overall_results_header_row.append(diff_cell_header)
-            
-            # Set background color based on result
-            if v.get("result") == "failure":
-                overall_results_header_row['bgcolor'] = self.HEX_FAIL
+                summary_key, summary = d, v
+            elif isinstance(v, dict) and dig(v, "overall_accuracy", "result") == "failure":
+                failed.append(d)
             else:
-                overall_results_header_row['bgcolor'] = self.HEX_SUCCESS
-                
-            soup.html.body.table.append(overall_results_header_row)
-            
-            # Add overall results data with correct counts
-            overall_results_data_row = soup.new_tag("tr")
-            
-            # Count only truly successful projects
-            successful_count = len([x for x in diff.items() if 
-                                isinstance(x[1], dict) and 
-                                dig(x[1], "overall_accuracy", "result") == "success" and
-                                "error" not in x[1] and
-                                "migration_results" not in x[0]])
-            total_count = len([x for x in diff.items() if 
-                            isinstance(x[1], dict) and 
-                            "error" not in x[1] and 
-                            "migration_results" not in x[0]])
-
-            data = [
-                f"Staged {asset}'s: '{len(self.staged_data)}' Successful {asset}'s: '{successful_count}'",
-                str(self.as_percentage(v.get("overall_accuracy", 0))),
-                v.get("result", "failure")
-            ]
-            for da in data:
-                cell_data = soup.new_tag("td")
-                cell_data.string = da if da else ""
-                overall_results_data_row.append(cell_data)
-            soup.html.body.table.append(overall_results_data_row)
-        
-        # Add a header for failed projects section with count
-        if failed_projects:
-            failed_header_row = soup.new_tag("tr")
-            failed_header = soup.new_tag("th")
-            failed_header['colspan'] = 3
-            failed_header['bgcolor'] = self.HEX_FAIL
-            total_projects = len(failed_projects) + len(successful_projects)
-            failed_header.string = f"Failed Projects ({len(failed_projects)}/{total_projects})"
-            failed_header_row.append(failed_header)
-            soup.html.body.table.append(failed_header_row)
-
-        # Add failed projects (with details expanded)
-        for d, v in failed_projects:
-            self.add_project_to_report(soup, d, v, asset, True)  # True = expand details
-
-        # Add a header for successful projects section with count
-        if successful_projects:
-            success_header_row = soup.new_tag("tr")
-            success_header = soup.new_tag("th")
-            success_header['colspan'] = 3
-            success_header['bgcolor'] = self.HEX_SUCCESS
-            total_projects = len(failed_projects) + len(successful_projects)
-            success_header.string = f"Successful Projects ({len(successful_projects)}/{total_projects})"
-            success_header_row.append(success_header)
-            soup.html.body.table.append(success_header_row)
-        
-        # Add successful projects (with details collapsed)
-        for d, v in successful_projects:
-            self.add_project_to_report(soup, d, v, asset, False)  # False = collapse details
-
-        # Add JavaScript for show/hide functionality
-        head = soup.new_tag("head")
-        script = soup.new_tag("script")
-        
-        # Extend the existing script with project-specific toggle function
-        script_content = self.SCRIPT
-        project_toggle_function = """
-            function toggleProjectDetails(projectId) {
-                var detailsDiv = document.getElementById('details-' + projectId);
-                var button = document.getElementById('toggle-' + projectId);
-                
-                if (detailsDiv.style.display === "none") {
-                    detailsDiv.style.display = "block";
-                    button.innerHTML = "Hide Details";
-                } else {
-                    detailsDiv.style.display = "none";
-                    button.innerHTML = "Show Details";
-                }
-            }
-        """
-        script.string = script_content + project_toggle_function
-        
-        style = soup.new_tag("style")
-        style.string = self.STYLE
-        head.append(script)
-        head.append(style)
-        soup.html.append(head)
-        
-        with open(filepath, "wb") as f:
-            f.write(soup.prettify().encode())
-
-    def add_project_to_report(self, soup, project_name, project_data, asset_type, expand_details=False):
-        """
-        Add a project to the HTML report with optional details expansion
-        
-        Args:
-            soup: BeautifulSoup object
-            project_name: Name of the project
-            project_data: Project data dictionary
-            asset_type: Type of asset (e.g., "Project")
-            expand_details: Whether to expand details by default
-        """
-        # Check for basic stats mismatches
-        basic_stats_mismatch = False
-        for field in self.PROBLEMATIC_FIELDS:
-            accuracy = dig(project_data, field, 'accuracy')
-            if accuracy is not None and accuracy < 1.0:
-                basic_stats_mismatch = True
-                break
-
-        # Generate a unique ID for this project
-        project_id = re.sub(r'[^a-zA-Z0-9]', '-', project_name)
-        
-        # Creating project row header
-        project_row = soup.new_tag("tr")
-        if basic_stats_mismatch:
-            project_row['class'] = 'project-row basic-stats-mismatch'
-        else:
-            project_row['class'] = 'project-row'
-        
-        # Project name cell with show/hide button
-        name_cell = soup.new_tag("td")
-        name_cell.string = project_name
-        
-        # Accuracy cell
-        accuracy_cell = soup.new_tag("td")
-        accuracy_cell.string = str(self.as_percentage(dig(project_data, "overall_accuracy", "accuracy")))
-        
-        # Result cell with toggle button
-        result_cell = soup.new_tag("td")
-        overall_accuracy = project_data.get("overall_accuracy")
-
-        # Handle both data structure formats
-        if isinstance(overall_accuracy, dict):
-            result = overall_accuracy.get("result")
-        else:
-            # If overall_accuracy is not a dict, look for result at the same level
-            result = project_data.get("result")
-
-        result_cell.string = (result or "unknown") + " "
-
-        # Add show/hide button
-        toggle_button = soup.new_tag("button")
-        toggle_button['id'] = f"toggle-{project_id}"
-        toggle_button['onclick'] = f"toggleProjectDetails('{project_id}')"
-        toggle_button.string = "Hide Details" if expand_details else "Show Details"
-        result_cell.append(toggle_button)
-        
-        # Set background color based on result
-        if result == "failure":
-            project_row['bgcolor'] = self.HEX_FAIL
-        else:
-            project_row['bgcolor'] = self.HEX_SUCCESS
-        
-        # Add cells to row
-        project_row.append(name_cell)
-        project_row.append(accuracy_cell)
-        project_row.append(result_cell)
-        
-        # Add row to table
-        soup.html.body.table.append(project_row)
-        
-        # Create details div
-        details_row = soup.new_tag("tr")
-        if basic_stats_mismatch:
-            details_row['class'] = 'project-row basic-stats-mismatch'
-        else:
-            details_row['class'] = 'project-row'
-        
-        details_cell = soup.new_tag("td")
-        details_cell['colspan'] = 3
-        
-        details_div = soup.new_tag("div")
-        details_div['id'] = f"details-{project_id}"
-        if not expand_details:
-            details_div['style'] = "display: none;"
-        
-        # Create details table
-        details_table = soup.new_tag("table")
-        details_table['width'] = "100%"
-        
-        # Add table headers
-        header_row = soup.new_tag("tr")
-        headers = ["Endpoint", "Accuracy", "Diff"]
-        
-        for header_text in headers:
-            header = soup.new_tag("th")
-            header.string = header_text
-            header_row.append(header)
-        
-        details_table.append(header_row)
-        
-        # Add endpoint rows
-        for endpoint in project_data:
-            if endpoint not in ["overall_accuracy", "error"] and 'total' not in endpoint.lower():
-                endpoint_row = soup.new_tag("tr")
-                data = [
-                    endpoint,
-                    str(self.as_percentage(dig(project_data, endpoint, 'accuracy'))),
-                    dig(project_data, endpoint, 'diff')
-                ]
-            elif "overall_accuracy" in endpoint:
-                continue  # Skip overall accuracy
-            elif "error" in endpoint:
-                endpoint_row = soup.new_tag("tr")
-                data = [
-                    "Error",
-                    "N/A",
-                    dig(project_data, endpoint, 'error')
-                ]
-            elif "total" in endpoint.lower():
-                endpoint_row = soup.new_tag("tr")
-                data = [
-                    endpoint,
-                    str(self.as_percentage(dig(project_data, endpoint, 'accuracy'))),
-                    [f"source: {dig(project_data, endpoint, 'source')}", 
-                    f"destination: {dig(project_data, endpoint, 'destination')}"]
-                ]
-            else:
-                continue  # Skip if doesn't match any category
-            
-            # Add the data to the row
-            for item in data:
-                cell = soup.new_tag("td")
-                if isinstance(item, dict):
-                    # Add show/hide button for JSON
-                    button = soup.new_tag("button")
-                    button['class'] = "accordion"
-                    button_id = f"{endpoint}-{project_id}"
-                    button['id'] = f"{button_id}-showhide"
-                    button.string = "show/hide"
-                    cell.append(button)
-                    
-                    # Add JSON content
-                    json_pre = soup.new_tag("pre")
-                    json_pre['class'] = "accordion-content"
-                    json_pre['id'] = "json"
-                    json_pre.string = json.dumps(item, indent=4)
-                    cell.append(json_pre)
-                elif isinstance(item, list):
-                    # Add list items as paragraphs
-                    for list_item in item:
-                        p = soup.new_tag("p")
-                        p.string = list_item
-                        cell.append(p)
-                else:
-                    # Add simple text
-                    cell.string = item if item else ""
-                
-                endpoint_row.append(cell)
-            
-            details_table.append(endpoint_row)
-        
-        # Add the table to the div
-        details_div.append(details_table)
-        
-        # Add the div to the cell and the cell to the row
-        details_cell.append(details_div)
-        details_row.append(details_cell)
-        
-        # Add the details row to the table
-        soup.html.body.table.append(details_row)
+                successful.append(d)
+        for d in failed + successful:
+            report.add(d, diff[d], nested=nested)
+        report.close(summary_key, summary if isinstance(summary, dict) else None,
+                     len(self.staged_data))
 
     def asset_exists(self, endpoint, identifier):
         if identifier:
@@ -0,0 +1,106 @@
+"""
+Mongo cache of diff results, per asset and endpoint, keyed on change markers of the asset.
+
+A change marker is the source and destination last_activity_at and updated_at of an asset,
+plus a hash of both (source and destination) asset responses.
+While the marker is unchanged, and the cached result is fresher than diff_cache_ttl hours,
+the cached successful endpoint diffs are reused instead of fetched and compared again.
+Callers only cache endpoints whose changes bump the marker, e.g. not settings or membership.
+"""
+import json
+from os import getpid
+from time import time
+from hashlib import sha256
+from pymongo import UpdateOne, errors
+from gitlab_ps_utils.dict_utils import dig
+
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
+
+
+def get_change_marker(source, destination):
+    """
+        :param source: (dict) Source asset e.g. GET /projects/:id response
+        :param destination: (dict) Destination asset
+        :return: (dict) Change marker of the asset, or None when either asset is missing
+    """
+    if not isinstance(source, dict) or not isinstance(destination, dict):
+        return None
+    return {
+        "source_changed_at": [source.get("last_activity_at"), source.get("updated_at")],
+        "destination_changed_at": [destination.get("last_activity_at"), destination.get("updated_at")],
+        "content_hash": sha256(json.dumps([source, destination], sort_keys=True, default=str).encode()).hexdigest()
+    }
+
+
+def is_successful_diff(diff):
+    """
+        Only successful diffs are cached, so failing endpoints are validated again on the next run
+    """
+    return isinstance(diff, dict) and dig(diff, "accuracy", default=0) == 1
+
+
+class DiffCache():
+    COLLECTION = "diff_cache"
+
+    def __init__(self, mongo, asset_type, ttl):
+        """
+            :param mongo: (CongregateMongoConnector) Mongo connection
+            :param asset_type: (str) e.g. project
+            :param ttl: (int) Max age of the cached diffs in hours
+        """
+        self.mongo = mongo
+        self.asset_type = asset_type
+        self.ttl = ttl
+        self.mongo.db[self.COLLECTION].create_index(
+            [("asset_type", 1), ("asset", 1), ("endpoint", 1)], unique=True)
+
+    def load(self, asset, marker):
+        """
+            :return: (dict) Cached diffs of the asset by endpoint, matching the change marker
+        """
+        if not marker:
+            return {}
+        try:
+            return {
+                d["endpoint"]: json.loads(d["diff"]) for d in self.mongo.db[self.COLLECTION].find({
+                    "asset_type": self.asset_type,
+                    "asset": asset,
+                    "cached_at": {"$gte": time() - self.ttl * 3600},
+                    **marker
+                })
+            }
+        except errors.PyMongoError as e:
+            self.mongo.log.warning(f"Failed to load cached diffs of {asset}, due to {e}")
+            return {}
+
+    def save(self, asset, marker, diffs):
+        """
+            Cache the successful endpoint diffs of an asset, replacing any with an older marker
+
+            :param diffs: (dict) Diffs by endpoint
+        """
+        if not marker:
+            return
+        cached_at = time()
+        ops = [UpdateOne(
+            {"asset_type": self.asset_type, "asset": asset, "endpoint": endpoint},
+            {"$set": {"cached_at": cached_at, "diff": json.dumps(diff), **marker}},
+            upsert=True) for endpoint, diff in diffs.items() if is_successful_diff(diff)]
+        try:
+            if ops:
+                self.mongo.db[self.COLLECTION].bulk_write(ops, ordered=False)
+        except errors.PyMongoError as e:
+            self.mongo.log.warning(f"Failed to cache diffs of {asset}, due to {e}")
+
+
+_caches = {}
+
+
+def get_diff_cache(asset_type, ttl):
+    '''
+        Returns the DiffCache of an asset type for this process, on the process-wide Mongo connection
+    '''
+    key = (getpid(), asset_type)
+    if key not in _caches:
+        _caches[key] = DiffCache(get_shared_mongo_connector(), asset_type, ttl)
+    return _caches[key]
@@ -0,0 +1,209 @@
+"""
+Paginated diff HTML report, written incrementally from string templates.
+
+Entries are rendered as they are iterated (e.g. straight from a Mongo cursor) into pages of
+diff_report_page_size entries. Only the per-page rollups are kept in memory,
+for the index page written last, with the overall accuracy and a link to each page.
+"""
+import os
+import re
+import json
+from html import escape
+
+from gitlab_ps_utils.dict_utils import dig
+from gitlab_ps_utils.misc_utils import pretty_print_key
+
+PROJECT_TOGGLE_SCRIPT = """
+    function toggleProjectDetails(projectId) {
+        var detailsDiv = document.getElementById('details-' + projectId);
+        var button = document.getElementById('toggle-' + projectId);
+
+        if (detailsDiv.style.display === "none") {
+            detailsDiv.style.display = "block";
+            button.innerHTML = "Hide Details";
+        } else {
+            detailsDiv.style.display = "none";
+            button.innerHTML = "Show Details";
+        }
+    }
+"""
+
+
+class PagedHtmlReport():
+    def __init__(self, client, asset, filepath):
+        """
+            :param client: (BaseDiffClient) Diff client, for its styles and accuracy helpers
+            :param asset: (str) Project, Group or User
+            :param filepath: (str) Index page path. Pages are written next to it as <name>-page-<n>.html
+        """
+        self.client = client
+        self.asset = asset
+        self.filepath = filepath
+        self.page_size = max(client.config.diff_report_page_size, 1)
+        self.page = None
+        self.pages = []
+        # Overall stage accuracy rollup, as calculate_overall_stage_accuracy
+        self.keys = 0
+        self.accuracy_sum = 0
+        self.failed = False
+        self.broken = False
+        # Successful and total entries, without errors
+        self.successful = 0
+        self.total = 0
+
+    def page_path(self, number):
+        base, ext = os.path.splitext(self.filepath)
+        return f"{base}-page-{number}{ext}"
+
+    def add(self, name, data, nested=False):
+        """
+            Render an entry of the diff report into the current page, starting a new one when full.
+            Failed entries are rendered with their details expanded.
+        """
+        self.add_to_rollup(name, data)
+        if not isinstance(data, dict):
+            p = re.compile('(?<!\\\\)\'')
+            data = json.loads(json.dumps(p.sub('\"', data)))
+        if not ((len(data) <= 50000 or nested is True) and len(data) <= 100000):
+            return
+        # Calculate accuracies for problematic fields
+        self.client.calculate_problematic_fields_accuracy(data)
+        if self.page is None or self.page["count"] >= self.page_size:
+            self.start_page()
+        failed = dig(data, "overall_accuracy", "result") == "failure"
+        self.page["file"].write(self.render_entry(name, data, failed))
+        self.page["count"] += 1
+        self.page["failed"] += int(failed)
+        self.page["accuracy_sum"] += self.get_accuracy(data)
+        self.page["first"] = self.page["first"] or name
+        self.page["last"] = name
+
+    def add_to_rollup(self, name, data):
+        self.keys += 1
+        if isinstance(data, dict) and "error" not in data:
+            self.total += 1
+            if dig(data, "overall_accuracy", "result") == "success":
+                self.successful += 1
+        if self.broken:
+            return
+        if name in ["/projects/:id", "/groups/:id"] and dig(data, "accuracy", default=0) == 0:
+            self.failed = self.broken = True
+            self.accuracy_sum = 0
+            return
+        accuracy = dig(data, "overall_accuracy", "accuracy", default=0) if isinstance(data, dict) else 0
+        self.accuracy_sum += accuracy
+        if accuracy == 0:
+            self.failed = True
+
+    def get_stage_accuracy(self):
+        return {
+            "overall_accuracy": self.accuracy_sum / self.keys if self.keys else 1,
+            "result": "failure" if self.failed else "success"
+        }
+
+    def get_accuracy(self, data):
+        accuracy = dig(data, "overall_accuracy", "accuracy", default=0)
+        return accuracy if isinstance(accuracy, (int, float)) else 0
+
+    def start_page(self):
+        self.end_page()
+        number = len(self.pages) + 1
+        path = self.page_path(number)
+        self.page = {"number": number, "path": path, "file": open(path, "w", encoding="utf-8"),
+                     "count": 0, "failed": 0, "accuracy_sum": 0, "first": None, "last": None}
+        self.page["file"].write(
+            f"{self.render_head(f'{self.asset} diff report - page {number}')}<body><table class='content'>"
+            f"<tr><th colspan='3'><a href='{escape(os.path.basename(self.filepath))}'>Index</a> - Page {number}</th></tr>"
+            "<tr><td colspan='3'><button id='filterButton' onclick='toggleBasicStatsMismatch()' data-showMismatch='false'>"
+            "Show Categories Only</button></td></tr>"
+            f"<tr><th>{escape(self.asset)}</th><th>Overall Accuracy</th><th>Result</th></tr>\n")
+
+    def end_page(self):
+        if self.page:
+            self.page["file"].write("</table></body></html>\n")
+            self.page["file"].close()
+            del self.page["file"]
+            self.pages.append(self.page)
+            self.page = None
+
+    def close(self, summary_key, summary=None, staged_count=0):
+        """
+            Write the last page and the index page
+
+            :param summary_key: (str) Overall results key e.g. project_migration_results
+            :param summary: (dict) Overall results, or None to use the accuracy rolled up from the entries
+            :param staged_count: (int) Number of staged assets
+        """
+        self.end_page()
+        summary = summary or self.get_stage_accuracy()
+        result = summary.get("result", "failure")
+        color = self.client.HEX_FAIL if result == "failure" else self.client.HEX_SUCCESS
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            f.write(
+                f"{self.render_head(f'{self.asset} diff report')}<body><table class='content'>"
+                "<tr><th colspan='5'>Instructions</th></tr>"
+                f"<tr><td colspan='5'>{escape(self.client.SUMMARY)}</td></tr>"
+                f"<tr bgcolor='{color}'><th colspan='3'>{escape(pretty_print_key(summary_key))}</th>"
+                "<th>Overall Accuracy</th><th>Result</th></tr>"
+                f"<tr><td colspan='3'>Staged {escape(self.asset)}'s: '{staged_count}' "
+                f"Successful {escape(self.asset)}'s: '{self.successful}' (of {self.total})</td>"
+                f"<td>{self.client.as_percentage(summary.get('overall_accuracy', 0))}</td><td>{escape(str(result))}</td></tr>"
+                "<tr><th>Page</th><th>Entries</th><th>Count</th><th>Failed</th><th>Accuracy</th></tr>\n")
+            for page in self.pages:
+                color = self.client.HEX_FAIL if page["failed"] else self.client.HEX_SUCCESS
+                f.write(
+                    f"<tr bgcolor='{color}'><td><a href='{escape(os.path.basename(page['path']))}'>Page {page['number']}</a></td>"
+                    f"<td>{escape(page['first'])} - {escape(page['last'])}</td><td>{page['count']}</td>"
+                    f"<td>{page['failed']}</td><td>{self.client.as_percentage(page['accuracy_sum'] / page['count'])}</td></tr>\n")
+            f.write("</table></body></html>\n")
+
+    def render_head(self, title):
+        return (f"<html><head><title>{escape(title)}</title>"
+                f"<script>{self.client.SCRIPT}{PROJECT_TOGGLE_SCRIPT}</script>"
+                f"<style>{self.client.STYLE}</style></head>")
+
+    def render_entry(self, name, data, expand_details=False):
+        # Check for basic stats mismatches
+        mismatch = any(accuracy is not None and accuracy < 1.0 for accuracy in (
+            dig(data, field, "accuracy") for field in self.client.PROBLEMATIC_FIELDS))
+        row_class = "project-row basic-stats-mismatch" if mismatch else "project-row"
+        entry_id = escape(re.sub(r'[^a-zA-Z0-9]', '-', name))
+        overall_accuracy = data.get("overall_accuracy")
+        # Handle both data structure formats
+        result = overall_accuracy.get("result") if isinstance(
+            overall_accuracy, dict) else data.get("result")
+        color = self.client.HEX_FAIL if result == "failure" else self.client.HEX_SUCCESS
+        style = "" if expand_details else " style='display: none;'"
+        rows = [
+            f"<tr class='{row_class}' bgcolor='{color}'><td>{escape(name)}</td>"
+            f"<td>{self.client.as_percentage(dig(data, 'overall_accuracy', 'accuracy'))}</td>"
+            f"<td>{escape(result or 'unknown')} <button id='toggle-{entry_id}' onclick=\"toggleProjectDetails('{entry_id}')\">"
+            f"{'Hide Details' if expand_details else 'Show Details'}</button></td></tr>",
+            f"<tr class='{row_class}'><td colspan='3'><div id='details-{entry_id}'"
+            f"{style}><table width='100%'>"
+            "<tr><th>Endpoint</th><th>Accuracy</th><th>Diff</th></tr>"
+        ]
+        for endpoint in data:
+            if endpoint == "overall_accuracy":
+                continue
+            if endpoint == "error":
+                cells = ["Error", "N/A", dig(data, endpoint, "error")]
+            elif "total" in endpoint.lower():
+                cells = [endpoint, self.client.as_percentage(dig(data, endpoint, "accuracy")),
+                         [f"source: {dig(data, endpoint, 'source')}", f"destination: {dig(data, endpoint, 'destination')}"]]
+            else:
+                cells = [endpoint, self.client.as_percentage(
+                    dig(data, endpoint, "accuracy")), dig(data, endpoint, "diff")]
+            rows.append(
+                f"<tr>{''.join(self.render_cell(c, f'{endpoint}-{entry_id}') for c in cells)}</tr>")
+        rows.append("</table></div></td></tr>\n")
+        return "".join(rows)
+
+    def render_cell(self, item, button_id):
+        if isinstance(item, dict):
+            # Show/hide button for JSON
+            return (f"<td><button class='accordion' id='{escape(button_id)}-showhide'>show/hide</button>"
+                    f"<pre class='accordion-content' id='json'>{escape(json.dumps(item, indent=4))}</pre></td>")
+        if isinstance(item, list):
+            return f"<td>{''.join(f'<p>{escape(str(i))}</p>' for i in item)}</td>"
+        return f"<td>{escape(str(item)) if item else ''}</td>"
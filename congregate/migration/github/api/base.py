@@ -1,4 +1,6 @@
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qs, urlencode
 from gitlab_ps_utils.decorators import stable_retry, token_rotate
 from gitlab_ps_utils.audit_logger import audit_logger
 from gitlab_ps_utils.logger import myLogger
@@ -7,6 +9,7 @@ from gitlab_ps_utils.misc_utils import generate_audit_log_message, safe_json_res
 from congregate.helpers.utils import is_github_dot_com
 from congregate.helpers.base_class import BaseClass
 from congregate.helpers.conf import Config
+from congregate.helpers.http_session import get_pooled_session
 
 base = BaseClass()
 
@@ -102,7 +105,7 @@ class GitHubApi():
         headers = self.generate_v3_request_header(self.token)
         if params is None:
             params = {}
-        return requests.get(url, params=params, headers=headers,
+        return get_pooled_session(url).get(url, params=params, headers=headers,
                             verify=self.config.ssl_verify)
 
     @stable_retry
@@ -118,7 +121,7 @@ class GitHubApi():
         auth = self.generate_v3_basic_auth(username, password)
         if params is None:
             params = {}
-        return requests.get(url, params=params, headers=headers,
+        return get_pooled_session(url).get(url, params=params, headers=headers,
                             verify=self.config.ssl_verify, auth=auth)
 
     @stable_retry
@@ -132,7 +135,7 @@ class GitHubApi():
         if header is None:
             headers = self.generate_v3_basic_auth_request_header()
         auth = self.generate_v3_basic_auth(username, password)
-        return requests.post(url, json=data, headers=headers,
+        return get_pooled_session(url).post(url, json=data, headers=headers,
                              verify=self.config.ssl_verify, auth=auth)
 
     @stable_retry
@@ -146,7 +149,7 @@ class GitHubApi():
         audit.info(generate_audit_log_message("POST", description, url))
         if headers is None:
             headers = self.generate_v3_request_header(self.token)
-        return requests.post(url, json=data, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).post(url, json=data, headers=headers, verify=self.config.ssl_verify)
 
     @stable_retry
     @token_rotate
@@ -161,7 +164,7 @@ class GitHubApi():
         }
         if variables:
             payload['variables'] = variables
-        return requests.post(url, json=payload, headers=headers, verify=self.config.ssl_verify)
+        return get_pooled_session(url).post(url, json=payload, headers=headers, verify=self.config.ssl_verify)
 
 
     @stable_retry
@@ -175,7 +178,7 @@ class GitHubApi():
         audit.info(generate_audit_log_message("PATCH", description, url))
         if headers is None:
             headers = self.generate_v3_request_header(self.token)
-        return requests.patch(url, json=data, headers=headers,
+        return get_pooled_session(url).patch(url, json=data, headers=headers,
                               verify=self.config.ssl_verify)
 
     def replace_unwanted_characters(self, s):
@@ -219,6 +222,7 @@ class GitHubApi():
         """
         url = self.generate_v3_request_url(host, api)
         lastPage = False
+        firstPage = True
         while lastPage is not True:
             if not params:
                 params = {
@@ -239,6 +243,11 @@ class GitHubApi():
                 yield (resp_json, True) if page_check else resp_json
             if resp_json and r.headers.get("Link", None):
                 h = self.create_dict_from_headers(r.headers['Link'])
+                if firstPage and (last_page := self.get_last_page(h)) and self.config.github_list_concurrency > 1:
+                    yield from self.list_prefetched_pages(
+                        host, api, resp_json, h["last"], last_page, page_check=page_check)
+                    break
+                firstPage = False
                 if h.get('next', None):
                     url = h['next']
                     yield from self.pageless_data(resp_json, page_check=page_check, lastPage=lastPage)
@@ -257,6 +266,79 @@ class GitHubApi():
                 lastPage = True
                 yield from self.pageless_data(resp_json, page_check=page_check, lastPage=lastPage)
 
+    def get_last_page(self, links):
+        """
+        Return the page number of the rel="last" link, or None for cursor (e.g. since) based pagination
+        """
+        if (last := links.get("last")) and (page := parse_qs(urlsplit(last).query).get("page")):
+            return int(page[0])
+        return None
+
+    def generate_page_url(self, url, page):
+        """
+        Replace the page query parameter of a Link header URL
+        """
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        query["page"] = [str(page)]
+        return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+    def list_prefetched_pages(self, host, api, first_page, last_url, last_page, page_check=False):
+        """
+        Fetch the pages following the first one concurrently, up to github_list_concurrency pages ahead,
+        and yield their data in order
+
+        :param first_page: (list) Data of the first page
+        :param last_url: (str) The rel="last" URL of the first page Link header
+        :param last_page: (int) The last page number
+
+        :yields: Individual objects from the presumed array of data
+        """
+        window = self.config.github_list_concurrency
+        yield from self.pageless_data(first_page, page_check=page_check)
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            pages = deque()
+            next_page = 2
+            while pages or next_page <= last_page:
+                while next_page <= last_page and len(pages) < window:
+                    url = self.generate_page_url(last_url, next_page)
+                    log.info(f"Listing {host} endpoint: {url}")
+                    pages.append(executor.submit(
+                        self.generate_v3_get_request, host, api, url))
+                    next_page += 1
+                r = pages.popleft().result()
+                if r.status_code >= 400:
+                    log.error(
+                        f"\nERROR: HTTP Response was {r.status_code}.\nBody Text: '{r.text}'")
+                    break
+                resp_json = safe_json_response(r) or []
+                if pages or next_page <= last_page:
+                    yield from self.pageless_data(resp_json, page_check=page_check)
+                else:
+                    for i, data in enumerate(resp_json):
+                        yield (data, i == len(resp_json) - 1) if page_check else data
+
+    def get_paged_total_count(self, host, api, params=None, limit=100):
+        """
+        Derive the total count of records from the rel="last" page number and the last page length,
+        instead of listing every page
+
+        :returns: Total number of records, or None when the endpoint does not expose its last page
+        """
+        params = dict(params or {}, per_page=limit)
+        r = self.generate_v3_get_request(host, api, params=params)
+        if r.status_code != 200:
+            return None
+        links = self.create_dict_from_headers(
+            r.headers["Link"]) if r.headers.get("Link") else {}
+        if not (last_page := self.get_last_page(links)):
+            resp_json = safe_json_response(r)
+            return len(resp_json) if isinstance(resp_json, list) and "next" not in links else None
+        last = self.generate_v3_get_request(host, api, links["last"])
+        if last.status_code != 200:
+            return None
+        return (last_page - 1) * limit + len(safe_json_response(last) or [])
+
     def get_total_count(self, host, api, params=None,
                         limit=100, page_check=False):
         """
@@ -270,6 +352,10 @@ class GitHubApi():
 
         :returns: Total number of records related to that API call
         """
+        # Issues include pull requests, which have to be filtered out one by one
+        if "issues" not in api and (count := self.get_paged_total_count(host, api, params=params, limit=limit)) is not None:
+            log.info(f"Total count for {host} endpoint {api}: {count}")
+            return count
         uniq = {}
         for data in self.list_all(
                 host, api, params=params, limit=limit, page_check=page_check):
@@ -2,7 +2,7 @@ from gitlab_ps_utils.misc_utils import safe_json_response, is_error_message_pres
 from gitlab_ps_utils.dict_utils import dig
 
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 from congregate.helpers.utils import is_github_dot_com
 from congregate.migration.github.api.orgs import OrgsApi
 from congregate.migration.github.api.teams import TeamsApi
@@ -51,12 +51,11 @@ class OrgsClient(BaseClass):
             self.handle_org_retrieval, orgs, groups, processes=processes, nestable=True)
 
     def handle_org_retrieval(self, groups, org):
-        mongoclient = CongregateMongoConnector()
+        mongoclient = get_shared_mongo_connector()
         self.add_org_as_group(groups, org["data"]["organization"]["login"], mongoclient)
         for team in self.orgs_api.get_all_org_teams_v4(org["data"]["organization"]["login"]):
             self.add_team_as_subgroup(
                 org, team, mongoclient)
-        mongoclient.close_connection()
 
     def add_org_as_group(self, groups, org_name, mongo):
         org = safe_json_response(self.orgs_api.get_org_v4(org_name))
@@ -70,14 +69,14 @@ class OrgsClient(BaseClass):
                     org_name):
                 org_repo['owner']['id'] = org["data"]["organization"]["databaseId"]
                 formatted_repo = self.repos.format_repo(org_repo, mongo)
-                mongo.insert_data(
+                mongo.upsert_data(
                     f"projects-{self.host}", formatted_repo)
-                formatted_repo.pop("_id")
+                formatted_repo.pop("_id", None)
                 formatted_repo["members"] = []
                 # Save all org repos ID references as part of group metadata
                 org_repos.append(formatted_repo.get("id"))
             members = self.add_org_members([], org, mongo)
-            mongo.insert_data(f"groups-{self.host}", {
+            mongo.upsert_data(f"groups-{self.host}", {
                 "name": org["data"]["organization"]["login"],
                 "id": org["data"]["organization"]["databaseId"],
                 "path": org["data"]["organization"]["login"],
@@ -101,7 +100,7 @@ class OrgsClient(BaseClass):
             if self.get_team_full_path(org_name, team):
                 for team_repo in self.teams_api.get_team_repos_v4(org_name, team["slug"]):
                     formatted_repo = self.repos.format_repo(team_repo, mongo)
-                    mongo.insert_data(
+                    mongo.upsert_data(
                         f"projects-{self.host}", formatted_repo)
                     # TODO: Actually add teams as subgroups to "groups-" in mongo?
 
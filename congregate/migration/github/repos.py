@@ -5,7 +5,7 @@ from gitlab_ps_utils.json_utils import json_pretty
 from gitlab_ps_utils.dict_utils import dig
 
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 from congregate.migration.github.api.repos import ReposApi
 from congregate.migration.github.users import UsersClient
 from congregate.migration.github.api.users import UsersApi
@@ -74,10 +74,9 @@ class ReposClient(BaseClass):
 
     def handle_retrieving_repos(self, repo, mongo=None):
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         data = self.format_repo(repo, mongo)
-        mongo.insert_data(f"projects-{self.host}", data)
-        mongo.close_connection()
+        mongo.upsert_data(f"projects-{self.host}", data)
 
     def format_repo(self, repo, mongo, org=False):
         """
@@ -432,7 +431,7 @@ class ReposClient(BaseClass):
         return user_emails_dict.values()
 
     def handle_list_of_reviewers(self, owner, repo, user_emails_dict, pull):
-        mongo = CongregateMongoConnector()
+        mongo = get_shared_mongo_connector()
         if reviewers := safe_json_response(
             self.repos_api.list_reviewers_for_a_pull_request(
                 owner, repo, pull["number"])):
@@ -442,4 +441,3 @@ class ReposClient(BaseClass):
                     if email := self.users.get_email_address(
                             single_user, None, mongo):
                         user_emails_dict[user['login']] = email
-        mongo.close_connection()
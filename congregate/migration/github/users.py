@@ -1,7 +1,7 @@
 from gitlab_ps_utils.misc_utils import safe_json_response, is_error_message_present, strip_netloc
 
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 from congregate.migration.github.api.users import UsersApi
 from congregate.migration.github.api.orgs import OrgsApi
 from congregate.migration.github.meta.github_browser import GitHubBrowser
@@ -42,7 +42,7 @@ class UsersClient(BaseClass):
         # mongo should be set to None unless this function is being used in a
         # unit test
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         single_user = self.users_api.get_user_v4(user["login"])
         error, single_user = is_error_message_present(single_user)
         if error or not single_user:
@@ -51,9 +51,8 @@ class UsersClient(BaseClass):
         else:
             if single_user.get("__typename") != "Organization":
                 formatted_user = self.format_user(single_user, browser, mongo)
-                mongo.insert_data(
+                mongo.upsert_data(
                     f"users-{strip_netloc(self.host)}", formatted_user)
-        mongo.close_connection()
 
     def format_users(self, users, mongo):
         data = []
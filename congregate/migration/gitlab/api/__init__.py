@@ -1,8 +1,12 @@
+from httpx import Client
 from gitlab_ps_utils.api import GitLabApi
 from congregate.helpers.conf import Config
 from congregate.helpers.utils import get_congregate_path
+from congregate.helpers.rate_limiter import get_httpx_event_hooks
+from congregate.helpers.request_counters import add_httpx_event_hooks
 
 app_path = get_congregate_path()
 log_name = 'congregate'
 config = Config()
-glapi = GitLabApi(app_path=app_path, log_name=log_name, ssl_verify=config.ssl_verify, timeout=config.gitlab_api_request_timeout)
+glapi = GitLabApi(app_path=app_path, log_name=log_name, ssl_verify=config.ssl_verify, timeout=config.gitlab_api_request_timeout,
+                  client=Client(verify=config.ssl_verify, event_hooks=add_httpx_event_hooks(get_httpx_event_hooks())))
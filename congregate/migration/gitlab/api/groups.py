@@ -115,10 +115,8 @@ class GroupsApi(GitLabApiWrapper):
             :param: token: (str) Access token to GitLab instance
             :yield: Response object containing the response to GET /groups/:id/members
         """
-        for member in self.api.list_all(host, token, f"groups/{gid}/members"):
-            member["email"] = self.users.get_user_email(
-                member["id"], host, token)
-            yield member
+        yield from self.users.add_member_emails(
+            self.api.list_all(host, token, f"groups/{gid}/members"), host, token)
 
     def get_all_group_members_incl_inherited(self, gid, host, token):
         """
@@ -385,7 +383,7 @@ class GroupsApi(GitLabApiWrapper):
             message = f"Sharing source group '{data}' with destination group id '{gid}' "
         return self.api.generate_post_request(host, token, f"groups/{gid}/share", json.dumps(data), description=message)
 
-    def get_all_group_projects(self, gid, host, token, include_subgroups=False, with_shared=False):
+    def get_all_group_projects(self, gid, host, token, include_subgroups=False, with_shared=False, simple=False):
         """
         Get a list of projects in this group
 
@@ -396,9 +394,10 @@ class GroupsApi(GitLabApiWrapper):
             :param: token: (str) Access token to GitLab instance
             :param: include_subgroups: (bool) Include projects in subgroups of this group. Default is false
             :param: with_shared: (bool) Include projects shared to this group. Default is true
+            :param: simple: (bool) Only limited fields for each project e.g. to list IDs
             :yield: Generator returning JSON of each result from GET /groups/:id/projects
         """
-        return self.api.list_all(host, token, f"groups/{gid}/projects?include_subgroups={include_subgroups}&with_shared={with_shared}")
+        return self.api.list_all(host, token, f"groups/{gid}/projects?include_subgroups={include_subgroups}&with_shared={with_shared}{'&simple=true' if simple else ''}")
 
     def get_all_group_projects_count(self, gid, host, token, include_subgroups=False, with_shared=False):
         """
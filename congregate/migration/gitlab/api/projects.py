@@ -1,5 +1,5 @@
 import json
-from urllib.parse import quote_plus, quote
+from urllib.parse import quote_plus, quote, parse_qs, urlsplit
 from congregate.migration.gitlab.api.base_api import GitLabApiWrapper
 from congregate.migration.gitlab.api.users import UsersApi
 
@@ -50,7 +50,7 @@ class ProjectsApi(GitLabApiWrapper):
         """
         return self.api.generate_get_request(host, token, f"projects/{quote_plus(path)}")
 
-    def get_all_projects(self, host, token, statistics=False):
+    def get_all_projects(self, host, token, statistics=False, last_activity_after=None, updated_after=None, simple=False):
         """
         Get a list of all visible projects across GitLab for the authenticated user
 
@@ -58,10 +58,50 @@ class ProjectsApi(GitLabApiWrapper):
 
             :param: host: (str) GitLab host URL
             :param: token: (str) Access token to GitLab instance
+            :param: last_activity_after: (str) ISO 8601 time. Only projects with a later last_activity_at
+            :param: updated_after: (str) ISO 8601 time. Only projects with a later updated_at
+            :param: simple: (bool) Only limited fields for each project e.g. to list IDs
             :yield: Generator containing JSON results from GET /projects
 
         """
-        return self.api.list_all(host, token, f"projects{'?statistics=true' if statistics else ''}", keyset=False)
+        params = {}
+        if last_activity_after:
+            params["last_activity_after"] = last_activity_after
+        if updated_after:
+            # Requires ordering by updated_at
+            params["updated_after"] = updated_after
+            params["order_by"] = "updated_at"
+        if simple:
+            params["simple"] = True
+        return self.api.list_all(host, token, f"projects{'?statistics=true' if statistics else ''}", params=params, keyset=False)
+
+    def get_all_project_ids(self, host, token):
+        """
+        Get the IDs of all visible projects, using keyset pagination, which unlike offset pagination is not capped
+
+        GitLab API Doc: https://docs.gitlab.com/ee/api/rest/#keyset-based-pagination
+
+            :param: host: (str) GitLab host URL
+            :param: token: (str) Access token to GitLab instance
+            :return: (set) Project IDs, or None if a page failed before the last page was reached
+        """
+        pids = set()
+        params = {"pagination": "keyset", "order_by": "id", "sort": "asc", "simple": True, "per_page": 100}
+        while True:
+            response = self.api.generate_get_request(host, token, "projects", params=params)
+            try:
+                page = response.json() if response.is_success else None
+            except ValueError:
+                page = None
+            if not isinstance(page, list):
+                self.log.error(
+                    f"Failed to list project IDs after ID {params.get('id_after', 0)}, with status {response.status_code}")
+                return None
+            pids.update(p["id"] for p in page)
+            # Only the last page has no next link
+            if not (next_url := response.links.get("next", {}).get("url")):
+                return pids
+            params["id_after"] = parse_qs(urlsplit(next_url).query)["id_after"][0]
 
     def get_members(self, pid, host, token):
         """
@@ -75,10 +115,8 @@ class ProjectsApi(GitLabApiWrapper):
             :yield: Generator containing JSON results from GET /projects
 
         """
-        for member in self.api.list_all(host, token, f"projects/{pid}/members"):
-            member["email"] = self.users.get_user_email(
-                member["id"], host, token)
-            yield member
+        yield from self.users.add_member_emails(
+            self.api.list_all(host, token, f"projects/{pid}/members"), host, token)
 
     def get_members_incl_inherited(self, pid, host, token):
         """
@@ -91,10 +129,8 @@ class ProjectsApi(GitLabApiWrapper):
             :param: token: (str) Access token to GitLab instance
             :yield: Generator returning JSON of each result from GET /projects/:pid/members/all
         """
-        for member in self.api.list_all(host, token, f"projects/{pid}/members/all"):
-            member["email"] = self.users.get_user_email(
-                member["id"], host, token)
-            yield member
+        yield from self.users.add_member_emails(
+            self.api.list_all(host, token, f"projects/{pid}/members/all"), host, token)
 
     def edit_member(self, host, token, pid, mid, level, message=None):
         """
@@ -1,9 +1,14 @@
 import json
 from urllib.parse import quote_plus
+from httpx import RequestError
+from gitlab_ps_utils.misc_utils import safe_json_response
+from gitlab_ps_utils.dict_utils import dig
 from congregate.migration.gitlab.api.base_api import GitLabApiWrapper
 
 
 class UsersApi(GitLabApiWrapper):
+    # GraphQL max page size
+    USERS_BATCH_SIZE = 100
 
     def get_user(self, uid, host, token):
         """
@@ -22,6 +27,100 @@ class UsersApi(GitLabApiWrapper):
         returned = self.get_user(uid, host, token).json()
         return returned.get("email", returned.get("public_email", ""))
 
+    def get_users_by_ids(self, uids, host, token):
+        """
+        Get the emails of multiple users in a single GraphQL request
+
+        GitLab API Doc: https://docs.gitlab.com/ee/api/graphql/reference/#queryusers
+
+            :param: uids: (list) GitLab user IDs, at most 100
+            :param: host: (str) GitLab host URL
+            :param: token: (str) Access token to GitLab instance
+            :return: Response object containing the response to the GraphQL users query
+        """
+        query = {
+            "query": """
+                query($ids: [ID!]) {
+                    users(ids: $ids, first: %d) {
+                        nodes {
+                            id
+                            emails {
+                                nodes {
+                                    email
+                                }
+                            }
+                        }
+                    }
+                }
+            """ % len(uids),
+            "variables": {
+                "ids": [f"gid://gitlab/User/{uid}" for uid in uids]
+            }
+        }
+        return self.api.generate_post_request(host, token, None, json.dumps(query), graphql_query=True)
+
+    def get_user_emails(self, uids, host, token):
+        """
+        Resolve user emails, consulting the process-wide user email cache first,
+        then batched GraphQL lookups, and single user lookups for any remaining users
+
+            :param: uids: (list) GitLab user IDs
+            :param: host: (str) GitLab host URL
+            :param: token: (str) Access token to GitLab instance
+            :return: (dict) User ID to email
+        """
+        # Imported here as the cache depends on the configuration validator, which depends on this module
+        from congregate.migration.gitlab.user_email_cache import get_user_email_cache
+        uids = list(dict.fromkeys(uids))
+        cache = get_user_email_cache()
+        emails = cache.get_many(host, uids)
+        missing = [uid for uid in uids if uid not in emails]
+        resolved = {}
+        for i in range(0, len(missing), self.USERS_BATCH_SIZE):
+            resolved.update(self.find_user_emails_by_ids(
+                missing[i:i + self.USERS_BATCH_SIZE], host, token))
+        for uid in missing:
+            if not resolved.get(uid):
+                resolved[uid] = self.get_user_email(uid, host, token)
+        cache.set_many(host, resolved)
+        emails.update(resolved)
+        return emails
+
+    def find_user_emails_by_ids(self, uids, host, token):
+        emails = {}
+        try:
+            resp = safe_json_response(
+                self.get_users_by_ids(uids, host, token))
+        except RequestError as re:
+            self.log.warning(
+                f"Failed batched lookup of {len(uids)} user emails, with error:\n{re}")
+            return emails
+        if not resp or resp.get("errors"):
+            self.log.warning(
+                f"Failed batched lookup of {len(uids)} user emails, with response:\n{resp}")
+            return emails
+        for user in dig(resp, 'data', 'users', 'nodes', default=[]) or []:
+            uid = int(user["id"].split("/")[-1])
+            addresses = list(dict.fromkeys(
+                e.get("email") for e in dig(user, 'emails', 'nodes', default=[]) or [] if e.get("email")))
+            # Email nodes are not flagged primary, so users with several are left to the single user lookup
+            if len(addresses) == 1:
+                emails[uid] = addresses[0]
+        return emails
+
+    def add_member_emails(self, members, host, token):
+        """
+        Add the user email to each group or project member, resolved once per unique user
+
+            :param: members: (iterable) Group or project members
+            :yield: Generator returning each member with its email
+        """
+        members = list(members)
+        emails = self.get_user_emails([m["id"] for m in members], host, token)
+        for member in members:
+            member["email"] = emails.get(member["id"], "")
+            yield member
+
     def get_current_user(self, host, token, headers=None):
         """
         Get the current user based on access token
@@ -2,7 +2,7 @@ import json
 from time import sleep
 from typing import Tuple
 from dacite import from_dict
-from celery import shared_task, chain
+from celery import shared_task
 from datetime import datetime, timedelta
 from gitlab_ps_utils.misc_utils import safe_json_response, is_error_message_present
 from congregate.helpers.migrate_utils import get_stage_wave_paths, get_staged_projects, get_full_path_with_parent_namespace
@@ -18,6 +18,9 @@ from congregate.migration.meta.api_models.bulk_import_entity_status import BulkI
 from congregate.migration.meta.data_models.dry_run import DryRunData
 from congregate.helpers.celery_mdbc import CeleryMongoConnector
 
+FAILED_STATUSES = ['failed', 'timeout', 'canceled']
+DONE_STATUSES = ['finished'] + FAILED_STATUSES
+
 
 class BulkImportsClient(BaseGitLabClient):
     def __init__(self, src_host=None, src_token=None, dest_host=None, dest_token=None):
@@ -278,6 +281,47 @@ class BulkImportsClient(BaseGitLabClient):
                     f"Entity import for '{entity.destination_slug}' in progress")
                 sleep(self.config.poll_interval)
 
+    def watch_entities(self, dt_id, on_finished):
+        """
+            Watch every entity of a bulk import with one listing of its entities per poll interval,
+            instead of polling each entity on its own, until the bulk import and all its entities are done.
+
+            :param dt_id: (int) Bulk import ID
+            :param on_finished: (func) Called with each entity (dict) that finished since the previous poll
+            :return: (dict) Final status of each entity, by entity ID
+        """
+        states = {}
+        while True:
+            # Read the overall status first, so the entities listed after it are final once it is done
+            import_status = safe_json_response(self.bulk_import.get_bulk_import_status(
+                self.dest_host, self.dest_token, dt_id)) or {}
+            for entity in self.bulk_import.get_bulk_import_entities(self.dest_host, self.dest_token, dt_id):
+                if entity.get('status') == states.get(entity.get('id')):
+                    continue
+                entity = from_dict(data_class=BulkImportEntityStatus, data=entity)
+                states[entity.id] = entity.status
+                if entity.status == 'finished':
+                    self.log.info(
+                        f"Entity import for '{entity.destination_slug}' is complete. Moving on to post-migration tasks")
+                    on_finished(entity.to_dict())
+                elif entity.status in FAILED_STATUSES:
+                    self.log.error(
+                        f"Entity import for '{entity.destination_slug}' {entity.status}. Refer to Congregate and GitLab logs for more information")
+            if import_status.get('status') in DONE_STATUSES and all(
+                    status in DONE_STATUSES for status in states.values()):
+                self.log.info(
+                    f"Bulk import {dt_id} entities done: {self.count_statuses(states)}")
+                return states
+            self.log.info(
+                f"Bulk import {dt_id} entities in progress: {self.count_statuses(states)}")
+            sleep(self.config.poll_interval)
+
+    def count_statuses(self, states):
+        counts = {}
+        for status in states.values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
     def calculate_entity_count(self, full_path):
         """
             Get total count of entities included in the direct transfer request
@@ -450,37 +494,12 @@ def kick_off_bulk_import(self, payload, dry_run=True):
     if dt_id:
         # Kick off overall watch job, passing the project entities flag
         watch_status = watch_import_status.delay(host, token, dt_id, extract_results=True, has_project_entities=has_project_entities)
-        entity_ids = []
-        processed_entities = set()
-        imported_entities = list(
-            dt_client.bulk_import.get_bulk_import_entities(host, token, dt_id))
-        while len(processed_entities) < len(imported_entities):
-            dt_client.log.info(
-                f"Total processed entities: {len(processed_entities)}, Total discovered entities: {len(imported_entities)}")
-            for entity in imported_entities:
-                entity_id = entity.get('id')
-                if entity_id not in processed_entities:
-                    dt_client.log.debug(f"Need to process entity {entity}")
-                    # Chain together watching the status of a specific entity
-                    # and then once that job completes, trigger post migration tasks
-                    res = chain(
-                        watch_import_entity_status.s(host, token, entity),
-                        post_migration_task.s(host, token, dry_run=dry_run)
-                    ).apply_async(queue='celery')
-                    dt_client.log.debug(f"Task response: {res}")
-                    entity_ids.append(res.id)
-                    processed_entities.add(entity_id)
-                else:
-                    dt_client.log.info(
-                        f"Entity {entity.get('id')} is already in the queue")
-            dt_client.log.info("Waiting for all entities to be populated")
-            sleep(dt_client.config.poll_interval)
-            imported_entities = list(
-                dt_client.bulk_import.get_bulk_import_entities(host, token, dt_id))
+        # A single watcher triggers the post migration tasks of all entities, as each finishes
+        watch_entities = watch_import_entities_status.delay(host, token, dt_id, dry_run=dry_run)
         return {
             'status': 'triggered direct transfer jobs',
             'overall_status_id': watch_status.id,
-            'entity_ids': entity_ids,
+            'entities_status_id': watch_entities.id,
             'dt_id': dt_id
         }
     if dt_entities and (not dt_id):
@@ -498,6 +517,14 @@ def watch_import_status(dest_host: str, dest_token: str, dt_id: int, extract_res
     return client.poll_import_status(dt_id, extract_results=extract_results, has_project_entities=has_project_entities)
 
 
+@shared_task(name='watch-import-entities-status')
+def watch_import_entities_status(dest_host: str, dest_token: str, dt_id: int, dry_run=True):
+    client = BulkImportsClient(
+        src_host=None, src_token=None, dest_host=dest_host, dest_token=dest_token)
+    return client.watch_entities(dt_id, lambda entity: post_migration_task.apply_async(
+        (entity, dest_host, dest_token), {'dry_run': dry_run}, queue='celery'))
+
+
 @shared_task(name='watch-import-entity-status')
 def watch_import_entity_status(dest_host: str, dest_token: str, entity: dict):
     client = BulkImportsClient(
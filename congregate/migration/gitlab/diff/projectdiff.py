@@ -8,6 +8,7 @@ from gitlab_ps_utils.json_utils import read_json_file_into_object
 from gitlab_ps_utils.api import GitLabApi
 
 from congregate.migration.diff.basediff import BaseDiffClient
+from congregate.migration.diff.diff_cache import get_diff_cache, get_change_marker
 from congregate.migration.gitlab import constants
 from congregate.migration.gitlab.api.projects import ProjectsApi
 from congregate.migration.gitlab.api.issues import IssuesApi
@@ -21,6 +22,12 @@ class ProjectDiffClient(BaseDiffClient):
     '''
         Extension of BaseDiffClient focused on finding the differences between migrated projects
     '''
+    COUNT_DIFFS = ["Commit Counts", "Branch Counts", "Merge Requests Counts",
+                   "Merge Request Comments", "Issues Counts", "Issue Comments"]
+    # Only endpoints whose changes bump last_activity_at (pushes, issues, merge requests, notes, wikis) are cached.
+    # Settings e.g. variables and protected branches, and membership, are always diffed again.
+    CACHED_DIFFS = COUNT_DIFFS + ["/projects/:id/repository/tree", "/projects/:id/repository/contributors",
+                                  "/projects/:id/issues", "/projects/:id/wikis"]
 
     def __init__(self, staged=False, rollback=False, processes=None):
         super().__init__()
@@ -87,156 +94,174 @@ class ProjectDiffClient(BaseDiffClient):
     def handle_endpoints(self, project):
         project_diff = {}
         # General endpoint - keep using REST API for this as it's more comprehensive
+        responses = {}
         project_diff["/projects/:id"] = self.generate_project_diff(
-            project, self.projects_api.get_project, obfuscate=True)
+            project, self.remember_responses(self.projects_api.get_project, responses), obfuscate=True)
 
         if not self.rollback:
-            # Use a single consolidated GraphQL query to fetch all counts
-            graphql_data = self.fetch_consolidated_graphql_data(project)
+            # Reuse the cached diffs of activity endpoints, while the project is unchanged on source and destination
+            project_path = get_dst_path_with_namespace(project)
+            marker = get_change_marker(responses.get(self.config.source_host),
+                                       responses.get(self.config.destination_host)) if self.config.diff_cache_ttl else None
+            cache = get_diff_cache("project", self.config.diff_cache_ttl) if marker else None
+            cached = {k: v for k, v in cache.load(project_path, marker).items()
+                      if k in self.CACHED_DIFFS} if cache else {}
+            if cached:
+                self.log.info(f"Reusing {len(cached)} cached endpoint diffs of unchanged project {project_path}")
+
+            if all(k in cached for k in self.COUNT_DIFFS):
+                project_diff.update({k: cached[k] for k in self.COUNT_DIFFS})
+            else:
+                project_diff.update(self.generate_count_diffs(project))
+
+            for key, endpoint, kwargs in self.get_endpoints():
+                project_diff[key] = cached[key] if key in cached else self.generate_project_diff(
+                    project, endpoint, **kwargs)
+
+            if cache:
+                cache.save(project_path, marker, {
+                    k: v for k, v in project_diff.items() if k in self.CACHED_DIFFS and k not in cached})
+
+        return project_diff
+
+    def remember_responses(self, endpoint, responses):
+        """
+            Wrap an endpoint to keep its JSON responses by host e.g. the source and destination project
+        """
+        def wrapper(asset_id, host, token, **kwargs):
+            response = endpoint(asset_id, host, token, **kwargs)
+            responses[host] = safe_json_response(response)
+            return response
+        return wrapper
+
+    def generate_count_diffs(self, project):
+        project_diff = {}
+        # Use a single consolidated GraphQL query to fetch all counts
+        graphql_data = self.fetch_consolidated_graphql_data(project)
             
-            if graphql_data and graphql_data.get("success"):
-                # Extract counts from the GraphQL response
-                source_data = graphql_data.get("source", {})
-                destination_data = graphql_data.get("destination", {})
+        if graphql_data and graphql_data.get("success"):
+            # Extract counts from the GraphQL response
+            source_data = graphql_data.get("source", {})
+            destination_data = graphql_data.get("destination", {})
                 
-                # Process all the counts we've fetched via GraphQL
-                self.log.info(f"Using consolidated GraphQL query results for project stats")
+            # Process all the counts we've fetched via GraphQL
+            self.log.info(f"Using consolidated GraphQL query results for project stats")
                 
-                # Commit Counts
-                project_diff["Commit Counts"] = {
-                    "source": source_data.get("commitCount", 0),
-                    "destination": destination_data.get("commitCount", 0),
-                    "accuracy": 1.0 if source_data.get("commitCount") == destination_data.get("commitCount") else 0.0,
-                    "diff": {"source": source_data.get("commitCount", 0), "destination": destination_data.get("commitCount", 0)} 
-                        if source_data.get("commitCount") != destination_data.get("commitCount") else None
-                }
+            # Commit Counts
+            project_diff["Commit Counts"] = {
+                "source": source_data.get("commitCount", 0),
+                "destination": destination_data.get("commitCount", 0),
+                "accuracy": 1.0 if source_data.get("commitCount") == destination_data.get("commitCount") else 0.0,
+                "diff": {"source": source_data.get("commitCount", 0), "destination": destination_data.get("commitCount", 0)} 
+                    if source_data.get("commitCount") != destination_data.get("commitCount") else None
+            }
 
-                # Branch Counts
-                project_diff["Branch Counts"] = {
-                    "source": source_data.get("branchCount", 0),
-                    "destination": destination_data.get("branchCount", 0),
-                    "accuracy": 1.0 if source_data.get("branchCount") == destination_data.get("branchCount") else 0.0,
-                    "diff": {"source": source_data.get("branchCount", 0), "destination": destination_data.get("branchCount", 0)} 
-                        if source_data.get("branchCount") != destination_data.get("branchCount") else None
-                }
-                # Merge Requests Counts
-                project_diff["Merge Requests Counts"] = {
-                    "source": source_data.get("mrCount", 0),
-                    "destination": destination_data.get("mrCount", 0),
-                    "accuracy": 1.0 if source_data.get("mrCount") == destination_data.get("mrCount") else 0.0,
-                    "diff": {"source": source_data.get("mrCount", 0), "destination": destination_data.get("mrCount", 0)}
-                        if source_data.get("mrCount") != destination_data.get("mrCount") else None
-                }
+            # Branch Counts
+            project_diff["Branch Counts"] = {
+                "source": source_data.get("branchCount", 0),
+                "destination": destination_data.get("branchCount", 0),
+                "accuracy": 1.0 if source_data.get("branchCount") == destination_data.get("branchCount") else 0.0,
+                "diff": {"source": source_data.get("branchCount", 0), "destination": destination_data.get("branchCount", 0)} 
+                    if source_data.get("branchCount") != destination_data.get("branchCount") else None
+            }
+            # Merge Requests Counts
+            project_diff["Merge Requests Counts"] = {
+                "source": source_data.get("mrCount", 0),
+                "destination": destination_data.get("mrCount", 0),
+                "accuracy": 1.0 if source_data.get("mrCount") == destination_data.get("mrCount") else 0.0,
+                "diff": {"source": source_data.get("mrCount", 0), "destination": destination_data.get("mrCount", 0)}
+                    if source_data.get("mrCount") != destination_data.get("mrCount") else None
+            }
                 
-                # Merge Request Comments
-                project_diff["Merge Request Comments"] = {
-                    "source": source_data.get("mrCommentCount", 0),
-                    "destination": destination_data.get("mrCommentCount", 0),
-                    "accuracy": 1.0 if source_data.get("mrCommentCount") == destination_data.get("mrCommentCount") else 0.0,
-                    "diff": {"source": source_data.get("mrCommentCount", 0), "destination": destination_data.get("mrCommentCount", 0)}
-                        if source_data.get("mrCommentCount") != destination_data.get("mrCommentCount") else None
-                }
+            # Merge Request Comments
+            project_diff["Merge Request Comments"] = {
+                "source": source_data.get("mrCommentCount", 0),
+                "destination": destination_data.get("mrCommentCount", 0),
+                "accuracy": 1.0 if source_data.get("mrCommentCount") == destination_data.get("mrCommentCount") else 0.0,
+                "diff": {"source": source_data.get("mrCommentCount", 0), "destination": destination_data.get("mrCommentCount", 0)}
+                    if source_data.get("mrCommentCount") != destination_data.get("mrCommentCount") else None
+            }
                 
-                # Issues Counts
-                project_diff["Issues Counts"] = {
-                    "source": source_data.get("issueCount", 0),
-                    "destination": destination_data.get("issueCount", 0),
-                    "accuracy": 1.0 if source_data.get("issueCount") == destination_data.get("issueCount") else 0.0,
-                    "diff": {"source": source_data.get("issueCount", 0), "destination": destination_data.get("issueCount", 0)}
-                        if source_data.get("issueCount") != destination_data.get("issueCount") else None
-                }
+            # Issues Counts
+            project_diff["Issues Counts"] = {
+                "source": source_data.get("issueCount", 0),
+                "destination": destination_data.get("issueCount", 0),
+                "accuracy": 1.0 if source_data.get("issueCount") == destination_data.get("issueCount") else 0.0,
+                "diff": {"source": source_data.get("issueCount", 0), "destination": destination_data.get("issueCount", 0)}
+                    if source_data.get("issueCount") != destination_data.get("issueCount") else None
+            }
                 
-                # Issue Comments
-                project_diff["Issue Comments"] = {
-                    "source": source_data.get("issueCommentCount", 0),
-                    "destination": destination_data.get("issueCommentCount", 0),
-                    "accuracy": 1.0 if source_data.get("issueCommentCount") == destination_data.get("issueCommentCount") else 0.0,
-                    "diff": {"source": source_data.get("issueCommentCount", 0), "destination": destination_data.get("issueCommentCount", 0)}
-                        if source_data.get("issueCommentCount") != destination_data.get("issueCommentCount") else None
-                }
-            else:
-                # Fallback to original methods if GraphQL fails
-                self.log.warning("Consolidated GraphQL query failed, falling back to individual queries")
-                project_diff["Commit Counts"] = self.generate_project_count_diff(
-                    project, "projects/:id/repository/commits")
-                project_diff["Merge Requests Counts"] = self.generate_project_count_diff_graphql(
-                    project, "merge_requests", "projects/:id/merge_requests")
-                project_diff["Issues Counts"] = self.generate_project_count_diff_graphql(
-                    project, "issues", "projects/:id/issues")
-                project_diff["Merge Request Comments"] = self.generate_nested_project_count_diff_graphql(
-                    project, "merge_requests", "notes")
-                project_diff["Issue Comments"] = self.generate_nested_project_count_diff_graphql(
-                    project, "issues", "notes")
+            # Issue Comments
+            project_diff["Issue Comments"] = {
+                "source": source_data.get("issueCommentCount", 0),
+                "destination": destination_data.get("issueCommentCount", 0),
+                "accuracy": 1.0 if source_data.get("issueCommentCount") == destination_data.get("issueCommentCount") else 0.0,
+                "diff": {"source": source_data.get("issueCommentCount", 0), "destination": destination_data.get("issueCommentCount", 0)}
+                    if source_data.get("issueCommentCount") != destination_data.get("issueCommentCount") else None
+            }
+        else:
+            # Fallback to original methods if GraphQL fails
+            self.log.warning("Consolidated GraphQL query failed, falling back to individual queries")
+            project_diff["Commit Counts"] = self.generate_project_count_diff(
+                project, "projects/:id/repository/commits")
+            project_diff["Merge Requests Counts"] = self.generate_project_count_diff_graphql(
+                project, "merge_requests", "projects/:id/merge_requests")
+            project_diff["Issues Counts"] = self.generate_project_count_diff_graphql(
+                project, "issues", "projects/:id/issues")
+            project_diff["Merge Request Comments"] = self.generate_nested_project_count_diff_graphql(
+                project, "merge_requests", "notes")
+            project_diff["Issue Comments"] = self.generate_nested_project_count_diff_graphql(
+                project, "issues", "notes")
+
+        return project_diff
 
+    def get_endpoints(self):
+        """
+            :return: (list) Diffed endpoints as (key, endpoint, generate_project_diff kwargs)
+        """
+        endpoints = [
             # CI/CD
-            project_diff["/projects/:id/variables"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_variables, obfuscate=True)
-            project_diff["/projects/:id/triggers"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_triggers)
-            project_diff["/projects/:id/deploy_keys"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_deploy_keys, obfuscate=True)
-            project_diff["/projects/:id/pipeline_schedules"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_pipeline_schedules)
-            project_diff["/projects/:id/environments"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_environments)
-            project_diff["/projects/:id/protected_environments"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_protected_environments)
+            ("/projects/:id/variables", self.projects_api.get_all_project_variables, {"obfuscate": True}),
+            ("/projects/:id/triggers", self.projects_api.get_all_project_triggers, {}),
+            ("/projects/:id/deploy_keys", self.projects_api.get_all_project_deploy_keys, {"obfuscate": True}),
+            ("/projects/:id/pipeline_schedules", self.projects_api.get_all_project_pipeline_schedules, {}),
+            ("/projects/:id/environments", self.projects_api.get_all_project_environments, {}),
+            ("/projects/:id/protected_environments", self.projects_api.get_all_project_protected_environments, {}),
 
             # Membership
-            project_diff["/projects/:id/members"] = self.generate_project_diff(
-                project, self.projects_api.get_members)
+            ("/projects/:id/members", self.projects_api.get_members, {}),
 
             # Repository
-            project_diff["/projects/:id/repository/tree"] = self.generate_project_diff(
-                project, self.repository_api.get_all_project_repository_tree)
-            project_diff["/projects/:id/repository/contributors"] = self.generate_project_diff(
-                project, self.repository_api.get_all_project_repository_contributors)
-            project_diff["/projects/:id/protected_tags"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_protected_tags)
-            project_diff["/projects/:id/forks"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_forks)
-            project_diff["/projects/:id/protected_branches"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_protected_branches)
-            project_diff["/projects/:id/releases"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_releases)
+            ("/projects/:id/repository/tree", self.repository_api.get_all_project_repository_tree, {}),
+            ("/projects/:id/repository/contributors", self.repository_api.get_all_project_repository_contributors, {}),
+            ("/projects/:id/protected_tags", self.projects_api.get_all_project_protected_tags, {}),
+            ("/projects/:id/forks", self.projects_api.get_all_project_forks, {}),
+            ("/projects/:id/protected_branches", self.projects_api.get_all_project_protected_branches, {}),
+            ("/projects/:id/releases", self.projects_api.get_all_project_releases, {}),
 
             # Issue Tracker
-            project_diff["/projects/:id/issues"] = self.generate_project_diff(
-                project, self.issues_api.get_all_project_issues)
-            project_diff["/projects/:id/labels"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_labels)
-            project_diff["/projects/:id/milestones"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_milestones)
-            project_diff["/projects/:id/boards"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_boards)
+            ("/projects/:id/issues", self.issues_api.get_all_project_issues, {}),
+            ("/projects/:id/labels", self.projects_api.get_all_project_labels, {}),
+            ("/projects/:id/milestones", self.projects_api.get_all_project_milestones, {}),
+            ("/projects/:id/boards", self.projects_api.get_all_project_boards, {}),
 
             # Misc
-            project_diff["/projects/:id/starrers"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_starrers)
-            project_diff["/projects/:id/badges"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_badges)
-            project_diff["/projects/:id/feature_flags"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_feature_flags)
-            project_diff["/projects/:id/custom_attributes"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_custom_attributes)
-            project_diff["/projects/:id/registry/repositories"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_registry_repositories)
-            project_diff["/projects/:id/hooks"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_hooks)
-            project_diff["/projects/:id/snippets"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_snippets)
-            project_diff["/projects/:id/wikis"] = self.generate_project_diff(
-                project, self.projects_api.get_all_project_wikis)
-
-            if self.config.source_tier not in ["core", "free"]:
-                project_diff["/projects/:id/approvals"] = self.generate_project_diff(
-                    project, self.projects_api.get_project_level_mr_approval_configuration)
-                project_diff["/projects/:id/approval_rules"] = self.generate_project_diff(
-                    project, self.projects_api.get_all_project_level_mr_approval_rules)
-                project_diff["/projects/:id/push_rule"] = self.generate_project_diff(
-                    project, self.projects_api.get_all_project_push_rules)
-        
-        return project_diff
+            ("/projects/:id/starrers", self.projects_api.get_all_project_starrers, {}),
+            ("/projects/:id/badges", self.projects_api.get_all_project_badges, {}),
+            ("/projects/:id/feature_flags", self.projects_api.get_all_project_feature_flags, {}),
+            ("/projects/:id/custom_attributes", self.projects_api.get_all_project_custom_attributes, {}),
+            ("/projects/:id/registry/repositories", self.projects_api.get_all_project_registry_repositories, {}),
+            ("/projects/:id/hooks", self.projects_api.get_all_project_hooks, {}),
+            ("/projects/:id/snippets", self.projects_api.get_all_project_snippets, {}),
+            ("/projects/:id/wikis", self.projects_api.get_all_project_wikis, {})
+        ]
+        if self.config.source_tier not in ["core", "free"]:
+            endpoints += [
+                ("/projects/:id/approvals", self.projects_api.get_project_level_mr_approval_configuration, {}),
+                ("/projects/:id/approval_rules", self.projects_api.get_all_project_level_mr_approval_rules, {}),
+                ("/projects/:id/push_rule", self.projects_api.get_all_project_push_rules, {})
+            ]
+        return endpoints
 
     def fetch_consolidated_graphql_data(self, project):
         """
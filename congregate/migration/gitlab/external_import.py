@@ -1,6 +1,5 @@
 import json
 
-from time import sleep
 from gitlab_ps_utils.misc_utils import is_error_message_present, safe_json_response
 from gitlab_ps_utils.dict_utils import dig
 from gitlab_ps_utils.json_utils import json_pretty
@@ -9,6 +8,7 @@ from gitlab_ps_utils.string_utils import deobfuscate
 from congregate.helpers.base_class import BaseClass
 from congregate.helpers.migrate_utils import migration_dry_run, sanitize_project_path
 from congregate.helpers.utils import is_dot_com, is_github_dot_com
+from congregate.helpers.status_scheduler import get_status_scheduler, StatusResult, PENDING, FINISHED, FAILED, TIMEOUT
 from congregate.migration.gitlab.api.external_import import ImportApi
 from congregate.migration.gitlab.api.projects import ProjectsApi
 from congregate.migration.gitlab.api.instance import InstanceApi
@@ -289,11 +289,21 @@ class ImportClient(BaseClass):
             return self.get_failed_result(dst_pwn, data)
 
     def wait_for_project_to_import(self, full_path):
-        total_time = 0
-        wait_time = self.config.export_import_status_check_time
+        result = self.schedule_project_import_status(full_path).result()
+        return result.state == FINISHED
+
+    def schedule_project_import_status(self, full_path, callback=None):
+        """
+            Register the import status check of an externally imported project with the status scheduler.
+
+            :param full_path: (str) Destination project full path
+            :param callback: (callable) Called with the resolved Future
+            :return: (Future) Resolved with a StatusResult in the FINISHED state once imported
+        """
         timeout = self.config.export_import_timeout
-        imported, success = False, False
-        while True:
+
+        def check(age):
+            imported = False
             project_statistics = safe_json_response(
                 self.projects.get_project_statistics(
                     full_path,
@@ -313,40 +323,37 @@ class ImportClient(BaseClass):
                     elif status == "failed":
                         self.log.error(
                             f"Import status is marked as {status} for {full_path}")
-                        success = False
-                        break
+                        return StatusResult(FAILED)
                     # Sub criteria - if repo statistics are populated
                     stats = dig(project_statistics, 'data',
                                 'project', 'statistics')
                     if imported and stats["commitCount"] > 0:
                         self.log.info(
                             f"Git commits have been found for {full_path}. Import is complete")
-                        success = True
-                        break
+                        return StatusResult(FINISHED)
                     if imported and ((stats["storageSize"] > 0) or (stats['repositorySize'] > 0)):
                         self.log.info(
                             f"Project storage is greater than 0 for {full_path}. Import is complete")
                         if stats["commitCount"] == 0:
                             self.log.warning(f"Git repo {full_path} is empty")
-                        success = True
-                        break
+                        return StatusResult(FINISHED)
                     repository = dig(project_statistics, 'data',
                                      'project', 'repository')
                     if imported and repository.get("empty") is True:
                         self.log.info(
                             f"Repository is empty for {full_path}. Import is complete")
-                        success = True
-                        break
-            if total_time >= timeout:
+                        return StatusResult(FINISHED)
+            if age >= timeout:
                 self.log.error(
                     f"Max import time exceeded for {full_path}. Skipping post-migration phase")
-                break
+                return StatusResult(TIMEOUT)
             self.log.info(f"Waiting for project {full_path} to import")
-            total_time += wait_time
             self.log.info(
-                f"Total time: {total_time}. Max time: {timeout}")
-            sleep(wait_time)
-        return success
+                f"Total time: {age:.0f}. Max time: {timeout}")
+            return StatusResult(PENDING)
+
+        return get_status_scheduler().schedule(
+            f"project {full_path} import", check, callback=callback)
 
     def get_project_repo_from_full_path(self, full_path):
         """
@@ -7,7 +7,8 @@ from gitlab_ps_utils.json_utils import json_pretty
 
 from celery import shared_task
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector, mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
+from congregate.helpers.utils import is_changed_since
 from congregate.helpers.migrate_utils import get_full_path_with_parent_namespace, is_top_level_group, get_staged_groups, \
     search_for_user_by_user_mapping_field
 from congregate.migration.gitlab.variables import VariablesClient
@@ -25,13 +26,15 @@ class GroupsClient(BaseClass):
         self.namespaces_api = NamespacesApi()
         self.skip_group_members = False
         self.skip_project_members = False
+        # Delta listing high-water mark (ISO 8601). Only group projects active or updated since are listed
+        self.since = None
         self.unique_groups = set()
         super().__init__()
 
     def traverse_groups(self, host, token, group):
         gid = group.get("id")
         if gid and gid not in self.unique_groups:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
             for k in constants.GROUP_KEYS_TO_IGNORE:
                 group.pop(k, None)
             self.unique_groups.add(gid)
@@ -46,12 +49,15 @@ class GroupsClient(BaseClass):
             for project in self.groups_api.get_all_group_projects(gid, host, token):
                 pid = project.get("id")
                 group["projects"].append(pid)
+                if not is_changed_since(project, self.since):
+                    continue
                 for k in constants.PROJECT_KEYS_TO_IGNORE:
                     project.pop(k, None)
                 # Avoids having to list all parent group projects i.e. listing only projects
                 project["members"] = [] if self.skip_project_members else list(
                     self.projects_api.get_members(pid, host, token))
-                mongo.insert_data(f"projects-{strip_netloc(host)}", project)
+                mongo.upsert_data(
+                    f"projects-{strip_netloc(host)}", project, replace=bool(self.since))
 
             # Save all descendant groups ID references as part of group metadata
             group["desc_groups"] = []
@@ -64,8 +70,7 @@ class GroupsClient(BaseClass):
                 self.log.debug("Traversing into subgroup")
                 self.traverse_groups(
                     host, token, subgroup)
-            mongo.insert_data(f"groups-{strip_netloc(host)}", group)
-            mongo.close_connection()
+            mongo.upsert_data(f"groups-{strip_netloc(host)}", group)
 
     def retrieve_group_info(self, host, token, location="source", processes=None):
         prefix = location if location != "source" else ""
@@ -300,7 +305,7 @@ class GroupsClient(BaseClass):
 
 
 @shared_task(name='retrieve-gl-groups')
-@mongo_connection
+@shared_mongo_connection
 def traverse_groups_task(host, token, group, mongo=None):
     gc = GroupsClient()
     gid = group.get("id")
@@ -324,7 +329,7 @@ def traverse_groups_task(host, token, group, mongo=None):
             # Avoids having to list all parent group projects i.e. listing only projects
             project["members"] = [] if gc.skip_project_members else list(
                 gc.projects_api.get_members(pid, host, token))
-            mongo.insert_data(f"projects-{strip_netloc(host)}", project)
+            mongo.upsert_data(f"projects-{strip_netloc(host)}", project)
 
         # Save all descendant groups ID references as part of group metadata
         group["desc_groups"] = []
@@ -338,4 +343,4 @@ def traverse_groups_task(host, token, group, mongo=None):
                 f"Traversing into subgroup {subgroup.get('full_path')}")
             traverse_groups_task.delay(
                 host, token, subgroup)
-        mongo.insert_data(f"groups-{strip_netloc(host)}", group)
+        mongo.upsert_data(f"groups-{strip_netloc(host)}", group)
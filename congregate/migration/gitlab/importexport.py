@@ -24,6 +24,7 @@ from congregate.helpers.migrate_utils import get_project_dest_namespace, is_user
     is_loc_supported, check_is_project_or_group_for_logging, migration_dry_run, check_download_directory, default_response, \
     get_stage_wave_paths
 from congregate.helpers.airgap_utils import extract_archive, delete_project_export
+from congregate.helpers.status_scheduler import get_status_scheduler, StatusResult, PENDING, FINISHED, FAILED, TIMEOUT
 
 
 class ImportExportClient(BaseGitLabClient):
@@ -66,75 +67,115 @@ class ImportExportClient(BaseGitLabClient):
 
     def wait_for_export_to_finish(
             self, src_id, name, is_project=True, retry=True):
-        exported = False
-        total_time = 0
-        wait_time = self.config.export_import_status_check_time
+        result = self.schedule_export_status(
+            src_id, name, is_project=is_project, retry=retry).result()
+        return result.state == FINISHED
+
+    def schedule_export_status(
+            self, src_id, name, is_project=True, retry=True, callback=None):
+        """
+            Trigger a group or project export and register its status check with the status scheduler.
+
+            :param src_id: (int) Source group or project ID
+            :param name: (str) Source group or project name
+            :param is_project: (bool) Project or group export
+            :param retry: (bool) Re-trigger the export once if it fails to trigger
+            :param callback: (callable) Called with the resolved Future
+            :return: (Future) Resolved with a StatusResult in the FINISHED state once exported
+        """
         timeout = self.config.export_import_timeout
         export_type = check_is_project_or_group_for_logging(is_project)
-        response = self.trigger_export_and_get_response(src_id, is_project)
-        while True:
+        state = {
+            "response": self.trigger_export_and_get_response(src_id, is_project),
+            "retrigger": False,
+            "retry": retry,
+            "since": 0
+        }
+
+        def check(age):
+            if state["retrigger"]:
+                state["response"] = self.trigger_export_and_get_response(
+                    src_id, is_project)
+                state["retrigger"] = False
+            response = state["response"]
+            total_time = age - state["since"]
             # Wait until rate limit is resolved
-            while response.status_code == 429:
+            if response.status_code == 429:
                 self.log.info(
                     f"Re-exporting {export_type.lower()} {name} (ID: {src_id}), waiting {self.COOL_OFF_MINUTES} minutes due to:\n{response.text}")
-                sleep(self.COOL_OFF_MINUTES * 60)
-                response = self.trigger_export_and_get_response(
-                    src_id, is_project)
+                state["retrigger"] = True
+                return StatusResult(PENDING, retry_after=self.COOL_OFF_MINUTES * 60)
             if response.status_code in [200, 201, 202]:
                 status = self.get_export_status(src_id, is_project)
                 if status.status_code in [200, 201, 202]:
                     status_json = safe_json_response(status)
-                    state = status_json.get("export_status")
-                    if state in ["finished", "regeneration_in_progress"]:
+                    export_state = status_json.get("export_status")
+                    if export_state in ["finished", "regeneration_in_progress"]:
                         self.log.info(
                             f"{export_type} {name} has finished exporting, with response:\n{json_pretty(status_json)}")
-                        exported = True
-                        break
-                    if state == "failed":
+                        return StatusResult(FINISHED, status_json)
+                    if export_state == "failed":
                         self.log.error(
                             f"{export_type} {name} export failed, with response:\n{json_pretty(status_json)}")
-                        break
+                        return StatusResult(FAILED, status_json)
                     # We don't want to wait for queued exports
-                    if state == "none" and total_time > timeout/4:
+                    if export_state == "none" and total_time > timeout/4:
                         self.log.error(
-                            f"SKIP: {export_type} {name} export with status '{state}' and response:\n{json_pretty(status_json)}")
-                        break
+                            f"SKIP: {export_type} {name} export with status '{export_state}' and response:\n{json_pretty(status_json)}")
+                        return StatusResult(FAILED, status_json)
                     if total_time < timeout:
                         self.log.info(
-                            f"{export_type} {name} export status '{state}' after {total_time}/{timeout} seconds")
-                        total_time += wait_time
-                        sleep(wait_time)
-                    else:
-                        self.log.error(
-                            f"{export_type} {name} time limit exceeded with export status:\n{json_pretty(status_json)}")
-                        break
-            elif retry:
+                            f"{export_type} {name} export status '{export_state}' after {total_time:.0f}/{timeout} seconds")
+                        return StatusResult(PENDING)
+                    self.log.error(
+                        f"{export_type} {name} time limit exceeded with export status:\n{json_pretty(status_json)}")
+                    return StatusResult(TIMEOUT, status_json)
+                if total_time < timeout:
+                    return StatusResult(PENDING)
                 self.log.error(
-                    f"{export_type} {name} export trigger failed{' (re-exporting)' if retry else ''}, with response:\n{response.text}")
-                response = self.trigger_export_and_get_response(
-                    src_id, is_project)
-                retry = False
-                total_time = 0
-            else:
+                    f"{export_type} {name} time limit exceeded with export status:\n{status}")
+                return StatusResult(TIMEOUT)
+            if state["retry"]:
                 self.log.error(
-                    f"SKIP: Failed to trigger source {export_type.lower()} {name} export, due to:\n{response.text}")
-                break
-        return exported
+                    f"{export_type} {name} export trigger failed (re-exporting), with response:\n{response.text}")
+                state["response"] = self.trigger_export_and_get_response(
+                    src_id, is_project)
+                state["retry"] = False
+                state["since"] = age
+                return StatusResult(PENDING, retry_after=0)
+            self.log.error(
+                f"SKIP: Failed to trigger source {export_type.lower()} {name} export, due to:\n{response.text}")
+            return StatusResult(FAILED)
+
+        return get_status_scheduler().schedule(
+            f"{export_type.lower()} {name} export", check, callback=callback)
 
     def wait_for_group_download(self, gid, retry=True):
-        exported = False
-        total_time = 0
-        wait_time = self.config.export_import_status_check_time
         timeout = self.config.export_import_timeout/2
-        response = self.trigger_export_and_get_response(gid, is_project=False)
-        while True:
+        state = {
+            "response": self.trigger_export_and_get_response(gid, is_project=False),
+            "retrigger": False,
+            "downloadable": False,
+            "retry": retry,
+            "since": 0
+        }
+
+        def check(age):
+            # Cool-off passed since the download became available
+            if state["downloadable"]:
+                return StatusResult(FINISHED)
+            if state["retrigger"]:
+                state["response"] = self.trigger_export_and_get_response(
+                    gid, is_project=False)
+                state["retrigger"] = False
+            response = state["response"]
+            total_time = age - state["since"]
             # Wait until rate limit is resolved
-            while response.status_code == 429:
+            if response.status_code == 429:
                 self.log.info(
                     f"Re-exporting group {gid}, waiting {self.COOL_OFF_MINUTES} minutes due to:\n{response.text}")
-                sleep(self.COOL_OFF_MINUTES * 60)
-                response = self.trigger_export_and_get_response(
-                    gid, is_project=False)
+                state["retrigger"] = True
+                return StatusResult(PENDING, retry_after=self.COOL_OFF_MINUTES * 60)
             if response.status_code == 202:
                 status = self.groups_api.get_group_download_status(
                     self.src_host, self.src_token, gid)
@@ -143,53 +184,49 @@ class ImportExportClient(BaseGitLabClient):
                 if status.status_code == 200:
                     self.log.info(
                         f"Waiting {self.COOL_OFF_MINUTES} minutes to download group {gid}")
-                    sleep(self.COOL_OFF_MINUTES * 60)
-                    exported = True
-                    break
+                    state["downloadable"] = True
+                    return StatusResult(PENDING, retry_after=self.COOL_OFF_MINUTES * 60)
                 if total_time < timeout:
                     self.log.info(
-                        f"Waited {total_time}/{timeout} seconds for group {gid} to export")
-                    total_time += wait_time
-                    sleep(wait_time)
-                else:
-                    self.log.error(
-                        f"Time limit exceeded for exporting group {gid}, with status:\n{status}")
-                    break
-            elif retry:
+                        f"Waited {total_time:.0f}/{timeout} seconds for group {gid} to export")
+                    return StatusResult(PENDING)
+                self.log.error(
+                    f"Time limit exceeded for exporting group {gid}, with status:\n{status}")
+                return StatusResult(TIMEOUT)
+            if state["retry"]:
                 self.log.error(
                     f"Group {gid} export failed (re-exporting), with response:\n{response.text}")
-                response = self.trigger_export_and_get_response(
+                state["response"] = self.trigger_export_and_get_response(
                     gid, is_project=False)
-                retry = False
-                total_time = 0
-            else:
-                self.log.error(
-                    f"SKIP: Failed to trigger source group {gid} export, due to:\n{response.text}")
-                break
-        return exported
+                state["retry"] = False
+                state["since"] = age
+                return StatusResult(PENDING, retry_after=0)
+            self.log.error(
+                f"SKIP: Failed to trigger source group {gid} export, due to:\n{response.text}")
+            return StatusResult(FAILED)
+
+        result = get_status_scheduler().schedule(
+            f"group {gid} download", check).result()
+        return result.state == FINISHED
 
     def wait_for_group_import(self, path):
-        group = {}
-        timer = 0
-        wait_time = self.config.export_import_status_check_time
         # Lightweight and requires half the timeout at most
         timeout = self.config.export_import_timeout/2
-        while True:
+
+        def check(age):
             group = self.groups.find_group_by_path(
                 self.config.destination_host, self.config.destination_token, path)
             if group:
                 self.log.info(
                     f"Group {path} imported successfully with ID {group.get('id')}")
-                break
+                return StatusResult(FINISHED, group)
             self.log.info(
-                f"Waited {timer}/{timeout} seconds for group {path} to import")
-            sleep(wait_time)
-            timer += wait_time
-            if timer > timeout:
-                self.log.error(
-                    f"Time limit exceeded for importing group {path}")
-                break
-        return group
+                f"Waited {age:.0f}/{timeout} seconds for group {path} to import")
+            return StatusResult(PENDING)
+
+        result = get_status_scheduler().schedule(
+            f"group {path} import", check, timeout=timeout).result()
+        return result.data or {}
 
     def trigger_export_and_get_response(self, source_id, is_project, data=None, headers=None):
         """
@@ -494,105 +531,124 @@ class ImportExportClient(BaseGitLabClient):
 
     def get_import_id_from_response(
             self, import_response, filename, name, path, dst_namespace, override_params, members):
-        total_time = 0
-        retry = True
-        import_id = None
-        wait_time = self.config.export_import_status_check_time
+        result = self.schedule_import_status(
+            import_response, filename, name, path, dst_namespace, override_params, members).result()
+        return result.data if result.state == FINISHED else None
+
+    def schedule_import_status(
+            self, import_response, filename, name, path, dst_namespace, override_params, members, callback=None):
+        """
+            Register the status check of a triggered project import with the status scheduler.
+            Rate limited or conflicting imports are re-attempted, and failed imports are deleted and re-imported once.
+
+            :return: (Future) Resolved with a StatusResult holding the destination project ID once FINISHED
+        """
         timeout = self.config.export_import_timeout
         host = self.dest_host
         token = self.dest_token
-        while True:
+        state = {
+            "response": import_response,
+            "reimport": False,
+            "retry": True,
+            "since": 0
+        }
+
+        def reimport():
+            state["reimport"] = True
+            return StatusResult(PENDING)
+
+        def check(age):
+            if state["reimport"]:
+                state["response"] = self.attempt_import(
+                    filename, name, path, dst_namespace, override_params, members)
+                state["reimport"] = False
+            import_response = state["response"]
+            total_time = age - state["since"]
             # Wait until rate limit is resolved or project deleted
-            while import_response.status_code in [500, 429, 409, 400]:
+            if import_response.status_code in [500, 429, 409, 400]:
                 text = import_response.text
                 if import_response.status_code == 429:
                     self.log.info(
                         f"Re-importing project '{name}' to '{dst_namespace}', waiting {self.COOL_OFF_MINUTES} minutes due to:\n{text}")
-                    sleep(self.COOL_OFF_MINUTES * 60)
+                    reimport()
+                    return StatusResult(PENDING, retry_after=self.COOL_OFF_MINUTES * 60)
                 # Assuming Default deletion adjourned period (Admin -> Settings
                 # -> General -> Visibility and access controls) is 0
-                elif import_response.status_code in [409, 400]:
+                if import_response.status_code in [409, 400]:
                     if total_time > timeout:
                         self.log.error(
                             f"Time limit exceeded waiting for project '{name}' to delete from '{dst_namespace}', with response:\n{text}")
-                        return None
+                        return StatusResult(TIMEOUT)
                     self.log.info(
-                        f"Waited {total_time}/{timeout} seconds for project '{name}' to delete from '{dst_namespace}' before re-importing:\n{text}")
-                    total_time += wait_time
-                    sleep(wait_time)
-                elif import_response.status_code == 500:
-                    if retry:
-                        self.log.info(
-                            f"Attempting to delete project '{name}' from '{dst_namespace}', before re-importing, due to:\n{text}")
-                        # Using project path instead of ID
-                        self.projects_api.delete_project(
-                            host, token, quote_plus(dst_namespace + "/" + path))
-                        sleep(wait_time)
-                        retry = False
-                    else:
-                        self.log.error(
-                            f"Skipping project '{name}' due to multiple 500 errors")
-                        break
-                import_response = self.attempt_import(
-                    filename, name, path, dst_namespace, override_params, members)
+                        f"Waited {total_time:.0f}/{timeout} seconds for project '{name}' to delete from '{dst_namespace}' before re-importing:\n{text}")
+                    return reimport()
+                if state["retry"]:
+                    self.log.info(
+                        f"Attempting to delete project '{name}' from '{dst_namespace}', before re-importing, due to:\n{text}")
+                    # Using project path instead of ID
+                    self.projects_api.delete_project(
+                        host, token, quote_plus(dst_namespace + "/" + path))
+                    state["retry"] = False
+                    return reimport()
+                self.log.error(
+                    f"Skipping project '{name}' due to multiple 500 errors")
+                return StatusResult(FAILED)
             safe_resp = safe_json_response(import_response)
             import_id = safe_resp.get("id") if safe_resp else None
-            if import_id:
-                status = self.projects_api.get_project_import_status(
-                    host, token, import_id)
-                if status.status_code in [200, 201]:
-                    status_json = safe_json_response(status)
-                    state = status_json.get(
-                        "import_status") if status_json else None
-                    if state == "finished":
-                        self.log.info(
-                            f"Project '{name}' successfully imported to '{dst_namespace}', with import status:\n{json_pretty(status_json)}")
-                        with open(f"{self.app_path}/data/logs/import_failed_relations.json", "a") as f:
-                            json.dump({status_json.get("path_with_namespace"): status_json.get(
-                                "failed_relations")}, f, indent=4)
-                        break
-                    if state == "failed":
-                        if self.SAML_MSG in status_json.get("import_error"):
-                            self.log.error(
-                                f"Project {name} import to {dst_namespace} failed:\n{json_pretty(status_json)}")
-                            return None
-                        self.log.error(
-                            f"Project {name} import to {dst_namespace} failed, with import status{' (re-importing)' if retry else ''}:\n{json_pretty(status_json)}")
-                        # Delete and re-import once if the project import status failed, otherwise just delete
-                        # Assuming Default deletion adjourned period (Admin ->
-                        # Settings -> General -> Visibility and access
-                        # controls) is 0
-                        if retry:
-                            self.log.info(
-                                f"Deleting project {name} from {dst_namespace} after import status failed (re-importing)")
-                            self.projects_api.delete_project(
-                                host, token, import_id)
-                            import_response = self.attempt_import(
-                                filename, name, path, dst_namespace, override_params, members)
-                            retry = False
-                            total_time = 0
-                        else:
-                            return None
-                    # For any other import status (started, scheduled, etc.)
-                    # wait for it to update
-                    elif total_time < timeout:
-                        self.log.info(
-                            f"Project {name} ({dst_namespace}) import status ({state}) after {total_time}/{timeout} seconds")
-                        total_time += wait_time
-                        sleep(wait_time)
-                    else:
-                        self.log.error(
-                            f"Time limit exceeded waiting for project {name} ({dst_namespace}) import status:\n{json_pretty(status_json)}")
-                        return None
-                else:
-                    self.log.error(
-                        f"Project {name} ({dst_namespace}) import attempt failed, with status:\n{status}")
-                    return None
-            else:
+            if not import_id:
                 self.log.error(
                     f"Project '{name}' ({dst_namespace}) failed to import:\n{import_response} - {import_response.text}")
-                return None
-        return import_id
+                return StatusResult(FAILED)
+            status = self.projects_api.get_project_import_status(
+                host, token, import_id)
+            if status.status_code not in [200, 201]:
+                self.log.error(
+                    f"Project {name} ({dst_namespace}) import attempt failed, with status:\n{status}")
+                return StatusResult(FAILED)
+            status_json = safe_json_response(status)
+            import_state = status_json.get(
+                "import_status") if status_json else None
+            if import_state == "finished":
+                self.log.info(
+                    f"Project '{name}' successfully imported to '{dst_namespace}', with import status:\n{json_pretty(status_json)}")
+                with open(f"{self.app_path}/data/logs/import_failed_relations.json", "a") as f:
+                    json.dump({status_json.get("path_with_namespace"): status_json.get(
+                        "failed_relations")}, f, indent=4)
+                return StatusResult(FINISHED, import_id)
+            if import_state == "failed":
+                if self.SAML_MSG in status_json.get("import_error"):
+                    self.log.error(
+                        f"Project {name} import to {dst_namespace} failed:\n{json_pretty(status_json)}")
+                    return StatusResult(FAILED)
+                self.log.error(
+                    f"Project {name} import to {dst_namespace} failed, with import status{' (re-importing)' if state['retry'] else ''}:\n{json_pretty(status_json)}")
+                # Delete and re-import once if the project import status failed, otherwise just delete
+                # Assuming Default deletion adjourned period (Admin ->
+                # Settings -> General -> Visibility and access
+                # controls) is 0
+                if state["retry"]:
+                    self.log.info(
+                        f"Deleting project {name} from {dst_namespace} after import status failed (re-importing)")
+                    self.projects_api.delete_project(
+                        host, token, import_id)
+                    state["response"] = self.attempt_import(
+                        filename, name, path, dst_namespace, override_params, members)
+                    state["retry"] = False
+                    state["since"] = age
+                    return StatusResult(PENDING, retry_after=0)
+                return StatusResult(FAILED)
+            # For any other import status (started, scheduled, etc.)
+            # wait for it to update
+            if total_time < timeout:
+                self.log.info(
+                    f"Project {name} ({dst_namespace}) import status ({import_state}) after {total_time:.0f}/{timeout} seconds")
+                return StatusResult(PENDING)
+            self.log.error(
+                f"Time limit exceeded waiting for project {name} ({dst_namespace}) import status:\n{json_pretty(status_json)}")
+            return StatusResult(TIMEOUT)
+
+        return get_status_scheduler().schedule(
+            f"project '{name}' import to '{dst_namespace}'", check, callback=callback)
 
     def export_project(self, project, dry_run=True):
         loc = self.config.location
@@ -601,14 +657,8 @@ class ImportExportClient(BaseGitLabClient):
         name = project["name"]
         namespace = project["namespace"]
         pid = project["id"]
-        if not self.config.airgap:
-            dst_path_with_namespace, _ = get_stage_wave_paths(project)
-            dst_pid = self.projects.find_project_by_path(
-                self.config.destination_host, self.config.destination_token, dst_path_with_namespace)
-            if dst_pid:
-                self.log.warning(
-                    f"SKIP: Project '{dst_path_with_namespace}' (ID: {dst_pid}) found on destination")
-                return False
+        if not self.config.airgap and self.is_project_on_destination(project):
+            return False
         if not dry_run:
             filename = get_export_filename_from_namespace_and_name(
                 namespace, name=name)
@@ -637,6 +687,16 @@ class ImportExportClient(BaseGitLabClient):
             return True
         return exported
 
+    def is_project_on_destination(self, project):
+        dst_path_with_namespace, _ = get_stage_wave_paths(project)
+        dst_pid = self.projects.find_project_by_path(
+            self.config.destination_host, self.config.destination_token, dst_path_with_namespace)
+        if dst_pid:
+            self.log.warning(
+                f"SKIP: Project '{dst_path_with_namespace}' (ID: {dst_pid}) found on destination")
+            return True
+        return False
+
     def handle_gzip_download(self, name, pid, filename):
         '''
             Attempt to download the export, if it's not a valid export, try again.
@@ -776,7 +836,7 @@ class ImportExportClient(BaseGitLabClient):
                 break
             if total_time < timeout:
                 self.log.info(
-                    f"Bulk group import status after {total_time}/{timeout} seconds: {state}")
+                    f"Bulk group import status after {total_time:.0f}/{timeout} seconds: {state}")
                 total_time += wait_time
                 sleep(wait_time)
                 resp = self.groups_api.get_bulk_group_import_status(
@@ -6,32 +6,33 @@
 
 from json import loads as json_loads
 from traceback import print_exc
+from queue import Queue
+from threading import BoundedSemaphore
+from multiprocessing import get_context
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
 from httpx import RequestError
+from tqdm import tqdm
 
 from gitlab_ps_utils.misc_utils import safe_json_response, strip_netloc, get_dry_log
-from gitlab_ps_utils.json_utils import write_json_to_file, json_pretty
+from gitlab_ps_utils.json_utils import json_pretty
 from celery import shared_task
 from dacite import from_dict
 
 import congregate.helpers.migrate_utils as mig_utils
 from congregate.helpers.utils import is_dot_com
 from congregate.helpers.airgap_utils import create_archive, delete_project_features, extract_archive, delete_project_export
+from congregate.helpers.status_scheduler import FINISHED
+from congregate.helpers.step_executor import Step, run_steps
+from congregate.helpers.client_registry import lazy_client
 
 from congregate.migration.meta.base_migrate import MigrateClient
 from congregate.migration.gitlab.importexport import ImportExportClient
 from congregate.migration.gitlab.variables import VariablesClient
-from congregate.migration.gitlab.users import UsersClient
-from congregate.migration.gitlab.api.users import UsersApi
-from congregate.migration.gitlab.groups import GroupsClient
-from congregate.migration.gitlab.api.groups import GroupsApi
-from congregate.migration.gitlab.projects import ProjectsClient
-from congregate.migration.gitlab.api.projects import ProjectsApi
 from congregate.migration.gitlab.api.project_repository import ProjectRepositoryApi
 from congregate.migration.gitlab.api.namespaces import NamespacesApi
 from congregate.migration.gitlab.api.instance import InstanceApi
 from congregate.migration.gitlab.merge_request_approvals import MergeRequestApprovalsClient
 from congregate.migration.gitlab.registries import RegistryClient
-from congregate.migration.gitlab.keys import KeysClient
 from congregate.migration.gitlab.hooks import HooksClient
 from congregate.migration.gitlab.environments import EnvironmentsClient
 from congregate.migration.gitlab.branches import BranchesClient
@@ -48,6 +49,23 @@ from congregate.migration.gitlab.issue_links import IssueLinksClient
 
 
 class GitLabMigrateClient(MigrateClient):
+    # Sub-clients are created on first use, so Celery tasks only build the ones their steps need
+    ie = lazy_client(ImportExportClient)
+    variables = lazy_client(VariablesClient)
+    project_repository_api = lazy_client(ProjectRepositoryApi)
+    namespaces_api = lazy_client(NamespacesApi)
+    instance_api = lazy_client(InstanceApi)
+    mr_approvals = lazy_client(MergeRequestApprovalsClient)
+    registries = lazy_client(lambda self: RegistryClient(reg_dry_run=self.reg_dry_run), bind=True)
+    packages = lazy_client(PackagesClient)
+    hooks = lazy_client(HooksClient)
+    environments = lazy_client(EnvironmentsClient)
+    branches = lazy_client(BranchesClient)
+    pushrules = lazy_client(PushRulesClient)
+    project_feature_flags_client = lazy_client(ProjectFeatureFlagClient, DRY_RUN=False)
+    issue_links_client = lazy_client(IssueLinksClient, DRY_RUN=False)
+    project_feature_flags_users_lists_client = lazy_client(ProjectFeatureFlagsUserListsClient, DRY_RUN=False)
+
     def __init__(self,
                  dry_run=True,
                  processes=None,
@@ -68,34 +86,9 @@ class GitLabMigrateClient(MigrateClient):
                  scm_source=None,
                  group_structure=False,
                  reg_dry_run=False,
-                 retain_contributors=False):
-        self.ie = ImportExportClient()
-        self.variables = VariablesClient()
-        self.users = UsersClient()
-        self.users_api = UsersApi()
-        self.groups = GroupsClient()
-        self.groups_api = GroupsApi()
-        self.projects = ProjectsClient()
-        self.projects_api = ProjectsApi()
-        self.project_repository_api = ProjectRepositoryApi()
-        self.namespaces_api = NamespacesApi()
-        self.instance_api = InstanceApi()
-        self.mr_approvals = MergeRequestApprovalsClient()
-        self.registries = RegistryClient(
-            reg_dry_run=reg_dry_run
-        )
-        self.packages = PackagesClient()
-        self.keys = KeysClient()
-        self.hooks = HooksClient()
-        self.environments = EnvironmentsClient()
-        self.branches = BranchesClient()
-        self.pushrules = PushRulesClient()
-        self.project_feature_flags_client = ProjectFeatureFlagClient(
-            DRY_RUN=False)
-        self.issue_links_client = IssueLinksClient(
-            DRY_RUN=False)
-        self.project_feature_flags_users_lists_client = ProjectFeatureFlagsUserListsClient(
-            DRY_RUN=False)
+                 retain_contributors=False,
+                 stream_projects=False):
+        self.reg_dry_run = reg_dry_run
         self.project_id_mapping = {}
         super().__init__(dry_run,
                          processes,
@@ -116,6 +109,7 @@ class GitLabMigrateClient(MigrateClient):
                          scm_source,
                          group_structure,
                          retain_contributors)
+        self.stream_projects = stream_projects
 
     def migrate(self):
         # Users
@@ -437,52 +431,84 @@ class GitLabMigrateClient(MigrateClient):
                     staged_projects):
                 self.log.warning(
                     f"USER projects staged ({len(user_projects)}):\n{json_pretty(user_projects)}")
+            if self.is_streamed_projects():
+                self.log.info("Streaming project exports into imports")
+                if not self.dry_run:
+                    self.reset_project_id_mapping_file()
+                export_results, import_results = self.stream_projects_migration(
+                    staged_projects)
+                staged_projects = self.handle_project_export_results(
+                    staged_projects, export_results)
+                self.handle_project_import_results(
+                    staged_projects, import_results)
+                return
             if not self.skip_project_export:
                 self.log.info(f"{dry_log}Exporting projects")
-                export_results = list(er for er in self.multi.start_multi_process(
-                    self.handle_exporting_projects, staged_projects, processes=self.processes))
-
-                self.are_results(export_results, "project", "export")
-
-                # Create list of projects that failed export
-                if failed := mig_utils.get_failed_export_from_results(
-                        export_results):
-                    self.log.warning("SKIP: Projects that failed to export or already exist on destination:\n{}".format(
-                        json_pretty(failed)))
-
-                # Append total count of projects exported
-                export_results.append(mig_utils.get_results(export_results))
-                self.log.info("### {0}Project export results ###\n{1}"
-                              .format(dry_log, json_pretty(export_results)))
-
-                # Filter out the failed ones
-                staged_projects = mig_utils.get_staged_projects_without_failed_export(
-                    staged_projects, failed)
+                if self.config.scheduled_project_exports and self.is_scheduled_export():
+                    export_results = self.schedule_exporting_projects(
+                        staged_projects)
+                else:
+                    export_results = list(er for er in self.multi.start_multi_process(
+                        self.handle_exporting_projects, staged_projects, processes=self.processes))
+                staged_projects = self.handle_project_export_results(
+                    staged_projects, export_results)
             else:
                 self.log.info(
                     "SKIP: Assuming staged projects are already exported")
 
             if not self.skip_project_import:
                 self.log.info("{}Importing projects".format(dry_log))
+                if not self.dry_run:
+                    self.reset_project_id_mapping_file()
                 import_results = list(ir for ir in self.multi.start_multi_process(
                     self.handle_importing_projects, staged_projects, processes=self.processes))
-
-                self.are_results(import_results, "project", "import")
-
-                # append Total : Successful count of project imports
-                import_results.append(mig_utils.get_results(import_results))
-                self.log.info("### {0}Project import results ###\n{1}"
-                              .format(dry_log, json_pretty(import_results)))
-                mig_utils.write_results_to_file(import_results, log=self.log)
-                # Run reporting
-                if staged_projects and import_results:
-                    self.create_issue_reporting(staged_projects, import_results)
+                self.handle_project_import_results(
+                    staged_projects, import_results)
             else:
                 self.log.info(
                     "SKIP: Assuming staged projects will be later imported")
         else:
             self.log.warning("SKIP: No projects staged for migration")
 
+    def handle_project_export_results(self, staged_projects, export_results):
+        """
+            Log the project export results and filter out the projects that failed to export
+
+            :return: (list) Staged projects without the failed exports
+        """
+        dry_log = get_dry_log(self.dry_run)
+        self.are_results(export_results, "project", "export")
+
+        # Create list of projects that failed export
+        if failed := mig_utils.get_failed_export_from_results(
+                export_results):
+            self.log.warning("SKIP: Projects that failed to export or already exist on destination:\n{}".format(
+                json_pretty(failed)))
+
+        # Append total count of projects exported
+        export_results.append(mig_utils.get_results(export_results))
+        self.log.info("### {0}Project export results ###\n{1}"
+                      .format(dry_log, json_pretty(export_results)))
+
+        # Filter out the failed ones
+        return mig_utils.get_staged_projects_without_failed_export(
+            staged_projects, failed)
+
+    def handle_project_import_results(self, staged_projects, import_results):
+        dry_log = get_dry_log(self.dry_run)
+        self.are_results(import_results, "project", "import")
+
+        # append Total : Successful count of project imports
+        import_results.append(mig_utils.get_results(import_results))
+        self.log.info("### {0}Project import results ###\n{1}"
+                      .format(dry_log, json_pretty(import_results)))
+        mig_utils.write_results_to_file(import_results, log=self.log)
+        if not self.dry_run:
+            self.write_project_id_mapping_file()
+        # Run reporting
+        if staged_projects and import_results:
+            self.create_issue_reporting(staged_projects, import_results)
+
     def handle_exporting_projects(self, project, src_host=None, src_token=None):
         pid = project["id"]
         project_path = project['path_with_namespace']
@@ -493,22 +519,12 @@ class GitLabMigrateClient(MigrateClient):
             filename: False
         }
         try:
-            c_retention = None
-            if self.retain_contributors and not self.config.direct_transfer:
-                self.log.info(
-                    f"{dry_log}Contributor Retention is enabled. Adding all project contributors as project members")
-                c_retention = ContributorRetentionClient(
-                    pid, None, project_path, dry_run=self.dry_run)
-                c_retention.build_map()
-                c_retention.add_contributors_to_project()
+            c_retention = self.add_export_contributors(project)
             self.log.info(
                 f"{dry_log}Exporting project {project_path} (ID: {pid}) as {filename}")
             result[filename] = ImportExportClient(src_host=src_host, src_token=src_token).export_project(
                 project, dry_run=self.dry_run)
-            if self.retain_contributors and not self.config.direct_transfer:
-                self.log.info(
-                    f"{dry_log}Contributor Retention is enabled. Project export is complete Removing all project contributors from members")
-                c_retention.remove_contributors_from_project(source=True)
+            self.remove_export_contributors(c_retention)
             if not self.dry_run:
                 if self.config.airgap:
                     exported_features = self.export_single_project_features(
@@ -524,11 +540,8 @@ class GitLabMigrateClient(MigrateClient):
                     delete_project_features(pid)
 
                 # Archive project immediately after export, if exported
-                if self.config.archive_logic and result[filename]:
-                    self.log.info(
-                        f"Archiving source project '{project_path}' (ID: {pid})")
-                    self.projects_api.archive_project(
-                        self.config.source_host, self.config.source_token, pid)
+                if result[filename]:
+                    self.archive_exported_project(project)
         except (IOError, RequestError) as oe:
             self.log.error(
                 f"Failed to export/download project {project_path} (ID: {pid}) as {filename} with error:\n{oe}")
@@ -537,6 +550,210 @@ class GitLabMigrateClient(MigrateClient):
             self.log.error(print_exc())
         return result
 
+    def add_export_contributors(self, project):
+        if self.retain_contributors and not self.config.direct_transfer:
+            self.log.info(
+                f"{get_dry_log(self.dry_run)}Contributor Retention is enabled. Adding all project contributors as project members")
+            c_retention = ContributorRetentionClient(
+                project["id"], None, project["path_with_namespace"], dry_run=self.dry_run)
+            c_retention.build_map()
+            c_retention.add_contributors_to_project()
+            return c_retention
+        return None
+
+    def remove_export_contributors(self, c_retention):
+        if c_retention:
+            self.log.info(
+                f"{get_dry_log(self.dry_run)}Contributor Retention is enabled. Project export is complete Removing all project contributors from members")
+            c_retention.remove_contributors_from_project(source=True)
+
+    def archive_exported_project(self, project):
+        if self.config.archive_logic:
+            self.log.info(
+                f"Archiving source project '{project['path_with_namespace']}' (ID: {project['id']})")
+            self.projects_api.archive_project(
+                self.config.source_host, self.config.source_token, project["id"])
+
+    def is_scheduled_export(self):
+        """
+            Whether filesystem exports can be triggered and downloaded by worker threads,
+            while the status scheduler polls all triggered exports in between.
+            Streamed projects always are, other exports only with scheduled_project_exports.
+        """
+        return not self.dry_run and not self.config.airgap and self.config.location == "filesystem"
+
+    def schedule_exporting_projects(self, staged_projects):
+        """
+            Export projects without pinning a worker to each export while it is being generated.
+
+            Workers only trigger exports and download finished ones.
+            All triggered exports are polled by the status scheduler in between,
+            which hands each finished export back to the workers through a callback.
+            The number of exports in flight is bounded by project_export_concurrency.
+
+            :param staged_projects: (list) Staged projects
+            :return: (list) Export results in the same format as handle_exporting_projects
+        """
+        processes = self.multi.get_no_of_processes(self.processes)
+        export_slots = BoundedSemaphore(
+            self.config.project_export_concurrency or processes)
+        workers = ThreadPoolExecutor(
+            max_workers=processes, thread_name_prefix="export")
+
+        def start_exporting_project(project):
+            # Released once the export is downloaded, or failed
+            exported = self.start_exporting_project(project, workers)
+            exported.add_done_callback(lambda _: export_slots.release())
+            return exported
+
+        try:
+            started = []
+            for project in staged_projects:
+                export_slots.acquire()
+                started.append(workers.submit(start_exporting_project, project))
+            exported = [s.result() for s in started]
+            return [e.result() for e in tqdm(
+                exported, total=len(exported), colour=self.TANUKI, desc=self.DESC, unit=self.UNIT)]
+        finally:
+            workers.shutdown(wait=True)
+
+    def is_streamed_projects(self):
+        return self.stream_projects and self.is_scheduled_export() \
+            and not self.skip_project_export and not self.skip_project_import
+
+    def stream_projects_migration(self, staged_projects):
+        """
+            Pipelined project migration, where each project is queued for import
+            as soon as its export is downloaded, instead of once all projects are exported.
+
+            The number of exports in flight, concurrent downloads and import processes are bounded
+            independently by project_export_concurrency, project_download_concurrency and project_import_concurrency.
+
+            :param staged_projects: (list) Staged projects
+            :return: (tuple) Export and import results
+        """
+        processes = self.multi.get_no_of_processes(self.processes)
+        export_slots = BoundedSemaphore(
+            self.config.project_export_concurrency or processes)
+        downloads = ThreadPoolExecutor(
+            max_workers=self.config.project_download_concurrency or processes, thread_name_prefix="download")
+        imports = ProcessPoolExecutor(
+            max_workers=self.config.project_import_concurrency or processes,
+            mp_context=get_context("spawn"),
+            initializer=self.multi.worker_init,
+            initargs=(self.handle_importing_projects,))
+        queued = Queue()
+
+        def queue_import(exported, project):
+            export_slots.release()
+            result = exported.result()
+            if mig_utils.get_failed_export_from_results([result]):
+                queued.put(None)
+                return
+            self.log.info(
+                f"Queueing project {project['path_with_namespace']} (ID: {project['id']}) for import")
+            try:
+                queued.put((project, imports.submit(self.multi.worker, project)))
+            except RuntimeError as re:
+                self.log.error(
+                    f"Failed to queue project {project['path_with_namespace']} for import with error:\n{re}")
+                failed = Future()
+                failed.set_exception(re)
+                queued.put((project, failed))
+
+        try:
+            exports = []
+            for project in staged_projects:
+                export_slots.acquire()
+                exported = self.start_exporting_project(project, downloads)
+                exported.add_done_callback(
+                    lambda e, p=project: queue_import(e, p))
+                exports.append(exported)
+            export_results = [e.result() for e in exports]
+            import_results = []
+            for _ in tqdm(exports, total=len(exports), colour=self.TANUKI, desc=self.DESC, unit=self.UNIT):
+                # Failed exports are reported with the export results, as they are not imported
+                if not (queued_import := queued.get()):
+                    continue
+                project, imported = queued_import
+                try:
+                    import_results.append(imported.result())
+                except Exception as e:
+                    self.log.error(
+                        f"Project {project['path_with_namespace']} import process failed with error:\n{e}")
+                    # Reported as a failed import, like handle_importing_projects does
+                    dst_pwn, _ = mig_utils.get_stage_wave_paths(project)
+                    import_results.append({dst_pwn: False})
+            return export_results, import_results
+        finally:
+            downloads.shutdown(wait=True)
+            imports.shutdown(wait=True)
+
+    def start_exporting_project(self, project, workers):
+        """
+            Trigger the project export and schedule its status check
+
+            :return: (Future) Resolved with the project export result once downloaded or failed
+        """
+        pid = project["id"]
+        project_path = project['path_with_namespace']
+        filename = mig_utils.get_export_filename_from_namespace_and_name(
+            project["namespace"], name=project["name"])
+        result = {
+            filename: False
+        }
+        done = Future()
+        try:
+            ie = ImportExportClient()
+            if ie.is_project_on_destination(project):
+                done.set_result(result)
+                return done
+            c_retention = self.add_export_contributors(project)
+            self.log.info(
+                f"Exporting project {project_path} (ID: {pid}) as {filename}")
+
+            def on_export_status(status):
+                try:
+                    workers.submit(self.finish_exporting_project,
+                                   project, ie, status, c_retention, result, done)
+                except RuntimeError as re:
+                    self.log.error(
+                        f"Failed to download project {project_path} (ID: {pid}) export with error:\n{re}")
+                    done.set_result(result)
+
+            ie.schedule_export_status(
+                pid, project["name"], callback=on_export_status)
+        except (IOError, RequestError) as oe:
+            self.log.error(
+                f"Failed to export project {project_path} (ID: {pid}) as {filename} with error:\n{oe}")
+            done.set_result(result)
+        except Exception as e:
+            self.log.error(e)
+            self.log.error(print_exc())
+            done.set_result(result)
+        return done
+
+    def finish_exporting_project(self, project, ie, status, c_retention, result, done):
+        pid = project["id"]
+        project_path = project['path_with_namespace']
+        filename = list(result)[0]
+        try:
+            if not status.cancelled() and not status.exception() and status.result().state == FINISHED:
+                ie.handle_gzip_download(project["name"], pid, filename)
+                result[filename] = True
+            self.remove_export_contributors(c_retention)
+            # Archive project immediately after export, if exported
+            if result[filename]:
+                self.archive_exported_project(project)
+        except (IOError, RequestError) as oe:
+            self.log.error(
+                f"Failed to export/download project {project_path} (ID: {pid}) as {filename} with error:\n{oe}")
+        except Exception as e:
+            self.log.error(e)
+            self.log.error(print_exc())
+        finally:
+            done.set_result(result)
+
     def handle_importing_projects(self, project, dst_host=None, dst_token=None, group_path=None, filename=None):
         src_id = project["id"]
         path = project["path_with_namespace"]
@@ -578,6 +795,7 @@ class GitLabMigrateClient(MigrateClient):
                 if import_id and not self.dry_run:
                     # Store project ID mapping
                     self.project_id_mapping[src_id] = import_id
+                    mig_utils.get_project_id_mapping_journal().append(src_id, import_id)
 
                     # Disable Shared CI
                     self.disable_shared_ci(dst_pwn, import_id)
@@ -619,14 +837,13 @@ class GitLabMigrateClient(MigrateClient):
                 if self.config.airgap:
                     self.log.info(f"Deleting project export file '{filename}'")
                     delete_project_export(filename)
-
-                # Write project id mapping file
-                self.write_project_id_mapping_file()
         return result
 
     def migrate_single_project_features(self, project, dst_id, dest_host=None, dest_token=None):
         """
-            Subsequent function to update project info AFTER import
+            Subsequent function to update project info AFTER import.
+            Feature steps run concurrently (project_features_concurrency) once the steps they depend on are done,
+            with each step duration recorded under step_timings.
         """
         project.pop("members", None)
         src_id = project["id"]
@@ -637,77 +854,87 @@ class GitLabMigrateClient(MigrateClient):
 
         results["id"] = dst_id
 
-        # Set default branch
-        self.branches.set_branch(src_path, dst_id, project.get("default_branch"))
+        # Steps only depending on the destination project ID run concurrently
+        steps = [
+            # Set default branch
+            Step("default_branch", lambda: self.branches.set_branch(
+                src_path, dst_id, project.get("default_branch"))),
 
-        # Shared with groups
-        results["shared_with_groups"] = self.projects.add_shared_groups(
-            dst_id, src_path, shared_with_groups)
+            # Shared with groups
+            Step("shared_with_groups", lambda: self.projects.add_shared_groups(
+                dst_id, src_path, shared_with_groups)),
 
-        # Environments
-        results["environments"] = EnvironmentsClient(dest_host=dest_host, dest_token=dest_token).migrate_project_environments(
-            src_id, dst_id, src_path, jobs_enabled)
+            # Environments
+            Step("environments", lambda: EnvironmentsClient(dest_host=dest_host, dest_token=dest_token).migrate_project_environments(
+                src_id, dst_id, src_path, jobs_enabled))
+        ]
 
         vars_client = VariablesClient(
             dest_host=dest_host, dest_token=dest_token)
-        # CI/CD Variables
-        results["cicd_variables"] = vars_client.migrate_cicd_variables(
-            src_id, dst_id, src_path, "projects", jobs_enabled)
+        steps += [
+            # CI/CD Variables
+            Step("cicd_variables", lambda: vars_client.migrate_cicd_variables(
+                src_id, dst_id, src_path, "projects", jobs_enabled)),
 
-        # Pipeline Schedule Variables
-        results["pipeline_schedule_variables"] = vars_client.migrate_pipeline_schedule_variables(
-            src_id, dst_id, src_path, jobs_enabled)
+            # Pipeline Schedule Variables
+            Step("pipeline_schedule_variables", lambda: vars_client.migrate_pipeline_schedule_variables(
+                src_id, dst_id, src_path, jobs_enabled))
+        ]
 
         if not self.config.airgap:
             # Deploy Keys
-            results["deploy_keys"] = self.keys.migrate_project_deploy_keys(
-                src_id, dst_id, src_path)
+            steps.append(Step("deploy_keys", lambda: self.keys.migrate_project_deploy_keys(
+                src_id, dst_id, src_path)))
 
             # Container Registries
             if self.config.source_registry and self.config.destination_registry:
-                results["container_registry"] = self.registries.migrate_registries(
-                    project, dst_id)
+                steps.append(Step("container_registry", lambda: self.registries.migrate_registries(
+                    project, dst_id)))
 
             # Package Registries
             if not project.get("packages_enabled", True):
                 self.log.info(f"Skipping package migration for project '{project['path_with_namespace']}' because packages are disabled.")
             else:
-                results["package_registry"] = self.packages.migrate_project_packages(
+                steps.append(Step("package_registry", lambda: self.packages.migrate_project_packages(
                     src_id, dst_id, src_path
-                )
+                )))
 
             # Hooks (Webhooks)
-            results["project_hooks"] = self.hooks.migrate_project_hooks(
-                src_id, dst_id, src_path)
+            steps.append(Step("project_hooks", lambda: self.hooks.migrate_project_hooks(
+                src_id, dst_id, src_path)))
 
             # Project Feature Flag Users Lists
-            project_feature_flags_users_lists = self.project_feature_flags_users_lists_client.migrate_project_feature_flags_user_lists_for_project(
-                src_id, dst_id)
-            results["project_feature_flags_users_lists"] = project_feature_flags_users_lists.get('completed')
+            steps.append(Step("project_feature_flags_users_lists", lambda: self.project_feature_flags_users_lists_client.migrate_project_feature_flags_user_lists_for_project(
+                src_id, dst_id)))
 
-            # Project Feature Flags
-            results["project_feature_flags"] = self.project_feature_flags_client.migrate_project_feature_flags_for_project(
-                src_id, dst_id, project_feature_flags_users_lists.get('user_lists_conversion_list') if isinstance(project_feature_flags_users_lists, dict) else None)
-
-            if self.retain_contributors and not self.config.direct_transfer:
-                c_retention = None
-                self.log.info(
-                    f"Contributor Retention is enabled. Project {project['path_with_namespace']} has been imported so removing all project contributors as project members")
-                c_retention = ContributorRetentionClient(
-                    src_id, dst_id, project['path_with_namespace'], dry_run=self.dry_run)
-                c_retention.build_map()
-                c_retention.remove_contributors_from_project()
+            # Project Feature Flags, mapped to the migrated user lists
+            steps.append(Step("project_feature_flags", lambda user_lists: self.project_feature_flags_client.migrate_project_feature_flags_for_project(
+                src_id, dst_id, user_lists.get('user_lists_conversion_list') if isinstance(user_lists, dict) else None),
+                depends_on=("project_feature_flags_users_lists",)))
 
         # Premium+ features
         if self.config.source_tier not in ["core", "free"]:
             if not self.config.airgap:
                 # Push Rules - handled by GitLab Importer as of 13.6
-                results["push_rules"] = self.pushrules.migrate_push_rules(
-                    src_id, dst_id, src_path)
-
-                # Merge Request Approvals
-                results["project_level_mr_approvals"] = MergeRequestApprovalsClient(dest_host=dest_host, dest_token=dest_token).migrate_project_level_mr_approvals(
-                    src_id, dst_id, src_path)
+                steps.append(Step("push_rules", lambda: self.pushrules.migrate_push_rules(
+                    src_id, dst_id, src_path)))
+
+                # Merge Request Approvals, including protected branch approval rules
+                steps.append(Step("project_level_mr_approvals", lambda _: MergeRequestApprovalsClient(dest_host=dest_host, dest_token=dest_token).migrate_project_level_mr_approvals(
+                    src_id, dst_id, src_path), depends_on=("default_branch",)))
+
+        if self.retain_contributors and not self.config.direct_transfer and not self.config.airgap:
+            # Remove contributors only once no other step may rely on their membership
+            steps.append(Step("contributor_retention", lambda *_: self.remove_import_contributors(
+                project, dst_id), depends_on=tuple(s.name for s in steps)))
+
+        step_results, results["step_timings"] = run_steps(
+            steps, max_workers=self.config.project_features_concurrency)
+        step_results.pop("default_branch", None)
+        step_results.pop("contributor_retention", None)
+        if isinstance(user_lists := step_results.get("project_feature_flags_users_lists"), dict):
+            step_results["project_feature_flags_users_lists"] = user_lists.get('completed')
+        results.update(step_results)
 
         # Source fields
         results["src_id"] = src_id
@@ -730,6 +957,14 @@ class GitLabMigrateClient(MigrateClient):
             f"Completed migrating additional source project '{src_path}' (ID: {src_id}) GitLab features")
         return results
 
+    def remove_import_contributors(self, project, dst_id):
+        self.log.info(
+            f"Contributor Retention is enabled. Project {project['path_with_namespace']} has been imported so removing all project contributors as project members")
+        c_retention = ContributorRetentionClient(
+            project["id"], dst_id, project['path_with_namespace'], dry_run=self.dry_run)
+        c_retention.build_map()
+        c_retention.remove_contributors_from_project()
+
     def export_single_project_features(self, project, src_host, src_token):
         """
             Function to export project features to mongo to then package up into a tar
@@ -773,14 +1008,22 @@ class GitLabMigrateClient(MigrateClient):
         return results
 
     def migrate_linked_items_in_issues(self):
-        # Read the mapping file from the json and put it inside the project_id_mapping variable
+        # Compact the mapping journal into the json and put it inside the project_id_mapping variable
         project_id_mapping = mig_utils.get_project_id_mapping()
         # Migrate issue links
         self.issue_links_client.migrate_issue_links(project_id_mapping)
 
     def write_project_id_mapping_file(self):
-        write_json_to_file(
-            f"{self.app_path}/data/project_id_mapping.json", self.project_id_mapping)
+        """
+            Compact the project ID mapping journal, appended by every import process, into its JSON file
+        """
+        mig_utils.get_project_id_mapping_journal().compact()
+
+    def reset_project_id_mapping_file(self):
+        """
+            Start the project ID mapping file afresh for this run's imports
+        """
+        mig_utils.get_project_id_mapping_journal().reset()
 
 
 @shared_task
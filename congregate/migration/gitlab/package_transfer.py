@@ -0,0 +1,81 @@
+"""
+Streams package files from the source to the destination package registry, in parallel.
+
+Each file is uploaded while it is downloaded, chunk by chunk, instead of being held in memory or written to disk.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from congregate.helpers.base_class import BaseClass
+from congregate.helpers.http_session import get_pooled_session
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class PackageFileStream():
+    '''
+        Streams a source package file response into an upload request body, with a known Content-Length
+    '''
+    def __init__(self, response, size):
+        self.response = response
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.response.iter_content(chunk_size=CHUNK_SIZE)
+
+
+class PackageTransfer(BaseClass):
+    def __init__(self):
+        super().__init__()
+        self.max_workers = self.config.package_transfer_concurrency
+
+    def stream_file(self, src_url, dest_url, size=None):
+        """
+            Stream a package file download (GET) into its upload (PUT)
+
+            :param src_url: (str) Source package file URL
+            :param dest_url: (str) Destination package file URL
+            :param size: (int) Package file size, when the source does not send a Content-Length
+            :return: Response object of the upload, or of the failed download
+        """
+        response = get_pooled_session(src_url).get(
+            src_url, headers={"PRIVATE-TOKEN": self.config.source_token}, stream=True, verify=self.config.ssl_verify)
+        try:
+            if response.status_code != 200:
+                # Read the (error) body before the response is closed
+                response.content
+                return response
+            # A compressed response is decoded, to its package file size
+            length = size if response.headers.get("Content-Encoding") else response.headers.get("Content-Length", size)
+            data = PackageFileStream(response, int(length)) if length else response.iter_content(chunk_size=CHUNK_SIZE)
+            return get_pooled_session(dest_url).put(dest_url, data=data, verify=self.config.ssl_verify, headers={
+                "PRIVATE-TOKEN": self.config.destination_token,
+                "Content-Type": "application/octet-stream"
+            })
+        finally:
+            response.close()
+
+    def run(self, transfers):
+        """
+            Run package file transfers, at most package_transfer_concurrency at a time.
+
+            The first file is transferred on its own, as the destination package is created by its first upload,
+            and concurrent first uploads could each create a package.
+
+            :param transfers: (list) Callables transferring a single file, returning whether it was migrated
+            :return: (list) Transfer results, False for transfers raising an exception
+        """
+        if not transfers:
+            return []
+        first = self.__run_transfer(transfers[0])
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [first] + list(executor.map(self.__run_transfer, transfers[1:]))
+
+    def __run_transfer(self, transfer):
+        try:
+            return transfer()
+        except Exception as e:
+            self.log.error(f"Failed to transfer package file, due to {e}")
+            return False
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from functools import partial
 from traceback import print_exc
 from httpx import RequestError
 from congregate.helpers.base_class import BaseClass
@@ -10,13 +11,16 @@ from congregate.migration.gitlab.api.maven import MavenPackagesApi
 from congregate.migration.gitlab.api.npm import NpmPackagesApi
 from congregate.migration.gitlab.api.helm import HelmPackagesApi
 from congregate.helpers.utils import ProjectIdPrefixedLogger, download_file_with_encoding_fallback, temp_directory, is_dot_com, upload_file_with_encoding_fallback
-from congregate.helpers.package_utils import generate_pypi_package_payload, generate_npm_package_payload, extract_pypi_package_metadata, extract_npm_package_metadata, get_pkg_data, generate_npm_json_data, generate_custom_npm_tarball_url, extract_pypi_wheel_metadata, compare_packages
+from congregate.helpers.package_utils import generate_pypi_package_payload, generate_npm_package_payload, extract_pypi_package_metadata, extract_npm_package_metadata, get_pkg_data, generate_npm_json_data, generate_custom_npm_tarball_url, extract_pypi_wheel_metadata, compare_packages, is_file_migrated
+from congregate.migration.gitlab.package_transfer import PackageTransfer
 from congregate.migration.meta.api_models.pypi_package import PyPiPackage
 from congregate.migration.meta.api_models.npm_package import NpmPackage
-from congregate.migration.meta.api_models.maven_package import MavenPackage
 
 
 class PackagesClient(BaseClass):
+    # Size threshold for uploading generic package files to GitLab.com with curl, instead of streaming them
+    LARGE_FILE_THRESHOLD = 90 * 1024 * 1024  # 90MB
+
     def __init__(self):
         self.packages = PackagesApi()
         self.pypi_packages = PyPiPackagesApi()
@@ -24,6 +28,7 @@ class PackagesClient(BaseClass):
         self.npm_packages = NpmPackagesApi()
         self.helm_packages = HelmPackagesApi()
         self.users = UsersApi()
+        self.transfer = PackageTransfer()
         super().__init__()
 
     def migrate_project_packages(self, src_id, dest_id, project_name):
@@ -52,19 +57,23 @@ class PackagesClient(BaseClass):
                         )
                     elif package_type == 'maven':
                         self.migrate_maven_packages(
-                            src_id, dest_id, package, project_name, results
+                            src_id, dest_id, package, project_name, results,
+                            all_dest_packages=all_dest_packages
                         )
                     elif package_type == 'pypi':
                         self.migrate_pypi_packages(
-                            src_id, dest_id, package, results
+                            src_id, dest_id, package, results,
+                            all_dest_packages=all_dest_packages
                         )
                     elif package_type == 'npm':
                         self.migrate_npm_packages(
-                            src_id, dest_id, package, results
+                            src_id, dest_id, package, results,
+                            all_dest_packages=all_dest_packages
                         )
                     elif package_type == 'helm':
                         self.migrate_helm_packages(
-                            src_id, dest_id, package, results
+                            src_id, dest_id, package, results,
+                            all_dest_packages=all_dest_packages
                         )
                     else:
                         self.log.warning(
@@ -90,48 +99,29 @@ class PackagesClient(BaseClass):
     def format_artifact(self, name, version):
         return f"{self.format_groupid(name)}:{self.format_artifactid(name)}:{version}"
 
-    def get_maven_files_data(self, src_id, package, project_name, path):
-        files = []
-        found_executable = False
-        found_pom = False
-
-        try:
-            for package_file in self.packages.get_package_files(self.config.source_host, self.config.source_token, src_id, package.get('id')):
-                file_name = package_file.get('file_name')
-                file_suffix = Path(file_name).suffix.lower()
-
-                supported_extensions = ['.pom', '.jar', '.war', '.ear']
-
-                if file_suffix in supported_extensions:
-                    if file_suffix == '.pom':
-                        found_pom = True
-                    if file_suffix in ['.jar', '.war', '.ear']:
-                        found_executable = True
-
-                    self.log.info(
-                        f"Attempting to download maven package: ({file_name}) from project: ({project_name})")
-
-                    response = self.maven_packages.download_maven_project_package(
-                        self.config.source_host, self.config.source_token, src_id, path, file_name)
-                    file_content = response.content
-
-                    files.append(MavenPackage(
-                        content=file_content,
-                        file_name=file_name
-                    ))
-        except RequestError as re:
-            self.log.error(
-                f"Failed to retrieve package files for '{package.get('name')}', version '{package.get('version')}'")
-            self.log.error(re)
-        return files, found_executable, found_pom
+    def get_dest_package_files(self, dest_id, package, all_dest_packages=None):
+        """
+        Returns the files of the destination package matching a source package (name, version and type), if any
+        """
+        if all_dest_packages is None:
+            all_dest_packages = self.packages.get_project_packages(
+                self.config.destination_host, self.config.destination_token, dest_id)
+        dest_package = next((p for p in all_dest_packages
+                             if p.get('name') == package.get('name')
+                             and p.get('version') == package.get('version')
+                             and p.get('package_type') == package.get('package_type')), None)
+        if not dest_package:
+            return []
+        return list(self.packages.get_package_files(
+            self.config.destination_host, self.config.destination_token, dest_id, dest_package.get('id')))
 
     def migrate_generic_packages(self, src_id, dest_id, package, results, all_source_packages=None, all_dest_packages=None):
         """
         Migrates generic packages with robust handling of file transfers.
+
+        Files are streamed from the source to the destination, package_transfer_concurrency at a time,
+        skipping files already in the destination with matching checksums.
         """
-        # Size threshold for using curl instead of direct API
-        LARGE_FILE_THRESHOLD = 90 * 1024 * 1024  # 90MB
-        
         # Check if destination is GitLab.com (which has Cloudflare)
         is_gitlab_com = is_dot_com(self.config.destination_host)
         
@@ -160,90 +150,108 @@ class PackagesClient(BaseClass):
         elif comparison["reason"] != "dest_not_found":
             self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Package exists but doesn't match: {comparison['reason']} - {comparison['details']}")
         
-        # Use context manager for temporary directory
-        with temp_directory(prefix="gitlab_package_") as temp_dir:
-            migration_status = True
+        migration_status = True
+        
+        # Get all package files
+        package_files = list(self.packages.get_package_files(
+            self.config.source_host, 
+            self.config.source_token, 
+            src_id, 
+            package.get('id')
+        ))
+        dest_files = self.get_dest_package_files(dest_id, package, all_dest_packages) if comparison["reason"] != "dest_not_found" else []
+        
+        self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Found {len(package_files)} files to migrate for package: {artifact}")
+        
+        transfers = []
+        for package_file in package_files:
+            file_name = package_file['file_name']
+            file_size = package_file.get('size', 0)
             
-            # Get all package files
-            package_files = list(self.packages.get_package_files(
-                self.config.source_host, 
-                self.config.source_token, 
-                src_id, 
-                package.get('id')
-            ))
+            # Skip oversized files (GitLab.com has a 5GB limit)
+            if is_gitlab_com and file_size > 5 * 1024 * 1024 * 1024:  # 5GB
+                self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] File '{file_name}' exceeds GitLab.com's 5GB size limit. Skipping.")
+                migration_status = False
+                continue
             
-            self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Found {len(package_files)} files to migrate for package: {artifact}")
+            # Skip files already migrated e.g. by a previously interrupted migration
+            if is_file_migrated(package_file, dest_files):
+                self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] File '{file_name}' already exists in destination with a matching checksum. Skipping.")
+                continue
             
-            # Process each file
-            for package_file in package_files:
-                file_name = package_file['file_name']
-                file_size = package_file.get('size', 0)
-                
-                self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Processing file: {file_name} (Size: {round(file_size/1024/1024, 2)} MB)")
-                
-                # Skip oversized files (GitLab.com has a 5GB limit)
-                if is_gitlab_com and file_size > 5 * 1024 * 1024 * 1024:  # 5GB
-                    self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] File '{file_name}' exceeds GitLab.com's 5GB size limit. Skipping.")
-                    migration_status = False
-                    continue
-                
-                # Set up the temp file path
-                temp_file_path = os.path.join(temp_dir, file_name)
-                
-                # Build download URL base
-                download_base_url = f"{self.config.source_host}/api/v4/projects/{src_id}/packages/generic/{package['name']}/{package['version']}"
-                
-                # Create a wrapped logger that includes project IDs
-                project_logger = ProjectIdPrefixedLogger(self.log, src_id, dest_id)
-                
-                # Download the file using utility function
-                download_success, actual_size, successful_encoding_type = download_file_with_encoding_fallback(
-                    download_base_url, 
-                    file_name, 
-                    temp_file_path, 
-                    self.config.source_token, 
-                    logger=project_logger
-                )
-                
-                if not download_success:
-                    self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] All download encoding attempts failed for file: {file_name}")
-                    migration_status = False
-                    continue
-                    
-                # Verify the downloaded file size
-                if actual_size != file_size and file_size > 0:
-                    self.log.warning(f"[Project SRC:{src_id} → DST:{dest_id}] Downloaded file size ({actual_size}) differs from expected size ({file_size})")
-                
-                # Build upload URL base
-                upload_base_url = f"{self.config.destination_host}/api/v4/projects/{dest_id}/packages/generic/{package['name']}/{package['version']}"
-                
-                # Determine if we should use curl (large files to GitLab.com)
-                use_curl = is_gitlab_com and actual_size > LARGE_FILE_THRESHOLD
-                
-                # Upload the file using utility function
-                upload_success = upload_file_with_encoding_fallback(
-                    upload_base_url, 
-                    file_name, 
-                    temp_file_path, 
-                    self.config.destination_token, 
-                    actual_size, 
-                    use_curl=use_curl, 
-                    logger=project_logger
-                )
-                
-                # Clean up the temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                
-                if not upload_success:
-                    self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] All upload attempts failed for file: {file_name}")
-                    migration_status = False
+            transfers.append(partial(self.transfer_generic_file, src_id, dest_id, package, package_file, is_gitlab_com))
+        
+        migration_status = all(self.transfer.run(transfers)) and migration_status
         
         # All operations complete, report result
         results.append({'Migrated': migration_status, 'Package': artifact})
         return migration_status
 
-    def migrate_maven_packages(self, src_id, dest_id, package, project_name, results):
+    def transfer_generic_file(self, src_id, dest_id, package, package_file, is_gitlab_com=False):
+        """
+        Streams a generic package file from the source to the destination.
+
+        Large files to GitLab.com, and files failing to stream (e.g. due to special characters in their name),
+        are downloaded to a temporary file instead, and uploaded with curl or multiple filename encodings.
+        """
+        file_name = package_file['file_name']
+        file_size = package_file.get('size', 0)
+        
+        self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Processing file: {file_name} (Size: {round(file_size/1024/1024, 2)} MB)")
+        
+        # Build download and upload URL bases
+        download_base_url = f"{self.config.source_host}/api/v4/projects/{src_id}/packages/generic/{package['name']}/{package['version']}"
+        upload_base_url = f"{self.config.destination_host}/api/v4/projects/{dest_id}/packages/generic/{package['name']}/{package['version']}"
+        
+        # Determine if we should use curl (large files to GitLab.com)
+        if not (is_gitlab_com and file_size > self.LARGE_FILE_THRESHOLD):
+            response = self.transfer.stream_file(
+                f"{download_base_url}/{file_name}", f"{upload_base_url}/{file_name}", file_size)
+            if response.status_code == 201:
+                self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Successfully streamed file: {file_name}")
+                return True
+            self.log.warning(f"[Project SRC:{src_id} → DST:{dest_id}] Failed to stream file: {file_name} (HTTP {response.status_code}), retrying with encoding fallbacks")
+        
+        # Create a wrapped logger that includes project IDs
+        project_logger = ProjectIdPrefixedLogger(self.log, src_id, dest_id)
+        
+        # Use context manager for temporary directory
+        with temp_directory(prefix="gitlab_package_") as temp_dir:
+            temp_file_path = os.path.join(temp_dir, file_name)
+            
+            # Download the file using utility function
+            download_success, actual_size, _ = download_file_with_encoding_fallback(
+                download_base_url, 
+                file_name, 
+                temp_file_path, 
+                self.config.source_token, 
+                logger=project_logger
+            )
+            
+            if not download_success:
+                self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] All download encoding attempts failed for file: {file_name}")
+                return False
+                
+            # Verify the downloaded file size
+            if actual_size != file_size and file_size > 0:
+                self.log.warning(f"[Project SRC:{src_id} → DST:{dest_id}] Downloaded file size ({actual_size}) differs from expected size ({file_size})")
+            
+            # Upload the file using utility function
+            upload_success = upload_file_with_encoding_fallback(
+                upload_base_url, 
+                file_name, 
+                temp_file_path, 
+                self.config.destination_token, 
+                actual_size, 
+                use_curl=is_gitlab_com and actual_size > self.LARGE_FILE_THRESHOLD, 
+                logger=project_logger
+            )
+        
+        if not upload_success:
+            self.log.error(f"[Project SRC:{src_id} → DST:{dest_id}] All upload attempts failed for file: {file_name}")
+        return upload_success
+
+    def migrate_maven_packages(self, src_id, dest_id, package, project_name, results, all_dest_packages=None):
         """
         Migrates a maven package from source project to destination project.
 
@@ -252,6 +260,10 @@ class PackagesClient(BaseClass):
         - dest_id: Identifier or path for the destination project.
         - package: The package name to migrate.
         - results: A dictionary to store the results of the migration.
+        - all_dest_packages: Optional pre-fetched list of destination packages.
+
+        Files are streamed from the source to the destination, package_transfer_concurrency at a time,
+        skipping files already in the destination with matching checksums.
         """
 
         # Format properly the group, artifactId and version of the package to migrate
@@ -262,31 +274,31 @@ class PackagesClient(BaseClass):
         version = package['version']
         path = f"{groupId}/{artifactId}/{version}"
 
-        # Get the maven files included inside the package to migrate - This is the downloading process
-        files, found_executable, found_pom = self.get_maven_files_data(
-            src_id, package, project_name, path)
-        migration_status = True
+        # Get the maven files included inside the package to migrate
+        files = []
+        try:
+            files = [f for f in self.packages.get_package_files(self.config.source_host, self.config.source_token, src_id, package.get('id'))
+                     if Path(f.get('file_name')).suffix.lower() in ['.pom', '.jar', '.war', '.ear']]
+        except RequestError as re:
+            self.log.error(
+                f"Failed to retrieve package files for '{package.get('name')}', version '{package.get('version')}'")
+            self.log.error(re)
+        suffixes = {Path(f.get('file_name')).suffix.lower() for f in files}
+        found_pom = '.pom' in suffixes
+        found_executable = bool(suffixes & {'.jar', '.war', '.ear'})
 
         # If we find both the pom and jar file, we can proceed to the migration
         if found_executable and found_pom:
-            for file in files:
-                # Check if the file doesn't exist in the destination instance yet as we don't want any duplicate
-                response = self.maven_packages.download_maven_project_package(
-                    self.config.destination_host, self.config.destination_token, dest_id, path, file.file_name)
-                if response.status_code == 200:
+            # Skip the files already in the destination instance as we don't want any duplicate
+            dest_files = self.get_dest_package_files(dest_id, package, all_dest_packages)
+            transfers = []
+            for package_file in files:
+                if is_file_migrated(package_file, dest_files):
                     self.log.info(
-                        f"File '{file.file_name}' already exists in the destination instance. Skipping")
+                        f"File '{package_file['file_name']}' already exists in the destination instance. Skipping")
                 else:
-                    # Proceed to uploading the file, since it's not yet present in the destination instance for this specific package
-                    response = self.maven_packages.upload_maven_package(
-                        self.config.destination_host, self.config.destination_token, dest_id, path, file.content, file.file_name)
-                    if response.status_code != 200:
-                        self.log.error(
-                            f"Failed to migrate package '{package['name']}' file '{file.file_name}':\n{response} - {response.text}")
-                        migration_status = False
-                    else:
-                        self.log.info(
-                            f"Successfully migrated package '{package['name']}' file '{file.file_name}'")
+                    transfers.append(partial(self.transfer_maven_file, src_id, dest_id, package, path, package_file))
+            migration_status = all(self.transfer.run(transfers))
 
             results.append({'Migrated': migration_status,
                            'Package': package['name']})
@@ -294,7 +306,26 @@ class PackagesClient(BaseClass):
             self.log.warning(
                 f"Unable to find usable data (executable or pom file is missing) for package '{package}'")
 
-    def migrate_pypi_packages(self, src_id, dest_id, package, results):
+    def transfer_maven_file(self, src_id, dest_id, package, path, package_file):
+        """
+        Streams a maven package file from the source to the destination
+        """
+        file_name = package_file['file_name']
+        self.log.info(
+            f"Attempting to migrate maven package '{package['name']}' file '{file_name}'")
+        response = self.transfer.stream_file(
+            f"{self.config.source_host}/api/v4/projects/{src_id}/packages/maven/{path}/{file_name}",
+            f"{self.config.destination_host}/api/v4/projects/{dest_id}/packages/maven/{path}/{file_name}",
+            package_file.get('size'))
+        if response.status_code not in [200, 201]:
+            self.log.error(
+                f"Failed to migrate package '{package['name']}' file '{file_name}':\n{response} - {response.text}")
+            return False
+        self.log.info(
+            f"Successfully migrated package '{package['name']}' file '{file_name}'")
+        return True
+
+    def migrate_pypi_packages(self, src_id, dest_id, package, results, all_dest_packages=None):
         version = package['version']
         package_name = package['name']
         artifact = self.format_artifact(package_name, version)
@@ -303,28 +334,8 @@ class PackagesClient(BaseClass):
         migration_status = True
 
         # Check if package already exists in destination
-        dest_packages = list(self.packages.get_project_packages(
-            self.config.destination_host,
-            self.config.destination_token,
-            dest_id
-        ))
-        
-        dest_package = next((p for p in dest_packages 
-                            if p.get('name') == package_name 
-                            and p.get('version') == version), None)
-                            
-        if dest_package:
+        if dest_files := self.get_dest_package_files(dest_id, package, all_dest_packages):
             self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] Package {package_name} v{version} already exists in destination, will check files")
-            
-            # Get file lists to check
-            dest_files = list(self.packages.get_package_files(
-                self.config.destination_host,
-                self.config.destination_token,
-                dest_id,
-                dest_package.get('id')
-            ))
-        else:
-            dest_files = []
 
         metadata = {}
         files = []
@@ -333,8 +344,8 @@ class PackagesClient(BaseClass):
             file_name = package_file['file_name']
             
             # Check if file already exists in destination
-            if dest_files and any(df['file_name'] == file_name for df in dest_files):
-                self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] File '{file_name}' already exists in destination. Skipping.")
+            if is_file_migrated(package_file, dest_files):
+                self.log.info(f"[Project SRC:{src_id} → DST:{dest_id}] File '{file_name}' already exists in destination with a matching checksum. Skipping.")
                 continue
 
             response = self.pypi_packages.download_pypi_project_package(
@@ -370,7 +381,7 @@ class PackagesClient(BaseClass):
 
         results.append({'Migrated': migration_status, 'Package': artifact})
 
-    def migrate_npm_packages(self, src_id, dest_id, package, results):
+    def migrate_npm_packages(self, src_id, dest_id, package, results, all_dest_packages=None):
         """
         Migrates a npm package from source project to destination project.
 
@@ -379,8 +390,10 @@ class PackagesClient(BaseClass):
         - dest_id: Identifier or path for the destination project.
         - package: The package name to migrate.
         - results: A dictionary to store the results of the migration.
+        - all_dest_packages: Optional pre-fetched list of destination packages.
 
         This method updates the `package.json` of both projects and records the migration status.
+        Files already in the destination with matching checksums are skipped.
         """
         version = package['version']
         package_name = package['name']
@@ -390,9 +403,14 @@ class PackagesClient(BaseClass):
         migration_status = True
 
         metadata = {}
+        dest_files = self.get_dest_package_files(dest_id, package, all_dest_packages)
         for package_file in self.packages.get_package_files(self.config.source_host, self.config.source_token, src_id, package.get('id')):
             file_name = package_file['file_name']
 
+            if is_file_migrated(package_file, dest_files):
+                self.log.info(f"Package {package_name} file {file_name} already exists in the destination instance. Skipping")
+                continue
+
             # Downloading the binary content file of the package
             response = self.npm_packages.download_npm_project_package(
                 self.config.source_host, self.config.source_token, src_id, package_name, file_name)
@@ -448,7 +466,7 @@ class PackagesClient(BaseClass):
 
         results.append({'Migrated': migration_status, 'Package': artifact})
 
-    def migrate_helm_packages(self, src_id, dest_id, package, results):
+    def migrate_helm_packages(self, src_id, dest_id, package, results, all_dest_packages=None):
         """
         Migrates a Helm package from source project to destination project.
 
@@ -457,8 +475,10 @@ class PackagesClient(BaseClass):
         - dest_id: Identifier or path for the destination project.
         - package: The package name to migrate.
         - results: A dictionary to store the results of the migration.
+        - all_dest_packages: Optional pre-fetched list of destination packages.
 
         This method updates the `package.json` of both projects and records the migration status.
+        Files already in the destination with matching checksums are skipped.
         """
         version = package['version']
         package_name = package['name']
@@ -470,8 +490,13 @@ class PackagesClient(BaseClass):
         src_user = self.users.get_current_user(self.config.source_host, self.config.source_token)
         dst_user = self.users.get_current_user(self.config.destination_host, self.config.destination_token)
         metadata = {}
+        dest_files = self.get_dest_package_files(dest_id, package, all_dest_packages)
         for package_file in self.packages.get_package_files(self.config.source_host, self.config.source_token, src_id, package.get('id')):
             file_name = package_file['file_name']
+            if is_file_migrated(package_file, dest_files):
+                self.log.info(
+                    f"Package '{file_name}' already exists in the destination instance. Skipping")
+                continue
             response = self.helm_packages.transfer_helm_package(self.config.source_host, self.config.destination_host, 
                                                                 self.config.source_token, self.config.destination_token, 
                                                                 src_id, dest_id, 
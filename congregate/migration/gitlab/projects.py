@@ -14,7 +14,7 @@ from gitlab_ps_utils.misc_utils import get_dry_log, get_timedelta, \
 from gitlab_ps_utils.json_utils import json_pretty, read_json_file_into_object, write_json_to_file
 from gitlab_ps_utils.list_utils import remove_dupes
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import mongo_connection, CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
 from congregate.migration.gitlab.api.projects import ProjectsApi
 from congregate.migration.gitlab.api.groups import GroupsApi
 from congregate.migration.gitlab.api.users import UsersApi
@@ -26,7 +26,7 @@ from congregate.migration.mirror import MirrorClient
 from congregate.helpers.migrate_utils import get_dst_path_with_namespace,  get_full_path_with_parent_namespace, \
     dig, get_staged_projects, get_staged_groups, add_post_migration_stats, is_user_project, \
     check_for_staged_user_projects, get_stage_wave_paths, search_for_user_by_user_mapping_field
-from congregate.helpers.utils import rotate_logs
+from congregate.helpers.utils import rotate_logs, is_changed_since, is_dot_com
 from congregate.migration.gitlab.api.project_repository import ProjectRepositoryApi
 from congregate.migration.meta.api_models.shared_with_group import SharedWithGroupPayload
 
@@ -42,6 +42,8 @@ class ProjectsClient(BaseClass):
         self.project_repository_api = ProjectRepositoryApi()
         self.dry_run = DRY_RUN
         self.skip_project_members = False
+        # Delta listing high-water mark (ISO 8601). Only projects active or updated since are listed
+        self.since = None
         super().__init__()
 
     def get_projects(self):
@@ -60,24 +62,38 @@ class ProjectsClient(BaseClass):
                 handle_retrieving_project.delay(host, token, project)
         else:
             if self.config.src_parent_group_path:
+                # Group projects cannot be filtered by last activity
                 self.multi.start_multi_process_stream_with_args(
                     self.handle_retrieving_project,
-                    self.groups_api.get_all_group_projects(
-                        self.config.src_parent_id, host, token, include_subgroups=True),
+                    (p for p in self.groups_api.get_all_group_projects(
+                        self.config.src_parent_id, host, token, include_subgroups=True) if is_changed_since(p, self.since)),
                     host,
                     token,
                     processes=processes)
             else:
                 self.multi.start_multi_process_stream_with_args(
                     self.handle_retrieving_project,
-                    self.projects_api.get_all_projects(host, token),
+                    self.get_changed_projects(host, token) if self.since else self.projects_api.get_all_projects(host, token),
                     host,
                     token,
                     processes=processes)
 
+    def get_changed_projects(self, host, token):
+        """
+            Projects with activity (last_activity_at) or changes (updated_at) since the delta listing high-water mark.
+            Renames, transfers, archiving and visibility changes only change updated_at
+        """
+        pids = set()
+        for projects in [self.projects_api.get_all_projects(host, token, last_activity_after=self.since),
+                         self.projects_api.get_all_projects(host, token, updated_after=self.since)]:
+            for project in projects:
+                if (pid := project.get("id")) not in pids:
+                    pids.add(pid)
+                    yield project
+
     def handle_retrieving_project(self, host, token, project, mongo=None):
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
         error, project = is_error_message_present(project)
         if error or not project:
             self.log.error(f"Failed to list project:\n{project}")
@@ -86,8 +102,34 @@ class ProjectsClient(BaseClass):
                 project.pop(k, None)
             project["members"] = [] if self.skip_project_members else list(
                 self.projects_api.get_members(project["id"], host, token))
-            mongo.insert_data(f"projects-{strip_netloc(host)}", project)
-        mongo.close_connection()
+            mongo.upsert_data(
+                f"projects-{strip_netloc(host)}", project, replace=bool(self.since))
+
+    def delete_missing_projects(self, host, token):
+        """
+            Sweep listed projects no longer found on source, after a delta listing.
+            Nothing is deleted unless the sweep provably listed every source project.
+
+            :return: (int) Number of deleted projects
+        """
+        if self.config.src_parent_group_path:
+            # Group projects have no keyset pagination. Offset pagination is complete only up to a known X-Total
+            count = self.groups_api.get_all_group_projects_count(
+                self.config.src_parent_id, host, token, include_subgroups=True)
+            pids = {p["id"] for p in self.groups_api.get_all_group_projects(
+                self.config.src_parent_id, host, token, include_subgroups=True, simple=True)
+                if isinstance(p, dict) and p.get("id")}
+            if count is None or len(pids) < count:
+                pids = None
+        elif not is_dot_com(host):
+            pids = self.projects_api.get_all_project_ids(host, token)
+        else:
+            return 0
+        if not pids:
+            self.log.warning(
+                "Skipping deleted projects sweep. Could not list every source project")
+            return 0
+        return get_shared_mongo_connector().delete_missing(f"projects-{strip_netloc(host)}", pids)
 
     def add_shared_groups(self, new_id, path, shared_with_groups):
         """Adds the list of groups we share the project with."""
@@ -1163,7 +1205,7 @@ class ProjectsClient(BaseClass):
 
 
 @shared_task(name='retrieve-gl-projects')
-@mongo_connection
+@shared_mongo_connection
 def handle_retrieving_project(host, token, project, mongo=None):
     pc = ProjectsClient()
     error, project = is_error_message_present(project)
@@ -1174,4 +1216,4 @@ def handle_retrieving_project(host, token, project, mongo=None):
             project.pop(k, None)
         project["members"] = [] if pc.skip_project_members else list(
             pc.projects_api.get_members(project["id"], host, token))
-        mongo.insert_data(f"projects-{strip_netloc(host)}", project)
+        mongo.upsert_data(f"projects-{strip_netloc(host)}", project)
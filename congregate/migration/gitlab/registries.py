@@ -1,4 +1,5 @@
 from httpx import RequestError
+from requests.exceptions import RequestException
 from datetime import datetime
 import shutil
 
@@ -10,6 +11,7 @@ from congregate.helpers.base_class import BaseClass
 from congregate.helpers.migrate_utils import get_target_project_path
 from congregate.migration.gitlab.api.users import UsersApi
 from congregate.migration.gitlab.api.projects import ProjectsApi
+from congregate.migration.gitlab.registry_copy import OciRegistry, RegistryCopier
 
 
 class RegistryClient(BaseClass):
@@ -47,6 +49,8 @@ class RegistryClient(BaseClass):
             return False
 
     def migrate(self, project, old_id, name):
+        if str(self.config.registry_copy_method).lower() == "api":
+            return self.copy(project, old_id, name)
         try:
             # Login to source registry
             src_client = self.__login_to_registry(
@@ -156,14 +160,9 @@ class RegistryClient(BaseClass):
         skipped_count = 0
         
         # Count total source tags
-        total_tags = len(list(tags))
-        
-        # Reset tags iterator (since we just consumed it)
-        tags_response = self.projects_api.get_all_project_registry_repositories_tags(
-            old_id, repo["id"], self.config.source_host, self.config.source_token
-        )
-        tags = iter(tags_response)
-        
+        tags = list(tags)
+        total_tags = len(tags)
+
         for tag in tags:
             # The current tag we are working on
             # Eg: latest or rolling-debian, etc
@@ -277,6 +276,74 @@ class RegistryClient(BaseClass):
             "skipped_count": skipped_count
         }
 
+    def copy(self, project, old_id, name):
+        """
+            Copy the project container registries blob by blob, through the registry HTTP API (registry_copy_method = api)
+        """
+        try:
+            copier = RegistryCopier(
+                self.__get_registry(self.config.source_host, self.config.source_token, self.config.source_registry),
+                self.__get_registry(self.config.destination_host, self.config.destination_token, self.config.destination_registry))
+            self.log.info(
+                f"Copying project {name} (ID: {old_id}) container registries")
+            total_tags, total_success = 0, 0
+            for repo in self.projects_api.get_all_project_registry_repositories(
+                    old_id, self.config.source_host, self.config.source_token):
+                error, repo = is_error_message_present(repo)
+                if error or not repo:
+                    self.log.error(
+                        f"Failed to fetch container registries ({repo}) for project {name}")
+                    return False
+                result = self.__copy_tags(project, repo, copier, name, old_id)
+                total_tags += result["total_tags"]
+                total_success += result["success_count"]
+            self.log.info(
+                f"Registry copy summary for project {name} (ID: {old_id}): {total_success}/{total_tags} tags, "
+                f"{copier.copied} blobs ({copier.bytes_copied} bytes) copied, {copier.mounted} mounted, {copier.skipped} already present")
+            if total_success < total_tags:
+                self.log.warning(
+                    f"WARNING: {total_tags - total_success} tags could not be copied from project {name}")
+            return True
+        except (RequestError, RequestException) as re:
+            self.log.error(
+                f"Failed to copy container registries for project {name}, with error:\n{re}")
+            return False
+
+    def __copy_tags(self, project, repo, copier, name, old_id):
+        repo_loc = repo["location"]
+        new_reg = self.generate_destination_registry_url(project, repo_loc)
+        src_repo = copier.src.repository_path(repo_loc)
+        dest_repo = copier.dest.repository_path(new_reg)
+        all_tags, success_count = [], 0
+        tags = list(self.projects_api.get_all_project_registry_repositories_tags(
+            old_id, repo["id"], self.config.source_host, self.config.source_token))
+        for tag in tags:
+            tag_name = tag["name"]
+            all_tags.append((f"{repo_loc}:{tag_name}", f"{new_reg}:{tag_name}"))
+            if self.reg_dry_run:
+                continue
+            try:
+                self.log.info(f"Copying image {repo_loc}:{tag_name} to {new_reg}:{tag_name}")
+                copier.copy_image(src_repo, dest_repo, tag_name)
+                success_count += 1
+            except (RequestException, KeyError, ValueError) as e:
+                self.log.error(
+                    f"Failed to copy image {repo_loc}:{tag_name} to {new_reg}:{tag_name}, with error:\n{e}")
+        self.log.info(
+            f"Registry copy report for repository {repo_loc} of project {name} (ID: {old_id}): {success_count}/{len(tags)} tags")
+        with open(f"{self.app_path}/data/reg_tuples/{old_id}_repos.tpls", "a") as tplf:
+            for tpl in all_tags:
+                tplf.write(f"{str(tpl)},\n")
+        return {
+            "total_tags": len(tags),
+            "success_count": success_count
+        }
+
+    def __get_registry(self, host, token, registry):
+        username = safe_json_response(
+            self.users.get_current_user(host, token)).get("username")
+        return OciRegistry(registry, username=username, password=token, ssl_verify=self.config.ssl_verify)
+
     def __clean_local(self, cleaner, client, key):
         """
         Cleans up processed images from the migration only
@@ -0,0 +1,234 @@
+"""
+Copies container images between registries through the OCI distribution HTTP API,
+without a local Docker daemon or disk.
+
+Only the blobs missing from the destination repository are copied, in parallel.
+Blobs already pushed to another destination repository are cross-mounted from it instead,
+so base layers shared across tags and projects are transferred once.
+"""
+import re
+from json import loads
+from hashlib import sha256
+from threading import Lock
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+from congregate.helpers.base_class import BaseClass
+from congregate.helpers.http_session import get_pooled_session
+
+MANIFEST_LIST_TYPES = [
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.index.v1+json"
+]
+MANIFEST_TYPES = MANIFEST_LIST_TYPES + [
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.oci.image.manifest.v1+json"
+]
+# Non-distributable (e.g. Windows base) layers stay on their external URLs
+FOREIGN_LAYER_TYPES = [
+    "application/vnd.docker.image.rootfs.foreign.diff.tar.gzip",
+    "application/vnd.oci.image.layer.nondistributable.v1.tar+gzip"
+]
+
+
+class BlobStream():
+    '''
+        Streams a source blob response into an upload request body, with a known Content-Length
+    '''
+    def __init__(self, response, size):
+        self.response = response
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return self.response.iter_content(chunk_size=1024 * 1024)
+
+    def read(self, size=None):
+        return self.response.raw.read(size, decode_content=False)
+
+
+class OciRegistry():
+    def __init__(self, registry, username=None, password=None, ssl_verify=True):
+        self.url = (registry if "://" in registry else f"https://{registry}").rstrip("/")
+        self.domain = self.url.split("://")[-1]
+        self.auth = (username, password) if username else None
+        self.ssl_verify = ssl_verify
+        self.tokens = {}
+
+    def repository_path(self, location):
+        """
+            Strip the registry domain from a repository location e.g. registry.example.com/group/project/image
+        """
+        if location.lower().startswith(self.domain.lower()):
+            return location[len(self.domain):].strip("/")
+        return location.strip("/")
+
+    def request(self, method, repo, path=None, url=None, scopes=None, headers=None, **kwargs):
+        """
+            Send a registry API request, authenticating against the token realm of a Bearer challenge
+        """
+        url = url or f"{self.url}/v2/{repo}/{path}"
+        scopes = tuple(scopes or [f"repository:{repo}:pull"])
+        headers = dict(headers or {})
+        if token := self.tokens.get(scopes):
+            headers["Authorization"] = f"Bearer {token}"
+        session = get_pooled_session(url)
+        response = session.request(
+            method, url, headers=headers, verify=self.ssl_verify, **kwargs)
+        challenge = response.headers.get("WWW-Authenticate", "")
+        if response.status_code == 401 and challenge.lower().startswith("bearer"):
+            headers["Authorization"] = f"Bearer {self.get_token(challenge, scopes)}"
+            response = session.request(
+                method, url, headers=headers, verify=self.ssl_verify, **kwargs)
+        return response
+
+    def get_token(self, challenge, scopes):
+        params = dict(re.findall(r'(\w+)="([^"]*)"', challenge))
+        realm = params.pop("realm")
+        response = get_pooled_session(realm).get(realm, params={
+            "service": params.get("service"),
+            "scope": list(scopes)
+        }, auth=self.auth, verify=self.ssl_verify)
+        response.raise_for_status()
+        data = response.json()
+        self.tokens[scopes] = data.get("token") or data.get("access_token")
+        return self.tokens[scopes]
+
+    def push_scopes(self, repo):
+        return [f"repository:{repo}:push,pull"]
+
+    def get_manifest(self, repo, reference):
+        """
+            :return: (tuple) Manifest content, media type and digest
+        """
+        response = self.request("GET", repo, f"manifests/{reference}", headers={
+            "Accept": ", ".join(MANIFEST_TYPES)})
+        response.raise_for_status()
+        digest = response.headers.get(
+            "Docker-Content-Digest") or f"sha256:{sha256(response.content).hexdigest()}"
+        return response.content, response.headers.get("Content-Type"), digest
+
+    def put_manifest(self, repo, reference, content, media_type):
+        response = self.request("PUT", repo, f"manifests/{reference}", scopes=self.push_scopes(repo),
+                                data=content, headers={"Content-Type": media_type})
+        response.raise_for_status()
+
+    def has_blob(self, repo, digest):
+        return self.request("HEAD", repo, f"blobs/{digest}", scopes=self.push_scopes(repo)).status_code == 200
+
+    def get_blob(self, repo, digest):
+        response = self.request("GET", repo, f"blobs/{digest}", stream=True)
+        response.raise_for_status()
+        return response
+
+    def mount_blob(self, repo, digest, from_repo):
+        """
+            Cross-mount a blob from another repository of this registry
+
+            :return: (bool) Whether the blob was mounted
+        """
+        response = self.request("POST", repo, "blobs/uploads/", params={"mount": digest, "from": from_repo},
+                                scopes=self.push_scopes(repo) + [f"repository:{from_repo}:pull"])
+        if response.status_code == 201:
+            return True
+        response.raise_for_status()
+        return False
+
+    def upload_blob(self, repo, digest, data):
+        """
+            Monolithic blob upload.
+            Starting a new upload right before it also renews an expired token, as the streamed data cannot be sent twice.
+        """
+        response = self.request(
+            "POST", repo, "blobs/uploads/", scopes=self.push_scopes(repo))
+        response.raise_for_status()
+        response = self.request("PUT", repo, url=urljoin(f"{self.url}/", response.headers["Location"]), scopes=self.push_scopes(repo),
+                                params={"digest": digest}, data=data, headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+
+
+class RegistryCopier(BaseClass):
+    # Destination repositories holding each blob pushed by this process, to cross-mount from
+    mount_sources = {}
+    mount_sources_lock = Lock()
+
+    def __init__(self, src, dest):
+        super().__init__()
+        self.src = src
+        self.dest = dest
+        self.max_workers = self.config.registry_blob_concurrency
+        self.copied = 0
+        self.mounted = 0
+        self.skipped = 0
+        self.bytes_copied = 0
+        self.__stats_lock = Lock()
+
+    def copy_image(self, src_repo, dest_repo, tag):
+        """
+            Copy a tagged image, or multi-platform image index, and all its blobs
+
+            :param src_repo: (str) Source repository path e.g. group/project/image
+            :param dest_repo: (str) Destination repository path
+            :param tag: (str) Image tag
+            :return: (str) The copied manifest digest
+        """
+        content, media_type, digest = self.src.get_manifest(src_repo, tag)
+        children, blobs = [], {}
+        if media_type in MANIFEST_LIST_TYPES:
+            for descriptor in self.parse(content).get("manifests", []):
+                child = self.src.get_manifest(src_repo, descriptor["digest"])
+                children.append(child)
+                blobs.update(self.get_blobs(child[0]))
+        else:
+            blobs.update(self.get_blobs(content))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Consume the results to raise the first error
+            list(executor.map(lambda b: self.copy_blob(
+                src_repo, dest_repo, b), blobs.values()))
+        for child_content, child_type, child_digest in children:
+            self.dest.put_manifest(dest_repo, child_digest, child_content, child_type)
+        self.dest.put_manifest(dest_repo, tag, content, media_type)
+        return digest
+
+    def parse(self, content):
+        return content if isinstance(content, dict) else loads(content)
+
+    def get_blobs(self, manifest):
+        manifest = self.parse(manifest)
+        descriptors = [manifest["config"]] if manifest.get("config") else []
+        descriptors += manifest.get("layers", [])
+        return {d["digest"]: d for d in descriptors if d.get("mediaType") not in FOREIGN_LAYER_TYPES}
+
+    def copy_blob(self, src_repo, dest_repo, descriptor):
+        digest = descriptor["digest"]
+        if self.dest.has_blob(dest_repo, digest):
+            self.add_mount_source(digest, dest_repo)
+            with self.__stats_lock:
+                self.skipped += 1
+            return
+        from_repo = self.get_mount_source(digest)
+        if from_repo and from_repo != dest_repo and self.dest.mount_blob(dest_repo, digest, from_repo):
+            self.add_mount_source(digest, dest_repo)
+            with self.__stats_lock:
+                self.mounted += 1
+            return
+        response = self.src.get_blob(src_repo, digest)
+        try:
+            self.dest.upload_blob(dest_repo, digest, BlobStream(
+                response, descriptor["size"]))
+        finally:
+            response.close()
+        self.add_mount_source(digest, dest_repo)
+        with self.__stats_lock:
+            self.copied += 1
+            self.bytes_copied += descriptor["size"]
+
+    def get_mount_source(self, digest):
+        with self.mount_sources_lock:
+            return self.mount_sources.get((self.dest.url, digest))
+
+    def add_mount_source(self, digest, repo):
+        with self.mount_sources_lock:
+            self.mount_sources[(self.dest.url, digest)] = repo
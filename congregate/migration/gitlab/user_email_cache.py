@@ -0,0 +1,87 @@
+"""
+Per-process cache of GitLab user emails, used to enrich group and project members.
+
+Emails are looked up in an in-process LRU first, then in the listed source users (users-<host> collection).
+Users missing from both are left to the caller to resolve, and stored back into the LRU.
+"""
+from collections import OrderedDict
+from threading import Lock
+
+from pymongo.errors import PyMongoError
+from gitlab_ps_utils.misc_utils import strip_netloc
+
+from congregate.helpers.base_class import BaseClass
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
+
+
+class UserEmailCache(BaseClass):
+    def __init__(self):
+        super().__init__()
+        self.max_size = self.config.user_email_cache_size
+        self.hits = 0
+        self.misses = 0
+        self.__emails = OrderedDict()
+        self.__lock = Lock()
+
+    def get_many(self, host, uids):
+        """
+            Get cached user emails
+
+            :param host: (str) GitLab host URL
+            :param uids: (list) GitLab user IDs
+            :return: (dict) Emails of the found user IDs
+        """
+        hostname = strip_netloc(host)
+        found = {}
+        with self.__lock:
+            for uid in uids:
+                if (key := (hostname, uid)) in self.__emails:
+                    self.__emails.move_to_end(key)
+                    found[uid] = self.__emails[key]
+        if missing := [uid for uid in uids if uid not in found]:
+            listed = self.find_listed_user_emails(host, missing)
+            self.set_many(host, listed)
+            found.update(listed)
+        self.hits += len(found)
+        self.misses += len(uids) - len(found)
+        return found
+
+    def set_many(self, host, emails):
+        hostname = strip_netloc(host)
+        with self.__lock:
+            for uid, email in emails.items():
+                self.__emails[(hostname, uid)] = email
+                self.__emails.move_to_end((hostname, uid))
+            while len(self.__emails) > self.max_size:
+                self.__emails.popitem(last=False)
+
+    def find_listed_user_emails(self, host, uids):
+        """
+            Look up user emails stored when listing the source users
+        """
+        hostname = strip_netloc(host)
+        if not self.config.source_host or hostname != strip_netloc(self.config.source_host):
+            return {}
+        try:
+            mongo = get_shared_mongo_connector()
+            return {
+                u["id"]: u["email"] for u in mongo.db[f"users-{hostname}"].find(
+                    {"id": {"$in": uids}}, {"id": 1, "email": 1}) if u.get("email")
+            }
+        except PyMongoError as e:
+            self.log.warning(
+                f"Failed to look up listed '{hostname}' user emails, with error:\n{e}")
+            return {}
+
+
+_cache = None
+
+
+def get_user_email_cache():
+    '''
+        Returns the UserEmailCache shared by everything running in this process.
+    '''
+    global _cache
+    if _cache is None:
+        _cache = UserEmailCache()
+    return _cache
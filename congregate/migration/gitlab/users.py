@@ -9,7 +9,7 @@ from gitlab_ps_utils.json_utils import json_pretty, read_json_file_into_object,
 from gitlab_ps_utils.dict_utils import rewrite_list_into_dict, rewrite_json_list_into_dict
 
 from congregate.helpers.base_class import BaseClass
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector, mongo_connection
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector, shared_mongo_connection
 from congregate.helpers.migrate_utils import get_staged_users, find_user_by_email_comparison_without_id, is_gl_version_older_than
 from congregate.helpers.utils import is_dot_com
 from congregate.migration.gitlab import constants
@@ -615,7 +615,7 @@ class UsersClient(BaseClass):
         # mongo should be set to None unless this function is being used in a
         # unit test
         if not mongo:
-            mongo = CongregateMongoConnector()
+            mongo = get_shared_mongo_connector()
 
         user["email"] = user.get("email", user.get("public_email", "")).lower()
         projects_limit = self.config.projects_limit
@@ -630,9 +630,8 @@ class UsersClient(BaseClass):
         # Avoid propagating field when creating users on gitlab.com with no config value set
         if is_dot_com(self.config.destination_host) and not projects_limit:
             user.pop("projects_limit", None)
-        mongo.insert_data(
+        mongo.upsert_data(
             f"users-{strip_netloc(self.config.source_host)}", user)
-        mongo.close_connection()
 
     def generate_user_data(self, user):
         user_model = from_dict(data_class=UserPayload, data=user)
@@ -882,7 +881,7 @@ class UsersClient(BaseClass):
 
 
 @shared_task(name='retrieve-gl-users')
-@mongo_connection
+@shared_mongo_connection
 def handle_retrieving_users_task(user, mongo=None):
     # mongo should be set to None unless this function is being used in a
     # unit test
@@ -904,7 +903,7 @@ def handle_retrieving_users_task(user, mongo=None):
         # Avoid propagating field when creating users on gitlab.com with no config value set
         if is_dot_com(user_client.config.destination_host) and not projects_limit:
             user.pop("projects_limit", None)
-        mongo.insert_data(
+        mongo.upsert_data(
             f"users-{strip_netloc(user_client.config.source_host)}", user)
     else:
         user_client.log.warning(f"Unable to process user data. Was provided [{user}]")
@@ -19,6 +19,7 @@ from congregate.helpers.utils import rotate_logs, is_dot_com
 from congregate.helpers.reporting import Reporting
 from congregate.cli.stage_projects import ProjectStageCLI
 from congregate.helpers.base_class import BaseClass
+from congregate.helpers.client_registry import lazy_client
 from congregate.migration.gitlab.users import UsersClient
 from congregate.migration.gitlab.api.users import UsersApi
 from congregate.migration.gitlab.keys import KeysClient
@@ -29,6 +30,16 @@ from congregate.migration.bitbucket.keys import KeysClient as bbKeysClient
 
 
 class MigrateClient(BaseClass):
+    # Sub-clients are created on first use
+    users = lazy_client(UsersClient)
+    users_api = lazy_client(UsersApi)
+    groups = lazy_client(GroupsClient)
+    groups_api = lazy_client(GroupsApi)
+    projects = lazy_client(ProjectsClient)
+    projects_api = lazy_client(ProjectsApi)
+    keys = lazy_client(KeysClient)
+    bbkeys = lazy_client(bbKeysClient)
+
     def __init__(
         self,
         dry_run=True,
@@ -52,14 +63,6 @@ class MigrateClient(BaseClass):
         retain_contributors=False,
         permanent=False,
     ):
-        self.users = UsersClient()
-        self.users_api = UsersApi()
-        self.groups = GroupsClient()
-        self.groups_api = GroupsApi()
-        self.projects = ProjectsClient()
-        self.projects_api = ProjectsApi()
-        self.keys = KeysClient()
-        self.bbkeys = bbKeysClient()
         super().__init__()
         self.dry_run = dry_run
         self.processes = processes
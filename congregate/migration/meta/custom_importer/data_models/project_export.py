@@ -26,7 +26,8 @@ class ProjectExport:
     '''
         Main dataclass for building out the content in the project tree folder
 
-        This will pull all the data together and eventually turn into several ndjson files
+        This will pull all the data together and eventually turn into several ndjson files.
+        List components may also be generators, written to their ndjson file as each record is built.
     '''
 
     # Required
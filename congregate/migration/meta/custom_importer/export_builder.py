@@ -2,6 +2,13 @@ import os
 import tempfile
 import tarfile
 from shutil import rmtree
+from hashlib import sha1
+from base64 import b64encode
+from contextlib import contextmanager
+from types import GeneratorType
+from concurrent.futures import ThreadPoolExecutor
+from fcntl import flock, LOCK_EX
+from urllib.parse import urlsplit, urlunsplit, unquote
 from json import dumps
 from dataclasses import fields
 from git import Repo, GitCommandError
@@ -18,11 +25,11 @@ class ExportBuilder(BaseClass):
 
         This class handles the final construction of the project export with functions to:
 
-        - Clone the git repo
+        - Mirror clone the git repo, reusing cached mirrors
         - Create a git repo bundle
         - Create the project export structure
-        - Convert all tree dataclasses into ndjson files
-        - Build the packaged tar.gz file
+        - Convert all tree dataclasses into ndjson files, streaming lazily built (generator) records
+        - Build the packaged tar.gz file, optionally while the export is still being built
     '''
 
     BINARY_FORMATS = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.bmp', '.webp']
@@ -38,6 +45,9 @@ class ExportBuilder(BaseClass):
         self.project = project
         self.git_env = git_env
         self.repo = None
+        self.mirror_path = None
+        # (tarfile, executor, futures) while packaging the export as it is built
+        self.packer = None
 
     def build_export(self, tree_export: ProjectExport, project_metadata: Project):
         """
@@ -52,22 +62,26 @@ class ExportBuilder(BaseClass):
         :param host: The GitLab host URL
         :param token: The access token for authentication
         """
-        # Create git bundle
-        if self.repo is None:
-            self.repo = self.clone_repo(self.project_path, self.clone_url)
-        try:
+        for d in [self.tree_path, self.project_path]:
+            self.file_done(d)
+
+        # Create git bundle, while no other process refreshes the mirror
+        with self.mirror_lock(self.clone_url):
+            if self.repo is None:
+                self.repo = self.update_mirror(self.project_path, self.clone_url)
             git_bundle_path = self.create_git_bundle(self.project, self.export_dir.name)
-            if git_bundle_path:
-                self.log.info(f"Created Git bundle at {git_bundle_path}")
-        except (GitCommandError, Exception) as e:
-            raise
+        if git_bundle_path:
+            self.log.info(f"Created Git bundle at {git_bundle_path}")
+            self.file_done(git_bundle_path)
             
 
         # Create snippets directory
         os.makedirs(os.path.join(self.export_dir.name, 'snippets'), exist_ok=True)
+        self.file_done(os.path.join(self.export_dir.name, 'snippets'))
 
         # Create uploads directory
         os.makedirs(os.path.join(self.export_dir.name, 'uploads'), exist_ok=True)
+        self.file_done(os.path.join(self.export_dir.name, 'uploads'))
 
         # Create GITLAB_VERSION and GITLAB_REVISION files
         self.write_to_file('GITLAB_VERSION', self.get_gitlab_version(self.config.destination_host, self.config.destination_token))
@@ -93,6 +107,43 @@ class ExportBuilder(BaseClass):
                 tar.add(os.path.join(self.export_dir.name, f), arcname=f)
         return filename
 
+    def build_export_tar_gz(self, tree_export: ProjectExport, project_metadata: Project):
+        """
+        Build a custom project export straight into its packaged tar.gz file.
+
+        Each export file is added to the tar.gz by a background thread as soon as it is written,
+        e.g. the git bundle is compressed while the tree records are still being fetched.
+
+        :param tree_export: ProjectExport object containing the exported project data
+        :param project_metadata: Project object containing the project metadata
+        :return: The tar.gz filename, under <filesystem_path>/downloads
+        """
+        filename = get_export_filename_from_namespace_and_name(
+                self.project['namespace'], self.project['name'])
+        path = f"{self.config.filesystem_path}/downloads/{filename}"
+        try:
+            with tarfile.open(path, mode="w:gz") as tar, ThreadPoolExecutor(max_workers=1) as executor:
+                self.packer = (tar, executor, [])
+                self.build_export(tree_export, project_metadata)
+                for future in self.packer[2]:
+                    future.result()
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        finally:
+            self.packer = None
+        return filename
+
+    def file_done(self, path):
+        """
+        Add a written export file (or directory) to the tar.gz being packaged, if any
+        """
+        if self.packer:
+            tar, executor, futures = self.packer
+            futures.append(executor.submit(
+                tar.add, path, arcname=os.path.relpath(path, self.export_dir.name), recursive=False))
+
     def get_gitlab_version(self, host, token):
         """
         Get the GitLab version from the specified host using the provided token.
@@ -132,7 +183,8 @@ class ExportBuilder(BaseClass):
             if self.repo:
                 # Create the bundle
                 bundle_path = f"{output_path}/project.bundle"
-                self.repo.git.bundle('create', bundle_path, '--all')
+                # Skip the mirrored non-branch refs e.g. refs/pull/*
+                self.repo.git.bundle('create', bundle_path, 'HEAD', '--branches', '--tags')
 
                 return bundle_path
             raise Exception("No repo cloned")
@@ -146,27 +198,52 @@ class ExportBuilder(BaseClass):
             raise
     
     def clone_repo(self, project_path, clone_url) -> Repo:
+        """
+        Mirror clone the repository into a bare repo, cached per source URL (git_mirror_cache).
+        A cached mirror is refreshed with only the new objects, and pruned of deleted refs.
+
+        :param project_path: The full path of the project
+        :param clone_url: The source repository URL
+        :return: The bare mirror Repo, or False if cloning failed
+        """
+        with self.mirror_lock(clone_url):
+            return self.update_mirror(project_path, clone_url)
+
+    @contextmanager
+    def mirror_lock(self, clone_url):
+        """
+        Hold the cached mirror lock, so processes exporting the same repository wait for each other
+        """
+        self.mirror_path = self.get_mirror_path(clone_url)
+        os.makedirs(os.path.dirname(self.mirror_path), exist_ok=True)
+        with open(f"{self.mirror_path}.lock", "a") as lock:
+            flock(lock, LOCK_EX)
+            yield
+
+    def update_mirror(self, project_path, clone_url):
+        """
+        Clone or refresh the cached mirror, while holding its lock.
+        The mirror only keeps the credential-free URL, as credentials are passed to each fetch.
+
+        :return: The bare mirror Repo, or False if cloning failed
+        """
         if not self.git_env:
             self.git_env = {
-                'GIT_SSL_NO_VERIFY': '1',
-                'pull.rebase': 'false'
+                'GIT_SSL_NO_VERIFY': '1'
             }
+        git_env = {**self.git_env, **self.get_credential_env(clone_url)}
+        url = self.get_credential_free_url(clone_url)
         try:
-            os.makedirs('repos', exist_ok=True)
-            repos_dir = f'repos/{project_path}'
-            # Clone the repository
-            repo = Repo.clone_from(clone_url, repos_dir, env=self.git_env)
-            repo.git.pull('--all')
-            default_branch = repo.git.branch('--show-current')
-            for branch in repo.git.branch('-a').split('\n'):
-                name = branch.lstrip('*').lstrip().split('->')[0].rstrip().split('remotes/origin/')[-1]
-                if name != 'HEAD':
-                    repo.git.checkout(name, '-f')
-                    repo.git.pull('origin', name)
-            for tag in repo.tags:
-                repo.git.checkout(tag.name, '-f')
-                repo.git.pull('origin', tag.name)
-            repo.git.checkout(default_branch)
+            if os.path.isdir(self.mirror_path):
+                repo = Repo(self.mirror_path)
+                # Mirrors of earlier versions kept the credentials in the URL
+                repo.git.remote('set-url', 'origin', url)
+                with repo.git.custom_environment(**git_env):
+                    repo.git.fetch('--prune', 'origin')
+                self.log.info(f"Refreshed cached mirror of {project_path} at {self.mirror_path}")
+            else:
+                repo = Repo.clone_from(url, self.mirror_path, mirror=True, env=git_env)
+                self.log.info(f"Mirrored {project_path} to {self.mirror_path}")
             return repo
 
         except GitCommandError as e:
@@ -176,7 +253,34 @@ class ExportBuilder(BaseClass):
         except Exception as e:
             self.log.error(f"Error creating Git bundle for {project_path}: {str(e)}")
             return False
-        
+
+    def get_credential_free_url(self, clone_url):
+        parts = urlsplit(clone_url)
+        return urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[-1]))
+
+    def get_credential_env(self, clone_url):
+        """
+        Git environment passing the clone URL credentials as an HTTP basic auth header,
+        through environment config so they are neither stored nor shown in the process arguments
+        """
+        parts = urlsplit(clone_url)
+        if parts.username is None:
+            return {}
+        credentials = b64encode(f"{unquote(parts.username)}:{unquote(parts.password or '')}".encode()).decode()
+        return {
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': 'http.extraHeader',
+            'GIT_CONFIG_VALUE_0': f"Authorization: Basic {credentials}",
+            'GIT_TERMINAL_PROMPT': '0'
+        }
+
+    def get_mirror_path(self, clone_url):
+        """
+        Mirror location of a source URL, keyed without its credentials
+        """
+        key = urlunsplit(urlsplit(self.get_credential_free_url(clone_url))._replace(query="", fragment=""))
+        return os.path.join(self.config.filesystem_path, "repos", "mirrors", f"{sha1(key.encode()).hexdigest()}.git")
+
     def create_tree_files(self, export: ProjectExport):
         """
         Create tree files for the project export.
@@ -195,21 +299,34 @@ class ExportBuilder(BaseClass):
     def create_tree_ndjson(self, data, output_path):
         """
         Write tree data to an ndjson file
+
+        Records of a list or generator are written in batches of export_ndjson_buffer_size,
+        so a generator's records are written (and released) while the next ones are built.
         """
         with open(output_path, "w") as f:
             if isinstance(data, dict):
                 f.write(f"{dumps(data.to_dict())}\n")
-            elif isinstance(data, list):
+            elif isinstance(data, (list, GeneratorType)):
+                buffer_size = self.config.export_ndjson_buffer_size
+                buffer = []
                 for item in data:
-                    f.write(f"{dumps(item.to_dict())}\n")
+                    buffer.append(f"{dumps(item.to_dict())}\n")
+                    if len(buffer) >= buffer_size:
+                        f.writelines(buffer)
+                        f.flush()
+                        buffer = []
+                f.writelines(buffer)
             else:
                 f.write('null')
+        self.file_done(output_path)
 
     def write_to_file(self, file_path, data, root=None):
         base_path = self.export_dir.name if not root else root
         with open(base_path + "/" + file_path, "w") as f:
             f.write(data)
+        self.file_done(base_path + "/" + file_path)
 
     def delete_cloned_repo(self):
-        rmtree(f'repos/{self.project_path}')
+        if not self.config.git_mirror_cache and self.mirror_path:
+            rmtree(self.mirror_path, ignore_errors=True)
     
\ No newline at end of file
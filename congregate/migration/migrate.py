@@ -36,6 +36,7 @@ class MigrateClient(BaseClass):
         sync_members=False,
         hard_delete=False,
         stream_groups=False,
+        stream_projects=False,
         skip_groups=False,
         skip_projects=False,
         skip_group_export=False,
@@ -59,6 +60,7 @@ class MigrateClient(BaseClass):
         self.start = start
         self.skip_users = skip_users
         self.stream_groups = stream_groups
+        self.stream_projects = stream_projects
         self.remove_members = remove_members
         self.sync_members = sync_members
         self.hard_delete = hard_delete
@@ -107,7 +109,8 @@ class MigrateClient(BaseClass):
                                 subgroups_only=self.subgroups_only,
                                 reg_dry_run=self.reg_dry_run,
                                 group_structure=self.group_structure,
-                                retain_contributors=self.retain_contributors
+                                retain_contributors=self.retain_contributors,
+                                stream_projects=self.stream_projects
                                 ).migrate()
         elif self.config.source_type == "bitbucket server":
             BitBucketServerMigrateClient(dry_run=self.dry_run,
@@ -11,7 +11,7 @@ from gitlab_ps_utils.dict_utils import dig
 from gitlab_ps_utils.string_utils import convert_to_underscores
 from congregate.migration.meta.base_ext_ci import BaseExternalCiClient
 from congregate.migration.teamcity.api.base import TeamcityApi
-from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.helpers.congregate_mdbc import get_shared_mongo_connector
 
 
 class TeamcityClient(BaseExternalCiClient):
@@ -28,7 +28,7 @@ class TeamcityClient(BaseExternalCiClient):
             build_configs, 'buildTypes', 'buildType'), processes=processes)
 
     def handle_retrieving_tc_jobs(self, job):
-        mongo = CongregateMongoConnector()
+        mongo = get_shared_mongo_connector()
         job_name = job['@id']
         scm_data = self.teamcity_api.get_build_vcs_roots(job_name)
         tc_host = strip_netloc(self.teamcity_api.host)
@@ -42,13 +42,12 @@ class TeamcityClient(BaseExternalCiClient):
             job_dict = {'name': job_name, 'url': scm_url}
             self.log.info(
                 f"Inserting TC job {job_name} from {tc_host} into mongo")
-            mongo.insert_data(f"teamcity-{tc_host}", job_dict)
+            mongo.upsert_data(f"teamcity-{tc_host}", job_dict, key="name")
         else:
             job_dict = {'name': job_name, 'url': "no_scm"}
             self.log.info(
                 f"Inserting TC job {job_name} from {tc_host} with no SCM attached into mongo")
-            mongo.insert_data(f"teamcity-{tc_host}", job_dict)
-        mongo.close_connection()
+            mongo.upsert_data(f"teamcity-{tc_host}", job_dict, key="name")
 
     def transform_ci_variables(self, parameter, ci_src_hostname):
         """
@@ -0,0 +1,58 @@
+"""
+Throughput benchmark of congregate against synthetic GitLab instances
+
+    python -m congregate.tests.benchmark --size small --output before.json
+    python -m congregate.tests.benchmark --size small --output after.json --compare before.json
+"""
+import sys
+import json
+import argparse
+from tempfile import mkdtemp
+
+from congregate.tests.benchmark.runner import BenchmarkRunner, PHASES, SIZES, compare, write_report
+
+
+def parse_endpoint_latency(values):
+    latency = {}
+    for value in values or []:
+        pattern, seconds = value.rsplit("=", 1)
+        latency[pattern] = float(seconds)
+    return latency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure listing, staging, migration and diff throughput against local mock GitLab instances")
+    parser.add_argument("--size", choices=SIZES, default="small", help="Synthetic source instance size")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=PHASES,
+                        help="Phases to run, in order. Later phases need the files of earlier ones")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--endpoint-latency", nargs="*", metavar="REGEX=SECONDS",
+                        help="Seconds added to responses of matching paths, e.g. '/export$=0.5'")
+    parser.add_argument("--page-size", type=int, help="Max items per page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--path", help="Working directory (CONGREGATE_PATH). Defaults to a new temporary directory")
+    parser.add_argument("--output", help="Write the JSON report to a file instead of stdout")
+    parser.add_argument("--compare", metavar="REPORT", help="Add the change (%%) from an earlier JSON report")
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(args.path or mkdtemp(prefix="congregate-benchmark-"), size=args.size, server_options={
+                                 "latency": args.latency,
+                                 "endpoint_latency": parse_endpoint_latency(args.endpoint_latency),
+                                 "error_rate": args.error_rate,
+                                 "rate_limit_rate": args.rate_limit_rate,
+                                 "page_size": args.page_size,
+                                 "seed": args.seed
+                             })
+    report = runner.run(args.phases)
+    if args.compare:
+        with open(args.compare) as f:
+            report["compared_to"] = {"report": args.compare, "change": compare(json.load(f), report)}
+    write_report(report, args.output)
+    return 1 if any(p["error"] for p in report["phases"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+import re
+from copy import deepcopy
+from email.parser import BytesParser
+from urllib.parse import unquote
+
+from congregate.helpers.utils import is_changed_since
+from congregate.tests.mockapi.gitlab.users import MockUsersApi
+from congregate.tests.mockapi.gitlab.groups import MockGroupsApi
+from congregate.tests.mockapi.gitlab.projects import MockProjectsApi
+
+API = "/api/v4"
+# Group or project ID, or URL encoded full path
+ID = r"([^/]+)"
+EXPORT_HEADERS = {"Content-Type": "application/gzip", "Content-Disposition": "attachment; filename=export.tar.gz"}
+EXPORT = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\x03\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+
+
+def get_form_data(request):
+    """
+        Fields of a multipart/form-data (file fields excluded) or JSON request body
+    """
+    content_type = request.headers.get("Content-Type", "")
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser().parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + request.body)
+        return {p.get_param("name", header="content-disposition"): p.get_payload(decode=True).decode(errors="ignore")
+                for p in message.get_payload() if not p.get_filename()}
+    if content_type.startswith("application/json"):
+        return request.json()
+    return dict(re.findall(r"([^&=]+)=([^&]*)", unquote(request.body.decode(errors="ignore"))))
+
+
+class MockGitLabInstance():
+    '''
+        Synthetic GitLab instance served by a MockApiServer, built from the mockapi sample records
+
+        Serves listing (users, groups, subgroups, projects, members), lookups by ID or full path,
+        and stubbed project and group export/import that finish immediately.
+        Group imports recreate the subgroups of the same group on the source instance, as the export would.
+        Any other GET returns an empty page, and any other write succeeds, so post-migration features find nothing to do.
+    '''
+    def __init__(self, server, users=0, groups=0, subgroups=0, projects=0, members=0, source=None):
+        """
+            :param source: (MockGitLabInstance) Instance the imported groups are exported from
+            :param users: (int) Number of users
+            :param groups: (int) Number of top-level groups
+            :param subgroups: (int) Number of subgroups per top-level group
+            :param projects: (int) Number of projects per group and subgroup
+            :param members: (int) Number of members per group and project
+        """
+        self.server = server
+        self.source = source
+        self.users = {}
+        self.groups = {}
+        self.projects = {}
+        self.next_id = 1
+        for _ in range(users):
+            self.add_user()
+        for g in range(groups):
+            group = self.add_group(f"group-{g}")
+            parents = [group] + [self.add_group(f"subgroup-{s}", parent=group) for s in range(subgroups)]
+            for parent in parents:
+                for p in range(projects):
+                    self.add_project(f"project-{p}", parent)
+        user_ids = list(self.users)
+        self.members = [self.users[uid] for uid in user_ids[:members]]
+        self.register()
+
+    def get_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def add_user(self, username=None, email=None):
+        uid = self.get_id()
+        user = MockUsersApi().get_user_gen()
+        user.update({
+            "id": uid,
+            "username": username or f"user-{uid}",
+            "name": username or f"User {uid}",
+            "email": email or f"user-{uid}@example.com",
+            "public_email": email or f"user-{uid}@example.com",
+            "web_url": f"{self.server.url}/user-{uid}",
+            "is_admin": False
+        })
+        self.users[uid] = user
+        return user
+
+    def add_group(self, path, parent=None, name=None):
+        group = MockGroupsApi().get_group()
+        full_path = f"{parent['full_path']}/{path}" if parent else path
+        group.update({
+            "id": self.get_id(),
+            "name": name or path,
+            "path": path,
+            "full_name": full_path.replace("/", " / "),
+            "full_path": full_path,
+            "parent_id": parent["id"] if parent else None,
+            "visibility": "private",
+            "web_url": f"{self.server.url}/groups/{full_path}",
+            "projects": [],
+            "shared_projects": []
+        })
+        self.groups[group["id"]] = group
+        return group
+
+    def add_project(self, path, namespace, name=None):
+        project = MockProjectsApi().get_project()
+        pid = self.get_id()
+        pwn = f"{namespace['full_path']}/{path}"
+        project.pop("members", None)
+        project.update({
+            "id": pid,
+            "name": name or path,
+            "path": path,
+            "name_with_namespace": f"{namespace['full_name']} / {name or path}",
+            "path_with_namespace": pwn,
+            "http_url_to_repo": f"{self.server.url}/{pwn}.git",
+            "ssh_url_to_repo": f"git@127.0.0.1:{pwn}.git",
+            "web_url": f"{self.server.url}/{pwn}",
+            "readme_url": None,
+            "shared_with_groups": [],
+            "namespace": {
+                "id": namespace["id"],
+                "name": namespace["name"],
+                "path": namespace["path"],
+                "kind": "group",
+                "full_path": namespace["full_path"],
+                "parent_id": namespace["parent_id"]
+            },
+            "import_status": "finished",
+            "updated_at": project["last_activity_at"]
+        })
+        self.projects[pid] = project
+        return project
+
+    def find(self, records, key, value):
+        value = unquote(value)
+        if value.isdigit():
+            return records.get(int(value))
+        return next((r for r in records.values() if r[key].lower() == value.lower()), None)
+
+    def register(self):
+        route = self.server.route
+        route("GET", f"{API}/user", lambda r: (200, {}, {**MockUsersApi().get_admin_user(), "email": "admin@example.com"}))
+        route("GET", f"{API}/version", lambda r: (200, {}, {"version": "17.0.0-ee", "revision": "benchmark"}))
+        route("GET", f"{API}/metadata", lambda r: (200, {}, {"version": "17.0.0-ee", "enterprise": True}))
+        route("GET", f"{API}/application/settings", lambda r: (
+            200, {}, {"bulk_import_enabled": True, "bulk_import_max_download_file_size": 5120}))
+        route("GET", f"{API}/users", self.get_users)
+        route("POST", f"{API}/users", self.create_user)
+        route("GET", f"{API}/users/{ID}", lambda r: self.get_one(self.users, "username", r))
+        route("GET", f"{API}/groups", lambda r: self.server.paginate(r, self.filter(self.groups, "full_path", r)))
+        route("POST", f"{API}/groups", self.create_group)
+        route("POST", f"{API}/groups/import", self.import_group)
+        route("GET", f"{API}/groups/{ID}", lambda r: self.get_one(self.groups, "full_path", r))
+        route("GET", f"{API}/namespaces/{ID}", lambda r: self.get_one(self.groups, "full_path", r))
+        route("GET", f"{API}/groups/{ID}/subgroups", lambda r: self.get_subgroups(r, descendants=False))
+        route("GET", f"{API}/groups/{ID}/descendant_groups", lambda r: self.get_subgroups(r, descendants=True))
+        route("GET", f"{API}/groups/{ID}/projects", self.get_group_projects)
+        route("GET", f"{API}/groups/{ID}/members(/all)?", lambda r: self.server.paginate(r, self.members))
+        route("POST", f"{API}/groups/{ID}/export", lambda r: (202, {}, {"message": "202 Accepted"}))
+        route("GET", f"{API}/groups/{ID}/export/download", lambda r: (200, EXPORT_HEADERS, EXPORT))
+        route("GET", f"{API}/projects", lambda r: self.server.paginate(r, self.filter(self.projects, "path_with_namespace", r)))
+        route("POST", f"{API}/projects/import", self.import_project)
+        route("GET", f"{API}/projects/{ID}", lambda r: self.get_one(self.projects, "path_with_namespace", r))
+        route("GET", f"{API}/projects/{ID}/members(/all)?", lambda r: self.server.paginate(r, self.members))
+        route("POST", f"{API}/projects/{ID}/export", lambda r: (202, {}, {"message": "202 Accepted"}))
+        route("GET", f"{API}/projects/{ID}/export", lambda r: (200, {}, {"export_status": "finished"}))
+        route("GET", f"{API}/projects/{ID}/export/download", lambda r: (200, EXPORT_HEADERS, EXPORT))
+        route("GET", f"{API}/projects/{ID}/import", self.get_import_status)
+        # Single (not list) resources that are unset
+        route("GET", f"{API}/(projects|groups)/{ID}/push_rule", lambda r: (200, {"Content-Type": "application/json"}, b"null"))
+        route("POST", "/api/graphql", self.graphql)
+        for method in ["POST", "PUT", "PATCH"]:
+            route(method, f"{API}/.*", lambda r: (201, {}, {"id": self.get_id()}))
+        route("DELETE", f"{API}/.*", lambda r: (204, {}, b""))
+        route("GET", f"{API}/.*", lambda r: self.server.paginate(r, []))
+
+    def get_one(self, records, key, request):
+        if record := self.find(records, key, request.match.group(1)):
+            return (200, {}, record)
+        return (404, {}, {"message": "404 Not found"})
+
+    def filter(self, records, key, request):
+        results = list(records.values())
+        if search := request.query.get("search"):
+            results = [r for r in results if search.lower() in r[key].lower()]
+        if since := request.query.get("last_activity_after"):
+            results = [r for r in results if is_changed_since(r, since, fields=("last_activity_at",))]
+        if since := request.query.get("updated_after"):
+            results = [r for r in results if is_changed_since(r, since, fields=("updated_at",))]
+        return results
+
+    def get_users(self, request):
+        users = list(self.users.values())
+        if search := request.query.get("search"):
+            users = [u for u in users if search.lower() in (u["email"].lower(), u["username"].lower())]
+        if username := request.query.get("username"):
+            users = [u for u in users if u["username"].lower() == username.lower()]
+        return self.server.paginate(request, users)
+
+    def get_subgroups(self, request, descendants=False):
+        if not (parent := self.find(self.groups, "full_path", request.match.group(1))):
+            return (404, {}, {"message": "404 Group Not Found"})
+        prefix = f"{parent['full_path']}/"
+        return self.server.paginate(request, [
+            g for g in self.groups.values()
+            if (g["full_path"].startswith(prefix) if descendants else g["parent_id"] == parent["id"])])
+
+    def get_group_projects(self, request):
+        if not (group := self.find(self.groups, "full_path", request.match.group(1))):
+            return (404, {}, {"message": "404 Group Not Found"})
+        nested = request.query.get("include_subgroups", "").lower() == "true"
+        return self.server.paginate(request, [
+            p for p in self.projects.values()
+            if p["namespace"]["id"] == group["id"]
+            or (nested and p["namespace"]["full_path"].startswith(f"{group['full_path']}/"))])
+
+    def create_user(self, request):
+        data = get_form_data(request)
+        if any(u["email"] == data.get("email") for u in self.users.values()):
+            return (409, {}, {"message": "Email has already been taken"})
+        return (201, {}, self.add_user(data.get("username"), data.get("email")))
+
+    def get_namespace(self, namespace):
+        return self.find(self.groups, "full_path", str(namespace)) if namespace else None
+
+    def create_group(self, request):
+        data = get_form_data(request)
+        parent = self.find(self.groups, "full_path", str(data.get("parent_id", "")))
+        return (201, {}, self.add_group(data.get("path"), parent=parent, name=data.get("name")))
+
+    def import_group(self, request):
+        data = get_form_data(request)
+        parent = self.find(self.groups, "full_path", str(data.get("parent_id", "")))
+        full_path = f"{parent['full_path']}/{data.get('path')}" if parent else data.get("path")
+        if any(g["full_path"] == full_path for g in self.groups.values()):
+            return (400, {}, {"message": "Group path has already been taken"})
+        group = self.add_group(data.get("path"), parent=parent, name=data.get("name"))
+        self.add_source_subgroups(data.get("path"), group)
+        return (202, {}, {"id": group["id"], "name": group["name"], "full_path": group["full_path"]})
+
+    def add_source_subgroups(self, path, group):
+        if self.source and (exported := self.source.find(self.source.groups, "path", path)):
+            self.copy_subgroups(exported, group)
+
+    def copy_subgroups(self, exported, group):
+        for sub in [g for g in self.source.groups.values() if g["parent_id"] == exported["id"]]:
+            self.copy_subgroups(sub, self.add_group(sub["path"], parent=group, name=sub["name"]))
+
+    def import_project(self, request):
+        data = get_form_data(request)
+        if not (namespace := self.get_namespace(data.get("namespace"))):
+            return (404, {}, {"message": "404 Namespace Not Found"})
+        if any(p["path_with_namespace"] == f"{namespace['full_path']}/{data.get('path')}" for p in self.projects.values()):
+            return (400, {}, {"message": "Project namespace name has already been taken"})
+        project = self.add_project(data.get("path"), namespace, name=data.get("name"))
+        return (201, {}, {**project, "import_status": "scheduled"})
+
+    def graphql(self, request):
+        """
+            Empty project issue, merge request and commit counts (as queried by the diff report)
+        """
+        empty = {"count": 0, "nodes": [], "pageInfo": {"hasNextPage": False, "endCursor": ""}}
+        return (200, {}, {"data": {"project": {
+            "issues": empty, "mergeRequests": empty, "statistics": {"commitCount": 0}}}})
+
+    def get_import_status(self, request):
+        if project := self.find(self.projects, "path_with_namespace", request.match.group(1)):
+            return (200, {}, {**deepcopy(project), "import_status": "finished"})
+        return (404, {}, {"message": "404 Project Not Found"})
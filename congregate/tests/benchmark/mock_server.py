@@ -0,0 +1,170 @@
+import re
+from json import dumps, loads
+from math import ceil
+from time import sleep, time
+from random import Random
+from threading import Thread, Lock
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from congregate.helpers.request_counters import get_endpoint_template
+
+
+class MockRequest():
+    def __init__(self, method, url, headers, body):
+        split = urlsplit(url)
+        self.method = method
+        self.path = split.path
+        self.query = dict(parse_qsl(split.query, keep_blank_values=True))
+        self.headers = headers
+        self.body = body
+        self.match = None
+
+    def json(self):
+        return loads(self.body) if self.body else {}
+
+
+class MockApiServer():
+    '''
+        Local HTTP stand-in serving mock API routes, with injected latency, errors and rate limiting
+
+        Routes are (method, path regex, handler) where handler(request) returns (status, headers, body).
+        Dict and list bodies are sent as JSON.
+    '''
+    def __init__(self, latency=0.0, endpoint_latency=None, error_rate=0.0, rate_limit_rate=0.0,
+                 page_size=None, seed=0):
+        """
+            :param latency: (float) Seconds added to every response
+            :param endpoint_latency: (dict) Seconds added to responses of paths matching a regex, instead of latency
+            :param error_rate: (float) Share of requests answered with a 500
+            :param rate_limit_rate: (float) Share of requests answered with a 429, to be retried after a second
+            :param page_size: (int) Max items per page, whatever per_page is requested
+            :param seed: (int) Seed of the injected errors and rate limits, so runs are comparable
+        """
+        self.latency = latency
+        self.endpoint_latency = [(re.compile(p), s) for p, s in (endpoint_latency or {}).items()]
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.page_size = page_size
+        self.random = Random(seed)
+        self.routes = []
+        self.counts = {}
+        self.lock = Lock()
+        self.server = None
+        self.url = None
+
+    def route(self, method, pattern, handler):
+        self.routes.append((method, re.compile(pattern), handler))
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.get_handler_class())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def get_counts(self):
+        """
+            :return: (dict) Number of requests by "method endpoint template status", e.g. "GET /api/v4/projects/:id 200"
+        """
+        with self.lock:
+            return dict(self.counts)
+
+    def handle(self, request):
+        with self.lock:
+            roll = self.random.random()
+        sleep(next((s for p, s in self.endpoint_latency if p.search(request.path)), self.latency))
+        if roll < self.rate_limit_rate:
+            response = (429, {"RateLimit-Reset": str(int(time()) + 1), "Retry-After": "1"},
+                        {"message": "429 Too Many Requests"})
+        elif roll < self.rate_limit_rate + self.error_rate:
+            response = (500, {}, {"message": "500 Internal Server Error"})
+        else:
+            response = self.dispatch(request)
+        key = f"{request.method} {get_endpoint_template(request.path)} {response[0]}"
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+        return response
+
+    def dispatch(self, request):
+        method = "GET" if request.method == "HEAD" else request.method
+        for route_method, pattern, handler in self.routes:
+            if route_method == method and (match := pattern.fullmatch(request.path)):
+                request.match = match
+                return handler(request)
+        return (404, {}, {"message": "404 Not found"})
+
+    def paginate(self, request, items, base_url=None):
+        """
+            GitLab style offset or (pagination=keyset) keyset page of a list, with the X-Total* and Link headers
+        """
+        per_page = int(request.query.get("per_page", 20))
+        if self.page_size:
+            per_page = min(per_page, self.page_size)
+        url = f"{base_url or self.url}{request.path}"
+        if request.query.get("pagination") == "keyset":
+            after = int(request.query.get("id_after") or 0)
+            page = [i for i in items if i["id"] > after][:per_page]
+            headers = {}
+            if len(page) == per_page:
+                query = {**request.query, "id_after": page[-1]["id"]}
+                # id_after must be followed by another parameter, as in GitLab
+                query["per_page"] = query.pop("per_page", per_page)
+                headers["Link"] = f'<{url}?{urlencode(query)}>; rel="next"'
+            return (200, headers, page)
+        current = int(request.query.get("page", 1))
+        pages = max(ceil(len(items) / per_page), 1)
+        headers = {
+            "X-Total": str(len(items)),
+            "X-Total-Pages": str(pages),
+            "X-Per-Page": str(per_page),
+            "X-Page": str(current),
+            "X-Next-Page": str(current + 1) if current < pages else ""
+        }
+        return (200, headers, items[(current - 1) * per_page:current * per_page])
+
+    def get_handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def read_body(self):
+                if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    return self.rfile.read(length) if length else b""
+                chunks = []
+                while size := int(self.rfile.readline().split(b";")[0], 16):
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+                self.rfile.readline()
+                return b"".join(chunks)
+
+            def respond(self):
+                request = MockRequest(self.command, self.path, self.headers, self.read_body())
+                status, headers, body = server.handle(request)
+                if isinstance(body, (dict, list)):
+                    body = dumps(body).encode()
+                    headers = {"Content-Type": "application/json", **headers}
+                elif isinstance(body, str):
+                    body = body.encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,300 @@
+import os
+import sys
+import json
+import platform
+from base64 import b64encode
+from time import perf_counter, time
+from resource import getrusage, RUSAGE_SELF, RUSAGE_CHILDREN
+from unittest.mock import patch
+from functools import partial
+
+from congregate.tests.benchmark.mock_server import MockApiServer
+from congregate.tests.benchmark.gitlab_instance import MockGitLabInstance
+
+PHASES = ["list", "stage-projects", "stage-wave", "migrate", "diff"]
+
+# Synthetic source instance sizes
+SIZES = {
+    "tiny": {"users": 5, "groups": 1, "subgroups": 1, "projects": 2, "members": 2},
+    "small": {"users": 50, "groups": 3, "subgroups": 3, "projects": 5, "members": 5},
+    "medium": {"users": 500, "groups": 10, "subgroups": 5, "projects": 10, "members": 10},
+    "large": {"users": 5000, "groups": 25, "subgroups": 10, "projects": 20, "members": 25}
+}
+
+WAVE_COLUMNS = ["Wave Name", "Wave Date", "Source http_url_to_repo", "Source Namespace",
+                "Target Namespace", "Override", "Source Project ID"]
+
+
+class InProcessMultiProcessing():
+    '''
+        Runs the MultiProcessing pool functions serially in the benchmark process,
+        so the in-memory MongoDB (mongomock) and the stubs are shared by all of them
+    '''
+    def __init__(self, multi):
+        self.multi = multi
+
+    def __getattr__(self, name):
+        return getattr(self.multi, name)
+
+    def start_multi_process(self, function, iterable, processes=None, nestable=False):
+        return [function(i) for i in iterable]
+
+    def start_multi_process_with_args(self, function, iterable, *args, processes=None, nestable=False, **kwargs):
+        return [function(*args, i, **kwargs) for i in iterable]
+
+    start_multi_process_stream = start_multi_process
+    start_multi_process_stream_with_args = start_multi_process_with_args
+
+    def handle_multi_process_write_to_file_and_return_results(
+            self, function, results_function, iterable, path, processes=None):
+        results = self.start_multi_process(function, iterable)
+        with open(path, "w") as f:
+            json.dump(results, f, indent=4)
+        return [results_function(r) for r in results]
+
+
+def get_peak_rss():
+    """
+        :return: (int) Peak resident set size (KiB) of this process since the last reset_peak_rss()
+    """
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        return getrusage(RUSAGE_SELF).ru_maxrss
+
+
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+class BenchmarkRunner():
+    '''
+        Runs congregate listing, staging, migration and diff phases against synthetic GitLab source and destination instances,
+        served by local MockApiServers, and measures each phase
+    '''
+    def __init__(self, path, size="small", server_options=None):
+        """
+            :param path: (str) Working directory, used as CONGREGATE_PATH
+            :param size: (str or dict) Name of a SIZES entry, or the sizes of the source instance
+            :param server_options: (dict) MockApiServer latency, error, rate limit and page size options
+        """
+        self.path = path
+        self.sizes = SIZES[size] if isinstance(size, str) else size
+        # Pools run serially in this process, to share the in-memory MongoDB and stubs
+        self.processes = 1
+        self.server_options = server_options or {}
+        self.source = MockApiServer(**self.server_options)
+        self.destination = MockApiServer(**self.server_options)
+        self.patches = []
+
+    def setup(self):
+        self.source.start()
+        self.destination.start()
+        self.source_instance = MockGitLabInstance(self.source, **self.sizes)
+        # Only the import user exists on the destination
+        self.destination_instance = MockGitLabInstance(self.destination, users=1, source=self.source_instance)
+        for d in ["data/logs", "data/results", "downloads"]:
+            os.makedirs(f"{self.path}/{d}", exist_ok=True)
+        self.write_config()
+        self.write_wave_spreadsheet()
+        os.environ["CONGREGATE_PATH"] = self.path
+        os.environ["APP_PATH"] = self.path
+        self.patch_in_process()
+
+    def teardown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.source.stop()
+        self.destination.stop()
+
+    def patch_in_process(self):
+        """
+            mongomock instead of MongoDB, serial pools, and no export/import cool off or download waits
+        """
+        import warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            import mongomock
+        from gitlab_ps_utils.processes import MultiProcessing
+        from gitlab_ps_utils.file_utils import download_file
+        self.patches = [
+            patch("congregate.helpers.mdbc.MongoClient",
+                  partial(mongomock.MongoClient, _store=mongomock.store.ServerStore())),
+            patch("congregate.helpers.base_class.MultiProcessing",
+                  lambda: InProcessMultiProcessing(MultiProcessing())),
+            patch("congregate.helpers.client_registry._shared", {}),
+            patch("congregate.helpers.congregate_mdbc._shared_connectors", {}),
+            patch("congregate.migration.gitlab.importexport.ImportExportClient.COOL_OFF_MINUTES", 0),
+            patch("congregate.migration.gitlab.importexport.download_file",
+                  lambda *args, **kwargs: download_file(*args, **{**kwargs, "wait": 0}))
+        ]
+        for p in self.patches:
+            p.start()
+
+    def write_config(self):
+        token = b64encode(b"benchmark").decode()
+        import_user = next(iter(self.destination_instance.users.values()))
+        with open(f"{self.path}/data/congregate.conf", "w") as f:
+            f.write(f"""[DESTINATION]
+dstn_hostname = {self.destination.url}
+dstn_access_token = {token}
+import_user_id = {import_user["id"]}
+shared_runners_enabled = True
+max_import_retries = 1
+username_suffix = _benchmark
+max_asset_expiration_time = 24
+
+[SOURCE]
+src_type = GitLab
+src_hostname = {self.source.url}
+src_access_token = {token}
+src_tier = ultimate
+
+[EXPORT]
+location = filesystem
+filesystem_path = {self.path}
+
+[USER]
+keep_inactive_users = False
+reset_pwd = True
+force_rand_pwd = False
+
+[APP]
+export_import_status_check_time = 1
+export_import_timeout = 60
+mongo_host = {os.getenv("MONGO_HOST", "localhost")}
+processes = {self.processes}
+ssl_verify = False
+archive_logic = False
+rate_limit_backend = none
+wave_spreadsheet_path = {self.path}/data/waves.csv
+wave_spreadsheet_columns = {", ".join(WAVE_COLUMNS)}
+wave_spreadsheet_column_to_project_property_mapping = {{
+    "Source http_url_to_repo": "http_url_to_repo",
+    "Source Namespace": "namespace.full_path",
+    "Source Project ID": "id"}}
+""")
+
+    def write_wave_spreadsheet(self):
+        with open(f"{self.path}/data/waves.csv", "w") as f:
+            f.write(",".join(WAVE_COLUMNS) + "\n")
+            for p in self.source_instance.projects.values():
+                f.write(f"wave-1,,{p['http_url_to_repo']},{p['namespace']['full_path']},,,{p['id']}\n")
+
+    def get_phases(self):
+        return {
+            "list": self.run_list,
+            "stage-projects": self.run_stage_projects,
+            "stage-wave": self.run_stage_wave,
+            "migrate": self.run_migrate,
+            "diff": self.run_diff
+        }
+
+    def run_list(self):
+        from congregate.cli.list_source import ListClient
+        ListClient(processes=self.processes).list_gitlab_data()
+
+    def run_stage_projects(self):
+        from congregate.cli.stage_projects import ProjectStageCLI
+        ProjectStageCLI().stage_data(["all"], dry_run=False)
+
+    def run_stage_wave(self):
+        from congregate.cli.stage_wave import WaveStageCLI
+        WaveStageCLI().stage_data("wave-1", dry_run=False)
+
+    def run_migrate(self):
+        from congregate.migration.gitlab.migrate import GitLabMigrateClient
+        GitLabMigrateClient(dry_run=False, processes=self.processes).migrate()
+
+    def run_diff(self):
+        from congregate.migration.gitlab.diff.projectdiff import ProjectDiffClient
+        diff = ProjectDiffClient(staged=True, processes=self.processes)
+        diff.generate_html_report("Project", diff.generate_diff_report(time()),
+                                  "/data/results/project_migration_results.html")
+
+    def measure(self, func):
+        """
+            :return: (dict) Wall time, requests (per second) by server and endpoint, and peak RSS of a phase
+        """
+        before = {"source": self.source.get_counts(), "destination": self.destination.get_counts()}
+        reset_peak_rss()
+        started = perf_counter()
+        error = None
+        try:
+            func()
+        except (Exception, SystemExit) as e:
+            error = repr(e)
+        wall = perf_counter() - started
+        endpoints = {}
+        for name, server in [("source", self.source), ("destination", self.destination)]:
+            for key, count in server.get_counts().items():
+                if count := count - before[name].get(key, 0):
+                    endpoints[f"{name} {key}"] = count
+        requests = sum(endpoints.values())
+        status_codes = {}
+        for key, count in endpoints.items():
+            status = key.rsplit(" ", 1)[1]
+            status_codes[status] = status_codes.get(status, 0) + count
+        return {
+            "wall_time": round(wall, 3),
+            "requests": requests,
+            "requests_per_second": round(requests / wall, 1) if wall else 0,
+            "status_codes": status_codes,
+            "peak_rss_kb": get_peak_rss(),
+            "children_peak_rss_kb": getrusage(RUSAGE_CHILDREN).ru_maxrss,
+            "endpoints": dict(sorted(endpoints.items(), key=lambda e: -e[1])),
+            "error": error
+        }
+
+    def run(self, phases=None):
+        """
+            :param phases: (list) Phases to run, in order. Later phases rely on the files of earlier ones
+            :return: (dict) Scenario and metrics of each phase
+        """
+        phase_funcs = self.get_phases()
+        self.setup()
+        try:
+            results = {}
+            for phase in phases or PHASES:
+                results[phase] = self.measure(phase_funcs[phase])
+            return {
+                "scenario": {
+                    "sizes": self.sizes,
+                    "source": {"users": len(self.source_instance.users), "groups": len(self.source_instance.groups),
+                               "projects": len(self.source_instance.projects)},
+                    "server": self.server_options
+                },
+                "environment": {"python": platform.python_version(), "platform": platform.platform()},
+                "phases": results
+            }
+        finally:
+            self.teardown()
+
+
+def compare(baseline, current):
+    """
+        :return: (dict) Per phase change (%) of the wall time, requests, requests per second and peak RSS of two runs
+    """
+    diff = {}
+    for phase, metrics in current["phases"].items():
+        if not (base := baseline["phases"].get(phase)):
+            continue
+        diff[phase] = {
+            k: round((metrics[k] - base[k]) * 100 / base[k], 1) if base[k] else None
+            for k in ["wall_time", "requests", "requests_per_second", "peak_rss_kb"]
+        }
+    return diff
+
+
+def write_report(report, output=None):
+    text = json.dumps(report, indent=4)
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+    else:
+        print(text, file=sys.stdout)
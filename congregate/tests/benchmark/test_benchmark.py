@@ -0,0 +1,111 @@
+import sys
+import json
+import unittest
+import subprocess
+from os import environ
+from tempfile import TemporaryDirectory
+from pytest import mark
+import requests
+
+from congregate.tests.benchmark.mock_server import MockApiServer
+from congregate.tests.benchmark.gitlab_instance import MockGitLabInstance
+from congregate.tests.benchmark.runner import compare
+
+
+@mark.unit_test
+class MockApiServerTests(unittest.TestCase):
+    def setUp(self):
+        self.server = MockApiServer()
+        self.instance = None
+        self.session = requests.Session()
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    def start(self, **sizes):
+        self.server.start()
+        self.instance = MockGitLabInstance(self.server, **sizes)
+
+    def get(self, path, **params):
+        return self.session.get(f"{self.server.url}/api/v4/{path}", params=params)
+
+    def test_offset_pagination(self):
+        self.start(users=5)
+        first = self.get("users", per_page=2)
+        self.assertEqual(first.headers["X-Total"], "5")
+        self.assertEqual(first.headers["X-Next-Page"], "2")
+        last = self.get("users", per_page=2, page=3)
+        self.assertEqual(len(last.json()), 1)
+        self.assertEqual(last.headers["X-Next-Page"], "")
+
+    def test_keyset_pagination(self):
+        self.start(groups=1, projects=3)
+        page = self.get("projects", pagination="keyset", per_page=2, order_by="id")
+        self.assertEqual(len(page.json()), 2)
+        self.assertIn(f"id_after={page.json()[-1]['id']}&", page.links["next"]["url"])
+        self.assertEqual(len(self.session.get(page.links["next"]["url"]).json()), 1)
+
+    def test_page_size_caps_per_page(self):
+        self.server.page_size = 2
+        self.start(users=5)
+        self.assertEqual(len(self.get("users", per_page=100).json()), 2)
+
+    def test_lookup_by_id_and_path(self):
+        self.start(groups=1, subgroups=1, projects=1)
+        group = self.get("groups/group-0%2Fsubgroup-0").json()
+        self.assertEqual(self.get(f"groups/{group['id']}").json()["full_path"], "group-0/subgroup-0")
+        self.assertEqual(self.get("groups/missing").status_code, 404)
+        self.assertEqual(len(self.get("groups/group-0/projects", include_subgroups="true").json()), 2)
+
+    def test_injected_errors_counted(self):
+        self.server.rate_limit_rate = 0.5
+        self.server.error_rate = 0.5
+        self.start()
+        statuses = {self.get("version").status_code for _ in range(10)}
+        self.assertEqual(statuses, {429, 500})
+        counts = self.server.get_counts()
+        self.assertEqual(sum(counts.values()), 10)
+        self.assertTrue(all(k.startswith("GET /api/v4/version ") for k in counts))
+
+    def test_group_import_copies_source_subgroups(self):
+        self.start(groups=1, subgroups=2)
+        destination = MockApiServer()
+        destination.start()
+        try:
+            dstn = MockGitLabInstance(destination, source=self.instance)
+            resp = self.session.post(f"{destination.url}/api/v4/groups/import",
+                                     data={"path": "group-0", "name": "group-0"},
+                                     files={"file": ("group-0.tar.gz", b"")})
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(sorted(g["full_path"] for g in dstn.groups.values()),
+                             ["group-0", "group-0/subgroup-0", "group-0/subgroup-1"])
+        finally:
+            destination.stop()
+
+
+@mark.unit_test
+class BenchmarkRunnerTests(unittest.TestCase):
+    def test_compare(self):
+        baseline = {"phases": {"list": {"wall_time": 2, "requests": 10, "requests_per_second": 5, "peak_rss_kb": 0}}}
+        current = {"phases": {
+            "list": {"wall_time": 1, "requests": 10, "requests_per_second": 10, "peak_rss_kb": 100},
+            "diff": {"wall_time": 1, "requests": 1, "requests_per_second": 1, "peak_rss_kb": 1}}}
+        self.assertDictEqual(compare(baseline, current), {
+            "list": {"wall_time": -50.0, "requests": 0.0, "requests_per_second": 100.0, "peak_rss_kb": None}})
+
+    def test_list_phase_report(self):
+        # A separate process, as CONGREGATE_PATH is read when congregate modules are imported
+        with TemporaryDirectory() as path:
+            proc = subprocess.run(
+                [sys.executable, "-m", "congregate.tests.benchmark", "--size", "tiny", "--phases", "list",
+                 "--path", path], capture_output=True, text=True, timeout=300,
+                env={k: v for k, v in environ.items() if k not in ["CONGREGATE_PATH", "APP_PATH"]})
+            self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+            report = json.loads(proc.stdout)
+        phase = report["phases"]["list"]
+        self.assertIsNone(phase["error"])
+        self.assertEqual(report["scenario"]["source"], {"users": 5, "groups": 2, "projects": 4})
+        self.assertGreater(phase["requests"], 0)
+        self.assertEqual(phase["status_codes"], {"200": phase["requests"]})
+        self.assertGreater(phase["peak_rss_kb"], 0)
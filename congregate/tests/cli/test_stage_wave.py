@@ -1,7 +1,9 @@
 import os
+import json
 import pytest
 
 from congregate.cli.stage_wave import WaveStageCLI
+from congregate.helpers.staging_store import get_staging_store
 
 @pytest.mark.unit_test
 class TestWaveStageCLI:
@@ -142,13 +144,10 @@ class TestWaveStageCLI:
         """Test stage_wave method when spreadsheet file doesn't exist."""
         monkeypatch.setattr('os.path.isfile', lambda x: False)
         monkeypatch.setattr('congregate.cli.stage_wave.WaveSpreadsheetHandler', lambda *args, **kwargs: None)
-        monkeypatch.setattr('congregate.cli.stage_wave.rewrite_list_into_dict', lambda x, y, **kwargs: x)
         
         wave_stage_cli.config.wave_spreadsheet_path = "/nonexistent/path"
         wave_stage_cli.the_number_of_instance = lambda scm_source=None: 0
-        wave_stage_cli.open_projects_file = lambda scm_source=None: []
-        wave_stage_cli.open_users_file = lambda scm_source=None: []
-        wave_stage_cli.open_groups_file = lambda scm_source=None: []
+        wave_stage_cli.get_listed_data = lambda asset, scm_source=None: []
         
         with pytest.raises(SystemExit) as exc_info:
             wave_stage_cli.stage_wave("wave1")
@@ -159,7 +158,6 @@ class TestWaveStageCLI:
     def test_stage_wave_scm_source_not_found(self, wave_stage_cli, monkeypatch):
         """Test stage_wave method when scm_source instance is not found."""
         monkeypatch.setattr('os.path.isfile', lambda x: True)
-        monkeypatch.setattr('congregate.cli.stage_wave.rewrite_list_into_dict', lambda x, y, **kwargs: {})
         
         mock_wsh_instance = type('MockWaveSpreadsheetHandler', (), {})()
         mock_wsh_instance.read_file_as_json = lambda **kwargs: [{"Source Project ID": "123"}]
@@ -173,9 +171,7 @@ class TestWaveStageCLI:
         wave_stage_cli.config.wave_spreadsheet_columns = ["col1", "col2"]
         wave_stage_cli.config.wave_spreadsheet_column_mapping = {}
         wave_stage_cli.the_number_of_instance = lambda scm_source: -1  # Returns -1 for not found
-        wave_stage_cli.open_projects_file = lambda scm_source=None: []
-        wave_stage_cli.open_users_file = lambda scm_source=None: []
-        wave_stage_cli.open_groups_file = lambda scm_source=None: []
+        wave_stage_cli.get_listed_data = lambda asset, scm_source=None: []
         wave_stage_cli.check_spreadsheet_data = lambda: None
         
         # Mock pcli.stage_data
@@ -201,14 +197,11 @@ class TestWaveStageCLI:
             return mock_instance
         
         monkeypatch.setattr('congregate.cli.stage_wave.WaveSpreadsheetHandler', mock_wsh_constructor)
-        monkeypatch.setattr('congregate.cli.stage_wave.rewrite_list_into_dict', lambda x, y, **kwargs: x)
         
         wave_stage_cli.config.wave_spreadsheet_path = "/valid/path"
         wave_stage_cli.config.wave_spreadsheet_columns = ["col1", "col2"]
         wave_stage_cli.the_number_of_instance = lambda scm_source=None: 0
-        wave_stage_cli.open_projects_file = lambda scm_source=None: []
-        wave_stage_cli.open_users_file = lambda scm_source=None: []
-        wave_stage_cli.open_groups_file = lambda scm_source=None: []
+        wave_stage_cli.get_listed_data = lambda asset, scm_source=None: []
         wave_stage_cli.check_spreadsheet_data = lambda: None
         
         with pytest.raises(SystemExit) as exc_info:
@@ -220,7 +213,6 @@ class TestWaveStageCLI:
     def test_stage_wave_with_override_flag(self, wave_stage_cli, monkeypatch):
         """Test stage_wave method when override flag is set."""
         monkeypatch.setattr('os.path.isfile', lambda x: True)
-        monkeypatch.setattr('congregate.cli.stage_wave.rewrite_list_into_dict', lambda x, y, **kwargs: {})
         
         mock_wsh_instance = type('MockWaveSpreadsheetHandler', (), {})()
         mock_wsh_instance.read_file_as_json = lambda **kwargs: [
@@ -236,9 +228,7 @@ class TestWaveStageCLI:
         wave_stage_cli.config.wave_spreadsheet_columns = ["col1", "col2"]
         wave_stage_cli.config.wave_spreadsheet_column_mapping = {}
         wave_stage_cli.the_number_of_instance = lambda scm_source=None: 0
-        wave_stage_cli.open_projects_file = lambda scm_source=None: []
-        wave_stage_cli.open_users_file = lambda scm_source=None: []
-        wave_stage_cli.open_groups_file = lambda scm_source=None: []
+        wave_stage_cli.get_listed_data = lambda asset, scm_source=None: []
         wave_stage_cli.check_spreadsheet_data = lambda: None
         
         # Mock pcli.stage_data to capture what gets staged
@@ -258,7 +248,6 @@ class TestWaveStageCLI:
     def test_stage_wave_success_with_valid_data(self, wave_stage_cli, monkeypatch):
         """Test stage_wave method with valid data and successful execution."""
         monkeypatch.setattr('os.path.isfile', lambda x: True)
-        monkeypatch.setattr('congregate.cli.stage_wave.rewrite_list_into_dict', lambda x, y, **kwargs: {})
         
         mock_wsh_instance = type('MockWaveSpreadsheetHandler', (), {})()
         mock_wsh_instance.read_file_as_json = lambda **kwargs: [
@@ -275,9 +264,7 @@ class TestWaveStageCLI:
         wave_stage_cli.config.wave_spreadsheet_columns = ["col1", "col2"]
         wave_stage_cli.config.wave_spreadsheet_column_mapping = {}
         wave_stage_cli.the_number_of_instance = lambda scm_source=None: 0
-        wave_stage_cli.open_projects_file = lambda scm_source=None: []
-        wave_stage_cli.open_users_file = lambda scm_source=None: []
-        wave_stage_cli.open_groups_file = lambda scm_source=None: []
+        wave_stage_cli.get_listed_data = lambda asset, scm_source=None: []
         wave_stage_cli.check_spreadsheet_data = lambda: None
         
         # Mock pcli.stage_data to capture what gets staged  
@@ -292,6 +279,29 @@ class TestWaveStageCLI:
         assert len(stage_data_calls) == 1
         assert stage_data_calls[0] == ["123", "456"]
 
+    def test_stage_wave_queries_staging_store(self, wave_stage_cli, monkeypatch, tmp_path):
+        """Test stage_wave looks up listed data by ID, path and URL without loading whole files."""
+        os.makedirs(tmp_path / "data")
+        (tmp_path / "data" / "projects.json").write_text(json.dumps([
+            {"id": 1, "path_with_namespace": "Group/Project", "http_url_to_repo": "https://gitlab.example.com/Group/Project.git"}]))
+        (tmp_path / "data" / "groups.json").write_text(json.dumps([{"id": 2, "full_path": "Group"}]))
+        (tmp_path / "data" / "users.json").write_text(json.dumps([{"id": 3, "username": "jdoe"}]))
+        monkeypatch.setattr('os.path.isfile', lambda x: False)
+        wave_stage_cli.app_path = str(tmp_path)
+        wave_stage_cli.config.wave_spreadsheet_path = "/nonexistent/path"
+        wave_stage_cli.the_number_of_instance = lambda scm_source=None: 0
+        for asset in ["projects", "groups", "users"]:
+            setattr(wave_stage_cli, f"open_{asset}_file", lambda scm_source=None: pytest.fail("Loaded whole file"))
+
+        with pytest.raises(SystemExit):
+            wave_stage_cli.stage_wave("wave1")
+
+        assert wave_stage_cli.project_paths["group/project"]["id"] == 1
+        assert wave_stage_cli.project_urls["https://gitlab.example.com/group/project.git"]["id"] == 1
+        assert wave_stage_cli.group_paths["group"]["id"] == 2
+        assert wave_stage_cli.rewritten_users[3]["username"] == "jdoe"
+        get_staging_store(str(tmp_path)).close()
+
     def test_check_spreadsheet_kv_all_items_exist(self, wave_stage_cli):
         """Test check_spreadsheet_kv when all mapping items exist in columns"""
         mapping = {'col1': 'property1', 'col2': 'property2', 'col3': 'property3'}
@@ -0,0 +1,13 @@
+from unittest.mock import patch
+from pytest import fixture
+
+
+@fixture(autouse=True, scope="session")
+def request_counters_path(tmp_path_factory):
+    '''
+        Every counted API request (and the counters flush on exit) writes to a temporary path, instead of data/
+    '''
+    path = str(tmp_path_factory.mktemp("congregate"))
+    with patch("congregate.helpers.request_counters.get_congregate_path", return_value=path), \
+            patch.dict("congregate.helpers.request_counters._counters", clear=True):
+        yield path
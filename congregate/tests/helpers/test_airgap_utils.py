@@ -0,0 +1,79 @@
+import os
+import json
+import tarfile
+import unittest
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch, PropertyMock
+from pytest import mark
+
+from congregate.helpers.airgap_utils import create_archive, extract_archive, CHECKSUMS_FILE
+
+
+@mark.unit_test
+class AirgapUtilsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "downloads"))
+        self.export_file = os.path.join(self.tmp.name, "group_project.tar.gz")
+        with open(self.export_file, "wb") as f:
+            f.write(os.urandom(3 * 1024 * 1024 + 7))
+        self.features = {"id": 1, "project_details": {"name": "project"}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def create_archive(self):
+        with patch("congregate.helpers.airgap_utils.__get_project_features") as mock_features:
+            mock_features.return_value = BytesIO(json.dumps(self.features).encode())
+            return create_archive(1, self.export_file)
+
+    @patch("congregate.helpers.airgap_utils.load_project_features")
+    @patch("congregate.helpers.conf.Config.filesystem_path", new_callable=PropertyMock)
+    def test_create_and_extract_archive(self, mock_path, mock_load):
+        mock_path.return_value = self.tmp.name
+        archive = self.create_archive()
+        self.assertEqual(archive, os.path.join(self.tmp.name, "group_project_artifact.tar.gz"))
+        with tarfile.open(archive, "r:gz") as tar:
+            self.assertEqual(tar.getnames(), ["group_project.tar.gz", "project_features.json", CHECKSUMS_FILE])
+
+        details, filename = extract_archive(archive)
+        self.assertEqual(details, {"name": "project"})
+        self.assertEqual(filename, "group_project.tar.gz")
+        mock_load.assert_called_once_with(self.features)
+        self.assertEqual(self.read(os.path.join(self.tmp.name, "downloads", filename)), self.read(self.export_file))
+
+    @patch("congregate.helpers.airgap_utils.load_project_features")
+    @patch("congregate.helpers.conf.Config.filesystem_path", new_callable=PropertyMock)
+    def test_extract_archive_checksum_mismatch(self, mock_path, _):
+        mock_path.return_value = self.tmp.name
+        archive = self.create_archive()
+        # Re-package the archive with a tampered manifest
+        tampered = os.path.join(self.tmp.name, "tampered.tar.gz")
+        with tarfile.open(archive, "r:gz") as src, tarfile.open(tampered, "w:gz") as dst:
+            for member in src.getmembers():
+                data = src.extractfile(member).read()
+                if member.name == CHECKSUMS_FILE:
+                    data = data.replace(data[:8], b"00000000", 1)
+                member.size = len(data)
+                dst.addfile(member, BytesIO(data))
+
+        with self.assertRaises(Exception) as e:
+            extract_archive(tampered)
+        self.assertIn("Checksum mismatch", str(e.exception))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "downloads", "group_project.tar.gz")))
+
+    @patch("congregate.helpers.airgap_utils.load_project_features")
+    @patch("congregate.helpers.conf.Config.airgap_checksums", new_callable=PropertyMock)
+    @patch("congregate.helpers.conf.Config.filesystem_path", new_callable=PropertyMock)
+    def test_create_archive_without_checksums(self, mock_path, mock_checksums, _):
+        mock_path.return_value = self.tmp.name
+        mock_checksums.return_value = False
+        archive = self.create_archive()
+        with tarfile.open(archive, "r:gz") as tar:
+            self.assertNotIn(CHECKSUMS_FILE, tar.getnames())
+        self.assertEqual(extract_archive(archive)[1], "group_project.tar.gz")
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pytest import mark
+
+from congregate.helpers.client_registry import get_shared, get_shared_config, lazy_client
+
+
+class SampleApi():
+    pass
+
+
+class SampleClient():
+    def __init__(self, DRY_RUN=True):
+        self.dry_run = DRY_RUN
+
+
+class SampleMigrateClient():
+    api = lazy_client(SampleApi)
+    client = lazy_client(SampleClient, DRY_RUN=False)
+    bound = lazy_client(lambda self: SampleClient(DRY_RUN=self.dry_run), bind=True)
+
+    def __init__(self, dry_run):
+        self.dry_run = dry_run
+
+
+@mark.unit_test
+@patch("congregate.helpers.client_registry._shared", {})
+class ClientRegistryTests(unittest.TestCase):
+    def test_get_shared(self):
+        factory = MagicMock(side_effect=object)
+        shared = get_shared("name", factory)
+        self.assertIs(get_shared("name", factory), shared)
+        factory.assert_called_once()
+        with patch("congregate.helpers.client_registry.getpid", return_value=-1):
+            self.assertIsNot(get_shared("name", factory), shared)
+
+    @patch("congregate.helpers.client_registry.ConfigurationValidator")
+    @patch("congregate.helpers.client_registry.exists", return_value=True)
+    @patch("congregate.helpers.client_registry.getmtime")
+    def test_get_shared_config_rebuilt_on_change(self, mock_mtime, _, mock_validator):
+        mock_validator.side_effect = lambda: object()
+        mock_mtime.return_value = 1
+        config = get_shared_config()
+        self.assertIs(get_shared_config(), config)
+        mock_mtime.return_value = 2
+        self.assertIsNot(get_shared_config(), config)
+        self.assertEqual(mock_validator.call_count, 2)
+
+    def test_lazy_client(self):
+        first, second = SampleMigrateClient(True), SampleMigrateClient(False)
+        self.assertNotIn("client", first.__dict__)
+        self.assertIs(first.client, first.client)
+        self.assertIsNot(first.client, second.client)
+        self.assertFalse(first.client.dry_run)
+        # API wrappers are shared by all instances
+        self.assertIs(first.api, second.api)
+        self.assertTrue(first.bound.dry_run)
+        self.assertFalse(second.bound.dry_run)
+        mock = MagicMock()
+        first.client = mock
+        self.assertIs(first.client, mock)
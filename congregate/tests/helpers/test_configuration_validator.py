@@ -1,4 +1,7 @@
 from io import StringIO
+from os import makedirs
+from time import time
+from tempfile import TemporaryDirectory
 import unittest
 from unittest import mock
 from pytest import mark, fixture
@@ -18,6 +21,8 @@ from congregate.tests.mockapi.ado.users import MockUsersApi as ADOUsers
 from congregate.tests.mockapi.gitlab.token import invalid_token
 from congregate.tests.mockapi.gitlab.error import other_error
 
+CONFIG_PATH = "congregate/tests/cli/data/test_not_ext_src_parent_group_path_no_mirror_name_aws_default.conf"
+
 @mark.unit_test
 class ConfigurationValidationTests(unittest.TestCase):
     def setUp(self):
@@ -27,8 +32,7 @@ class ConfigurationValidationTests(unittest.TestCase):
         self.gl_settings = GLMockSettings()
         self.bbs_users = BBSUsers()
         self.ado_users = ADOUsers()
-        self.config = ConfigurationValidator(
-            path="congregate/tests/cli/data/test_not_ext_src_parent_group_path_no_mirror_name_aws_default.conf")
+        self.config = ConfigurationValidator(path=CONFIG_PATH)
 
     @fixture(autouse=True)
     def capsys(self, capsys):
@@ -960,6 +964,42 @@ class ConfigurationValidationTests(unittest.TestCase):
 
         self.assertTrue(self.config.direct_transfer)
 
+    @mock.patch("congregate.helpers.configuration_validator._validations", set())
+    @mock.patch('congregate.helpers.configuration_validator.ConfigurationValidator.validate_dstn_token')
+    def test_dstn_token_validated_once_per_process(self, valid_token):
+        valid_token.return_value = True
+        self.config.dstn_token_validated_in_session = False
+        self.config.destination_token
+        other = ConfigurationValidator(path=CONFIG_PATH)
+        self.assertTrue(other.dstn_token_validated_in_session)
+        other.destination_token
+        valid_token.assert_called_once()
+        # Another token is validated again
+        other = ConfigurationValidator(path=CONFIG_PATH)
+        other.as_obj().set("DESTINATION", "dstn_access_token", "other")
+        self.assertFalse(other.dstn_token_validated_in_session)
+        self.config.dstn_token_validated_in_session = False
+        self.assertFalse(ConfigurationValidator(path=CONFIG_PATH).dstn_token_validated_in_session)
+
+    @mock.patch("congregate.helpers.configuration_validator._validations", set())
+    @mock.patch("congregate.helpers.configuration_validator.get_congregate_path")
+    @mock.patch("congregate.helpers.conf.Config.config_validation_ttl", new_callable=mock.PropertyMock)
+    def test_validations_shared_by_processes_within_ttl(self, ttl, path):
+        with TemporaryDirectory() as tmp:
+            makedirs(f"{tmp}/data")
+            path.return_value = tmp
+            ttl.return_value = 300
+            self.config.src_token_validated_in_session = True
+            with open(f"{tmp}/data/config_validations.json") as f:
+                raw = f.read()
+            self.assertNotIn("dGVzdA==", raw)
+            # e.g. a spawned worker process
+            with mock.patch("congregate.helpers.configuration_validator._validations", set()):
+                self.assertTrue(ConfigurationValidator(path=CONFIG_PATH).src_token_validated_in_session)
+            with mock.patch("congregate.helpers.configuration_validator._validations", set()), \
+                    mock.patch("congregate.helpers.configuration_validator.time", return_value=time() + 301):
+                self.assertFalse(ConfigurationValidator(path=CONFIG_PATH).src_token_validated_in_session)
+
 
 def mock_api(*side_effect):
     mock_handler = mock.Mock()
@@ -25,6 +25,14 @@ class MongoConnectorTests(unittest.TestCase):
                     "groups-github.example.com", "users-github.example.com", "keys-github.example.com"]
         self.assertListEqual(self.c.db.list_collection_names(), expected)
 
+    def test_high_water_mark(self):
+        self.assertIsNone(self.c.get_high_water_mark("projects-github.example.com"))
+        self.c.set_high_water_mark("projects-github.example.com", "2024-01-01T00:00:00Z")
+        self.c.set_high_water_mark("projects-github.example.com", "2024-02-01T00:00:00Z")
+
+        self.assertEqual(self.c.get_high_water_mark("projects-github.example.com"), "2024-02-01T00:00:00Z")
+        self.assertIsNone(self.c.get_high_water_mark("groups-github.example.com"))
+
     def test_find_user_email(self):
         data = {
             "id": 1,
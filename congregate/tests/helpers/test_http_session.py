@@ -0,0 +1,34 @@
+import unittest
+from unittest.mock import patch
+from pytest import mark
+import responses
+
+from congregate.helpers.http_session import get_pooled_session, get_host, PooledSession
+
+
+@mark.unit_test
+class HttpSessionTests(unittest.TestCase):
+    @patch("congregate.helpers.http_session._sessions", {})
+    def test_get_pooled_session_per_host(self):
+        session = get_pooled_session("https://github.example.com/api/v3/orgs")
+        self.assertIs(session, get_pooled_session(
+            "https://github.example.com/api/v3/users?since=1"))
+        self.assertIsNot(session, get_pooled_session(
+            "https://bitbucket.example.com/rest/api/1.0/projects"))
+        self.assertEqual(session.host, "https://github.example.com")
+
+    def test_get_host(self):
+        self.assertEqual(get_host(
+            "https://dev.azure.com/org/_apis/projects"), "https://dev.azure.com")
+        self.assertEqual(get_host("http://localhost:7990/rest"), "http://localhost:7990")
+
+    @responses.activate
+    def test_pooled_session_counts_requests(self):
+        responses.add(responses.GET, "https://github.example.com/api/v3/orgs", json=[])
+        session = PooledSession("https://github.example.com", pool_size=2)
+        for _ in range(3):
+            session.get("https://github.example.com/api/v3/orgs")
+        self.assertEqual(session.requests_sent, 3)
+        with patch("congregate.helpers.http_session.log") as mock_log:
+            session.close()
+            mock_log.info.assert_called_once()
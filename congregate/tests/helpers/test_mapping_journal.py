@@ -0,0 +1,76 @@
+import os
+import json
+import unittest
+from tempfile import TemporaryDirectory
+from multiprocessing import get_context
+from pytest import mark
+
+from congregate.helpers.mapping_journal import MappingJournal
+
+
+def append_mappings(path, start):
+    journal = MappingJournal(path)
+    for i in range(start, start + 100):
+        journal.append(i, i + 1000)
+    journal.close()
+
+
+@mark.unit_test
+class MappingJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "project_id_mapping.json")
+        self.journal = MappingJournal(self.path)
+
+    def tearDown(self):
+        self.journal.close()
+        self.tmp.cleanup()
+
+    def test_load_last_mapping_wins(self):
+        self.journal.append(1, 101)
+        self.journal.append(2, 102)
+        self.journal.append(1, 201)
+        self.assertEqual(self.journal.load(), {"1": 201, "2": 102})
+
+    def test_load_skips_torn_line(self):
+        self.journal.append(1, 101)
+        self.journal.close()
+        with open(self.journal.journal_path, "a") as f:
+            f.write('["2", 1')
+        self.assertEqual(self.journal.load(), {"1": 101})
+
+    def test_compact(self):
+        with open(self.path, "w") as f:
+            json.dump({"1": 101, "2": 102}, f)
+        self.journal.append(2, 202)
+        self.journal.append(3, 103)
+        self.assertEqual(self.journal.compact(), {"1": 101, "2": 202, "3": 103})
+        self.assertEqual(os.path.getsize(self.journal.journal_path), 0)
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f), {"1": 101, "2": 202, "3": 103})
+        # Appends after compaction go to the emptied journal
+        self.journal.append(4, 104)
+        self.assertEqual(self.journal.load()["4"], 104)
+        self.assertEqual(len(self.journal.compact()), 4)
+
+    def test_concurrent_appends(self):
+        ctx = get_context("spawn")
+        workers = [ctx.Process(target=append_mappings, args=(self.path, start))
+                   for start in range(0, 400, 100)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        mapping = self.journal.compact()
+        self.assertEqual(len(mapping), 400)
+        self.assertEqual(mapping["399"], 1399)
+
+    def test_reset(self):
+        with open(self.path, "w") as f:
+            json.dump({"1": 101}, f)
+        self.journal.append(2, 102)
+        self.journal.reset()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.journal.load(), {})
+        self.journal.append(3, 103)
+        self.assertEqual(self.journal.compact(), {"3": 103})
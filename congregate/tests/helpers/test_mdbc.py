@@ -1,5 +1,8 @@
+import os
+import json
 import unittest
 import warnings
+from tempfile import TemporaryDirectory
 from unittest.mock import patch, PropertyMock, mock_open
 from pytest import mark
 # mongomock is using deprecated logic as of Python 3.3
@@ -9,6 +12,7 @@ with warnings.catch_warnings():
     import mongomock
 
 from congregate.helpers.mdbc import MongoConnector
+from congregate.helpers.csv_utils import write_collection_csv, write_projects_csv
 
 
 @mark.unit_test
@@ -149,3 +153,92 @@ class MongoConnectorTests(unittest.TestCase):
         }
 
         self.assertDictEqual(expected, actual)
+
+    def test_upsert_data_buffered_until_bulk_write_size(self):
+        self.c.bulk_write_size = 2
+        self.c.bulk_write_interval = 60
+        self.c.upsert_data("sample", {"id": 1, "hello": "world"})
+
+        self.assertEqual(self.c.db.sample.count_documents({}), 0)
+
+        self.c.upsert_data("sample", {"id": 2, "hello": "world"})
+
+        self.assertEqual(self.c.db.sample.count_documents({}), 2)
+        self.assertDictEqual(self.c.bulk_buffer, {})
+
+    def test_upsert_duplicate_data(self):
+        self.c.bulk_write_size = 10
+        self.c.bulk_write_interval = 60
+        self.c.upsert_data("sample", {"id": 1, "hello": "world"})
+        self.c.upsert_data("sample", {"id": 1, "hello": "there"})
+        self.c.flush_bulk_writes()
+
+        actual = self.c.db['sample'].find_one()
+        actual.pop("_id")
+        expected = {
+            "id": 1,
+            "hello": "world"
+        }
+
+        self.assertEqual(self.c.db.sample.count_documents({}), 1)
+        self.assertDictEqual(expected, actual)
+
+    def test_upsert_data_buffers_a_copy(self):
+        self.c.bulk_write_size = 10
+        self.c.bulk_write_interval = 60
+        data = {"id": 1, "members": [{"username": "jdoe"}]}
+        self.c.upsert_data("sample", data)
+        data["members"].append({"username": "jsmith"})
+        self.c.flush_bulk_writes()
+
+        actual = self.c.db['sample'].find_one()
+        actual.pop("_id")
+
+        self.assertDictEqual({"id": 1, "members": [{"username": "jdoe"}]}, actual)
+
+    def test_dump_collection_flushes_buffer(self):
+        self.c.bulk_write_size = 10
+        self.c.bulk_write_interval = 60
+        self.c.upsert_data("sample", {"id": 1, "hello": "world"})
+        with patch("congregate.helpers.mdbc.stream_json_yield_to_file") as mock_stream:
+            self.c.dump_collection_to_file("sample", "/tmp/sample.json")
+            mock_stream.assert_called_once()
+
+        self.assertEqual(self.c.db.sample.count_documents({}), 1)
+
+    def test_stream_projection(self):
+        self.c.insert_data("sample", {"id": 1, "name": "one", "secret": "token"})
+        self.assertEqual(list(self.c.stream_projection("sample", ["id", "name"])), [
+            {"id": 1, "name": "one"}])
+
+    def test_write_collection_csv(self):
+        projects = [{"id": i, "name": f"project-{i}", "archived": bool(i % 2), "namespace": {"id": 10},
+                     "members": [{"username": "jdoe"}], "import_url": None} for i in range(5)]
+        for p in projects:
+            self.c.insert_data("projects-gitlab.example.com", dict(p))
+        with TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "projects.json"), "w") as f:
+                json.dump(projects, f)
+            write_projects_csv(os.path.join(tmp, "projects.json"), os.path.join(tmp, "expected.csv"))
+            write_collection_csv(self.c, "projects-gitlab.example.com",
+                                 os.path.join(tmp, "projects.csv"), "projects")
+            with open(os.path.join(tmp, "expected.csv")) as expected, open(os.path.join(tmp, "projects.csv")) as actual:
+                self.assertEqual(actual.read(), expected.read())
+
+    def test_upsert_data_replace(self):
+        self.c.upsert_data("sample", {"id": 1, "hello": "world", "old": True})
+        self.c.upsert_data("sample", {"id": 1, "hello": "there"}, replace=True)
+        self.c.flush_bulk_writes()
+
+        actual = self.c.db['sample'].find_one()
+        actual.pop("_id")
+
+        self.assertEqual(self.c.db.sample.count_documents({}), 1)
+        self.assertDictEqual({"id": 1, "hello": "there"}, actual)
+
+    def test_delete_missing(self):
+        for i in range(4):
+            self.c.insert_data("sample", {"id": i})
+
+        self.assertEqual(self.c.delete_missing("sample", {0, 2, 5}), 2)
+        self.assertEqual(sorted(d["id"] for d in self.c.db.sample.find()), [0, 2])
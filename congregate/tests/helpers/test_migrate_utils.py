@@ -48,7 +48,7 @@ class MigrateTests(unittest.TestCase):
         expected = []
         self.assertListEqual(failed_results, expected)
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -107,7 +107,7 @@ class MigrateTests(unittest.TestCase):
         self.assertListEqual(filtered_staged, expected)
         print(filtered_staged)
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -122,7 +122,7 @@ class MigrateTests(unittest.TestCase):
         self.assertListEqual(
             filtered_staged, self.mock_projects.get_staged_projects())
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -138,7 +138,7 @@ class MigrateTests(unittest.TestCase):
             self.mock_projects.get_staged_projects(), failed_results)
         self.assertListEqual(filtered_staged, [])
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -154,7 +154,7 @@ class MigrateTests(unittest.TestCase):
             self.mock_projects.get_staged_projects(), failed_results)
         self.assertListEqual(filtered_staged, [])
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -205,7 +205,7 @@ class MigrateTests(unittest.TestCase):
         self.assertListEqual(filtered_staged, expected)
         print(filtered_staged)
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -220,7 +220,7 @@ class MigrateTests(unittest.TestCase):
         self.assertListEqual(
             filtered_staged, self.mock_groups.get_staged_groups())
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.dstn_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.dstn_parent_id",
            new_callable=PropertyMock)
     @patch.object(GroupsApi, "get_group")
     @patch.object(ConfigurationValidator, "validate_dstn_parent_group_id")
@@ -684,7 +684,7 @@ class MigrateTests(unittest.TestCase):
         self.assertFalse(mutils.is_top_level_group(
             self.mock_groups.get_subgroup()))
 
-    @patch("congregate.helpers.base_class.ConfigurationValidator.src_parent_id",
+    @patch("congregate.helpers.configuration_validator.ConfigurationValidator.src_parent_id",
            new_callable=PropertyMock)
     def test_is_top_level_group_src_parent_group(self, src_parent_id):
         src_parent_id.return_value = 4
@@ -0,0 +1,99 @@
+import os
+import unittest
+from unittest.mock import patch, PropertyMock, MagicMock
+from tempfile import TemporaryDirectory
+from contextlib import contextmanager
+from pytest import mark
+
+from congregate.helpers.rate_limiter import RateLimiter, FileRateLimitStore, get_retry_after, get_reset_time, \
+    record_response
+
+
+class DictRateLimitStore():
+    def __init__(self):
+        self.states = {}
+
+    @contextmanager
+    def locked(self, host):
+        yield self.states.setdefault(host, {})
+
+
+@mark.unit_test
+class RateLimiterTests(unittest.TestCase):
+    HOST = "https://gitlab.example.com"
+
+    def test_headers(self):
+        self.assertEqual(get_retry_after({"Retry-After": "30"}, 100), 30)
+        self.assertEqual(get_retry_after(
+            {"Retry-After": "Thu, 01 Jan 1970 00:01:40 GMT"}, 40), 60)
+        self.assertIsNone(get_retry_after({}, 100))
+        # Unix timestamp (GitLab, GitHub) and seconds (IETF draft)
+        self.assertEqual(get_reset_time({"RateLimit-Reset": "1700000000"}, 100), 1700000000)
+        self.assertEqual(get_reset_time({"X-RateLimit-Reset": "60"}, 100), 160)
+
+    def test_unlimited_without_headers(self):
+        limiter = RateLimiter(DictRateLimitStore(), burst=2)
+        state = {}
+        limiter.adapt(state, 200, {}, 100)
+        self.assertEqual([limiter.take(state, 100) for _ in range(5)], [0] * 5)
+
+    def test_paces_remaining_requests_over_window(self):
+        limiter = RateLimiter(DictRateLimitStore(), burst=2)
+        state = {}
+        limiter.adapt(state, 200, {"RateLimit-Remaining": "10", "RateLimit-Reset": "20"}, 100)
+        self.assertEqual(state["rate"], 0.5)
+        # Burst, then one request every 2 seconds
+        self.assertEqual(limiter.take(state, 100), 0)
+        self.assertEqual(limiter.take(state, 100), 0)
+        self.assertEqual(limiter.take(state, 100), 2)
+        self.assertEqual(limiter.take(state, 102), 0)
+        # Not paced once the window is over
+        self.assertEqual(limiter.take(state, 121), 0)
+        self.assertNotIn("rate", state)
+
+    def test_blocks_until_retry_after_or_reset(self):
+        limiter = RateLimiter(DictRateLimitStore())
+        state = {}
+        limiter.adapt(state, 429, {"Retry-After": "30"}, 100)
+        self.assertEqual(limiter.take(state, 110), 20)
+        state = {}
+        limiter.adapt(state, 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "45"}, 100)
+        self.assertEqual(limiter.take(state, 100), 45)
+        state = {}
+        limiter.adapt(state, 429, {}, 100)
+        self.assertEqual(limiter.take(state, 100), RateLimiter.DEFAULT_RETRY_AFTER)
+
+    @patch("congregate.helpers.rate_limiter.sleep")
+    def test_file_store_shared_between_limiters(self, mock_sleep):
+        with TemporaryDirectory() as path:
+            first = RateLimiter(FileRateLimitStore(path))
+            second = RateLimiter(FileRateLimitStore(path))
+            with patch("congregate.helpers.rate_limiter.time", side_effect=[100, 100, 100, 130]):
+                second.update(f"{self.HOST}/api/v4/users", 200,
+                              {"RateLimit-Remaining": "100", "RateLimit-Reset": "60"})
+                first.update(f"{self.HOST}/api/v4/projects", 429, {"Retry-After": "30"})
+                second.acquire(f"{self.HOST}/api/v4/groups")
+            mock_sleep.assert_called_once_with(RateLimiter.MAX_SLEEP)
+
+    def test_skips_store_of_hosts_without_known_limit(self):
+        store = DictRateLimitStore()
+        store.locked = MagicMock(wraps=store.locked)
+        limiter = RateLimiter(store)
+        limiter.update(f"{self.HOST}/api/v4/projects", 200, {"Content-Type": "application/json"})
+        limiter.acquire(f"{self.HOST}/api/v4/groups")
+        store.locked.assert_not_called()
+        # A 429 without headers is enough to pace the host
+        limiter.update(f"{self.HOST}/api/v4/projects", 429, {})
+        self.assertEqual(limiter.limited_hosts, {self.HOST})
+        self.assertEqual(store.locked.call_count, 1)
+
+    @patch("congregate.helpers.rate_limiter._limiters", {})
+    @patch("congregate.helpers.conf.Config.rate_limit_backend", new_callable=PropertyMock, return_value="file")
+    def test_file_store_under_congregate_path(self, _):
+        with TemporaryDirectory() as path:
+            with patch("congregate.helpers.rate_limiter.get_congregate_path", return_value=path):
+                record_response(f"{self.HOST}/api/v4/projects", 200, {})
+                self.assertFalse(os.path.exists(f"{path}/data/rate_limits"))
+                record_response(f"{self.HOST}/api/v4/projects", 200,
+                                {"RateLimit-Remaining": "100", "RateLimit-Reset": "60"})
+            self.assertEqual(os.listdir(f"{path}/data/rate_limits"), ["gitlab.example.com.json"])
@@ -0,0 +1,91 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from multiprocessing import get_context
+from pytest import mark
+
+from congregate.helpers.request_counters import RequestCounters, get_endpoint_template
+
+
+def record_requests(path):
+    counters = RequestCounters(path)
+    for i in range(10):
+        counters.record("GET", f"https://gitlab.example.com/api/v4/projects/{i}", 200, 100, 0.5)
+    counters.flush()
+
+
+@mark.unit_test
+class RequestCountersTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.counters = RequestCounters(os.path.join(self.tmp.name, "request_counters.json"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_endpoint_template(self):
+        self.assertEqual(get_endpoint_template(
+            "https://gitlab.example.com/api/v4/projects/42/issues/7?page=2"), "/api/v4/projects/:id/issues/:id")
+        self.assertEqual(get_endpoint_template(
+            "https://gitlab.example.com/api/v4/projects/group%2Fproject/repository/commits/"
+            "1d9e5fbc7eb2d5a2b0cbbcc5f87b4e51fcde0b2a"), "/api/v4/projects/:id/repository/commits/:id")
+        self.assertEqual(get_endpoint_template(
+            "https://dev.azure.com/org/_apis/projects/6ce954b1-ce1f-45d1-b94d-e6bf2464ba2c"), "/org/_apis/projects/:id")
+        # GitHub and BitBucket owner and repository names
+        self.assertEqual(get_endpoint_template(
+            "https://api.github.com/repos/org/repo/pulls/3/comments"), "/repos/:name/:name/pulls/:id/comments")
+        self.assertEqual(get_endpoint_template(
+            "https://github.example.com/api/v3/orgs/org/repos?page=2"), "/api/v3/orgs/:name/repos")
+        self.assertEqual(get_endpoint_template(
+            "https://bitbucket.example.com/rest/api/1.0/projects/KEY/repos/repo/pull-requests/4"),
+            "/rest/api/1.0/projects/:name/repos/:name/pull-requests/:id")
+        self.assertEqual(get_endpoint_template(
+            "https://api.bitbucket.org/2.0/repositories/workspace/repo/pullrequests"), "/2.0/repositories/:name/:name/pullrequests")
+        self.assertEqual(get_endpoint_template(
+            "https://gitlab.example.com/api/v4/groups/1/projects/shared"), "/api/v4/groups/:id/projects/shared")
+
+    def test_summarize(self):
+        self.counters.record("GET", "https://gitlab.example.com/api/v4/projects/1", 200, 1000, 0.2)
+        self.counters.record("get", "https://gitlab.example.com/api/v4/projects/2", 200, 500, 0.4)
+        self.counters.record("POST", "https://gitlab.example.com/api/v4/projects", 201, 0, 1.0)
+        self.counters.record("PUT", "https://api.github.com/repos/org/repo", 404, 0, 0.4)
+        summary = self.counters.summarize()
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["write_requests"], 2)
+        self.assertEqual(summary["bytes"], 1500)
+        self.assertAlmostEqual(summary["latency"], 2.0)
+        self.assertEqual(summary["hosts"], {"https://gitlab.example.com": 3, "https://api.github.com": 1})
+        self.assertEqual(summary["status_codes"], {"200": 2, "201": 1, "404": 1})
+        self.assertEqual(summary["endpoints"]["GET /api/v4/projects/:id"], 2)
+
+    def test_flush_creates_data_directory(self):
+        self.counters.path = os.path.join(self.tmp.name, "data", "request_counters.json")
+        self.counters.record("GET", "https://gitlab.example.com/api/v4/projects/1", 200)
+        self.counters.flush()
+        self.assertEqual(self.counters.summarize()["requests"], 1)
+
+    def test_flush_failure_keeps_counts(self):
+        self.counters.path = self.tmp.name
+        self.counters.record("GET", "https://gitlab.example.com/api/v4/projects/1", 200)
+        self.counters.flush()
+        self.assertEqual(sum(c[0] for c in self.counters.counts.values()), 1)
+
+    def test_reset(self):
+        self.counters.record("GET", "https://gitlab.example.com/api/v4/projects/1", 200)
+        self.counters.flush()
+        self.counters.record("GET", "https://gitlab.example.com/api/v4/projects/1", 200)
+        self.counters.reset()
+        self.assertEqual(self.counters.summarize()["requests"], 0)
+
+    def test_aggregates_processes(self):
+        ctx = get_context("spawn")
+        workers = [ctx.Process(target=record_requests, args=(self.counters.path,)) for _ in range(3)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        self.counters.record("POST", "https://gitlab.example.com/api/v4/projects", 201)
+        summary = self.counters.summarize()
+        self.assertEqual(summary["requests"], 31)
+        self.assertEqual(summary["bytes"], 3000)
+        self.assertEqual(summary["endpoints"]["GET /api/v4/projects/:id"], 30)
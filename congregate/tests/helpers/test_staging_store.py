@@ -0,0 +1,93 @@
+import os
+import unittest
+from threading import Thread
+from json import dump
+from tempfile import TemporaryDirectory
+from pytest import mark
+
+from congregate.helpers.staging_store import StagingStore
+
+
+@mark.unit_test
+class StagingStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        os.makedirs(f"{self.tmp.name}/data")
+        self.write("projects", [
+            {"id": 1, "path_with_namespace": "Group/Project-1",
+             "http_url_to_repo": "https://gitlab.example.com/Group/Project-1.git", "namespace": {"id": 10}},
+            {"id": 2, "path_with_namespace": "group/project-2",
+             "http_url_to_repo": "https://gitlab.example.com/group/project-2.git", "namespace": {"id": 10}}
+        ])
+        self.write("users", [
+            {"id": 5, "username": "jdoe", "email": "jdoe@example.com"},
+            {"id": 6, "username": "5", "email": "other@example.com"}
+        ])
+        self.store = StagingStore(self.tmp.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def write(self, file, data):
+        with open(f"{self.tmp.name}/data/{file}.json", "w") as f:
+            dump(data, f)
+
+    def test_get_missing_file(self):
+        self.assertIsNone(self.store.get("groups"))
+
+    def test_listed_data(self):
+        projects = self.store.get("projects")
+        self.assertEqual(len(projects), 2)
+        self.assertEqual([p["id"] for p in projects], [1, 2])
+        self.assertEqual(projects[1]["id"], 2)
+        self.assertEqual(projects[-1]["id"], 2)
+        with self.assertRaises(IndexError):
+            projects[2]
+        self.assertEqual([p["id"] for p in projects.get_many([2, 1, 3])], [1, 2])
+
+    def test_index(self):
+        projects = self.store.get("projects")
+        by_id = projects.index("id")
+        self.assertEqual(by_id[1]["path_with_namespace"], "Group/Project-1")
+        self.assertIs(by_id[1], by_id[1])
+        self.assertNotIn(3, by_id)
+        by_path = projects.index("path_with_namespace", lowercase=True)
+        self.assertEqual(by_path["group/project-1"]["id"], 1)
+        by_url = projects.index("http_url_to_repo", lowercase=True)
+        self.assertEqual(by_url["https://gitlab.example.com/group/project-1.git"]["id"], 1)
+        self.assertEqual(list(by_url), [
+            "https://gitlab.example.com/group/project-1.git",
+            "https://gitlab.example.com/group/project-2.git"])
+
+    def test_find_users(self):
+        users = self.store.get("users")
+        self.assertEqual([u["id"] for u in users.find_users("jdoe")], [5])
+        self.assertEqual([u["id"] for u in users.find_users("other@example.com")], [6])
+        self.assertEqual([u["id"] for u in users.find_users("5")], [5, 6])
+        self.assertEqual(users.find_users("unknown"), [])
+
+    def test_reindex_changed_file(self):
+        self.assertEqual(len(self.store.get("projects")), 2)
+        self.write("projects", [{"id": 3, "path_with_namespace": "group/project-3"}])
+        projects = self.store.get("projects")
+        self.assertEqual([p["id"] for p in projects], [3])
+        self.assertEqual(projects.index("path_with_namespace")["group/project-3"]["id"], 3)
+
+    def test_index_all_scm_sources(self):
+        self.write("projects-github.example.com", [{"id": 7}])
+        self.store.index_all()
+        files = [f for (f,) in self.store.conn.execute("SELECT file FROM files ORDER BY file")]
+        self.assertEqual(files, ["projects", "projects-github.example.com", "users"])
+        self.assertEqual(self.store.get("projects", "github.example.com")[0]["id"], 7)
+
+    def test_query_from_other_threads(self):
+        projects = self.store.get("projects")
+        results = []
+        threads = [Thread(target=lambda: results.append(projects.index("id")[2]["id"])) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [2, 2, 2])
+        self.assertEqual(len(projects), 2)
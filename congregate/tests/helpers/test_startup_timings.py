@@ -0,0 +1,32 @@
+import sys
+import builtins
+import importlib
+import unittest
+from io import StringIO
+from time import perf_counter
+from unittest.mock import patch
+from pytest import mark
+
+from congregate.helpers.startup_timings import CommandTimings
+
+
+@mark.unit_test
+class StartupTimingsTests(unittest.TestCase):
+    @patch("congregate.helpers.startup_timings.register")
+    def test_command_timings(self, mock_register):
+        original = builtins.__import__
+        timings = CommandTimings(perf_counter())
+        try:
+            timings.start("list")
+            mock_register.assert_called_once_with(timings.report)
+            sys.modules.pop("colorsys", None)
+            importlib.import_module("colorsys")
+            self.assertGreater(timings.import_time, 0)
+        finally:
+            with patch("sys.stderr", new_callable=StringIO) as stderr:
+                timings.report()
+        self.assertIs(builtins.__import__, original)
+        self.assertIn("Timings of 'list': startup", stderr.getvalue())
+        t = timings.get_timings()
+        self.assertGreaterEqual(t["modules"], 1)
+        self.assertGreaterEqual(t["total"], t["startup"] + t["imports"])
@@ -0,0 +1,74 @@
+import unittest
+from threading import Event
+from unittest.mock import MagicMock
+from pytest import mark
+from httpx import RequestError
+
+from congregate.helpers.status_scheduler import StatusScheduler, StatusResult, PENDING, FINISHED, FAILED, TIMEOUT
+
+
+@mark.unit_test
+class StatusSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = StatusScheduler(max_concurrency=2)
+
+    def tearDown(self):
+        self.scheduler.close()
+
+    def test_schedule_polls_until_finished(self):
+        check = MagicMock(side_effect=[
+            StatusResult(PENDING), StatusResult(PENDING), StatusResult(FINISHED, 12345)])
+        result = self.scheduler.schedule(
+            "project", check, wait_time=0.01).result(timeout=5)
+        self.assertEqual(result, StatusResult(FINISHED, 12345))
+        self.assertEqual(check.call_count, 3)
+
+    def test_schedule_callback(self):
+        called = Event()
+        callback = MagicMock(side_effect=lambda _: called.set())
+        future = self.scheduler.schedule(
+            "project", lambda _: StatusResult(FAILED), wait_time=0.01, callback=callback)
+        self.assertTrue(called.wait(timeout=5))
+        callback.assert_called_once_with(future)
+        self.assertEqual(future.result().state, FAILED)
+
+    def test_schedule_timeout(self):
+        check = MagicMock(return_value=StatusResult(PENDING))
+        result = self.scheduler.schedule(
+            "project", check, wait_time=0.01, timeout=0.05).result(timeout=5)
+        self.assertEqual(result.state, TIMEOUT)
+        self.assertGreater(check.call_count, 1)
+
+    def test_schedule_request_error_is_retried(self):
+        check = MagicMock(side_effect=[
+            RequestError("connection reset"), StatusResult(FINISHED)])
+        result = self.scheduler.schedule(
+            "project", check, wait_time=0.01).result(timeout=5)
+        self.assertEqual(result.state, FINISHED)
+
+    def test_schedule_error_is_raised(self):
+        check = MagicMock(side_effect=ValueError("invalid status"))
+        future = self.scheduler.schedule("project", check, wait_time=0.01)
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+
+    def test_schedule_many_bounded_concurrency(self):
+        futures = [self.scheduler.schedule(
+            f"project {i}", lambda age: StatusResult(FINISHED if age > 0.02 else PENDING),
+            wait_time=0.01) for i in range(10)]
+        self.assertTrue(all(f.result(timeout=5).state == FINISHED for f in futures))
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_next_wait_backoff(self):
+        entry = MagicMock(wait_time=10, age=0)
+        self.assertEqual(self.scheduler.next_wait(entry), 10)
+        entry.age = 300
+        self.assertEqual(self.scheduler.next_wait(entry), 20)
+        entry.age = 3600
+        self.assertEqual(self.scheduler.next_wait(entry), 80)
+
+    def test_close_cancels_queued(self):
+        future = self.scheduler.schedule(
+            "project", lambda _: StatusResult(PENDING), wait_time=0.01, delay=60)
+        self.scheduler.close()
+        self.assertTrue(future.cancelled())
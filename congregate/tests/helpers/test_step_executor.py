@@ -0,0 +1,67 @@
+import unittest
+from time import sleep, perf_counter
+from threading import Lock
+from pytest import mark
+
+from congregate.helpers.step_executor import Step, run_steps
+
+
+@mark.unit_test
+class StepExecutorTests(unittest.TestCase):
+    def test_run_steps_results_and_timings(self):
+        results, timings = run_steps([
+            Step("a", lambda: 1),
+            Step("b", lambda a: a + 1, depends_on=("a",)),
+            Step("c", lambda a, b: a + b, depends_on=("a", "b"))
+        ], max_workers=2)
+        self.assertEqual(results, {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(set(timings), {"a", "b", "c"})
+
+    def test_run_steps_respects_dependencies(self):
+        order = []
+        lock = Lock()
+
+        def step(name, delay=0):
+            def run(*_):
+                sleep(delay)
+                with lock:
+                    order.append(name)
+            return run
+
+        run_steps([
+            Step("user_lists", step("user_lists", 0.05)),
+            Step("feature_flags", step("feature_flags"), depends_on=("user_lists",)),
+            Step("hooks", step("hooks"))
+        ], max_workers=3)
+        self.assertLess(order.index("user_lists"), order.index("feature_flags"))
+        self.assertEqual(order[0], "hooks")
+
+    def test_run_steps_concurrently(self):
+        start = perf_counter()
+        run_steps([Step(str(i), lambda: sleep(0.1)) for i in range(4)], max_workers=4)
+        self.assertLess(perf_counter() - start, 0.35)
+
+    def test_run_steps_missing_dependency_passes_none(self):
+        results, _ = run_steps(
+            [Step("b", lambda a: a, depends_on=("a",))])
+        self.assertEqual(results, {"b": None})
+
+    def test_run_steps_error_skips_dependents(self):
+        dependent = []
+
+        def fail():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            run_steps([
+                Step("a", fail),
+                Step("b", lambda _: dependent.append(True), depends_on=("a",))
+            ])
+        self.assertEqual(dependent, [])
+
+    def test_run_steps_circular_dependencies(self):
+        with self.assertRaises(ValueError):
+            run_steps([
+                Step("a", lambda _: None, depends_on=("b",)),
+                Step("b", lambda _: None, depends_on=("a",))
+            ])
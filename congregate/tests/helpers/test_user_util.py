@@ -5,7 +5,7 @@ import congregate.helpers.user_util as uutil
 
 @pytest.mark.unit_test
 class UserUtilTest(unittest.TestCase):
-    @mock.patch("congregate.helpers.base_class.ConfigurationValidator.user_map", new_callable=unittest.mock.PropertyMock)
+    @mock.patch("congregate.helpers.configuration_validator.ConfigurationValidator.user_map", new_callable=unittest.mock.PropertyMock)
     def test_happy(self, um):
         um.return_value = "congregate/tests/helpers/user_util/data/fake_user_map.csv"
         with self.assertLogs('congregate.helpers.base_class') as captured:
@@ -19,7 +19,7 @@ class UserUtilTest(unittest.TestCase):
         self.assertIn('INFO:congregate.helpers.base_class:DRY-RUN: Found 0 users in the CSV not in staged_users: \n', captured.output)
         self.assertIn('INFO:congregate.helpers.base_class:DRY-RUN: 0 users will be removed from staging, and only the mapped will be staged', captured.output)
 
-    @mock.patch("congregate.helpers.base_class.ConfigurationValidator.user_map", new_callable=unittest.mock.PropertyMock)
+    @mock.patch("congregate.helpers.configuration_validator.ConfigurationValidator.user_map", new_callable=unittest.mock.PropertyMock)
     def test_bad_in_csv(self, um):
         um.return_value = "congregate/tests/helpers/user_util/data/fake_user_map_extra.csv"
         with self.assertLogs('congregate.helpers.base_class') as captured:
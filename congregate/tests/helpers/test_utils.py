@@ -88,3 +88,15 @@ class UtilsTests(unittest.TestCase):
         actual = xml_to_dict(test_xml)
 
         self.assertEqual(expected, actual)
+
+    def test_is_changed_since(self):
+        project = {"last_activity_at": "2024-01-01T10:00:00.123Z"}
+        self.assertTrue(utils.is_changed_since(project, "2024-01-01T09:59:59Z"))
+        self.assertFalse(utils.is_changed_since(project, "2024-01-01T10:00:01Z"))
+        self.assertTrue(utils.is_changed_since(project, None))
+        self.assertTrue(utils.is_changed_since({}, "2024-01-01T10:00:01Z"))
+        self.assertFalse(utils.is_changed_since(
+            {"updated_at": "2024-01-01T10:00:00+00:00"}, "2024-01-01T10:00:00Z", fields=("updated_at",)))
+        # Renames, transfers and archiving only change updated_at
+        self.assertTrue(utils.is_changed_since(
+            {**project, "updated_at": "2024-01-02T00:00:00Z"}, "2024-01-01T10:00:01Z"))
@@ -45,16 +45,16 @@ class BaseTests(unittest.TestCase):
         self.assertEqual(resp, "https://api.github.com/users")
 
     def test_generate_v3_get_request(self):
-        with patch("congregate.migration.github.api.base.requests.Response") as mock_resp:
-            with patch("congregate.migration.github.api.base.requests.get") as mock_get:
-                mock_get.return_value = mock_resp
+        with patch("requests.Response") as mock_resp:
+            with patch("congregate.migration.github.api.base.get_pooled_session") as mock_session:
+                mock_session.return_value.get.return_value = mock_resp
                 resp = self.api.generate_v3_get_request("HOST", "API")
                 self.assertEqual(mock_resp, resp)
 
     def test_generate_v3_basic_auth_get_request(self):
-        with patch("congregate.migration.github.api.base.requests.Response") as mock_resp:
-            with patch("congregate.migration.github.api.base.requests.get") as mock_get:
-                mock_get.return_value = mock_resp
+        with patch("requests.Response") as mock_resp:
+            with patch("congregate.migration.github.api.base.get_pooled_session") as mock_session:
+                mock_session.return_value.get.return_value = mock_resp
                 resp = self.api.generate_v3_get_request(
                     "HOST", "API", "USERNAME", "PASSWORD")
                 self.assertEqual(mock_resp, resp)
@@ -149,6 +149,35 @@ class BaseTests(unittest.TestCase):
         expected = []
         self.assertEqual(expected, actual)
 
+    def add_paged_organizations(self, pages=3, per_page=2):
+        url = "https://github.example.net/api/v3/organizations"
+        for page in range(1, pages + 1):
+            link = f'<{url}?per_page={per_page}&page={pages}>; rel="last"'
+            if page < pages:
+                link = f'<{url}?per_page={per_page}&page={page + 1}>; rel="next", {link}'
+            data = [{"id": (page - 1) * per_page + i}
+                    for i in range(per_page if page < pages else 1)]
+            responses.add(
+                responses.GET, url, headers={"Link": link}, status=200, json=data,
+                match=[responses.matchers.query_param_matcher(
+                    {"per_page": str(per_page), "page": str(page)} if page > 1 else {"per_page": str(per_page)})])
+
+    @responses.activate
+    def test_list_all_prefetches_pages_in_order(self):
+        self.add_paged_organizations()
+        actual = list(self.api.list_all(
+            "https://github.example.net", "organizations", limit=2, page_check=True))
+        self.assertEqual(actual, [({"id": 0}, False), ({"id": 1}, False), (
+            {"id": 2}, False), ({"id": 3}, False), ({"id": 4}, True)])
+
+    @responses.activate
+    def test_get_total_count_from_last_page(self):
+        self.add_paged_organizations()
+        self.assertEqual(self.api.get_total_count(
+            "https://github.example.net", "organizations", limit=2), 5)
+        # Only the first and last pages are requested
+        self.assertEqual(len(responses.calls), 2)
+
     # pylint: disable=no-member
 
     # @responses.activate
@@ -166,9 +195,9 @@ class BaseTests(unittest.TestCase):
     #         self.api.list_all("http://host", "organizations", verify=False)
 
     def test_generate_v3_post_request(self):
-        with patch("congregate.migration.github.api.base.requests.Response") as mock_resp:
-            with patch("congregate.migration.github.api.base.requests.post") as mock_post:
-                mock_post.return_value = mock_resp
+        with patch("requests.Response") as mock_resp:
+            with patch("congregate.migration.github.api.base.get_pooled_session") as mock_session:
+                mock_session.return_value.post.return_value = mock_resp
                 resp = self.api.generate_v3_post_request(
                     "HOST", "API", {"data": "data"})
                 self.assertEqual(mock_resp, resp)
@@ -1,7 +1,9 @@
 import unittest
+from unittest.mock import patch, MagicMock
 from pytest import mark
 
 from congregate.migration.gitlab.bulk_imports import BulkImportsClient
+from congregate.migration.gitlab.api.bulk_imports import BulkImportApi
 
 
 @mark.unit_test
@@ -47,3 +49,30 @@ class BulkImportsTests(unittest.TestCase):
         full_path = 'one/two/three'
         self.assertFalse(self.bulk_imports.parent_group_exists(
             full_path, self.sort_paths(entity_paths)))
+
+    def entity(self, eid, status):
+        return {
+            "id": eid, "bulk_import_id": 1, "status": status, "entity_type": "project",
+            "source_full_path": f"group/project-{eid}", "destination_name": f"project-{eid}",
+            "destination_slug": f"project-{eid}", "destination_namespace": "group",
+            "created_at": "", "updated_at": "", "failures": [], "namespace_id": None, "project_id": eid + 100
+        }
+
+    @patch("congregate.migration.gitlab.bulk_imports.sleep")
+    @patch.object(BulkImportApi, "get_bulk_import_entities")
+    @patch.object(BulkImportApi, "get_bulk_import_status")
+    def test_watch_entities(self, mock_status, mock_entities, _):
+        mock_status.side_effect = [MagicMock(json=lambda: {"status": status}) for status in [
+            "started", "started", "finished"]]
+        mock_entities.side_effect = [
+            [self.entity(1, "started"), self.entity(2, "created")],
+            [self.entity(1, "finished"), self.entity(2, "started"), self.entity(3, "started")],
+            [self.entity(1, "finished"), self.entity(2, "finished"), self.entity(3, "failed")]
+        ]
+        finished = []
+        states = self.bulk_imports.watch_entities(1, finished.append)
+        # Each entity is dispatched once, as soon as it finished
+        self.assertEqual([e["project_id"] for e in finished], [101, 102])
+        self.assertEqual(states, {1: "finished", 2: "finished", 3: "failed"})
+        # One listing of the entities per poll
+        self.assertEqual(mock_entities.call_count, 3)
@@ -1,6 +1,21 @@
+import os
 import unittest
+import warnings
+from tempfile import TemporaryDirectory
+from unittest.mock import patch, PropertyMock
 from pytest import mark
 from gitlab_ps_utils.jsondiff import Comparator
+# mongomock is using deprecated logic as of Python 3.3
+# This warning suppression is used so tests can pass
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    import mongomock
+
+from congregate.helpers.configuration_validator import ConfigurationValidator
+from congregate.helpers.mdbc import MongoConnector
+from congregate.migration.diff.basediff import BaseDiffClient
+from congregate.migration.diff.diff_cache import DiffCache, get_change_marker
+from congregate.migration.gitlab.diff.projectdiff import ProjectDiffClient
 
 
 @mark.unit_test
@@ -25,3 +40,113 @@ class ComparatorTests(unittest.TestCase):
         actual = self.engine._compare_arrays(list_one, list_two)
 
         self.assertEqual(expected, actual)
+
+
+@mark.unit_test
+class PagedHtmlReportTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        with patch("congregate.migration.diff.basediff.read_json_file_into_object", return_value=[{}, {}, {}]):
+            self.client = BaseDiffClient()
+        self.client.app_path = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, name):
+        with open(os.path.join(self.tmp.name, name), "r") as f:
+            return f.read()
+
+    @patch.object(ConfigurationValidator, "diff_report_page_size", new_callable=PropertyMock)
+    def test_generate_html_report_pages(self, mock_page_size):
+        mock_page_size.return_value = 2
+        diff = {
+            "group/a": {"overall_accuracy": {"accuracy": 1, "result": "success"},
+                        "/projects/:id/issues": {"accuracy": 1, "diff": {}}},
+            "group/b": {"overall_accuracy": {"accuracy": 0, "result": "failure"},
+                        "/projects/:id/issues": {"accuracy": 0, "diff": {"title": "<script>"}}},
+            "group/c": {"overall_accuracy": {"accuracy": 1, "result": "success"}},
+            "project_migration_results": {"overall_accuracy": 0.6667, "result": "failure"}
+        }
+        self.client.generate_html_report("Project", diff, "/report.html")
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), [
+                         "report-page-1.html", "report-page-2.html", "report.html"])
+        index = self.read("report.html")
+        self.assertIn("Staged Project's: '3' Successful Project's: '2' (of 3)", index)
+        self.assertIn("<a href='report-page-1.html'>Page 1</a></td><td>group/b - group/a</td><td>2</td><td>1</td>", index)
+        self.assertIn("<a href='report-page-2.html'>Page 2</a></td><td>group/c - group/c</td><td>1</td><td>0</td>", index)
+        # Failed entries first, with details expanded and diffs escaped
+        page = self.read("report-page-1.html")
+        self.assertLess(page.index("group/b"), page.index("group/a"))
+        self.assertIn("<div id='details-group-b'><table", page)
+        self.assertIn("&lt;script&gt;", page)
+        self.assertNotIn('"<script>"', page)
+
+
+@mark.unit_test
+class DiffCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = DiffCache(MongoConnector(db="test", client=mongomock.MongoClient), "project", 24)
+        self.marker = get_change_marker(
+            {"id": 1, "last_activity_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z"},
+            {"id": 2, "last_activity_at": "2024-01-02T00:00:00Z", "updated_at": "2024-01-02T00:00:00Z"})
+
+    def test_get_change_marker_missing_destination(self):
+        self.assertIsNone(get_change_marker({"id": 1}, None))
+
+    def test_load_saved_successful_diffs(self):
+        self.cache.save("group/project", self.marker, {
+            "/projects/:id/labels": {"diff": {}, "accuracy": 1},
+            "/projects/:id/issues": {"diff": {0: {"+++": 1}}, "accuracy": 0.5},
+            "Commit Counts": {"source": 3, "destination": 3, "accuracy": 1.0, "diff": None}
+        })
+        self.assertEqual(self.cache.load("group/project", self.marker), {
+            "/projects/:id/labels": {"diff": {}, "accuracy": 1},
+            "Commit Counts": {"source": 3, "destination": 3, "accuracy": 1.0, "diff": None}
+        })
+
+    def test_load_changed_project(self):
+        self.cache.save("group/project", self.marker, {"/projects/:id/labels": {"diff": {}, "accuracy": 1}})
+        changed = get_change_marker(
+            {"id": 1, "last_activity_at": "2024-01-03T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z"},
+            {"id": 2, "last_activity_at": "2024-01-02T00:00:00Z", "updated_at": "2024-01-02T00:00:00Z"})
+        self.assertEqual(self.cache.load("group/project", changed), {})
+        self.assertEqual(self.cache.load("group/other", self.marker), {})
+
+    @patch("congregate.migration.diff.diff_cache.time")
+    def test_load_expired(self, mock_time):
+        mock_time.return_value = 1000000
+        self.cache.save("group/project", self.marker, {"/projects/:id/labels": {"diff": {}, "accuracy": 1}})
+        mock_time.return_value = 1000000 + 25 * 3600
+        self.assertEqual(self.cache.load("group/project", self.marker), {})
+
+
+@mark.unit_test
+class ProjectDiffCacheTests(unittest.TestCase):
+    @patch("congregate.migration.gitlab.diff.projectdiff.getmtime", return_value=0)
+    @patch("congregate.migration.gitlab.diff.projectdiff.read_json_file_into_object", return_value=[])
+    @patch("congregate.migration.diff.basediff.read_json_file_into_object", return_value=[{}, {}, {}])
+    def setUp(self, *_):
+        self.client = ProjectDiffClient()
+        self.cache = DiffCache(MongoConnector(db="test", client=mongomock.MongoClient), "project", 24)
+        self.diffed = []
+        self.client.generate_project_diff = lambda project, endpoint, **kwargs: \
+            self.diffed.append(endpoint) or {"diff": {}, "accuracy": 1}
+        self.client.generate_count_diffs = lambda project: {
+            k: {"diff": None, "accuracy": 1} for k in ProjectDiffClient.COUNT_DIFFS}
+        self.client.get_endpoints = lambda: [
+            (key, key, {}) for key in ["/projects/:id/variables", "/projects/:id/members", "/projects/:id/issues"]]
+
+    @patch("congregate.migration.gitlab.diff.projectdiff.get_dst_path_with_namespace", return_value="group/project")
+    @patch("congregate.migration.gitlab.diff.projectdiff.get_change_marker", return_value={"content_hash": "abc"})
+    @patch("congregate.migration.gitlab.diff.projectdiff.get_diff_cache")
+    @patch.object(ConfigurationValidator, "diff_cache_ttl", new_callable=PropertyMock, return_value=24)
+    def test_handle_endpoints_reuses_only_activity_diffs(self, _, mock_cache, *__):
+        mock_cache.return_value = self.cache
+        project = {"id": 1, "path_with_namespace": "group/project"}
+        first = self.client.handle_endpoints(project)
+        self.assertEqual(self.diffed[1:], ["/projects/:id/variables", "/projects/:id/members", "/projects/:id/issues"])
+        self.diffed.clear()
+        # Settings and membership are diffed again, while issues are unchanged
+        self.assertEqual(self.client.handle_endpoints(project), first)
+        self.assertEqual(self.diffed[1:], ["/projects/:id/variables", "/projects/:id/members"])
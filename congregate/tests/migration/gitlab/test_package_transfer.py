@@ -0,0 +1,82 @@
+import unittest
+from time import sleep
+from functools import partial
+from unittest.mock import patch, PropertyMock
+from pytest import mark
+import responses
+from requests import Session
+
+from congregate.helpers.package_utils import is_file_migrated
+from congregate.migration.gitlab.packages import PackagesClient
+from congregate.migration.gitlab.package_transfer import PackageTransfer
+
+SRC = "https://gitlab.source.com"
+DEST = "https://gitlab.destination.com"
+
+
+@mark.unit_test
+@patch("congregate.migration.gitlab.package_transfer.get_pooled_session", side_effect=lambda url: Session())
+@patch("congregate.helpers.conf.Config.destination_host", new_callable=PropertyMock, return_value=DEST)
+@patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock, return_value=SRC)
+class PackageTransferTests(unittest.TestCase):
+    def setUp(self):
+        self.package = {"id": 1, "name": "com/example/app", "version": "1.0", "package_type": "maven"}
+        self.files = [
+            {"file_name": "app-1.0.pom", "size": 3, "file_md5": "a", "file_sha1": "b"},
+            {"file_name": "app-1.0.jar", "size": 4, "file_md5": "c", "file_sha1": "d"}
+        ]
+
+    def test_is_file_migrated(self, *_):
+        src_file = {"file_name": "app.jar", "size": 4, "file_sha256": "x", "file_md5": "y"}
+        self.assertTrue(is_file_migrated(src_file, [{"file_name": "app.jar", "size": 4, "file_md5": "y"}]))
+        self.assertFalse(is_file_migrated(src_file, [{"file_name": "app.jar", "size": 4, "file_md5": "z"}]))
+        self.assertFalse(is_file_migrated(src_file, [{"file_name": "app.war", "size": 4, "file_md5": "y"}]))
+        # Without a common digest, a file of the same name and size is transferred again
+        self.assertFalse(is_file_migrated(src_file, [{"file_name": "app.jar", "size": 4}]))
+        self.assertFalse(is_file_migrated(src_file, [{"file_name": "app.jar", "size": 4, "file_sha1": "w"}]))
+        self.assertFalse(is_file_migrated(src_file, []))
+
+    @responses.activate
+    @patch("congregate.migration.gitlab.api.packages.PackagesApi.get_package_files")
+    def test_migrate_maven_packages_streams_missing_files(self, mock_files, *_):
+        mock_files.side_effect = [iter(self.files), iter(self.files[:1])]
+        path = "com/example/app/1.0"
+        responses.add(responses.GET, f"{SRC}/api/v4/projects/1/packages/maven/{path}/app-1.0.jar", body=b"jar!")
+        uploads = []
+        responses.add_callback(responses.PUT, f"{DEST}/api/v4/projects/2/packages/maven/{path}/app-1.0.jar",
+                               callback=lambda r: uploads.append((r.headers["Content-Length"], b"".join(r.body))) or (200, {}, ""))
+        results = []
+        PackagesClient().migrate_maven_packages(1, 2, self.package, "app", results, all_dest_packages=[
+            {"id": 9, "name": "com/example/app", "version": "1.0", "package_type": "maven"}])
+        self.assertEqual(results, [{"Migrated": True, "Package": "com/example/app"}])
+        # The pom already on the destination (matching checksums) is skipped
+        self.assertEqual([c.request.method for c in responses.calls], ["GET", "PUT"])
+        self.assertEqual(uploads, [("4", b"jar!")])
+
+    @responses.activate
+    @patch("congregate.migration.gitlab.api.packages.PackagesApi.get_package_files")
+    def test_migrate_maven_packages_failed_download(self, mock_files, *_):
+        mock_files.return_value = iter(self.files)
+        responses.add(responses.GET, f"{SRC}/api/v4/projects/1/packages/maven/com/example/app/1.0/app-1.0.pom", body=b"pom")
+        responses.add(responses.GET, f"{SRC}/api/v4/projects/1/packages/maven/com/example/app/1.0/app-1.0.jar", status=404)
+        responses.add(responses.PUT, f"{DEST}/api/v4/projects/2/packages/maven/com/example/app/1.0/app-1.0.pom", status=201)
+        results = []
+        PackagesClient().migrate_maven_packages(1, 2, self.package, "app", results, all_dest_packages=[])
+        self.assertEqual(results, [{"Migrated": False, "Package": "com/example/app"}])
+        self.assertEqual(len([c for c in responses.calls if c.request.method == "PUT"]), 1)
+
+    @patch("congregate.helpers.conf.Config.package_transfer_concurrency", new_callable=PropertyMock, return_value=4)
+    def test_run_transfers_first_file_alone(self, *_):
+        events = []
+
+        def transfer(i):
+            events.append(("start", i))
+            sleep(0.01)
+            events.append(("end", i))
+            return i != 2
+
+        results = PackageTransfer().run([partial(transfer, i) for i in range(4)])
+        self.assertEqual(results, [True, True, False, True])
+        # The destination package is created by the first upload, before the others start
+        self.assertEqual(events[:2], [("start", 0), ("end", 0)])
+        self.assertEqual(PackageTransfer().run([]), [])
@@ -0,0 +1,118 @@
+import unittest
+from threading import Lock, Timer, Thread
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest.mock import patch, PropertyMock, MagicMock
+from pytest import mark
+
+from congregate.helpers.status_scheduler import FINISHED
+from congregate.migration.gitlab.migrate import GitLabMigrateClient
+
+
+class MockImportExportClient():
+    '''
+        Export status scheduling and downloads, recording the number of exports in flight
+    '''
+    def __init__(self, failed_downloads=()):
+        self.failed_downloads = failed_downloads
+        self.lock = Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.events = []
+
+    def __call__(self):
+        return self
+
+    def is_project_on_destination(self, project):
+        return False
+
+    def schedule_export_status(self, pid, name, callback=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        status = Future()
+        status.set_result(MagicMock(state=FINISHED))
+        Timer(0.01, callback, (status,)).start()
+
+    def handle_gzip_download(self, name, pid, filename):
+        with self.lock:
+            self.in_flight -= 1
+            self.events.append(("download", pid))
+        if pid in self.failed_downloads:
+            raise IOError(f"Failed to download {filename}")
+
+
+@mark.unit_test
+class ProjectExportSchedulingTests(unittest.TestCase):
+    def setUp(self):
+        self.projects = [{"id": i, "name": f"project-{i}", "path": f"project-{i}", "namespace": "group",
+                          "path_with_namespace": f"group/project-{i}"} for i in range(1, 7)]
+        self.migrate = GitLabMigrateClient(dry_run=False, processes=4)
+        self.migrate.multi = MagicMock()
+        self.migrate.multi.get_no_of_processes.return_value = 4
+
+    @patch("congregate.helpers.conf.Config.archive_logic", new_callable=PropertyMock)
+    @patch("congregate.helpers.conf.Config.project_export_concurrency", new_callable=PropertyMock)
+    @patch("congregate.migration.gitlab.migrate.ImportExportClient")
+    def test_schedule_exporting_projects_bounds_exports_in_flight(self, mock_ie, mock_concurrency, mock_archive):
+        ie = MockImportExportClient(failed_downloads=[2])
+        mock_ie.side_effect = ie
+        mock_concurrency.return_value = 2
+        mock_archive.return_value = False
+        results = self.migrate.schedule_exporting_projects(self.projects)
+        self.assertEqual(ie.max_in_flight, 2)
+        self.assertEqual(len(results), 6)
+        self.assertEqual([list(r.values())[0] for r in results], [True, False, True, True, True, True])
+
+    def stream(self, ie, export_concurrency, failed_imports=()):
+        """
+            Stream the projects migration, with import processes replaced by threads
+        """
+        def worker(project):
+            with ie.lock:
+                ie.events.append(("import", project["id"]))
+            if project["id"] in failed_imports:
+                raise RuntimeError(f"Failed to import {project['path_with_namespace']}")
+            return {project["path_with_namespace"]: True}
+
+        self.migrate.multi.worker.side_effect = worker
+        results = []
+        with patch("congregate.migration.gitlab.migrate.ImportExportClient", side_effect=ie), \
+                patch("congregate.migration.gitlab.migrate.ProcessPoolExecutor",
+                      lambda max_workers, **kwargs: ThreadPoolExecutor(max_workers=max_workers)), \
+                patch("congregate.helpers.conf.Config.project_export_concurrency",
+                      new_callable=PropertyMock, return_value=export_concurrency), \
+                patch("congregate.helpers.conf.Config.project_download_concurrency",
+                      new_callable=PropertyMock, return_value=2), \
+                patch("congregate.helpers.conf.Config.project_import_concurrency",
+                      new_callable=PropertyMock, return_value=2), \
+                patch("congregate.helpers.conf.Config.archive_logic", new_callable=PropertyMock, return_value=False):
+            # A leaked export slot would block the migration
+            migration = Thread(target=lambda: results.append(
+                self.migrate.stream_projects_migration(self.projects)), daemon=True)
+            migration.start()
+            migration.join(timeout=30)
+        self.assertFalse(migration.is_alive(), "Project migration blocked")
+        return results[0]
+
+    def test_stream_projects_migration_bounds_exports_in_flight(self):
+        ie = MockImportExportClient()
+        export_results, import_results = self.stream(ie, 2)
+        self.assertEqual(ie.max_in_flight, 2)
+        self.assertEqual(len(export_results), 6)
+        self.assertEqual(len(import_results), 6)
+
+    def test_stream_projects_migration_downloads_before_import(self):
+        ie = MockImportExportClient()
+        self.stream(ie, 3)
+        for project in self.projects:
+            self.assertLess(ie.events.index(("download", project["id"])), ie.events.index(("import", project["id"])))
+
+    def test_stream_projects_migration_releases_failed_exports_and_imports(self):
+        ie = MockImportExportClient(failed_downloads=[1])
+        export_results, import_results = self.stream(ie, 1, failed_imports=[2])
+        self.assertEqual(ie.max_in_flight, 1)
+        self.assertEqual([list(r.values())[0] for r in export_results], [False, True, True, True, True, True])
+        # The failed export is not imported, and the failed import is reported
+        self.assertNotIn(("import", 1), ie.events)
+        self.assertEqual(sorted(import_results, key=lambda r: list(r)[0]),
+                         [{"group/project-2": False}] + [{f"group/project-{i}": True} for i in range(3, 7)])
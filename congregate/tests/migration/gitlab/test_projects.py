@@ -3,7 +3,7 @@ import unittest
 from unittest.mock import patch, PropertyMock, MagicMock
 from congregate.helpers.conf import Config
 from pytest import mark
-from httpx import RequestError
+from httpx import RequestError, Response, Request
 
 from congregate.helpers.configuration_validator import ConfigurationValidator
 from congregate.tests.mockapi.gitlab.groups import MockGroupsApi
@@ -105,6 +105,92 @@ class ProjectsTests(unittest.TestCase):
             "gitlab.example.com-host")]
         self.assertEqual(len(actual_projects), 0)
 
+    @patch.object(ProjectsClient, "handle_retrieving_project")
+    @patch.object(GroupsApi, "get_all_group_projects")
+    @patch('congregate.helpers.conf.Config.src_parent_group_path', new_callable=PropertyMock)
+    @patch('congregate.helpers.conf.Config.src_parent_id', new_callable=PropertyMock)
+    @patch('congregate.helpers.conf.Config.direct_transfer', new_callable=PropertyMock)
+    def test_retrieve_project_info_delta_src_parent_group(self, mock_direct_transfer, mock_src_parent_id, mock_src_parent_group_path, mock_get_all_group_projects, mock_handle):
+        mock_direct_transfer.return_value = False
+        mock_src_parent_id.return_value = 42
+        mock_src_parent_group_path.return_value = "mock_src_parent_group_path"
+        projects = self.mock_projects.get_all_projects()
+        projects[0]["last_activity_at"] = "2024-01-02T00:00:00Z"
+        mock_get_all_group_projects.return_value = projects
+        self.projects.multi = MagicMock()
+        self.projects.multi.start_multi_process_stream_with_args.side_effect = lambda f, it, *args, **kwargs: [
+            f(*args, i) for i in it]
+        self.projects.since = "2024-01-01T00:00:00Z"
+
+        self.projects.retrieve_project_info("https://gitlab.example.com", "token")
+
+        mock_handle.assert_called_once_with("https://gitlab.example.com", "token", projects[0])
+
+    @patch.object(ProjectsApi, "get_all_projects")
+    def test_get_changed_projects(self, mock_get_all_projects):
+        mock_get_all_projects.side_effect = lambda host, token, **kwargs: iter(
+            [{"id": 1}, {"id": 2}] if "last_activity_after" in kwargs else [{"id": 2}, {"id": 3}])
+        self.projects.since = "2024-01-01T00:00:00Z"
+
+        self.assertEqual([p["id"] for p in self.projects.get_changed_projects("https://gitlab.example.com", "token")],
+                         [1, 2, 3])
+        mock_get_all_projects.assert_any_call(
+            "https://gitlab.example.com", "token", last_activity_after="2024-01-01T00:00:00Z")
+        mock_get_all_projects.assert_any_call(
+            "https://gitlab.example.com", "token", updated_after="2024-01-01T00:00:00Z")
+
+    @patch.object(ProjectsApi, "get_all_project_ids")
+    @patch('congregate.helpers.conf.Config.src_parent_group_path', new_callable=PropertyMock)
+    @patch("congregate.migration.gitlab.projects.get_shared_mongo_connector")
+    def test_delete_missing_projects(self, mock_mongo, mock_src_parent_group_path, mock_get_all_project_ids):
+        mock_src_parent_group_path.return_value = None
+        mock_get_all_project_ids.return_value = {1, 2}
+        mock_mongo.return_value.delete_missing.return_value = 3
+
+        self.assertEqual(self.projects.delete_missing_projects("https://gitlab.example.com", "token"), 3)
+        mock_mongo.return_value.delete_missing.assert_called_once_with(
+            "projects-gitlab.example.com", {1, 2})
+
+        # Incomplete sweeps delete nothing
+        mock_get_all_project_ids.return_value = None
+        self.assertEqual(self.projects.delete_missing_projects("https://gitlab.example.com", "token"), 0)
+        mock_mongo.return_value.delete_missing.assert_called_once()
+
+    @patch.object(GroupsApi, "get_all_group_projects")
+    @patch.object(GroupsApi, "get_all_group_projects_count")
+    @patch('congregate.helpers.conf.Config.src_parent_group_path', new_callable=PropertyMock)
+    @patch('congregate.helpers.conf.Config.src_parent_id', new_callable=PropertyMock)
+    @patch("congregate.migration.gitlab.projects.get_shared_mongo_connector")
+    def test_delete_missing_projects_src_parent_group(self, mock_mongo, mock_src_parent_id, mock_src_parent_group_path, mock_count, mock_get_all_group_projects):
+        mock_src_parent_id.return_value = 42
+        mock_src_parent_group_path.return_value = "mock_src_parent_group_path"
+        mock_get_all_group_projects.side_effect = lambda *args, **kwargs: iter([{"id": 1}, {"id": 2}])
+
+        # Without X-Total (over 10,000 projects) completeness cannot be shown
+        for count in [None, 3]:
+            mock_count.return_value = count
+            self.assertEqual(self.projects.delete_missing_projects("https://gitlab.example.com", "token"), 0)
+        mock_mongo.return_value.delete_missing.assert_not_called()
+
+        mock_count.return_value = 2
+        self.projects.delete_missing_projects("https://gitlab.example.com", "token")
+        mock_mongo.return_value.delete_missing.assert_called_once_with(
+            "projects-gitlab.example.com", {1, 2})
+
+    def test_get_all_project_ids(self):
+        url = "https://gitlab.example.com/api/v4/projects"
+        def page(ids, after=None, status=200):
+            headers = {"Link": f'<{url}?id_after={after}&per_page=100>; rel="next"'} if after else {}
+            return Response(status, json=[{"id": i} for i in ids], headers=headers, request=Request("GET", url))
+        with patch.object(ProjectsApi, "api") as mock_api:
+            mock_api.generate_get_request.side_effect = [page([1, 2], after=2), page([3])]
+            self.assertEqual(self.projects_api.get_all_project_ids("https://gitlab.example.com", "token"), {1, 2, 3})
+            self.assertEqual(mock_api.generate_get_request.call_args_list[1][1]["params"]["id_after"], "2")
+            self.assertEqual(mock_api.generate_get_request.call_args_list[1][1]["params"]["order_by"], "id")
+
+            mock_api.generate_get_request.side_effect = [page([1, 2], after=2), page([], status=500)]
+            self.assertIsNone(self.projects_api.get_all_project_ids("https://gitlab.example.com", "token"))
+
     @patch('congregate.helpers.conf.Config.destination_host', new_callable=PropertyMock)
     @patch.object(ConfigurationValidator, 'destination_token', new_callable=PropertyMock)
     @patch.object(ProjectsApi, "add_member")
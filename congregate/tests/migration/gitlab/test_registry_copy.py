@@ -0,0 +1,74 @@
+import unittest
+from json import dumps
+from unittest.mock import patch
+from pytest import mark
+import responses
+
+from congregate.migration.gitlab.registry_copy import OciRegistry, RegistryCopier
+from congregate.tests.mockapi.gitlab.registry_server import MockOciRegistry
+
+
+@mark.unit_test
+@patch.dict(RegistryCopier.mount_sources, clear=True)
+class RegistryCopyTests(unittest.TestCase):
+    def setUp(self):
+        self.src = MockOciRegistry("https://registry.source.com")
+        self.dest = MockOciRegistry(
+            "https://registry.destination.com", token_realm="https://gitlab.destination.com/jwt/auth")
+        self.copier = RegistryCopier(OciRegistry("registry.source.com"), OciRegistry(
+            "https://registry.destination.com", "root", "token"))
+
+    def uploads(self):
+        return [r for r in self.dest.requests if r[0] == "PUT" and "/blobs/uploads/" in r[1]]
+
+    @responses.activate
+    def test_copy_image_skips_blobs_on_destination(self):
+        self.src.register()
+        self.dest.register()
+        self.src.add_image("group/app", "1.0", [b"base", b"app-1.0"])
+        self.src.add_image("group/app", "2.0", [b"base", b"app-2.0"])
+        self.copier.copy_image("group/app", "new/app", "1.0")
+        self.copier.copy_image("group/app", "new/app", "2.0")
+        self.assertEqual(self.dest.manifests["new/app"]["1.0"], self.src.manifests["group/app"]["1.0"])
+        self.assertEqual(self.dest.manifests["new/app"]["2.0"], self.src.manifests["group/app"]["2.0"])
+        # Base layer and image config are copied once
+        self.assertEqual(len(self.uploads()), 4)
+        self.assertEqual((self.copier.copied, self.copier.skipped), (4, 2))
+
+    @responses.activate
+    def test_copy_image_mounts_blobs_across_repositories(self):
+        self.src.register()
+        self.dest.register()
+        self.src.add_image("group/app", "latest", [b"base", b"app"])
+        self.src.add_image("group/other", "latest", [b"base", b"other"])
+        self.copier.copy_image("group/app", "new/app", "latest")
+        self.copier.copy_image("group/other", "new/other", "latest")
+        self.assertEqual(set(self.dest.blobs["new/other"]), set(self.src.blobs["group/other"]))
+        self.assertEqual(self.copier.mounted, 2)
+        self.assertEqual(len(self.uploads()), 4)
+
+    @responses.activate
+    def test_copy_image_index(self):
+        self.src.register()
+        self.dest.register()
+        children = [self.src.add_image("group/app", platform, [b"base", platform.encode()])
+                    for platform in ["amd64", "arm64"]]
+        index = {
+            "schemaVersion": 2,
+            "mediaType": "application/vnd.oci.image.index.v1+json",
+            "manifests": [{
+                "mediaType": child["mediaType"],
+                "digest": self.src.add_blob("group/app", dumps(child).encode(), child["mediaType"])["digest"],
+                "size": len(dumps(child))
+            } for child in children]
+        }
+        self.src.add_manifest("group/app", "latest", dumps(index).encode(), index["mediaType"])
+        self.copier.copy_image("group/app", "new/app", "latest")
+        self.assertEqual(self.dest.manifests["new/app"]["latest"], self.src.manifests["group/app"]["latest"])
+        for descriptor in index["manifests"]:
+            self.assertIn(descriptor["digest"], self.dest.manifests["new/app"])
+
+    def test_repository_path(self):
+        registry = OciRegistry("https://registry.source.com")
+        self.assertEqual(registry.repository_path(
+            "registry.source.com/group/app"), "group/app")
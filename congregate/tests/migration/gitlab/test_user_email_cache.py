@@ -0,0 +1,94 @@
+import unittest
+import warnings
+from unittest.mock import patch, PropertyMock, MagicMock
+from pytest import mark
+# mongomock is using deprecated logic as of Python 3.3
+# This warning suppression is used so tests can pass
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    import mongomock
+
+from congregate.helpers.congregate_mdbc import CongregateMongoConnector
+from congregate.migration.gitlab.user_email_cache import UserEmailCache
+from congregate.migration.gitlab.api.users import UsersApi
+
+
+@mark.unit_test
+class UserEmailCacheTests(unittest.TestCase):
+    HOST = "https://gitlab.example.com"
+
+    def setUp(self):
+        with patch("congregate.helpers.conf.Config.list_ci_source_config") as mock_list_ci_sources:
+            mock_list_ci_sources.side_effect = [{}, {}]
+            with patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock) as mock_source_host:
+                mock_source_host.return_value = self.HOST
+                self.mongo = CongregateMongoConnector(
+                    client=mongomock.MongoClient)
+        self.mongo.insert_data("users-gitlab.example.com",
+                               {"id": 1, "email": "jdoe@email.com", "username": "jdoe"})
+        self.mongo.insert_data("users-gitlab.example.com",
+                               {"id": 2, "email": "", "username": "nomail"})
+
+    @patch("congregate.migration.gitlab.user_email_cache.get_shared_mongo_connector")
+    @patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock)
+    def test_get_many_from_listed_users(self, mock_source_host, mock_mongo):
+        mock_source_host.return_value = self.HOST
+        mock_mongo.return_value = self.mongo
+        cache = UserEmailCache()
+        self.assertEqual(cache.get_many(self.HOST, [1, 2, 3]), {1: "jdoe@email.com"})
+        # Served from the LRU
+        self.assertEqual(cache.get_many(self.HOST, [1]), {1: "jdoe@email.com"})
+        self.assertEqual(mock_mongo.call_count, 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    @patch("congregate.migration.gitlab.user_email_cache.get_shared_mongo_connector")
+    @patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock)
+    def test_get_many_skips_listed_users_of_other_hosts(self, mock_source_host, mock_mongo):
+        mock_source_host.return_value = self.HOST
+        cache = UserEmailCache()
+        self.assertEqual(cache.get_many("https://gitlabdestination.com", [1]), {})
+        mock_mongo.assert_not_called()
+
+    @patch("congregate.helpers.conf.Config.user_email_cache_size", new_callable=PropertyMock)
+    @patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock)
+    def test_set_many_evicts_least_recently_used(self, mock_source_host, mock_size):
+        mock_source_host.return_value = None
+        mock_size.return_value = 2
+        cache = UserEmailCache()
+        cache.set_many(self.HOST, {1: "a@email.com", 2: "b@email.com"})
+        cache.get_many(self.HOST, [1])
+        cache.set_many(self.HOST, {3: "c@email.com"})
+        self.assertEqual(cache.get_many(self.HOST, [1, 2, 3]), {
+                         1: "a@email.com", 3: "c@email.com"})
+
+    @patch("congregate.migration.gitlab.user_email_cache._cache", None)
+    @patch.object(UsersApi, "get_user_email")
+    @patch.object(UsersApi, "get_users_by_ids")
+    @patch("congregate.helpers.conf.Config.source_host", new_callable=PropertyMock)
+    def test_add_member_emails_batched(self, mock_source_host, mock_graphql, mock_get_user_email):
+        mock_source_host.return_value = None
+        resp = MagicMock()
+        resp.json.return_value = {"data": {"users": {"nodes": [
+            {"id": "gid://gitlab/User/1", "publicEmail": "",
+             "emails": {"nodes": [{"email": "jdoe@email.com"}]}},
+            {"id": "gid://gitlab/User/2", "publicEmail": "", "emails": None},
+            {"id": "gid://gitlab/User/3", "publicEmail": "",
+             "emails": {"nodes": [{"email": "secondary@email.com"}, {"email": "asmith@email.com"}]}}
+        ]}}}
+        mock_graphql.return_value = resp
+        mock_get_user_email.side_effect = lambda uid, host, token: {2: "rsmith@email.com", 3: "asmith@email.com"}[uid]
+        users = UsersApi()
+        members = [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 3}]
+        self.assertEqual(list(users.add_member_emails(members, self.HOST, "token")), [
+            {"id": 1, "email": "jdoe@email.com"},
+            {"id": 2, "email": "rsmith@email.com"},
+            {"id": 1, "email": "jdoe@email.com"},
+            {"id": 3, "email": "asmith@email.com"}
+        ])
+        mock_graphql.assert_called_once_with([1, 2, 3], self.HOST, "token")
+        # Users without a single unambiguous email are looked up one by one
+        self.assertEqual([c.args[0] for c in mock_get_user_email.call_args_list], [2, 3])
+        # Members of the next project are served from the cache
+        self.assertEqual(list(users.add_member_emails([{"id": 2}], self.HOST, "token")), [
+            {"id": 2, "email": "rsmith@email.com"}])
+        mock_graphql.assert_called_once()
@@ -0,0 +1,96 @@
+import re
+from json import dumps, loads
+from uuid import uuid4
+from hashlib import sha256
+from urllib.parse import urlsplit, parse_qs
+import responses
+
+
+def get_digest(data):
+    return f"sha256:{sha256(data).hexdigest()}"
+
+
+class MockOciRegistry():
+    '''
+        In-memory registry:2 stand-in, serving the OCI distribution API through responses
+    '''
+    def __init__(self, url, token_realm=None):
+        self.url = url
+        self.token_realm = token_realm
+        # repo -> {digest: bytes}
+        self.blobs = {}
+        # repo -> {reference: (content, media type)}
+        self.manifests = {}
+        self.uploads = {}
+        self.requests = []
+
+    def register(self):
+        pattern = re.compile(re.escape(self.url) + r"/v2/.*")
+        for method in [responses.HEAD, responses.GET, responses.POST, responses.PUT]:
+            responses.add_callback(method, pattern, callback=self.handle)
+        if self.token_realm:
+            responses.add(responses.GET, re.compile(re.escape(self.token_realm) + ".*"),
+                          json={"token": "registry-token"})
+
+    def add_image(self, repo, tag, layers):
+        """
+            Store an image from its layer contents, and return its manifest
+        """
+        config = dumps({"architecture": "amd64", "os": "linux"}).encode()
+        manifest = {
+            "schemaVersion": 2,
+            "mediaType": "application/vnd.docker.distribution.manifest.v2+json",
+            "config": self.add_blob(repo, config, "application/vnd.docker.container.image.v1+json"),
+            "layers": [self.add_blob(repo, layer, "application/vnd.docker.image.rootfs.diff.tar.gzip") for layer in layers]
+        }
+        self.add_manifest(repo, tag, dumps(manifest).encode(), manifest["mediaType"])
+        return manifest
+
+    def add_blob(self, repo, data, media_type):
+        self.blobs.setdefault(repo, {})[get_digest(data)] = data
+        return {"mediaType": media_type, "digest": get_digest(data), "size": len(data)}
+
+    def add_manifest(self, repo, reference, content, media_type):
+        manifests = self.manifests.setdefault(repo, {})
+        manifests[reference] = manifests[get_digest(content)] = (content, media_type)
+
+    def handle(self, request):
+        parts = urlsplit(request.url)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        self.requests.append((request.method, parts.path, query))
+        if self.token_realm and request.headers.get("Authorization") != "Bearer registry-token":
+            return (401, {"WWW-Authenticate": f'Bearer realm="{self.token_realm}",service="container_registry"'}, "")
+        repo, kind, rest = re.match(
+            r"/v2/(.+?)/(blobs/uploads|blobs|manifests)/?(.*)", parts.path).groups()
+        blobs = self.blobs.setdefault(repo, {})
+        if kind == "blobs":
+            if rest not in blobs:
+                return (404, {}, "")
+            return (200, {"Docker-Content-Digest": rest}, blobs[rest] if request.method == "GET" else "")
+        if kind == "blobs/uploads" and request.method == "POST":
+            if (mount := query.get("mount")) and mount in self.blobs.get(query.get("from"), {}):
+                blobs[mount] = self.blobs[query["from"]][mount]
+                return (201, {"Location": f"/v2/{repo}/blobs/{mount}"}, "")
+            self.uploads[upload := str(uuid4())] = repo
+            return (202, {"Location": f"/v2/{repo}/blobs/uploads/{upload}"}, "")
+        if kind == "blobs/uploads":
+            body = request.body.read() if hasattr(request.body, "read") else request.body
+            if rest not in self.uploads or get_digest(body) != query.get("digest"):
+                return (400, {}, dumps({"errors": [{"code": "DIGEST_INVALID"}]}))
+            del self.uploads[rest]
+            blobs[query["digest"]] = body
+            return (201, {"Docker-Content-Digest": query["digest"]}, "")
+        manifests = self.manifests.setdefault(repo, {})
+        if request.method == "GET":
+            if rest not in manifests:
+                return (404, {}, "")
+            content, media_type = manifests[rest]
+            return (200, {"Content-Type": media_type, "Docker-Content-Digest": get_digest(content)}, content)
+        manifest = loads(request.body)
+        referenced = [m["digest"] for m in manifest.get("manifests", []) if m["digest"] not in manifests]
+        referenced += [b["digest"] for b in [manifest.get("config") or {}] + manifest.get("layers", [])
+                       if b and b["digest"] not in blobs]
+        if referenced:
+            return (400, {}, dumps({"errors": [{"code": "MANIFEST_BLOB_UNKNOWN", "detail": referenced}]}))
+        self.add_manifest(repo, rest, request.body, request.headers["Content-Type"])
+        return (201, {"Docker-Content-Digest": get_digest(request.body)}, "")
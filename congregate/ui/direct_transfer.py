@@ -74,6 +74,7 @@ def find_pending_migration_tasks(mongo=None):
     migration_tasks = [
         'trigger-bulk-import-task',
         'watch-import-status',
+        'watch-import-entities-status',
         'watch-import-entity-status',
         'post-migration-task'
     ]